@@ -6,7 +6,7 @@ def find_priority_file(self, files):
                     return file
         return None#!/usr/bin/env python3
 """
-Automatizare incarcare fisiere pe Archive.org - Versiunea cu ZERO TAB CLOSURES:
+Automatizare incarcare fisiere pe Archive.org - tab-urile se închid doar după upload confirmat:
 - Scaneaza RECURSIV toate subfolderele din g:\\ARHIVA\\B\\ (fara limita de nivel)
 - Pentru foldere cu PDF: incarca TOATE fisierele (exceptand .jpg/.png) pe archive.org
 - Pentru foldere fara PDF: muta un fisier specific in d:\\3\\ cu OVERWRITE
@@ -16,7 +16,10 @@ Automatizare incarcare fisiere pe Archive.org - Versiunea cu ZERO TAB CLOSURES:
 - Pastreaza evidenta progresului in state_archive.json
 - Verifica erori 404/505 dupa 5 minute de la ultimul upload si salveaza titlurile intr-un txt
 - NOUĂ FUNCȚIONALITATE: Copiază automat fișierele cu erori în g:\\TEMP\\ pentru verificare ușoară
-- ZERO TAB CLOSURES: NICIUN tab nu se închide NICIODATĂ - upload-uri de 200+ MB durează 30+ minute!
+- Tab-urile de upload se închid DOAR după succes confirmat (redirect la /details/<id>); cele cu erori rămân deschise,
+  iar cel mult MAX_LIVE_UPLOAD_TABS upload-uri rulează simultan (Chrome nu mai moare cu out-of-memory)
+- Backend alternativ (--backend ias3): upload direct prin API-ul S3 archive.org, fără Chrome
+- Backend fals (ArchiveUploader(backend="fake")): upload simulat, fără rețea - doar pentru benchmark_uploader_loop.py
 
 Inainte de pornire ruleaza start_chrome_debug.bat pentru sesiunea Chrome cu remote debugging.
 
@@ -32,10 +35,11 @@ REM Asigură-te că nu mai e deja un Chrome deschis pe acel profil
 import time
 import os
 import sys
+import argparse
+import threading
 import re
 import json
-import shutil
-import difflib
+import copy
 from datetime import datetime
 from pathlib import Path
 from selenium import webdriver
@@ -46,6 +50,26 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import WebDriverException, TimeoutException, NoSuchElementException
 
+from archive_batch_planner import DAILY_PLAN_FILE, describe_result, load_plan, planned_folders, planned_paths, record_plan_result
+from archive_file_index import FileNameIndex
+from archive_file_validator import FileValidator
+from archive_form_filler import fill_form_script, missing_fields
+from archive_bandwidth import BandwidthShaper
+from archive_fake_backend import FakeUploadBackend
+from archive_ias3 import IAS3Uploader, form_metadata
+from archive_upload_scheduler import UploadScheduler
+from archive_cdp_listener import NetworkErrorListener
+from archive_chrome_pool import BASE_DEBUG_PORT, ChromePool
+from archive_dom_probe import classify_probe, probe_tabs
+from archive_tab_manager import MAX_LIVE_UPLOAD_TABS, SUCCEEDED, UploadTabManager
+from archive_upload_monitor import UploadMonitor, debugger_address, list_targets, target_id
+from archive_waits import WaitPolicy, WaitTimeout
+from archive_work_queue import FAILED, IN_FLIGHT, INVALID, WorkQueue
+from archive_title_normalizer import normalize_filename_for_matching, sanitize_title
+from archive_transfer import TransferEngine
+from archive_near_duplicates import SKIP_LIST_FILE, load_skip_list
+from archive_retry import RetryEngine
+
 
 # Configurari
 ARCHIVE_PATH = Path(r"g:\ARHIVA\C") # - Aici e folderul cu fisiere
@@ -53,7 +77,18 @@ MOVE_PATH = Path(r"d:\3")  # Aici e folderul unde copiezi fisierele diferite de
 TEMP_PATH = Path(r"g:\TEMP")  # NOUĂ: Pentru fișierele cu erori
 ARCHIVE_URL = "https://archive.org/upload"
 MAX_UPLOADS_PER_DAY = 9999
+UPLOAD_BACKEND = "selenium"  # "selenium" = formularul din Chrome, "ias3" = API-ul S3 archive.org (fără Chrome)
+MAX_UPLOADS_IN_FLIGHT = 3  # IAS3: upload-uri simultane
+MAX_IN_FLIGHT_MB = 1024    # IAS3: MB aflați simultan în upload
+UPLOAD_GLOBAL_MBPS = 0     # Plafon total MB/s (0 = nelimitat; se poate schimba din mers cu archive_bandwidth.py)
+UPLOAD_PER_ITEM_MBPS = 0   # Plafon MB/s per upload (IAS3: token bucket; Chrome: CDP pe tab-ul de upload)
+CHROME_DEBUG_ADDRESS = "127.0.0.1:9222"  # Chrome-ul pornit de start_chrome_debug.bat
+CHROME_POOL_SIZE = 1       # Selenium: instanțe Chrome (>1 = pool pe porturile 9222, 9223...; vezi archive_chrome_pool.py)
 STATE_FILENAME = "state_archive.json"
+VALIDATE_BEFORE_UPLOAD = True  # PDF/EPUB/DJVU verificate structural înainte de upload (archive_file_validator.py)
+USE_DAILY_PLAN = True  # Dacă există planul de azi (archive_batch_planner.py), se încarcă doar unitățile din el
+# Pauzele fixe înlocuite de WaitPolicy (2 + 3 + 0.5 + 0.5 + 0.8 + 3 + 10 + 2), doar pentru raport
+LEGACY_SLEEP_SECONDS_PER_UPLOAD = 21.8
 
 # Extensii in ordinea prioritatii pentru foldere fara PDF
 PRIORITY_EXTENSIONS = ['.mobi', '.epub', '.djvu', '.docx', '.doc', '.lit', '.rtf']
@@ -62,13 +97,37 @@ PRIORITY_EXTENSIONS = ['.mobi', '.epub', '.djvu', '.docx', '.doc', '.lit', '.rtf
 IGNORE_EXTENSIONS = ['.jpg', '.png']
 
 class ArchiveUploader:
-    def __init__(self, timeout=90):
+    def __init__(self, timeout=90, backend=UPLOAD_BACKEND, pool_size=CHROME_POOL_SIZE):
         self.timeout = timeout
+        self.backend = backend
+        self.pool_size = pool_size
+        self.pool_workers = []  # Câte un ArchiveUploader per instanță Chrome din pool
+        self.chrome_address = CHROME_DEBUG_ADDRESS
+        self.shaper = BandwidthShaper(UPLOAD_GLOBAL_MBPS, UPLOAD_PER_ITEM_MBPS)  # Comun: IAS3 și toate instanțele Chrome
+        self.ias3 = IAS3Uploader(shaper=self.shaper) if backend == "ias3" else None
+        self.fake_backend = FakeUploadBackend() if backend == "fake" else None
+        self.ias3_failures = []  # Și eșecurile backend-ului fals (același format)
+        self.state_lock = threading.RLock()  # Upload-urile IAS3 rulează în paralel
         self.driver = None
         self.wait = None
+        self.waits = WaitPolicy()  # Așteptări cu buget per câmp în formularul de upload
         self.attached_existing = False
         self.state_path = STATE_FILENAME
-        self.upload_tabs = []  # FIXED: Track upload tabs instead of closing them
+        self.work_queue = WorkQueue()  # Starea persistentă a fiecărei unități (upload_work_queue.json)
+        self.retry = RetryEngine(self.work_queue)  # Unitățile eșuate revin în coadă cu backoff după clasa erorii
+        self.transfers = TransferEngine()  # Copierile în d:\3 și TEMP: reflink/copiere în kernel, identicele sărite
+        self.tab_manager = UploadTabManager(max_live_tabs=MAX_LIVE_UPLOAD_TABS,
+                                            on_settle=self.work_queue.settle_tab)  # Stare per tab de upload
+        self.upload_monitor = UploadMonitor(self.tab_manager)  # Finalizarea upload-urilor, în fundal
+        # Erorile HTTP ale upload-urilor și plafonul de bandă al tab-urilor, prin CDP
+        self.network_listener = NetworkErrorListener(self.tab_manager, shaper=self.shaper)
+        # Duplicate locale (generate cu: python archive_near_duplicates.py g:\ARHIVA --write-skip-list)
+        self.near_duplicates = load_skip_list(SKIP_LIST_FILE)
+        self.validator = FileValidator()  # Cache după (cale, mărime, mtime) în file_validation_cache.json
+        # Lotul zilei după buget de octeți/timp (generat cu: python archive_batch_planner.py g:\ARHIVA\C)
+        self.daily_plan = load_plan(DAILY_PLAN_FILE) if USE_DAILY_PLAN else None
+        self.plan_units = planned_paths(self.daily_plan) if self.daily_plan else set()
+        self.plan_deferred_folders = set()  # Foldere cu unități lăsate de plan pe altă zi
         self._load_state()
 
     def _load_state(self):
@@ -121,16 +180,35 @@ class ArchiveUploader:
     def mark_unit_processed(self, unit_path, unit_name, action_type):
         """Marchează o unitate ca procesată"""
         unit_key = str(unit_path)
-        if unit_key not in self.state.get("processed_units", []):
-            self.state.setdefault("processed_units", []).append(unit_key)
-            print(f"✅ Unitatea marcată ca procesată: {unit_name} ({action_type})")
-        self._save_state()
+        with self.state_lock:
+            if unit_key not in self.state.get("processed_units", []):
+                self.state.setdefault("processed_units", []).append(unit_key)
+                print(f"✅ Unitatea marcată ca procesată: {unit_name} ({action_type})")
+            self._save_state()
+        if action_type == "UPLOAD" and self.backend == "selenium":
+            self.work_queue.in_flight(unit_name)  # Tab-ul încă încarcă; verified vine de la UploadTabManager
+        elif action_type == "INVALID":
+            self.work_queue.invalid(unit_name)  # Neîncărcată: nu e "verified" (confirmat pe archive.org)
+        else:
+            self.work_queue.verified(unit_name, action_type)
+
+    def unmark_unit_processed(self, unit, reason="upload pierdut odată cu Chrome"):
+        """Upload pierdut (Chrome crăpat) sau eșuat: unitatea se reia, contoarele se corectează"""
+        unit_key = str(unit["path"])
+        with self.state_lock:
+            if unit_key in self.state.get("processed_units", []):
+                self.state["processed_units"].remove(unit_key)
+                self.state["uploads_today"] -= len(unit["all_files"])
+                self.state["total_files_uploaded"] -= len(unit["all_files"])
+                self._save_state()
+        self.work_queue.requeue(unit["name"], reason)
 
     def _save_state(self):
         """Salveaza starea in fisierul JSON"""
         try:
-            with open(self.state_path, "w", encoding="utf-8") as f:
-                json.dump(self.state, f, indent=2, ensure_ascii=False)
+            with self.state_lock:
+                with open(self.state_path, "w", encoding="utf-8") as f:
+                    json.dump(self.state, f, indent=2, ensure_ascii=False)
         except Exception as e:
             print(f"⚠ Nu am putut salva starea: {e}")
 
@@ -139,7 +217,7 @@ class ArchiveUploader:
         try:
             print("🔧 Initializare WebDriver – incerc conectare la instanta Chrome existenta...")
             chrome_options = Options()
-            chrome_options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
+            chrome_options.add_experimental_option("debuggerAddress", self.chrome_address)
             prefs = {
                 "download.default_directory": os.path.abspath(os.getcwd()),
                 "download.prompt_for_download": False,
@@ -150,6 +228,8 @@ class ArchiveUploader:
             try:
                 self.driver = webdriver.Chrome(options=chrome_options)
                 self.wait = WebDriverWait(self.driver, self.timeout)
+                self.waits.attach(self.driver)
+                self.tab_manager.attach(self.driver)
                 self.attached_existing = True
                 print("✅ Conectat la instanta Chrome existenta cu succes.")
                 return True
@@ -163,6 +243,8 @@ class ArchiveUploader:
                 chrome_options.add_argument("--window-size=1920,1080")
                 self.driver = webdriver.Chrome(options=chrome_options)
                 self.wait = WebDriverWait(self.driver, self.timeout)
+                self.waits.attach(self.driver)
+                self.tab_manager.attach(self.driver)
                 self.attached_existing = False
                 print("✅ Chrome nou pornit cu succes.")
                 return True
@@ -224,7 +306,7 @@ class ArchiveUploader:
                 success = self.setup_chrome_driver()
                 if success:
                     print("   ✅ Chrome nou pornit după crash")
-                    self.upload_tabs = []  # Reset upload tabs list
+                    self.tab_manager.reset()  # Tab-urile vechi s-au pierdut odată cu Chrome
                     return True
                 else:
                     print("   ❌ Eroare la pornirea Chrome nou")
@@ -248,13 +330,26 @@ class ArchiveUploader:
         processing_units = []
 
         try:
+            if self.work_queue.has_folder(folder_path):
+                processing_units = [unit for unit in self.work_queue.folder_units(folder_path)
+                                    if not self.is_unit_processed(unit["path"])]
+                if self.work_queue.is_deferred(folder_path):
+                    self.plan_deferred_folders.add(os.path.normcase(str(folder_path)))
+                print(f"🧾 {folder_path.name}: {len(processing_units)} unități reluate din coada de lucru (fără rescanare)")
+                return processing_units
+
             for root, dirs, files in os.walk(folder_path):
                 current_path = Path(root)
                 if files:  # Procesăm doar dacă există fișiere
                     unit_files = [current_path / f for f in files if (current_path / f).suffix.lower() not in IGNORE_EXTENSIONS]
                     pdf_files = [f for f in unit_files if f.suffix.lower() == '.pdf']
                     unit_name = str(current_path.relative_to(ARCHIVE_PATH))
-                    if not self.is_unit_processed(current_path):
+                    if os.path.normcase(str(current_path)) in self.near_duplicates:
+                        print(f"⏭️ {unit_name}: DUPLICAT LOCAL - sărit (vezi {SKIP_LIST_FILE})")
+                    elif self.daily_plan and pdf_files and os.path.normcase(str(current_path)) not in self.plan_units:
+                        self.plan_deferred_folders.add(os.path.normcase(str(folder_path)))
+                        print(f"🗓️ {unit_name}: nu e în planul de azi - amânată")
+                    elif not self.is_unit_processed(current_path):
                         processing_units.append({
                             "path": current_path,
                             "actual_path": current_path,
@@ -269,6 +364,8 @@ class ArchiveUploader:
                         print(f"⏭️ {unit_name}: DEJA PROCESATĂ")
 
             print(f"📊 Unități NOI de procesat pentru {folder_path.name}: {len(processing_units)}")
+            self.work_queue.enqueue(folder_path, processing_units,
+                                    deferred=os.path.normcase(str(folder_path)) in self.plan_deferred_folders)
             return processing_units
 
         except Exception as e:
@@ -288,6 +385,10 @@ class ArchiveUploader:
 
             processed = set(self.state.get("processed_folders", []))
             remaining = [f for f in all_folders if str(f) not in processed]
+            if self.daily_plan:
+                plan_folders = planned_folders(self.daily_plan)
+                remaining = [f for f in remaining if os.path.normcase(str(f)) in plan_folders]
+                print(f"🗓️ Planul zilei: {len(self.daily_plan['units'])} unități în {len(plan_folders)} foldere")
 
             print(f"📁 Găsite {len(all_folders)} foldere total")
             print(f"📋 Procesate deja: {len(processed)}")
@@ -309,7 +410,8 @@ class ArchiveUploader:
 
         if unit["has_pdf"]:
             # NEVER RESTART - Let uploads run for as long as they need (30+ minutes for 200+ MB files)
-            print(f"📊 Chrome tabs: {len(self.driver.window_handles)} - TOATE PĂSTRATE pentru upload-uri lungi!")
+            if self.driver:
+                print(f"📊 Chrome tabs: {len(self.driver.window_handles)} - TOATE PĂSTRATE pentru upload-uri lungi!")
             # Only check Chrome health if there are signs of actual crashes
 
             if self.state["uploads_today"] >= MAX_UPLOADS_PER_DAY:
@@ -336,15 +438,23 @@ class ArchiveUploader:
 
             print(f"   📊 TOTAL fișiere pentru upload: {len(unit['all_files'])}")
 
-            success = self.upload_files_to_archive(unit["all_files"], unit["name"])
+            self.work_queue.launching(unit["name"])
+            if self.backend == "ias3":
+                success = self.upload_files_ias3(unit["all_files"], unit["name"])
+            elif self.backend == "fake":
+                success = self.upload_files_fake(unit["all_files"], unit["name"])
+            else:
+                success = self.upload_files_to_archive(unit["all_files"], unit["name"])
             if success:
-                self.state["uploads_today"] += len(unit["all_files"])
-                self.state["total_files_uploaded"] += len(unit["all_files"])
+                with self.state_lock:
+                    self.state["uploads_today"] += len(unit["all_files"])
+                    self.state["total_files_uploaded"] += len(unit["all_files"])
                 print(f"✅ Upload #{self.state['uploads_today']} reușit pentru {unit['name']} (toate {len(unit['all_files'])} fișiere)")
                 print(f"📊 Rămân {MAX_UPLOADS_PER_DAY - self.state['uploads_today']} upload-uri pentru astăzi")
                 self.mark_unit_processed(unit["path"], unit["name"], "UPLOAD")
                 return True
             else:
+                self.work_queue.requeue(unit["name"], "lansarea upload-ului a eșuat")
                 return False
         else:
             print(f"❌ Niciun PDF în {unit['name']} - caut fișier de mutat în d:\\3\\")
@@ -363,6 +473,76 @@ class ArchiveUploader:
                 self.mark_unit_processed(unit["path"], unit["name"], "GOLA")
                 return True
 
+    def divert_invalid_units(self, units, force=False):
+        """Validare înainte de upload: unitățile cu fișiere corupte/trunchiate merg în TEMP, nu pe archive.org"""
+        upload_units = [unit for unit in units if unit["has_pdf"]]
+        if not (VALIDATE_BEFORE_UPLOAD or force) or not upload_units:
+            return units
+
+        invalid = self.validator.validate_units(upload_units)
+        print(self.validator.summary())
+        for unit in invalid:
+            print(f"🩺 {unit['name']}: fișiere invalide - NU se încarcă")
+            for file_path, result in unit["invalid_files"]:
+                print(f"   ❌ {file_path.name}: {'; '.join(result['errors'])}")
+            self.copy_invalid_files_to_temp(unit)
+            self.mark_unit_processed(unit["path"], unit["name"], "INVALID")
+            unit["result"] = True
+        return [unit for unit in units if "invalid_files" not in unit]
+
+    def reopen_invalid_units(self):
+        """Unitățile oprite ca INVALID se revalidează (cache-ul se reface la VALIDATOR_VERSION nou); cele valide acum se reiau"""
+        entries = self.work_queue.in_state(INVALID)
+        if not entries or not VALIDATE_BEFORE_UPLOAD:
+            return 0
+        units = {e["name"]: self.work_queue.unit(e["name"]) for e in entries}
+        still_invalid = {unit["name"] for unit in self.validator.validate_units(list(units.values()))}
+        reopened = 0
+        for entry in entries:
+            if entry["name"] in still_invalid:
+                continue
+            with self.state_lock:
+                if str(units[entry["name"]]["path"]) in self.state.get("processed_units", []):
+                    self.state["processed_units"].remove(str(units[entry["name"]]["path"]))
+                if entry["folder"] in self.state.get("processed_folders", []):
+                    self.state["processed_folders"].remove(entry["folder"])
+                self._save_state()
+            self.work_queue.requeue(entry["name"], "validă la revalidare - reluată")
+            print(f"🩺 {entry['name']}: oprită ca INVALID, acum validă - intră din nou la upload")
+            reopened += 1
+        return reopened
+
+    def copy_invalid_files_to_temp(self, unit):
+        """Copiază fișierele invalide în TEMP, cu un fișier INFO (ca la erorile de upload)"""
+        try:
+            TEMP_PATH.mkdir(exist_ok=True)
+        except Exception as e:
+            print(f"❌ Eroare la crearea folderului TEMP: {e}")
+            return
+        timestamp = datetime.now().strftime("%H%M%S")
+        pairs = [(file_path, TEMP_PATH / f"{file_path.stem}_INVALID_{timestamp}{file_path.suffix}")
+                 for file_path, _ in unit["invalid_files"]]
+        # Copii de inspecție separate (reflink unde se poate): repararea lor în TEMP nu atinge originalul
+        transfers = self.transfers.transfer_many(pairs)
+        for (file_path, result), (_, dest_path), transfer in zip(unit["invalid_files"], pairs, transfers):
+            info_path = TEMP_PATH / f"{file_path.stem}_INVALID_{timestamp}_INFO.txt"
+            try:
+                if transfer["error"]:
+                    raise OSError(transfer["error"])
+                with open(info_path, 'w', encoding='utf-8') as f:
+                    f.write(f"FIȘIER INVALID - OPRIT ÎNAINTE DE UPLOAD\n")
+                    f.write("=" * 40 + "\n\n")
+                    f.write(f"Fișier original: {file_path}\n")
+                    f.write(f"Unitate: {unit['name']}\n")
+                    f.write(f"Mărime: {result['size']} octeți\n")
+                    f.write(f"Erori: {'; '.join(result['errors'])}\n")
+                    if result["warnings"]:
+                        f.write(f"Avertismente: {'; '.join(result['warnings'])}\n")
+                    f.write(f"Data: {datetime.now().isoformat()}\n")
+                print(f"   📁 Copiat în TEMP: {dest_path.name}")
+            except Exception as e:
+                print(f"   ❌ Nu am putut copia {file_path.name} în TEMP: {e}")
+
     def find_priority_file(self, files):
         """Gaseste primul fisier conform prioritatii"""
         for ext in PRIORITY_EXTENSIONS:
@@ -376,8 +556,13 @@ class ArchiveUploader:
         try:
             MOVE_PATH.mkdir(exist_ok=True)
             dest_path = MOVE_PATH / file_path.name
-            shutil.copy2(file_path, dest_path)
-            print(f"📁 Mutat cu overwrite: {file_path.name} → {dest_path}")
+            result = self.transfers.transfer(file_path, dest_path)
+            if result["error"]:
+                raise OSError(result["error"])
+            if result["method"] == "identical":
+                print(f"📁 Deja în d:\\3\\ (conținut identic, nerescris): {file_path.name}")
+            else:
+                print(f"📁 Mutat cu overwrite ({result['method']}): {file_path.name} → {dest_path}")
             return True
         except Exception as e:
             print(f"❌ Eroare la mutarea fisierului {file_path}: {e}")
@@ -385,9 +570,7 @@ class ArchiveUploader:
 
     def sanitize_title(self, folder_name):
         """Curata numele folderului pentru titlu"""
-        title = re.sub(r'[^\w\s-]', ' ', folder_name)
-        title = re.sub(r'\s+', ' ', title).strip()
-        return title
+        return sanitize_title(folder_name)
 
     def navigate_to_upload_page(self):
         """Navigheaza la pagina de upload"""
@@ -405,17 +588,17 @@ class ArchiveUploader:
         """FIXED: Incarca TOATE fisierele pe archive.org - FĂRĂ închiderea automată a tab-urilor"""
         current_window = None
         new_window = None
+        launch_failure = "eroare la lansare"  # Rămâne setat pe orice ieșire înainte de "Upload LANSAT"
 
         try:
             print("⚠️ ATENȚIE: NU schimba tab-ul în Chrome în timpul upload-ului!")
             print("🚫 Chrome = INTANGIBLE în următoarele minute!")
 
-            # Salvează fereastra curentă
-            current_window = self.driver.current_window_handle
-
-            # NEVER close tabs - uploads can take 30+ minutes for large files (200+ MB)
+            # Tab-urile se închid doar după succes confirmat; la capacitate maximă se așteaptă un loc liber
+            self.tab_manager.wait_for_capacity()
+            current_window = self.driver.current_window_handle  # Salvează fereastra curentă
             all_windows = self.driver.window_handles
-            print(f"📊 Tab-uri deschise: {len(all_windows)} (TOATE PĂSTRATE - upload-uri pot dura 30+ minute!)")
+            print(f"📊 Tab-uri deschise: {len(all_windows)} - {self.tab_manager.summary()}")
 
             # Deschide tab nou pentru upload - ÎNTOTDEAUNA
             print("🆕 Deschid tab NOU pentru upload...")
@@ -423,38 +606,47 @@ class ArchiveUploader:
             new_window = self.driver.window_handles[-1]
             self.driver.switch_to.window(new_window)
 
-            # FIXED: Track this upload tab
-            self.upload_tabs.append(new_window)
-            print(f"📋 Tab upload #{len(self.upload_tabs)} creat: {new_window}")
+            self.tab_manager.register(new_window, folder_name)
+            self.work_queue.attach_tab(folder_name, new_window, self.chrome_address)
+            if self.network_listener.attach(new_window, folder_name):
+                print("🎧 Ascultător CDP atașat - erorile HTTP ale upload-ului se văd imediat")
+            print(f"📋 Tab upload #{len(self.tab_manager.tabs)} creat: {new_window}")
 
             if not self.navigate_to_upload_page():
+                launch_failure = "pagina de upload nu s-a încărcat"
                 return False
 
             print(f"📤 Incep incarcarea pentru folderul: {folder_name} ({len(files)} fisiere)")
+            self.waits.start_item(folder_name)
 
-            time.sleep(2)
             try:
-                file_input = self.driver.find_element(By.CSS_SELECTOR, 'input[type="file"]')
-            except:
-                print("❌ Nu am gasit input-ul pentru fisiere")
+                file_input = self.waits.until("file_input", EC.presence_of_element_located((By.CSS_SELECTOR, 'input[type="file"]')))
+            except WaitTimeout as e:
+                print(f"❌ Nu am gasit input-ul pentru fisiere: {e}")
+                launch_failure = "input-ul de fișiere lipsește"
                 return False
 
             file_paths = "\n".join([str(f.absolute()) for f in files])
             file_input.send_keys(file_paths)
 
             print(f"📁 Fisiere trimise: {len(files)}")
-            print("⏳ Aștept 3 secunde pentru încărcarea fișierelor...")
-            time.sleep(3)
+            print("⏳ Aștept formularul de metadate...")
+            try:
+                self.waits.until("form", EC.element_to_be_clickable((By.CSS_SELECTOR, "#description, span#description")))
+            except WaitTimeout as e:
+                print(f"❌ Formularul nu a apărut după adăugarea fișierelor: {e}")
+                launch_failure = "formularul de metadate nu a apărut"
+                return False
 
             result = self.fill_form_fields(folder_name)
+            print(self.waits.item_summary())
+            launch_failure = "" if result else "formularul nu a fost trimis"
             if result:
                 print("✅ Upload LANSAT cu succes!")
-                # ZERO TAB CLOSURES - Tab remains open indefinitely for monitoring
-                print("📋 TAB PĂSTRAT DESCHIS PERMANENT - NICIODATĂ NU SE ÎNCHIDE!")
-                print(f"🏷️ Tab ID: {new_window}")
+                print(f"📋 Tab {new_window} PĂSTRAT până la confirmarea upload-ului (redirect la /details/)")
                 print("⏳ Upload-uri mari (200+ MB) pot dura 30+ minute - TAB-ul rămâne activ!")
 
-                # Switch back to original window but NEVER close upload tab
+                # Revine la tab-ul principal; tab-ul de upload îl închide tab_manager după succes
                 if current_window in self.driver.window_handles:
                     self.driver.switch_to.window(current_window)
                     print(f"🔄 Revin la tab-ul principal: {current_window}")
@@ -472,6 +664,7 @@ class ArchiveUploader:
 
         except Exception as e:
             print(f"❌ Eroare la incarcarea fisierelor: {e}")
+            launch_failure = str(e).splitlines()[0] if str(e) else type(e).__name__
             # NEVER close tabs even on error - let user investigate the upload status
             if new_window:
                 print(f"⚠️ Eroare în upload, dar PĂSTREZ tab-ul {new_window} pentru investigare și posibila continuare!")
@@ -484,6 +677,35 @@ class ArchiveUploader:
             except:
                 pass
             return False
+        finally:
+            # Un tab rămas pe /upload ar fi "uploading" la nesfârșit: ar ocupa un loc din MAX_LIVE_UPLOAD_TABS
+            # și ar ține wait_until_settled până la MAX_SETTLE_WAIT
+            if new_window and launch_failure:
+                self.tab_manager.launch_failed(new_window, launch_failure)
+
+    def upload_files_ias3(self, files, folder_name):
+        """Incarca fisierele prin API-ul S3 archive.org - aceleasi metadate ca fill_form_fields, fara Chrome"""
+        metadata = form_metadata(files, self.sanitize_title(folder_name))
+        print(f"📤 Upload IAS3 pentru {folder_name}: '{metadata['title']}' ({len(files)} fisiere)")
+        # O reîncercare/reluare încarcă în item-ul creat de prima încercare, nu într-unul nou <bază>_YYYYMM
+        result = self.ias3.upload_item(files, metadata, identifier=self.work_queue.identifier(folder_name) or None,
+                                       on_identifier=lambda identifier: self.work_queue.set_identifier(folder_name, identifier))
+        if result["success"]:
+            mb = result["bytes"] / (1024 * 1024)
+            print(f"✅ Upload IAS3 terminat: {result['identifier']} ({mb:.1f} MB în {result['seconds']:.0f}s)")
+        else:
+            self.ias3_failures.append({"folder": folder_name, "identifier": result["identifier"],
+                                       "error": result["error"], "files": [str(f) for f in files]})
+        return result["success"]
+
+    def upload_files_fake(self, files, folder_name):
+        """Upload simulat (archive_fake_backend.py) - aceleași metadate și aceeași evidență a eșecurilor ca IAS3"""
+        metadata = form_metadata(files, self.sanitize_title(folder_name))
+        result = self.fake_backend.upload_item(files, metadata)
+        if not result["success"]:
+            self.ias3_failures.append({"folder": folder_name, "identifier": result["identifier"],
+                                       "error": result["error"], "files": [str(f) for f in files]})
+        return result["success"]
 
     def is_timeout_error(self, exception):
         """Verifică dacă o excepție este cauzată de timeout HTTP"""
@@ -500,23 +722,33 @@ class ArchiveUploader:
         try:
             auto_title = self.sanitize_title(folder_name)
 
+            # Calea rapidă: un singur script completează și verifică tot formularul
+            fast = fill_form_script(self.driver, auto_title)
+            if fast["ok"]:
+                print(f"⚡ Formular completat și verificat dintr-un singur apel în {fast['seconds'] * 1000:.0f} ms - title '{fast['title']}'")
+                return self.click_upload_button()
+            print(f"⚠ Scriptul rapid nu a completat: {', '.join(missing_fields(fast))}"
+                  f"{' (' + fast['error'] + ')' if fast['error'] else ''} - completez pas cu pas")
+
             try:
-                title_element = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#page_title, span.mdata_value.edit_text.required.x-archive-meta-title")))
-                title_text = title_element.text.strip() or title_element.get_attribute("title") or auto_title
-                print(f"📝 Title detectat: '{title_text}'")
-                auto_title = title_text
+                title_element = self.waits.until("title", EC.presence_of_element_located((By.CSS_SELECTOR, "#page_title, span.mdata_value.edit_text.required.x-archive-meta-title")), optional=True)
+                if title_element:
+                    title_text = title_element.text.strip() or title_element.get_attribute("title") or auto_title
+                    print(f"📝 Title detectat: '{title_text}'")
+                    auto_title = title_text
             except Exception as e:
                 print(f"⚠ Nu am putut citi title-ul: {e}")
 
             description_completed = False
             try:
-                desc_wrapper = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "#description, span#description")))
+                desc_wrapper = self.waits.until("description", EC.element_to_be_clickable((By.CSS_SELECTOR, "#description, span#description")))
                 desc_wrapper.click()
-                time.sleep(0.5)
+                # Editorul apare fie în iframe, fie direct în pagină - se așteaptă oricare
+                self.waits.until("description_editor", lambda d: d.find_elements(By.TAG_NAME, "iframe") or d.find_elements(By.CSS_SELECTOR, "body.wysiwyg"), optional=True)
                 try:
                     iframe = self.driver.find_element(By.TAG_NAME, "iframe")
                     self.driver.switch_to.frame(iframe)
-                    editor_body = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "body.wysiwyg")))
+                    editor_body = self.waits.until("description_editor", EC.presence_of_element_located((By.CSS_SELECTOR, "body.wysiwyg")))
                     self.driver.execute_script("arguments[0].innerText = arguments[1];", editor_body, auto_title)
                     self.driver.switch_to.default_content()
                     description_completed = True
@@ -524,7 +756,7 @@ class ArchiveUploader:
                 except Exception:
                     try:
                         self.driver.switch_to.default_content()
-                        editor_body = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "body.wysiwyg")))
+                        editor_body = self.waits.until("description_editor", EC.presence_of_element_located((By.CSS_SELECTOR, "body.wysiwyg")))
                         self.driver.execute_script("arguments[0].innerText = arguments[1];", editor_body, auto_title)
                         description_completed = True
                         print("📝 Description completată în editor direct")
@@ -535,11 +767,10 @@ class ArchiveUploader:
 
             subjects_completed = False
             try:
-                subj_wrapper = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "#subjects, span#subjects")))
+                subj_wrapper = self.waits.until("subjects", EC.element_to_be_clickable((By.CSS_SELECTOR, "#subjects, span#subjects")))
                 subj_wrapper.click()
-                time.sleep(0.5)
                 try:
-                    subj_input = self.driver.find_element(By.CSS_SELECTOR, "input[placeholder*='Add keywords'], input.input_field")
+                    subj_input = self.waits.until("subjects_input", EC.visibility_of_element_located((By.CSS_SELECTOR, "input[placeholder*='Add keywords'], input.input_field")))
                     subj_input.clear()
                     subj_input.send_keys(auto_title)
                     subjects_completed = True
@@ -560,12 +791,11 @@ class ArchiveUploader:
             date_completed = False
             print("📝 Activez câmpurile de dată prin click pe span...")
             try:
-                date_span = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "#date_text, span#date_text")))
+                date_span = self.waits.until("date", EC.element_to_be_clickable((By.CSS_SELECTOR, "#date_text, span#date_text")))
                 date_span.click()
                 print("   ✅ Click pe span#date_text efectuat")
-                time.sleep(0.8)
                 try:
-                    year_element = self.wait.until(EC.presence_of_element_located((By.ID, "date_year")))
+                    year_element = self.waits.until("date_fields", EC.element_to_be_clickable((By.ID, "date_year")))
                     month_element = self.driver.find_element(By.ID, "date_month")
                     day_element = self.driver.find_element(By.ID, "date_day")
                     year_element.click()
@@ -644,30 +874,30 @@ class ArchiveUploader:
             except Exception as e:
                 print(f"❌ Eroare la selectarea Collection: {e}")
 
-            print("🔍 VERIFICARE FINALĂ - 10 secunde pentru toate câmpurile...")
-            all_fields_completed = False
-            for check in range(10):
-                print(f"   Verificare #{check + 1}/10...")
-                try:
-                    desc_ok = description_completed
-                    subj_ok = subjects_completed
-                    year_val = self.driver.execute_script("return document.getElementById('date_year') ? document.getElementById('date_year').value : '';") or ""
-                    month_val = self.driver.execute_script("return document.getElementById('date_month') ? document.getElementById('date_month').value : '';") or ""
-                    day_val = self.driver.execute_script("return document.getElementById('date_day') ? document.getElementById('date_day').value : '';") or ""
-                    date_ok = (year_val == '1983' and month_val == '12' and day_val == '13')
-                    coll_val = self.driver.execute_script("return document.querySelector('select.mediatypecollection') ? document.querySelector('select.mediatypecollection').value : '';") or ""
-                    coll_ok = (coll_val == "texts:opensource")
-                    print(f"   Status: Desc={desc_ok}, Subj={subj_ok}, Date={date_ok} [{year_val}-{month_val}-{day_val}], Coll={coll_ok}")
-                    if desc_ok and subj_ok and date_ok and coll_ok:
-                        print("   ✅ TOATE câmpurile sunt completate și verificate!")
-                        all_fields_completed = True
-                        break
-                    else:
-                        print("   ⚠ Unele câmpuri nu sunt completate, mai verific...")
-                        time.sleep(1)
-                except Exception as verify_error:
-                    print(f"   ❌ Eroare la verificare: {verify_error}")
-                    time.sleep(1)
+            print(f"🔍 VERIFICARE FINALĂ - cel mult {self.waits.budget('verify'):g} secunde pentru toate câmpurile...")
+            field_status = {}
+
+            def fields_ready():
+                values = self.driver.execute_script("""
+                    var value = function (el) { return el ? el.value : ''; };
+                    return {
+                        year: value(document.getElementById('date_year')),
+                        month: value(document.getElementById('date_month')),
+                        day: value(document.getElementById('date_day')),
+                        collection: value(document.querySelector('select.mediatypecollection'))
+                    };
+                """) or {}
+                field_status.update(values)
+                date_ok = (values.get("year") == '1983' and values.get("month") == '12' and values.get("day") == '13')
+                coll_ok = values.get("collection") == "texts:opensource"
+                return description_completed and subjects_completed and date_ok and coll_ok
+
+            all_fields_completed = bool(self.waits.until_true("verify", fields_ready, optional=True))
+            print(f"   Status: Desc={description_completed}, Subj={subjects_completed}, "
+                  f"Date=[{field_status.get('year', '')}-{field_status.get('month', '')}-{field_status.get('day', '')}], "
+                  f"Coll={field_status.get('collection', '')}")
+            if all_fields_completed:
+                print("   ✅ TOATE câmpurile sunt completate și verificate!")
 
             if not all_fields_completed:
                 print("❌ OPRESC UPLOAD-UL - NU toate câmpurile sunt completate!")
@@ -685,30 +915,36 @@ class ArchiveUploader:
                     pass
                 return False
 
-            print("✅ TOATE câmpurile verificate și completate - ÎNCEPE UPLOAD-UL!")
-            try:
-                upload_final_button = self.wait.until(EC.element_to_be_clickable((By.ID, "upload_button")))
-                upload_final_button.click()
-                print("✅ Upload inițiat - TAB RĂMÂNE DESCHIS pentru monitorizare upload și detectare erori!")
-                time.sleep(3)
-                return True
-            except Exception as e:
-                print(f"❌ Nu am putut apăsa butonul de upload: {e}")
-                return False
+            return self.click_upload_button()
         except Exception as e:
             print(f"❌ Eroare generală la completarea formularului: {e}")
             return False
 
+    def click_upload_button(self):
+        """Apasă butonul de upload după ce toate câmpurile sunt verificate"""
+        print("✅ TOATE câmpurile verificate și completate - ÎNCEPE UPLOAD-UL!")
+        try:
+            upload_final_button = self.waits.until("upload_button", EC.element_to_be_clickable((By.ID, "upload_button")))
+            upload_final_button.click()
+            # Upload pornit = apare #progress_msg sau butonul dispare; tab-ul nou se poate deschide imediat după
+            started = self.waits.until("upload_started", EC.any_of(
+                EC.presence_of_element_located((By.ID, "progress_msg")),
+                EC.invisibility_of_element_located((By.ID, "upload_button"))), optional=True)
+            print("✅ Upload inițiat - TAB RĂMÂNE DESCHIS pentru monitorizare upload și detectare erori!")
+            if not started:
+                print("⚠ Nu am văzut pornirea upload-ului - verificarea de erori de la final îl va prinde dacă a eșuat")
+            return True
+        except Exception as e:
+            print(f"❌ Nu am putut apăsa butonul de upload: {e}")
+            return False
+
     def process_folder(self, folder_path):
         """Procesează un folder împărțindu-l în unități (toate nivelurile)"""
         print(f"\n📂 Procesez folderul: {folder_path.name}")
-        processing_units = self.scan_folder_structure(folder_path)
+        processing_units = self.divert_invalid_units(self.scan_folder_structure(folder_path))
         if not processing_units:
             print(f"✅ Toate unitățile din {folder_path.name} au fost deja procesate!")
-            if str(folder_path) not in self.state.get("processed_folders", []):
-                self.state.setdefault("processed_folders", []).append(str(folder_path))
-                self.state["last_processed_folder"] = folder_path.name
-                self._save_state()
+            self.mark_folder_processed(folder_path)
             return True
 
         all_success = True
@@ -716,30 +952,135 @@ class ArchiveUploader:
             print(f"\n📊 Unitatea {i}/{len(processing_units)} din {folder_path.name}")
             try:
                 result = self.process_single_unit(unit)
-                if result and unit["has_pdf"]:
-                    time.sleep(10)  # Adaugă 10-secunde delay după fiecare upload
                 if result == "limit_reached":
                     print(f"🎯 Limita de {MAX_UPLOADS_PER_DAY} upload-uri atinsă!")
                     return "limit_reached"
                 elif not result:
                     print(f"⚠ Eșec la procesarea unității {unit['name']}")
                     all_success = False
-                if i < len(processing_units):
-                    print("⏳ Pauză 2 secunde între unități...")
-                    time.sleep(2)
             except Exception as e:
                 print(f"❌ Eroare la procesarea unității {unit['name']}: {e}")
                 all_success = False
                 continue
 
-        if all_success:
-            if str(folder_path) not in self.state.get("processed_folders", []):
-                self.state.setdefault("processed_folders", []).append(str(folder_path))
-                self.state["last_processed_folder"] = folder_path.name
-                self._save_state()
-                print(f"✅ Folderul {folder_path.name} complet procesat!")
+        if all_success and self.mark_folder_processed(folder_path):
+            print(f"✅ Folderul {folder_path.name} complet procesat!")
         return all_success
 
+    def process_folders_scheduled(self, folders):
+        """IAS3: unitățile cu PDF din toate folderele merg în planificator (SJF, limitat de număr și MB în zbor)"""
+        scheduler = UploadScheduler(self.process_single_unit, MAX_UPLOADS_IN_FLIGHT, MAX_IN_FLIGHT_MB * 1024 * 1024)
+        folder_units = []
+
+        for folder_path in folders:
+            folder_units.append((folder_path, self.scan_folder_structure(folder_path)))
+
+        for unit in self.divert_invalid_units([unit for _, units in folder_units for unit in units]):
+            if unit["has_pdf"]:
+                size = sum(f.stat().st_size for f in unit["all_files"] if f.exists())
+                scheduler.submit(unit, size, unit["name"])
+            else:
+                unit["result"] = self.process_single_unit(unit)  # Mutarea în d:\3 nu așteaptă upload-urile
+
+        print(f"\n🚚 {len(scheduler.queue)} upload-uri în coadă - maxim {MAX_UPLOADS_IN_FLIGHT} simultan, {MAX_IN_FLIGHT_MB} MB în zbor")
+        for job in scheduler.run():
+            job.payload["result"] = job.result
+
+        self.mark_folders_processed(folder_units)
+        print(scheduler.summary())
+        return "limit_reached" if scheduler.stopped else True
+
+    def mark_folders_processed(self, folder_units):
+        """Folderele ale căror unități s-au terminat toate cu succes"""
+        for folder_path, units in folder_units:
+            if all(unit.get("result") is True for unit in units) and self.mark_folder_processed(folder_path):
+                print(f"✅ Folderul {folder_path.name} complet procesat!")
+
+    def mark_folder_processed(self, folder_path):
+        """Adaugă folderul în processed_folders; nu și dacă planul zilei a amânat unități din el"""
+        if os.path.normcase(str(folder_path)) in self.plan_deferred_folders:
+            print(f"🗓️ {folder_path.name}: rămâne deschis - are unități amânate de planul zilei")
+            return False
+        with self.state_lock:
+            if str(folder_path) in self.state.get("processed_folders", []):
+                return False
+            self.state.setdefault("processed_folders", []).append(str(folder_path))
+            self.state["last_processed_folder"] = folder_path.name
+            self._save_state()
+        return True
+
+    def adopt_in_flight_tabs(self):
+        """Upload-urile rămase în curs de la rularea trecută intră sub UploadTabManager (monitor, închidere după succes)"""
+        handles = set(self.driver.window_handles)
+        adopted = [entry for entry in self.work_queue.in_state(IN_FLIGHT)
+                   if entry["address"] == self.chrome_address and entry["tab"] in handles]
+        for entry in adopted:
+            self.tab_manager.register(entry["tab"], entry["name"])
+        if adopted:
+            print(f"🔗 {len(adopted)} upload-uri din rularea trecută preluate în monitorizare ({self.chrome_address})")
+
+    def pool_worker(self, address):
+        """Uploader pentru o instanță din pool: stare comună (state + state_lock), driver și tab-uri proprii"""
+        worker = copy.copy(self)
+        worker.chrome_address = address
+        worker.pool_workers = []
+        worker.driver = None
+        worker.wait = None
+        worker.waits = WaitPolicy()
+        worker.tab_manager = UploadTabManager(max_live_tabs=MAX_LIVE_UPLOAD_TABS, on_settle=self.work_queue.settle_tab)
+        worker.upload_monitor = UploadMonitor(worker.tab_manager)
+        worker.network_listener = NetworkErrorListener(worker.tab_manager, shaper=self.shaper)
+        return worker
+
+    def process_folders_pooled(self, folders):
+        """Selenium cu mai multe instanțe Chrome: unitățile cu PDF dintr-o singură coadă, un crash repornește doar instanța lui"""
+        pool = ChromePool(self.pool_size)
+        folder_units = []
+        jobs = []
+
+        for folder_path in folders:
+            folder_units.append((folder_path, self.scan_folder_structure(folder_path)))
+
+        for unit in self.divert_invalid_units([unit for _, units in folder_units for unit in units]):
+            if unit["has_pdf"]:
+                jobs.append(unit)
+            else:
+                unit["result"] = self.process_single_unit(unit)  # Mutarea în d:\3 nu are nevoie de Chrome
+        units_by_name = {unit["name"]: unit for unit in jobs}
+
+        if not pool.start():
+            print("❌ Nicio instanță Chrome din pool nu a pornit")
+            return False
+
+        def connect(instance):
+            worker = self.pool_worker(instance.address)
+            if not worker.setup_chrome_driver() or not worker.attached_existing:
+                if worker.driver:
+                    worker.driver.quit()  # Chrome pornit de ChromeDriver, nu instanța din pool
+                return None
+            worker.adopt_in_flight_tabs()
+            worker.upload_monitor.start()
+            self.pool_workers.append(worker)
+            return worker
+
+        def on_crash(worker):
+            worker.upload_monitor.stop()
+            worker.network_listener.stop()
+            self.pool_workers.remove(worker)
+            lost = [units_by_name[tab.folder_name] for tab in worker.tab_manager.uploading()
+                    if tab.folder_name in units_by_name]
+            for unit in lost:
+                worker.unmark_unit_processed(unit)
+            return lost
+
+        print(f"\n🧩 {len(jobs)} upload-uri în coadă pentru {len(pool.ready())} instanțe Chrome")
+        for unit, result in pool.run(jobs, connect, lambda worker, unit: worker.process_single_unit(unit), on_crash):
+            unit["result"] = result
+
+        self.mark_folders_processed(folder_units)
+        print(pool.summary())
+        return "limit_reached" if pool.stopped else True
+
     def clean_filename(self, filename):
         """Curăță și standardizează numele fișierului"""
         filename = re.sub(r'^C:\\fakepath\\', '', filename)
@@ -839,6 +1180,35 @@ class ArchiveUploader:
                 pass
             return "unknown", "unknown"
 
+    def error_from_probe(self, window_handle, probe):
+        """error_info din sonda DOM (archive_dom_probe), în formatul lui check_single_tab_for_errors"""
+        if probe.get("closed"):
+            print(f"   ❌ Tab-ul {window_handle} nu mai există (a fost închis prematur)")
+            return {
+                "filename": "tab-closed-prematurely",
+                "page_title": "Tab închis",
+                "window_handle": window_handle,
+                "error_code": "TAB_CLOSED",
+                "error_status": "Tab was closed before upload completion",
+                "error_details": "Tab was closed prematurely, cannot check for upload errors",
+                "timestamp": datetime.now().isoformat()
+            }
+        error = classify_probe(probe)
+        if not error:
+            return None
+        filename = error["filename"]
+        if filename not in ("memory-error-detected", "fisier-necunoscut"):
+            filename = self.clean_filename(filename)
+        return {
+            "filename": filename,
+            "page_title": probe.get("title", ""),
+            "window_handle": window_handle,
+            "error_code": error["error_code"],
+            "error_status": error["error_status"],
+            "error_details": error["error_details"],
+            "timestamp": datetime.now().isoformat()
+        }
+
     def check_single_tab_for_errors(self, window_handle, tab_index):
         """FIXED: Verifică o singură filă pentru erori 400/404/505/503, inclusiv pop-up-uri"""
         print(f"\n📋 === VERIFIC FILA #{tab_index}: {window_handle} ===")
@@ -1015,24 +1385,15 @@ class ArchiveUploader:
 
     def normalize_filename_for_matching(self, filename):
         """Normalizează numele fișierului pentru comparație"""
-        # Elimină extensia
-        name = Path(filename).stem if isinstance(filename, (str, Path)) else str(filename)
-
-        # Convertește la lowercase
-        name = name.lower()
-
-        # Înlocuiește caracterele speciale cu space sau elimină
-        name = re.sub(r'[^\w\s]', ' ', name)
-
-        # Elimină spațiile multiple și strip
-        name = re.sub(r'\s+', ' ', name).strip()
+        return normalize_filename_for_matching(filename)
 
-        # Înlocuiește spațiile cu -
-        name = name.replace(' ', '-')
+    def build_file_index(self, search_folders):
+        """Construiește o singură dată indexul de nume pentru căutarea fișierelor cu erori"""
+        file_index = FileNameIndex(self.normalize_filename_for_matching).build(search_folders)
+        print(file_index.summary())
+        return file_index
 
-        return name
-
-    def find_original_file_for_error(self, error_filename, search_folders):
+    def find_original_file_for_error(self, error_filename, search_folders, file_index=None):
         """Găsește fișierul original pe baza numelui din eroare"""
         print(f"🔍 Caut fișierul original pentru: '{error_filename}'")
 
@@ -1040,36 +1401,13 @@ class ArchiveUploader:
         normalized_error = self.normalize_filename_for_matching(error_filename)
         print(f"   📝 Nume normalizat din eroare: '{normalized_error}'")
 
-        # Lista candidaților
-        candidates = []
+        if file_index is None:
+            file_index = self.build_file_index(search_folders)
 
-        # Scanează toate fișierele din folderele procesate recent
-        for folder_path in search_folders:
-            if not folder_path.exists():
-                continue
-
-            try:
-                for root, dirs, files in os.walk(folder_path):
-                    for file in files:
-                        file_path = Path(root) / file
-                        if file_path.suffix.lower() in ['.pdf', '.epub', '.mobi', '.djvu', '.docx', '.doc']:
-                            normalized_file = self.normalize_filename_for_matching(file)
-
-                            # Calculează similaritatea
-                            similarity = difflib.SequenceMatcher(None, normalized_error, normalized_file).ratio()
-
-                            if similarity > 0.6:  # Threshold pentru potrivire
-                                candidates.append({
-                                    'path': file_path,
-                                    'similarity': similarity,
-                                    'normalized_name': normalized_file
-                                })
-                                print(f"   📋 Candidat găsit: {file} (similaritate: {similarity:.2f})")
-            except Exception as e:
-                print(f"   ⚠️ Eroare la scanarea folderului {folder_path}: {e}")
-
-        # Sortează după similaritate
-        candidates.sort(key=lambda x: x['similarity'], reverse=True)
+        # Potrivire exactă pe cheie, altfel difflib doar pe candidații apropiați (threshold 0.6)
+        candidates = file_index.find(normalized_error)
+        for candidate in candidates[:5]:
+            print(f"   📋 Candidat găsit: {candidate['path'].name} (similaritate: {candidate['similarity']:.2f})")
 
         if candidates:
             best_match = candidates[0]
@@ -1107,9 +1445,11 @@ class ArchiveUploader:
             processed_folders.append(ARCHIVE_PATH)
 
         print(f"🔍 Voi căuta în {len(processed_folders)} foldere pentru fișierele cu erori")
+        file_index = self.build_file_index(processed_folders)
 
         copied_files = []
         failed_copies = []
+        jobs = []  # (error_info, original_file, dest_path, info_path, error_code)
 
         for i, error_info in enumerate(failed_uploads, 1):
             print(f"\n📋 Procesez eroarea {i}/{len(failed_uploads)}: {error_info['filename']}")
@@ -1120,7 +1460,7 @@ class ArchiveUploader:
                 continue
 
             # Găsește fișierul original
-            original_file = self.find_original_file_for_error(error_info['filename'], processed_folders)
+            original_file = self.find_original_file_for_error(error_info['filename'], processed_folders, file_index)
 
             if not original_file:
                 failed_copies.append({
@@ -1129,26 +1469,26 @@ class ArchiveUploader:
                 })
                 continue
 
-            try:
-                # Creează numele simplu cu cod eroare și timestamp
-                original_name = original_file.stem
-                original_ext = original_file.suffix
-                error_code = error_info.get('error_code', 'unknown')
-                timestamp = datetime.now().strftime("%H%M%S")
+            # Creează numele simplu cu cod eroare și timestamp
+            original_name = original_file.stem
+            original_ext = original_file.suffix
+            error_code = error_info.get('error_code', 'unknown')
+            timestamp = datetime.now().strftime("%H%M%S")
 
-                # Fișierul PDF direct în TEMP
-                dest_filename = f"{original_name}_ERROR-{error_code}_{timestamp}{original_ext}"
-                dest_path = TEMP_PATH / dest_filename
+            # Fișierul PDF direct în TEMP, lângă fișierul INFO
+            dest_path = TEMP_PATH / f"{original_name}_ERROR-{error_code}_{timestamp}{original_ext}"
+            info_path = TEMP_PATH / f"{original_name}_ERROR-{error_code}_{timestamp}_INFO.txt"
+            print(f"   📁 Copiez: {original_file.name}")
+            print(f"   📁    → {dest_path}")
+            jobs.append((error_info, original_file, dest_path, info_path, error_code))
 
-                # Fișierul INFO direct în TEMP
-                info_filename = f"{original_name}_ERROR-{error_code}_{timestamp}_INFO.txt"
-                info_path = TEMP_PATH / info_filename
+        # Copierile în paralel (pool limitat); copii separate, nu hardlink-uri - se pot repara fără a atinge originalul
+        transfers = self.transfers.transfer_many([(job[1], job[2]) for job in jobs])
 
-                # Copiază fișierul PDF
-                print(f"   📁 Copiez: {original_file.name}")
-                print(f"   📁    → {dest_path}")
-
-                shutil.copy2(original_file, dest_path)
+        for (error_info, original_file, dest_path, info_path, error_code), transfer in zip(jobs, transfers):
+            try:
+                if transfer["error"]:
+                    raise OSError(transfer["error"])
 
                 # Creează fișierul INFO
                 with open(info_path, 'w', encoding='utf-8') as f:
@@ -1172,7 +1512,7 @@ class ArchiveUploader:
                     'error_info': error_info
                 })
 
-                print(f"   ✅ Copiat cu succes în TEMP: {dest_filename}")
+                print(f"   ✅ Copiat cu succes în TEMP ({transfer['method']}): {dest_path.name}")
 
             except Exception as e:
                 print(f"   ❌ Eroare la copierea fișierului {original_file}: {e}")
@@ -1202,9 +1542,15 @@ class ArchiveUploader:
         return copied_files
 
     def check_for_errors_after_upload(self):
-        """FIXED: Verifică toate filele DESCHISE pentru erori după 5 minute de la ultimul upload"""
-        print("\n⏳ Aștept 5 minute după ultimul upload pentru a verifica erorile...")
-        time.sleep(300)  # Așteaptă 5 minute
+        """Verifică filele DESCHISE pentru erori imediat ce ultimul upload s-a terminat"""
+        print("\n⏳ Aștept finalizarea upload-urilor (monitorizate în fundal)...")
+        self.upload_monitor.wait_until_settled()
+        self.upload_monitor.stop()
+        self.network_listener.drain()  # Corpurile răspunsurilor de eroare încă în drum
+        cdp_errors = self.network_listener.errors_by_tab()  # Înainte de stop(): după el niciun tab nu mai e ascultat
+        self.network_listener.stop()
+        for line in self.upload_monitor.report():
+            print(f"   {line}")
         print("\n🔍 === ÎNCEPUT VERIFICARE ERORI 400/404/505/503 DUPĂ UPLOAD ===")
 
         if not self.driver:
@@ -1212,57 +1558,92 @@ class ArchiveUploader:
             return
 
         try:
+            # Tab-urile terminate între timp se închid înainte de verificare
+            self.tab_manager.refresh()
             current_window = self.driver.current_window_handle
             all_windows = self.driver.window_handles
             print(f"📊 Găsite {len(all_windows)} file deschise în Chrome")
             print(f"🏠 Fereastra curentă: {current_window}")
 
             # FIXED: Check only upload tabs first, then all tabs
-            print(f"📋 Tab-uri de upload create: {len(self.upload_tabs)}")
+            upload_tabs = self.tab_manager.handles()
+            print(f"📋 Tab-uri de upload încă deschise: {len(upload_tabs)} ({self.tab_manager.closed} închise după succes)")
+
+            # URL + titlu pentru toate tab-urile dintr-o singură cerere /json/list
+            address = debugger_address(self.driver)
+            targets = {}
+            if address:
+                try:
+                    targets = list_targets(address)
+                except Exception as e:
+                    print(f"   ⚠ DevTools indisponibil ({e}) - verific tab-urile prin driver")
 
             print("   📋 Lista tuturor filelor:")
+            tab_urls = {}
             for i, window_handle in enumerate(all_windows, 1):
+                tab_type = "UPLOAD" if window_handle in upload_tabs else "NORMAL"
                 try:
-                    self.driver.switch_to.window(window_handle)
-                    url = self.driver.current_url
-                    title = self.driver.title
-                    is_upload_tab = window_handle in self.upload_tabs
-                    tab_type = "UPLOAD" if is_upload_tab else "NORMAL"
-                    print(f"   {i}. {window_handle} [{tab_type}] - URL: {url} - Titlu: {title}")
+                    target = targets.get(target_id(window_handle))
+                    if target is None:
+                        self.driver.switch_to.window(window_handle)
+                        target = {"url": self.driver.current_url, "title": self.driver.title}
+                    tab_urls[window_handle] = target.get("url", "")
+                    print(f"   {i}. {window_handle} [{tab_type}] - URL: {target.get('url', '')} - Titlu: {target.get('title', '')}")
                 except Exception as e:
                     print(f"   {i}. {window_handle} - EROARE: {e}")
 
             failed_uploads = []
 
+            # Tab-urile ascultate prin CDP: erorile HTTP sunt deja știute, fără scanarea page_source
+            for handle, tab in list(self.tab_manager.tabs.items()):
+                if handle not in cdp_errors or tab.state == SUCCEEDED:
+                    continue  # Un PUT reîncercat cu succes nu e eroare dacă upload-ul s-a terminat
+                errors = cdp_errors[handle]
+                if not errors and tab.detail in ("TAB_CLOSED", "OUT_OF_MEMORY"):
+                    errors = [{"filename": "tab-closed-prematurely" if tab.detail == "TAB_CLOSED" else "memory-error-detected",
+                               "page_title": tab.folder_name, "window_handle": handle, "error_code": tab.detail,
+                               "error_status": tab.detail, "error_details": f"Tab-ul upload-ului {tab.folder_name}: {tab.detail}",
+                               "timestamp": (tab.finished_at or datetime.now()).isoformat()}]
+                failed_uploads.extend(errors)
+            if failed_uploads:
+                print(f"🎧 Erori capturate prin CDP: {len(failed_uploads)}")
+
             # FIXED: Check all tabs, but prioritize upload tabs
             tabs_to_check = []
 
-            # First, add all upload tabs
-            for tab in self.upload_tabs:
-                if tab in all_windows:
+            # First, add upload tabs without a CDP listener
+            for tab in upload_tabs:
+                if tab in all_windows and tab not in cdp_errors:
                     tabs_to_check.append((tab, "UPLOAD"))
 
             # Then add other tabs that might be archive.org
             for tab in all_windows:
-                if tab not in self.upload_tabs:
-                    try:
-                        self.driver.switch_to.window(tab)
-                        if "archive.org" in self.driver.current_url:
-                            tabs_to_check.append((tab, "ARCHIVE"))
-                    except:
-                        continue
+                if tab not in upload_tabs and "archive.org" in tab_urls.get(tab, ""):
+                    tabs_to_check.append((tab, "ARCHIVE"))
 
             print(f"🎯 Verificând {len(tabs_to_check)} tab-uri relevante pentru erori...")
 
+            # Sondă DOM într-un singur apel per tab, în paralel, fără switch_to.window
+            probes = {}
+            if targets and tabs_to_check:
+                started = time.perf_counter()
+                probes = probe_tabs(address, [handle for handle, _ in tabs_to_check], targets=targets)
+                print(f"   🔬 Sondă DOM pe {len(probes)} tab-uri în {time.perf_counter() - started:.1f}s")
+
             for i, (window_handle, tab_type) in enumerate(tabs_to_check, 1):
-                print(f"\n📋 Verificare {i}/{len(tabs_to_check)} - Tab {tab_type}: {window_handle}")
-                error_info = self.check_single_tab_for_errors(window_handle, i)
+                probe = probes.get(window_handle)
+                if probe is None or "error" in probe:
+                    if probe:
+                        print(f"   ⚠ Sonda DOM a eșuat pentru {window_handle}: {probe['error']} - verific prin driver")
+                    print(f"\n📋 Verificare {i}/{len(tabs_to_check)} - Tab {tab_type}: {window_handle}")
+                    error_info = self.check_single_tab_for_errors(window_handle, i)
+                else:
+                    error_info = self.error_from_probe(window_handle, probe)
                 if error_info and error_info["error_code"] in ["400", "404", "500", "503", "505", "TAB_CLOSED", "OUT_OF_MEMORY"]:
                     failed_uploads.append(error_info)
                     print(f"   🚨 EROARE {error_info['error_code']}/{error_info['error_status']} CONFIRMATĂ în tab {tab_type} #{i}")
                 else:
                     print(f"   ✅ Tab {tab_type} #{i} - OK, nu există erori")
-                time.sleep(2)
 
             # FIXED: Return to a safe tab
             try:
@@ -1273,7 +1654,7 @@ class ArchiveUploader:
                     # Find a non-upload tab to switch to
                     safe_tab = None
                     for tab in self.driver.window_handles:
-                        if tab not in self.upload_tabs:
+                        if tab not in upload_tabs:
                             safe_tab = tab
                             break
                     if safe_tab:
@@ -1296,11 +1677,14 @@ class ArchiveUploader:
             print(f"📊 Erori reale de server: {len(real_errors)}")
             print(f"⚠️ Tab-uri închise prematur: {len(tab_closure_errors)}")
 
-            # NOUĂ FUNCȚIONALITATE: Copiază fișierele cu erori în TEMP
+            # Unitățile cu erori revin în coada de lucru cu backoff (archive_retry.py);
+            # în TEMP se copiază doar erorile reale care nu aparțin niciunei unități din coadă
+            unmatched, retry_decisions = self.requeue_failed_units(failed_uploads)
             copied_files = []
-            if real_errors:  # Only copy real server errors, not tab closures
-                print(f"\n📁 === ÎNCEPE COPIEREA FIȘIERELOR CU ERORI REALE ===")
-                copied_files = self.copy_error_files_to_temp(real_errors)
+            unmatched_real = [err for err in unmatched if err.get('error_code') not in ['TAB_CLOSED']]
+            if unmatched_real:
+                print(f"\n📁 === ÎNCEPE COPIEREA FIȘIERELOR CU ERORI FĂRĂ UNITATE ÎN COADĂ ===")
+                copied_files = self.copy_error_files_to_temp(unmatched_real)
 
             failed_uploads_list = []
             if failed_uploads:
@@ -1353,6 +1737,12 @@ class ArchiveUploader:
                 if not failed_uploads:
                     f.write("✅ Nu au fost detectate probleme în niciun tab.\n")
 
+                if retry_decisions:
+                    f.write(f"\n🔁 DECIZII DE REÎNCERCARE (archive_retry.py):\n")
+                    f.write("=" * 30 + "\n")
+                    for name, decision in retry_decisions.items():
+                        f.write(f"📖 {name}: {decision['outcome']} - {decision['detail']}\n")
+
                 # Adaugă informații despre fișierele copiate
                 if copied_files:
                     f.write(f"\n" + "=" * 70 + "\n")
@@ -1371,10 +1761,83 @@ class ArchiveUploader:
             print(f"❌ Eroare generală la verificarea erorilor: {e}")
             return []
 
+    def unit_for_error(self, error):
+        """Unitatea (numele din coada de lucru) căreia îi aparține eroarea: din ascultătorul CDP sau din tab"""
+        if error.get("unit"):
+            return error["unit"]
+        handle = error.get("window_handle", "")
+        tab = self.tab_manager.tabs.get(handle)
+        if tab:
+            return tab.folder_name
+        for entry in self.work_queue.in_state(IN_FLIGHT, FAILED):
+            if handle and entry["tab"] == handle:
+                return entry["name"]
+        return None
+
+    def requeue_failed_units(self, errors):
+        """Erorile grupate pe unitate trec prin RetryEngine; întoarce (erorile fără unitate, deciziile per unitate)"""
+        by_unit = {}
+        unmatched = []
+        for error in errors:
+            name = self.unit_for_error(error)
+            entry = self.work_queue.entries.get(name) if name else None
+            if entry is None:
+                unmatched.append(error)
+            elif entry.get("outcome") == "failed" or (error.get("window_handle") and entry["tab"] != error["window_handle"]):
+                continue  # Tab-ul unei încercări deja tratate (rămas deschis pentru investigare)
+            else:
+                by_unit.setdefault(name, []).append(error)
+
+        decisions = {}
+        for name, unit_errors in by_unit.items():
+            decision = self.retry.record_failure(name, unit_errors)
+            decisions[name] = decision
+            if decision["outcome"] == "retry":
+                self.unmark_unit_processed(self.work_queue.unit(name), decision["detail"])
+                print(f"   🔁 {name}: {decision['detail']} la {decision['retry_at'][11:19]}")
+            else:
+                print(f"   ❌ {name}: {decision['detail']}")
+        return unmatched, decisions
+
+    def ias3_errors(self, failures):
+        """Eșecurile IAS3 în formatul erorilor din tab-uri (pentru RetryEngine)"""
+        errors = []
+        for failure in failures:
+            status = re.search(r'HTTP (\d{3})', failure["error"])
+            errors.append({"unit": failure["folder"], "filename": failure["identifier"],
+                           "error_code": status.group(1) if status else "NETWORK",
+                           "error_status": failure["error"], "error_details": failure["error"],
+                           "timestamp": datetime.now().isoformat()})
+        return errors
+
+    def retry_failed_uploads(self):
+        """Reîncercările care ajung la scadență în rularea curentă: backoff, validare (unde clasa erorii o cere), upload"""
+        runner = self.pool_workers[0] if self.pool_workers else self
+        while True:
+            names = self.retry.wait_for_due()
+            if not names:
+                return
+            units = [self.work_queue.unit(name) for name in names]
+            units = self.divert_invalid_units(units, force=any(self.retry.needs_validation(name) for name in names))
+            print(f"\n🔁 === REÎNCERCARE AUTOMATĂ: {len(units)} unități ===")
+            if runner.driver:
+                runner.upload_monitor.start()
+            ias3_seen = len(self.ias3_failures)
+            for unit in units:
+                if runner.process_single_unit(unit) == "limit_reached":
+                    print(f"🎯 Limita de {MAX_UPLOADS_PER_DAY} upload-uri atinsă! Reîncercările rămân în coadă.")
+                    return
+            if self.backend in ("ias3", "fake"):
+                self.requeue_failed_units(self.ias3_errors(self.ias3_failures[ias3_seen:]))
+            else:
+                runner.check_for_errors_after_upload()
+
     def save_error_results_to_file(self, filenames):
         """Salvează lista finală a titlurilor cu erori 404/505 într-un fișier"""
         try:
             filename = f"upload_errors_with_400_404_505_503_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+            if self.pool_size > 1:  # Câte un raport per instanță Chrome din pool
+                filename = filename.replace(".txt", f"_port{self.chrome_address.rsplit(':', 1)[-1]}.txt")
             with open(filename, 'w', encoding='utf-8') as f:
                 f.write(f"LISTA FIȘIERELOR CU ERORI 400/404/505/503 - {datetime.now().isoformat()}\n")
                 f.write("=" * 60 + "\n\n")
@@ -1389,20 +1852,45 @@ class ArchiveUploader:
 
     def run(self):
         """Executa procesul principal"""
-        print("🚀 Încep executarea Archive.org Uploader - ZERO TAB CLOSURES")
+        print("🚀 Încep executarea Archive.org Uploader")
         print("=" * 60)
         print("⚠️ IMPORTANT: NU schimba tab-ul în Chrome în timpul upload-urilor!")
         print("🚫 Hands off Chrome during uploads - lasă să lucreze singur!")
-        print("✅ ZERO TAB CLOSURES: Toate tab-urile rămân deschise permanent!")
-        print("⏳ Upload-uri mari (200+ MB) pot dura 30+ minute - TOTUL PĂSTRAT!")
+        print(f"✅ Tab-urile se închid doar după upload confirmat - maxim {MAX_LIVE_UPLOAD_TABS} upload-uri simultan în Chrome")
+        print("⏳ Upload-uri mari (200+ MB) pot dura 30+ minute - tab-ul lor rămâne deschis până la final!")
         print("=" * 60)
 
         try:
-            if not self.setup_chrome_driver():
+            # Unitățile rămase launching/in_flight la oprirea trecută - înainte de orice upload nou
+            self.work_queue.reconcile()
+            self.reopen_invalid_units()  # Unitățile invalid care trec acum revalidarea revin la upload
+            self.work_queue.prune()
+            print(self.work_queue.summary())
+
+            if self.backend == "ias3":
+                print("📡 Backend upload: IAS3 (API S3 archive.org) - Chrome nu este folosit")
+                if not self.ias3.credentials:
+                    print("❌ Lipsesc cheile S3 (IA_ACCESS_KEY_ID / IA_SECRET_ACCESS_KEY sau ia.ini)")
+                    return False
+                if self.ias3.multipart.uploads:
+                    print(f"🔁 {len(self.ias3.multipart.uploads)} upload-uri multipart întrerupte vor fi reluate de la ultima parte confirmată")
+            elif self.backend == "fake":
+                print(f"🧪 Backend upload: simulat ({self.fake_backend.describe()}) - Chrome nu este folosit")
+            elif self.pool_size > 1:
+                print(f"🧩 Pool Chrome: {self.pool_size} instanțe (porturi {BASE_DEBUG_PORT}-{BASE_DEBUG_PORT + self.pool_size - 1})")
+            elif not self.setup_chrome_driver():
                 return False
+            else:
+                self.adopt_in_flight_tabs()
+                self.upload_monitor.start()
+
+            if self.backend != "fake":
+                print(f"🚦 Limită upload: {self.shaper.describe()} (modificabilă din mers: python archive_bandwidth.py --global-mbps N)")
 
             MOVE_PATH.mkdir(exist_ok=True)
             TEMP_PATH.mkdir(exist_ok=True)  # Creează și folderul TEMP
+            if self.near_duplicates:
+                print(f"⏭️ {len(self.near_duplicates)} foldere duplicate local vor fi sărite ({SKIP_LIST_FILE})")
             folders_to_process = self.get_folders_to_process()
 
             if not folders_to_process:
@@ -1410,33 +1898,60 @@ class ArchiveUploader:
                 return True
 
             print(f"🎯 Procesez foldere până la limita de {MAX_UPLOADS_PER_DAY} upload-uri...")
+            run_started = time.monotonic()
             print(f"📊 Upload-uri deja făcute astăzi: {self.state['uploads_today']}")
 
             if self.state["uploads_today"] >= MAX_UPLOADS_PER_DAY:
                 print(f"✅ Limita de {MAX_UPLOADS_PER_DAY} upload-uri deja atinsă pentru astăzi!")
                 return True
 
-            for i, folder in enumerate(folders_to_process, 1):
-                print(f"\n📊 Progres: {i}/{len(folders_to_process)}")
-                try:
-                    result = self.process_folder(folder)
-                    if result == "limit_reached":
-                        print(f"🎯 Limita de {MAX_UPLOADS_PER_DAY} upload-uri atinsă! Opresc procesarea.")
+            if self.backend == "ias3":
+                if self.process_folders_scheduled(folders_to_process) == "limit_reached":
+                    print(f"🎯 Limita de {MAX_UPLOADS_PER_DAY} upload-uri atinsă! Opresc procesarea.")
+            elif self.pool_size > 1 and self.backend == "selenium":
+                if self.process_folders_pooled(folders_to_process) == "limit_reached":
+                    print(f"🎯 Limita de {MAX_UPLOADS_PER_DAY} upload-uri atinsă! Opresc procesarea.")
+            else:
+                for i, folder in enumerate(folders_to_process, 1):
+                    print(f"\n📊 Progres: {i}/{len(folders_to_process)}")
+                    try:
+                        result = self.process_folder(folder)
+                        if result == "limit_reached":
+                            print(f"🎯 Limita de {MAX_UPLOADS_PER_DAY} upload-uri atinsă! Opresc procesarea.")
+                            break
+                        elif not result:
+                            print(f"⚠ Eșec la procesarea folderului {folder.name}")
+                        print("⏳ Pauză 3 secunde...")
+                        time.sleep(3)
+                    except KeyboardInterrupt:
+                        print("\n⚠ Încetat de utilizator")
                         break
-                    elif not result:
-                        print(f"⚠ Eșec la procesarea folderului {folder.name}")
-                    print("⏳ Pauză 3 secunde...")
-                    time.sleep(3)
-                except KeyboardInterrupt:
-                    print("\n⚠ Încetat de utilizator")
-                    break
-                except Exception as e:
-                    print(f"❌ Eroare la procesarea folderului {folder}: {e}")
-                    continue
+                    except Exception as e:
+                        print(f"❌ Eroare la procesarea folderului {folder}: {e}")
+                        continue
 
             # FIXED: Check for errors only after all uploads are done
             print(f"\n🔍 TOATE UPLOAD-URILE FINALIZATE - VERIFIC ERORILE...")
-            self.check_for_errors_after_upload()
+            if self.backend in ("ias3", "fake"):
+                # Upload-urile IAS3 (și cele simulate) sunt sincrone - erorile se știu deja, fără așteptarea de 5 minute
+                print(f"📊 Upload-uri {self.backend.upper()} eșuate: {len(self.ias3_failures)}")
+                for failure in self.ias3_failures:
+                    print(f"   ❌ {failure['folder']} ({failure['identifier']}): {failure['error']}")
+                self.requeue_failed_units(self.ias3_errors(self.ias3_failures))
+            elif self.pool_workers:
+                for worker in self.pool_workers:
+                    print(f"\n🧩 Chrome {worker.chrome_address}:")
+                    print(worker.waits.total_summary(LEGACY_SLEEP_SECONDS_PER_UPLOAD))
+                    worker.check_for_errors_after_upload()
+            else:
+                print(self.waits.total_summary(LEGACY_SLEEP_SECONDS_PER_UPLOAD))
+                self.check_for_errors_after_upload()
+            self.retry_failed_uploads()
+
+            if self.daily_plan:
+                result = record_plan_result(self.daily_plan, self.state.get("processed_units", []),
+                                            time.monotonic() - run_started)
+                print(describe_result(result))
 
             print(f"\n📊 RAPORT FINAL:")
             print(f"📤 Upload-uri pe archive.org astăzi: {self.state['uploads_today']}/{MAX_UPLOADS_PER_DAY}")
@@ -1444,8 +1959,14 @@ class ArchiveUploader:
             print(f"📄 Total fișiere încărcate: {self.state['total_files_uploaded']}")
             print(f"📋 Total foldere procesate: {len(self.state['processed_folders'])}")
             print(f"🗂️ Fișiere cu erori copiate în: {TEMP_PATH}")
-            print(f"📊 Tab-uri de upload create și PĂSTRATE: {len(self.upload_tabs)}")
-            print(f"🕐 ZERO TAB CLOSURES - toate upload-urile pot continua 30+ minute fără întrerupere!")
+            for worker in self.pool_workers or [self]:
+                print(worker.tab_manager.summary())
+            print(self.work_queue.summary())
+            print(self.transfers.summary())
+            if self.fake_backend:
+                print(self.fake_backend.summary())
+            for line in self.retry.report():
+                print(f"   {line}")
 
             if self.state['uploads_today'] >= MAX_UPLOADS_PER_DAY:
                 print(f"🎯 LIMITA ZILNICĂ ATINSĂ! Nu mai pot face upload-uri astăzi.")
@@ -1467,6 +1988,13 @@ class ArchiveUploader:
 
 def main():
     """Functia principala"""
+    parser = argparse.ArgumentParser(description="Upload automat pe archive.org")
+    parser.add_argument("--backend", choices=["selenium", "ias3"], default=UPLOAD_BACKEND,
+                        help="selenium = formularul din Chrome, ias3 = API-ul S3 (fără Chrome)")
+    parser.add_argument("--chrome-pool", type=int, default=CHROME_POOL_SIZE,
+                        help="selenium: câte instanțe Chrome (profiluri și porturi separate) împart upload-urile")
+    args = parser.parse_args()
+
     if not ARCHIVE_PATH.exists():
         print(f"❌ Directorul sursa nu exista: {ARCHIVE_PATH}")
         return False
@@ -1475,9 +2003,11 @@ def main():
     print(f"📁 Director destinatie: {MOVE_PATH}")
     print(f"🗂️ Director pentru erori: {TEMP_PATH}")
     print(f"🎯 Upload-uri maxime pe zi: {MAX_UPLOADS_PER_DAY}")
-    print(f"\n🚨 REGULA DE AUR: NU atinge Chrome în timpul upload-urilor!")
+    print(f"📡 Backend upload: {args.backend}")
+    if args.backend == "selenium":
+        print(f"\n🚨 REGULA DE AUR: NU atinge Chrome în timpul upload-urilor!")
 
-    uploader = ArchiveUploader()
+    uploader = ArchiveUploader(backend=args.backend, pool_size=args.chrome_pool)
     success = uploader.run()
 
     if not success:
@@ -1,4 +1,5 @@
 import re
+import sys
 import requests
 import json
 import os
@@ -7,6 +8,20 @@ import time
 from pathlib import Path
 from urllib.parse import quote_plus
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Modulele comune (archive_*.py) sunt în folderul părinte
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from archive_singleflight import SingleFlight, request_key
+from archive_fuzzy_batch import BATCH_AVAILABLE, score_strategies
+from archive_title_normalizer import extract_title_from_filename
+from archive_transfer import TransferEngine
+
+ADVANCED_SEARCH_URL = "https://archive.org/advancedsearch.php"
+SEARCH_WORKERS = 4  # Foldere verificate în paralel
+
+# Interogările identice aflate simultan în zbor (ex: autor_titlu pentru volume) se trimit o singură dată
+SEARCH_FLIGHT = SingleFlight("advancedsearch")
 
 # Instalează mai întâi: pip install rapidfuzz
 try:
@@ -48,32 +63,7 @@ def normalize_clan_names(text):
 
 def extract_title_from_filename_improved(filepath):
     """Extrage titlul cărții din numele fișierului PDF cu normalizare îmbunătățită."""
-    filename = os.path.splitext(os.path.basename(filepath))[0]
-
-    # Încearcă să identifice pattern-ul "Autor - Serie - Număr. Titlu"
-    if ' - ' in filename:
-        parts = filename.split(' - ')
-        if len(parts) >= 2:
-            author_part = parts[0].strip()
-            title_part = ' - '.join(parts[1:]).strip()
-            return author_part, title_part
-
-    # Curăță numele fișierului
-    cleanup_words = [
-        'scan', 'ctrl', 'ocr', 'retail', 'foto', 'conv', 'convert',
-        'epub', 'pdf', 'djvu', 'mobi', 'mmxii', 'mmxi', 'mmxx'
-    ]
-
-    clean_name = filename
-    for word in cleanup_words:
-        clean_name = re.sub(rf'\b{word}\b', '', clean_name, flags=re.IGNORECASE)
-
-    # Elimină numere izolate și caractere speciale
-    clean_name = re.sub(r'\b\d+\b', '', clean_name)
-    clean_name = re.sub(r'[._\-]+', ' ', clean_name)
-    clean_name = ' '.join(clean_name.split())
-
-    return "", clean_name
+    return extract_title_from_filename(filepath)
 
 def generate_search_strategies_enhanced(author, title, filepath):
     """Generează strategii de căutare îmbunătățite cu variații de clanuri."""
@@ -153,9 +143,34 @@ def generate_search_strategies_enhanced(author, title, filepath):
     # Returnează doar primele 6 strategii pentru a evita spam-ul
     return strategies[:6]
 
+def fetch_search_json(url):
+    """Execută o cerere advancedsearch și returnează JSON-ul decodat."""
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    response = requests.get(url, headers=headers, timeout=12)
+    response.raise_for_status()
+    return response.json()
+
+def doc_title_creator(doc):
+    """Extrage (titlu, creator) ca text dintr-un document advancedsearch."""
+    title = doc.get('title', [''])
+    if isinstance(title, list):
+        title = title[0] if title else ''
+
+    creator = doc.get('creator', [''])
+    if isinstance(creator, list):
+        creator = ', '.join(creator) if creator else ''
+
+    return title, creator
+
+def extract_query_words(query):
+    """Cuvintele interogării, fără operatori și câmpuri (preprocesate o dată per strategie)."""
+    query_words = re.sub(r'[~"]', '', query).replace('title:', '').replace('creator:', '').replace('AND', '').split()
+    return [w for w in query_words if len(w) > 1 and w not in ['(', ')']]
+
 def search_archive_org_aggressive(strategies, min_relevance_score=0.2):
     """Căutare agresivă cu threshold mai mic și fuzzy matching îmbunătățit."""
     all_results = []
+    fetched = []  # (strategie, documente, (titlu, creator) per document, cuvintele interogării)
 
     for strategy in strategies:
         query = strategy['query']
@@ -163,50 +178,46 @@ def search_archive_org_aggressive(strategies, min_relevance_score=0.2):
             continue
 
         try:
-            url = f"https://archive.org/advancedsearch.php?q={quote_plus(query)}&output=json&rows=12"
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(url, headers=headers, timeout=12)
-            response.raise_for_status()
-
-            data = response.json()
+            url = f"{ADVANCED_SEARCH_URL}?q={quote_plus(query)}&output=json&rows=12"
+            data = SEARCH_FLIGHT.do(request_key("GET", url), fetch_search_json, url)
             docs = data.get('response', {}).get('docs', [])
-
-            for doc in docs:
-                title = doc.get('title', [''])
-                if isinstance(title, list):
-                    title = title[0] if title else ''
-
-                creator = doc.get('creator', [''])
-                if isinstance(creator, list):
-                    creator = ', '.join(creator) if creator else ''
-
-                # Calculează scorul de relevanță cu fuzzy matching agresiv
-                query_words = re.sub(r'[~"]', '', query).replace('title:', '').replace('creator:', '').replace('AND', '').split()
-                query_words = [w for w in query_words if len(w) > 1 and w not in ['(', ')']]
-
-                if FUZZY_AVAILABLE:
-                    relevance_score, score_details = calculate_aggressive_fuzzy_relevance(query_words, title, creator)
-                else:
-                    relevance_score, common_words = calculate_relevance_score_aggressive(query_words, title, creator)
-                    score_details = {'common_words': common_words}
-
-                if relevance_score >= min_relevance_score:
-                    result = {
-                        'title': title,
-                        'creator': creator,
-                        'relevance_score': relevance_score,
-                        'identifier': doc.get('identifier', ''),
-                        'url': f"https://archive.org/details/{doc.get('identifier', '')}",
-                        'strategy': strategy['name'],
-                        'strategy_description': strategy['description'],
-                        'score_details': score_details
-                    }
-                    all_results.append(result)
+            fetched.append((strategy, docs, [doc_title_creator(doc) for doc in docs], extract_query_words(query)))
 
         except Exception as e:
             print(f"Eroare căutare pentru strategia '{strategy['name']}': {e}")
             continue
 
+    # Calculează scorurile de relevanță pentru toate strategiile folderului deodată
+    if FUZZY_AVAILABLE and BATCH_AVAILABLE:
+        scores = score_strategies([(query_words, titles_creators) for _, _, titles_creators, query_words in fetched])
+    elif FUZZY_AVAILABLE:
+        scores = [[calculate_aggressive_fuzzy_relevance(query_words, title, creator)
+                   for title, creator in titles_creators]
+                  for _, _, titles_creators, query_words in fetched]
+    else:
+        scores = []
+        for _, _, titles_creators, query_words in fetched:
+            strategy_scores = []
+            for title, creator in titles_creators:
+                relevance_score, common_words = calculate_relevance_score_aggressive(query_words, title, creator)
+                strategy_scores.append((relevance_score, {'common_words': common_words}))
+            scores.append(strategy_scores)
+
+    for (strategy, docs, titles_creators, _), strategy_scores in zip(fetched, scores):
+        for doc, (title, creator), (relevance_score, score_details) in zip(docs, titles_creators, strategy_scores):
+            if relevance_score >= min_relevance_score:
+                result = {
+                    'title': title,
+                    'creator': creator,
+                    'relevance_score': relevance_score,
+                    'identifier': doc.get('identifier', ''),
+                    'url': f"https://archive.org/details/{doc.get('identifier', '')}",
+                    'strategy': strategy['name'],
+                    'strategy_description': strategy['description'],
+                    'score_details': score_details
+                }
+                all_results.append(result)
+
     # Elimină duplicatele și sortează
     unique_results = {}
     for result in all_results:
@@ -314,6 +325,52 @@ def calculate_relevance_score_aggressive(query_words, result_title, result_creat
 
     return min(final_score + importance_bonus, 1.0), exact_matches
 
+def check_subfolder_aggressive(subfolder_info):
+    """Caută un subfolder pe archive.org; returnează (nume afișat, intrare de șters sau None)."""
+    # Afișează numele fișierului PDF
+    if subfolder_info['files']:
+        main_file = subfolder_info['files'][0]
+        display_name = os.path.basename(main_file)[:45]
+    else:
+        return f"{subfolder_info['author']} - {subfolder_info['book']}", None
+
+    test_file = subfolder_info['files'][0]
+
+    # Extrage autorul și titlul
+    author, title = extract_title_from_filename_improved(test_file)
+
+    if not author and subfolder_info['author']:
+        author = subfolder_info['author']
+
+    # Generează strategii cu variații de clanuri
+    strategies = generate_search_strategies_enhanced(author, title, test_file)
+
+    found, results = search_archive_org_aggressive(strategies, min_relevance_score=0.2)
+    time.sleep(0.05)  # Pauză foarte mică
+
+    if not (found and results):
+        return display_name, None
+
+    subfolder_size = calculate_folder_size(subfolder_info['path'])
+    best_result = results[0]
+
+    return display_name, {
+        'name': display_name,
+        'path': subfolder_info['path'],
+        'size': subfolder_size,
+        'files_count': len(subfolder_info['files']),
+        'extracted_author': author,
+        'extracted_title': title,
+        'best_match': best_result['title'],
+        'relevance_score': best_result['relevance_score'],
+        'archive_url': best_result['url'],
+        'winning_strategy': best_result['strategy_description'],
+        'strategy': best_result['strategy'],
+        'author': subfolder_info['author'],
+        'book': subfolder_info['book'],
+        'score_details': best_result.get('score_details', {})
+    }
+
 def scan_and_delete_found_folders_final(base_directory, use_backup=True):
     """
     Versiunea finală cu matching agresiv pentru variații de clanuri.
@@ -371,71 +428,48 @@ def scan_and_delete_found_folders_final(base_directory, use_backup=True):
     print("\n🔍 Încep căutarea agresivă cu variații de clanuri...")
     print("="*60)
 
-    subfolders_to_delete = []
     processed = 0
     found_count = 0
     start_time = time.time()
 
-    for subfolder_key, subfolder_info in subfolders_to_process.items():
-        processed += 1
-
-        elapsed = time.time() - start_time
-        rate = processed / elapsed if elapsed > 0 else 0
-        eta_seconds = (total_subfolders - processed) / rate if rate > 0 else 0
-        eta_minutes = int(eta_seconds / 60)
-
-        # Afișează numele fișierului PDF
-        if subfolder_info['files']:
-            main_file = subfolder_info['files'][0]
-            display_name = os.path.basename(main_file)[:45]
-        else:
-            display_name = f"{subfolder_info['author']} - {subfolder_info['book']}"
-
-        print(f"[{processed:3}/{total_subfolders}] {display_name:<45}", end=" ")
-
-        if subfolder_info['files']:
-            test_file = subfolder_info['files'][0]
-
-            # Extrage autorul și titlul
-            author, title = extract_title_from_filename_improved(test_file)
-
-            if not author and subfolder_info['author']:
-                author = subfolder_info['author']
+    # Folderele se verifică în paralel; interogările identice în zbor sunt coalescate
+    results_by_index = {}
+    subfolder_list = list(subfolders_to_process.values())
 
-            # Generează strategii cu variații de clanuri
-            strategies = generate_search_strategies_enhanced(author, title, test_file)
+    with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+        futures = {executor.submit(check_subfolder_aggressive, subfolder_info): index
+                   for index, subfolder_info in enumerate(subfolder_list)}
 
-            print(f"🔍 Agresiv...", end=" ")
+        for future in as_completed(futures):
+            processed += 1
+            index = futures[future]
 
-            found, results = search_archive_org_aggressive(strategies, min_relevance_score=0.2)
+            elapsed = time.time() - start_time
+            rate = processed / elapsed if elapsed > 0 else 0
+            eta_seconds = (total_subfolders - processed) / rate if rate > 0 else 0
+            eta_minutes = int(eta_seconds / 60)
 
-            if found and results:
-                subfolder_size = calculate_folder_size(subfolder_info['path'])
-                best_result = results[0]
-
-                subfolders_to_delete.append({
-                    'name': display_name,
-                    'path': subfolder_info['path'],
-                    'size': subfolder_size,
-                    'files_count': len(subfolder_info['files']),
-                    'extracted_author': author,
-                    'extracted_title': title,
-                    'best_match': best_result['title'],
-                    'relevance_score': best_result['relevance_score'],
-                    'archive_url': best_result['url'],
-                    'winning_strategy': best_result['strategy_description'],
-                    'author': subfolder_info['author'],
-                    'book': subfolder_info['book'],
-                    'score_details': best_result.get('score_details', {})
-                })
+            try:
+                display_name, found_entry = future.result()
+            except Exception as e:
+                subfolder_info = subfolder_list[index]
+                print(f"[{processed:3}/{total_subfolders}] {subfolder_info['author']} - {subfolder_info['book']}: ❌ Eroare: {e}")
+                continue
+
+            results_by_index[index] = found_entry
+            if found_entry is None and not subfolder_list[index]['files']:
+                print(f"[{processed:3}/{total_subfolders}] {display_name:<45} ❌ Fără fișiere")
+            elif found_entry:
                 found_count += 1
-                print(f"✅ GĂSIT {best_result['relevance_score']:.2f} ({format_size(subfolder_size)}) [{best_result['strategy']}] ETA: {eta_minutes}min")
+                print(f"[{processed:3}/{total_subfolders}] {display_name:<45} 🔍 Agresiv... "
+                      f"✅ GĂSIT {found_entry['relevance_score']:.2f} ({format_size(found_entry['size'])}) "
+                      f"[{found_entry['strategy']}] ETA: {eta_minutes}min")
             else:
-                print(f"❌ Nu există    ETA: {eta_minutes}min")
-        else:
-            print("❌ Fără fișiere")
+                print(f"[{processed:3}/{total_subfolders}] {display_name:<45} 🔍 Agresiv... ❌ Nu există    ETA: {eta_minutes}min")
 
-        time.sleep(0.05)  # Pauză foarte mică
+    # Păstrează ordinea originală a subfolderelor în raport
+    subfolders_to_delete = [results_by_index[i] for i in sorted(results_by_index) if results_by_index[i]]
+    print(f"\n{SEARCH_FLIGHT.summary()}")
 
     # Verifică dacă s-au găsit subfoldere de șters
     if not subfolders_to_delete:
@@ -498,6 +532,7 @@ def scan_and_delete_found_folders_final(base_directory, use_backup=True):
 
         deleted_count = 0
         deleted_size = 0
+        transfers = TransferEngine()  # Backup: rename pe același volum, altfel copiere în kernel în paralel
 
         for i, subfolder in enumerate(subfolders_to_delete, 1):
             try:
@@ -510,7 +545,9 @@ def scan_and_delete_found_folders_final(base_directory, use_backup=True):
                     safe_name = subfolder['name'].replace('/', '_').replace('\\', '_').replace(':', '_')
                     safe_name = safe_name[:50]  # Limitează lungimea
                     backup_path = os.path.join(backup_directory, f"{safe_name}_{timestamp}")
-                    shutil.move(subfolder['path'], backup_path)
+                    moved = transfers.move_tree(Path(subfolder['path']), Path(backup_path))
+                    if moved["error"]:
+                        raise OSError(moved["error"])
                     print(f"✅ Mutat ({format_size(subfolder['size'])})")
                 else:
                     # Șterge definitiv
@@ -624,6 +661,7 @@ def main():
     print("• Folosi fuzzy search (~) pentru toleranță la erori")
     print("• Threshold foarte mic (0.2) pentru mai multe găsiri")
     print("• Testa strategii multiple cu prioritizare")
+    print(f"• Verifica {SEARCH_WORKERS} foldere în paralel (cererile identice sunt trimise o singură dată)")
     print("="*60)
 
     backup_choice = input("\nCe vrei să fac cu folderele găsite?\n1. Mută în backup (sigur)\n2. Șterge definitiv (risky)\nAlege (1 sau 2): ")
@@ -9,12 +9,14 @@ Strategia hibridă:
 2. Nivel 2: Simulare Chrome upload - doar pentru cazurile incerte
 
 Înainte de rulare:
-1. Rulează start_chrome_debug.bat pentru a porni Chrome în debug mode
+1. Cu CHECK_BROWSER = "lean": o singură dată, python archive_check_browser.py --login
+   (profilul headless separat); cu CHECK_BROWSER = "debug": start_chrome_debug.bat
 2. Rulează acest script
 """
 
 import os
 import re
+import sys
 import time
 import shutil
 import json
@@ -32,10 +34,15 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import WebDriverException, TimeoutException, NoSuchElementException
 
+# Modulele comune (archive_*.py) sunt în folderul părinte
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from archive_check_browser import CHECK_PROFILE_DIR, start_lean_browser
+
 # ============= CONFIGURĂRI =============
 ARCHIVE_PATH = Path(r"g:\ARHIVA\B+")
 ARCHIVE_URL = "https://archive.org/upload"
 SEARCH_BASE_URL = "https://archive.org/search"
+CHECK_BROWSER = "lean"  # "lean" = Chrome headless separat (archive_check_browser.py), "debug" = Chrome-ul de pe 9222
 STATE_FILE = Path("archive_duplicate_hybrid_state.json")
 LOG_FILE = Path(f"archive_duplicate_hybrid_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
 
@@ -138,6 +145,14 @@ class ArchiveHybridChecker:
             return True  # Deja conectat
 
         try:
+            if CHECK_BROWSER == "lean":
+                logger.info(f"🔧 Pornesc Chrome-ul headless de verificare ({CHECK_PROFILE_DIR})...")
+                self.driver = start_lean_browser()
+                self.wait = WebDriverWait(self.driver, self.timeout)
+                self.base_window = self.driver.current_window_handle
+                logger.info("✅ Chrome de verificare pornit - separat de Chrome-ul upload-urilor")
+                return True
+
             logger.info("🔧 Conectare la Chrome debug mode...")
             chrome_options = Options()
             chrome_options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
@@ -687,6 +702,8 @@ class ArchiveHybridChecker:
                     if self.base_window in self.driver.window_handles:
                         self.driver.switch_to.window(self.base_window)
 
+                    if CHECK_BROWSER == "lean":
+                        self.driver.quit()  # Chrome-ul headless e al nostru
                     logger.info("🧹 Chrome cleanup completat")
                 except Exception as cleanup_error:
                     logger.warning(f"⚠️ Eroare la cleanup: {cleanup_error}")
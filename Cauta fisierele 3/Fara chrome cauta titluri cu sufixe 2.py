@@ -18,6 +18,7 @@ AVANTAJE:
 
 import os
 import re
+import sys
 import time
 import shutil
 import json
@@ -29,6 +30,12 @@ from typing import List, Dict, Any, Tuple, Optional
 from urllib.parse import quote_plus
 from bs4 import BeautifulSoup
 
+# Modulele comune (archive_*.py) sunt în folderul părinte
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from archive_identifier_predictor import predict_for_files
+from archive_singleflight import SingleFlight, request_key
+from archive_title_normalizer import clean_title_pure_web, generate_identifier_base, remove_diacritics
+
 # ============= CONFIGURĂRI =============
 ARCHIVE_PATH = Path(r"g:\ARHIVA\C")
 SEARCH_BASE_URL = "https://archive.org/search"
@@ -100,6 +107,9 @@ class ArchivePureWebChecker:
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
+        # Cererile identice aflate simultan în zbor se trimit o singură dată
+        self.flight = SingleFlight("archive.org")
+
     def load_state(self) -> Dict[str, Any]:
         """Încarcă starea salvată anterior"""
         default_state = {
@@ -153,79 +163,20 @@ class ArchivePureWebChecker:
 
     def clean_title_for_search(self, filename: str) -> str:
         """Curăță titlul pentru căutare SIMPLĂ pe Archive.org"""
-        name = Path(filename).stem
         logger.debug(f"🔧 Curățare titlu original: {filename}")
-
-        # ⚡ PRIMUL: Elimină COMPLET parantezele și conținutul lor
-        name = re.sub(r'\s*\([^)]*\)', '', name)  # (trad.) dispare complet
-        name = re.sub(r'\s*\[[^\]]*\]', '', name)  # [ceva] dispare complet
-
-        # ⚡ AL DOILEA: Elimină sufixele tehnice de la sfârșit
-        # retail, scan, ctrl, ocr, vp, draft, final
-        technical_suffixes = ['retail', 'scan', 'ctrl', 'ocr', 'vp', 'draft', 'final', 'edit', 'copy', 'backup']
-
-        # Elimină după ultima " - " dacă este sufix tehnic
-        parts = name.rsplit(' - ', 1)
-        if len(parts) == 2:
-            last_part = parts[1].strip().lower()
-            if last_part in technical_suffixes:
-                name = parts[0]  # Păstrează doar partea din față
-
-        # ⚡ AL TREILEA: Elimină toate punctuațiile rămase
-        # Păstrează doar literele, cifrele și spațiile
-        name = re.sub(r'[^\w\s]', ' ', name)
-
-        # ⚡ AL PATRULEA: Elimină versiunile (v1, v.1.0, etc.)
-        words = name.split()
-        words = [w for w in words if not re.match(r'^v\.?\d', w.lower())]
-
-        # Curăță spațiile multiple
-        result = ' '.join(words)
-        result = re.sub(r'\s+', ' ', result).strip()
-
+        result = clean_title_pure_web(filename)
         logger.debug(f"✨ Titlu pentru căutare simplă: '{result}'")
         return result
 
     def generate_identifier_base(self, title: str) -> str:
         """Generează base identifier-ul așa cum l-ar genera Archive.org"""
-        # Începe cu titlul
-        identifier = title.lower()
-
-        # Înlocuiește toate caracterele non-alfanumerice cu liniuțe
-        identifier = re.sub(r'[^a-z0-9\s\.]', '-', identifier)
-
-        # Înlocuiește spațiile cu liniuțe
-        identifier = re.sub(r'\s+', '-', identifier)
-
-        # Curăță liniuțele multiple
-        identifier = re.sub(r'-+', '-', identifier)
-
-        # Elimină liniuțele de la început și sfârșit
-        identifier = identifier.strip('-')
-
-        # Limitează lungimea (Archive.org are limite)
-        if len(identifier) > 80:
-            words = identifier.split('-')
-            result_parts = []
-            current_length = 0
-
-            for word in words:
-                if current_length + len(word) + 1 <= 80:  # +1 pentru liniuță
-                    result_parts.append(word)
-                    current_length += len(word) + 1
-                else:
-                    break
-
-            identifier = '-'.join(result_parts)
-
+        identifier = generate_identifier_base(title)
         logger.debug(f"🔧 Base identifier generat: {identifier}")
         return identifier
 
     def remove_diacritics(self, text: str) -> str:
         """Elimină diacriticele din text"""
-        import unicodedata
-        return ''.join(c for c in unicodedata.normalize('NFD', text)
-                      if unicodedata.category(c) != 'Mn')
+        return remove_diacritics(text)
 
     def generate_search_variants(self, title: str) -> List[str]:
         """Generează variante de căutare pentru un titlu"""
@@ -255,11 +206,21 @@ class ArchivePureWebChecker:
 
         return unique_variants[:5]  # Max 5 variante
 
+    def _head_status(self, url: str) -> int:
+        """Execută un HEAD și returnează doar codul de status"""
+        return self.session.head(url, timeout=10, allow_redirects=True).status_code
+
+    def _get_json(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Execută un GET și returnează JSON-ul decodat"""
+        response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
     def test_url_exists(self, url: str, identifier: str) -> bool:
         """Testează dacă un URL există pe Archive.org"""
         try:
-            response = self.session.head(url, timeout=10, allow_redirects=True)
-            if response.status_code == 200:
+            status_code = self.flight.do(request_key("HEAD", url), self._head_status, url)
+            if status_code == 200:
                 logger.info(f"   🎯 URL EXISTENT: {identifier}")
                 return True
             return False
@@ -405,10 +366,7 @@ class ArchivePureWebChecker:
         }
 
         try:
-            response = self.session.get(API_BASE_URL, params=params, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-
-            data = response.json()
+            data = self.flight.do(request_key("GET", API_BASE_URL, params), self._get_json, API_BASE_URL, params)
             response_data = data.get("response", {})
             num_found = response_data.get("numFound", 0)
             docs = response_data.get("docs", [])
@@ -533,61 +491,24 @@ class ArchivePureWebChecker:
             return False, "no_duplicates"
 
     def method_3_direct_url_test_enhanced(self, folder_info: Dict[str, Any]) -> Tuple[bool, str]:
-        """METODA 3 ÎMBUNĂTĂȚITĂ - Test direct URL cu toate variantele posibile"""
+        """METODA 3 ÎMBUNĂTĂȚITĂ - Test direct URL pe identifier-ele prezise exact"""
         identifier_base = folder_info["identifier_base"]
-        search_title = folder_info["search_title"]
 
         logger.info(f"🔍 METODA 3 ÎMBUNĂTĂȚITĂ - Test URL pentru: {identifier_base}")
 
-        # ⚡ GENEREAZĂ TOATE VARIANTELE POSIBILE
-        variants_to_test = [
-            identifier_base,  # Base original
-        ]
-
-        # ⚡ ADAUGĂ VARIANTE cu sufixe comune
-        common_suffixes = ['-retail', '-scan', '-ctrl', '-ocr', '-vp', '-istor']
-        for suffix in common_suffixes:
-            variants_to_test.append(identifier_base + suffix)
-
-        # ⚡ ADAUGĂ VARIANTE cu cuvinte comune care lipsesc
-        # Pentru cazuri ca "trad", "ed", "edition" etc.
-        common_middle_words = ['trad', 'trad.', 'ed', 'edition', 'vol', 'tome']
+        # ⚡ Identifier-ul pe care l-ar da archive.org (1-2 candidați în loc de ~60 de variante);
+        # duplicatele cu sufix de dată le găsește method_2 prin căutarea pe prefix
+        variants_to_test = predict_for_files(folder_info["priority_file"], folder_info.get("all_files", []))
 
-        # Încearcă să insereze cuvinte în mijloc (după numele autorului)
-        parts = identifier_base.split('-')
-        if len(parts) >= 3:  # autor-nume-titlu...
-            base_author = '-'.join(parts[:2])  # "chelaru-marius"
-            rest_title = '-'.join(parts[2:])   # "poarta-catre-poezia-araba"
+        logger.info(f"   🔍 Testez {len(variants_to_test)} identifier-e prezise: {', '.join(variants_to_test)}")
 
-            for word in common_middle_words:
-                # Varianta cu cuvântul în mijloc
-                middle_variant = f"{base_author}-{word}-{rest_title}"
-                variants_to_test.append(middle_variant)
-
-                # Și cu sufixe
-                for suffix in common_suffixes:
-                    variants_to_test.append(middle_variant + suffix)
-
-        # ⚡ ADAUGĂ VARIANTE cu COMMON_DUPLICATE_SUFFIXES
-        for date_suffix in COMMON_DUPLICATE_SUFFIXES[:6]:  # Primele 6 sufixe
-            variants_to_test.append(identifier_base + date_suffix)
-
-        # ⚡ ELIMINĂ DUPLICATELE
-        variants_to_test = list(dict.fromkeys(variants_to_test))
-
-        logger.info(f"   🔍 Testez {len(variants_to_test)} variante")
-
-        # ⚡ TESTEAZĂ TOATE VARIANTELE
         for i, variant in enumerate(variants_to_test):
-            if i % 10 == 0:  # Log la fiecare 10 variante
-                logger.info(f"   📊 Progres teste URL: {i+1}/{len(variants_to_test)}")
-
             test_url = f"{DETAILS_BASE_URL}/{variant}"
             if self.test_url_exists(test_url, variant):
                 logger.info(f"   🎯 DUPLICAT GĂSIT: {variant}")
-                return True, f"url_variant_{i}"
+                return True, f"url_predicted_{i}"
 
-        logger.info(f"   ✅ Niciun duplicat găsit în {len(variants_to_test)} variante")
+        logger.info(f"   ✅ Niciun duplicat găsit în {len(variants_to_test)} identifier-e prezise")
         return False, "no_duplicates"
 
     def check_folder_web_only(self, folder_info: Dict[str, Any]) -> bool:
@@ -711,6 +632,8 @@ class ArchivePureWebChecker:
             f"🔧 API identifier: {(self.api_hits / max(total_processed, 1)) * 100:.1f}%",
             f"🌐 Test direct URL: {(self.url_test_hits / max(total_processed, 1)) * 100:.1f}%",
             "",
+            self.flight.summary(),
+            "",
             f"📈 STATISTICI TOTALE:",
             f"📈 Total istoric foldere șterse: {self.state['stats']['total_deleted']}",
             f"📈 Total spațiu istoric eliberat: {self.state['stats']['total_space_saved_mb']:.2f} MB",
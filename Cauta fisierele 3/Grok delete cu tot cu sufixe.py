@@ -11,11 +11,24 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import json
 from datetime import datetime
 import re
+import sys
+
+# Modulele comune (archive_*.py) sunt în folderul părinte
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from archive_check_browser import CHECK_PROFILE_DIR, start_lean_browser
+
+# "lean" = Chrome headless separat (archive_check_browser.py), "debug" = Chrome-ul interactiv de pe 9222
+CHECK_BROWSER = "lean"
 
 def setup_browser():
-    """Se conectează la Chrome-ul deschis cu debug pe portul 9222."""
+    """Chrome-ul pentru simulări: profilul lean headless sau Chrome-ul deschis cu debug pe portul 9222."""
     from selenium.webdriver.chrome.service import Service
 
+    if CHECK_BROWSER == "lean":
+        driver = start_lean_browser()
+        print(f"      🌐 Chrome headless de verificare pornit ({CHECK_PROFILE_DIR})")
+        return driver
+
     chrome_options = Options()
     chrome_options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
 
@@ -7,7 +7,7 @@ Versiune stabilă cu gestionare completă a erorilor.
 """
 
 import os
-import re
+import sys
 import time
 import shutil
 import json
@@ -17,8 +17,14 @@ from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
+# Modulele comune (archive_*.py) sunt în folderul părinte
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from archive_singleflight import SingleFlight, request_key
+from archive_title_normalizer import clean_title_cleaner
+
 # Configurații generale
 ARCHIVE_PATH = Path(r"g:\ARHIVA\B")
+API_URL = "https://archive.org/advancedsearch.php"
 DELAY_BETWEEN_SEARCHES = 3  # secunde între cereri
 STATE_FILE = Path("archive_cleanup_state.json")
 LOG_FILE = Path(f"archive_cleanup_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
@@ -43,6 +49,7 @@ class ArchiveCleaner:
         self.deleted_count = 0
         self.checked_count = 0
         self.error_count = 0
+        self.flight = SingleFlight("advancedsearch")  # Coalescing pentru titlurile identice în zbor
 
     def _load_state(self) -> Dict[str, Any]:
         """Încarcă starea anterioară din fișier"""
@@ -83,25 +90,7 @@ class ArchiveCleaner:
 
     def _clean_title(self, filename: str) -> str:
         """Curăță titlul fișierului pentru căutare"""
-        name = Path(filename).stem
-
-        # Elimină modele comune de sufixe
-        patterns = [
-            r'[_-]\d{6,8}$',  # Data la sfârșit
-            r'\s*[\(\[].*?[\)\]]',  # Conținut între paranteze
-            r'\b[vV]\.?\s*\d+([\.\-]\d+)*\b',  # Numere de versiune
-            r'\b(ed|edit|edition|version)\b.*$',  # Mențiuni de ediție
-            r'\b(scan(ned)?|ocr|digital|copy|retail)\b',  # Termeni tehnici
-            r'[_\s]+$'  # Spații sau underscore la sfârșit
-        ]
-
-        for pattern in patterns:
-            name = re.sub(pattern, '', name, flags=re.IGNORECASE)
-
-        # Normalizare format
-        name = re.sub(r'\s+[-–]\s*', ' - ', name)  # Uniformizare separator
-        name = re.sub(r'\s+', ' ', name).strip()  # Elimină spații multiple
-
+        name = clean_title_cleaner(filename)
         logger.debug(f"Curățare titlu: '{filename}' → '{name}'")
         return name
 
@@ -154,9 +143,15 @@ class ArchiveCleaner:
             logger.error(f"Eroare la scanare: {e}")
             return []
 
+    def _fetch_json(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Execută cererea către API și returnează JSON-ul decodat"""
+        response = requests.get(url, params=params, timeout=API_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
     def _check_archive(self, title: str) -> bool:
         """Verifică existența titlului pe archive.org"""
-        url = "https://archive.org/advancedsearch.php"
+        url = API_URL
         params = {
             "q": f'title:"{title}"',
             "fl[]": "identifier",
@@ -168,10 +163,7 @@ class ArchiveCleaner:
         for attempt in range(1, MAX_API_ATTEMPTS + 1):
             try:
                 logger.debug(f"Încercare {attempt}: Caut '{title}'")
-                response = requests.get(url, params=params, timeout=API_TIMEOUT)
-                response.raise_for_status()
-
-                data = response.json()
+                data = self.flight.do(request_key("GET", url, params), self._fetch_json, url, params)
                 num_found = data.get("response", {}).get("numFound", 0)
 
                 if num_found > 0:
@@ -243,6 +235,7 @@ class ArchiveCleaner:
             f"Foldere șterse: {self.deleted_count}",
             f"Erori întâmpinate: {self.error_count}",
             f"Spațiu total eliberat: {self.state['stats']['total_space_saved_mb']:.2f} MB",
+            self.flight.summary(),
             ""
         ]
 
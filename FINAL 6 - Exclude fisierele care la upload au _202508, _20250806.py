@@ -39,6 +39,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import WebDriverException, TimeoutException, NoSuchElementException
+from archive_title_normalizer import clean_title_uploader, normalize_filename_for_matching, sanitize_title
 
 # Configurari
 ARCHIVE_PATH = Path(r"g:\ARHIVA\B")
@@ -219,26 +220,8 @@ class ArchiveUploader:
 
     def clean_title_for_search(self, filename):
         """Curăță numele fișierului pentru căutare pe Internet Archive"""
-        name = Path(filename).stem
         print(f"[CLEAN] original filename: {filename}")
-
-        # Elimină extensia și sufixele comune
-        name = re.sub(r'[_-]\d{6,8}$', '', name)
-        name = re.sub(r'\s*[\(\[].*?[\)\]]', '', name)
-        name = re.sub(r'\b[vV]\.?\s*\d+([\.\-]\d+)*\b', '', name)
-
-        # Elimină sufixele tehnice
-        suffixes = ['scan', 'ctrl', 'retail', r'cop\d+', 'Vp', 'draft', 'final', 'ocr', 'edit',
-                    'proof', 'beta', 'alpha', 'test', 'demo', 'sample', 'preview', 'full',
-                    'complete', 'fix', 'corrected']
-        pattern = r'\b(' + '|'.join(suffixes) + r')\b'
-        name = re.sub(pattern, '', name, flags=re.IGNORECASE)
-
-        # Curăță caracterele speciale și spațiile
-        name = re.sub(r'[^\w\s-]', ' ', name)
-        name = re.sub(r'\s+[-–]\s*$', '', name)  # Elimină liniuțele de la sfârșit
-        name = re.sub(r'\s+', ' ', name).strip()
-
+        name = clean_title_uploader(filename)
         print(f"[CLEAN] cleaned title: {name}")
         return name
 
@@ -443,9 +426,7 @@ class ArchiveUploader:
 
     def sanitize_title(self, folder_name):
         """Curata numele folderului pentru titlu"""
-        title = re.sub(r'[^\w\s-]', ' ', folder_name)
-        title = re.sub(r'\s+', ' ', title).strip()
-        return title
+        return sanitize_title(folder_name)
 
     def navigate_to_upload_page(self):
         """Navigheaza la pagina de upload"""
@@ -1025,12 +1006,7 @@ class ArchiveUploader:
 
     def normalize_filename_for_matching(self, filename):
         """Normalizează numele fișierului pentru comparație"""
-        name = Path(filename).stem if isinstance(filename, (str, Path)) else str(filename)
-        name = name.lower()
-        name = re.sub(r'[^\w\s]', ' ', name)
-        name = re.sub(r'\s+', ' ', name).strip()
-        name = name.replace(' ', '-')
-        return name
+        return normalize_filename_for_matching(filename)
 
     def find_original_file_for_error(self, error_filename, search_folders):
         """Găsește fișierul original pe baza numelui din eroare"""
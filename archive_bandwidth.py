@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Limitare de bandă pentru upload-uri (token bucket), ajustabilă din mers.
+
+Când rulează mai multe upload-uri mari simultan, cererile scurte către API-ul
+archive.org (exists_on_archive din FINAL 5/6, verificatoarele de duplicate)
+ies din REQUEST_TIMEOUT / 15s și se reîncearcă. Limitele de aici lasă loc
+pentru ele:
+- global_mbps: plafonul tuturor upload-urilor la un loc (setat sub viteza
+  legăturii, diferența rămâne pentru cererile scurte)
+- per_upload_mbps: plafonul fiecărui upload, ca un fișier mare să nu ia tot
+  plafonul global
+0 = nelimitat.
+
+Două căi, după backend:
+- IAS3: corpul fiecărei cereri trece prin token bucket-uri (wrap), plafonul
+  global e un bucket comun
+- Chrome (selenium, backend-ul implicit): upload-ul pleacă din pagina
+  archive.org, deci Python nu vede octeții. Tab-urile de upload sunt limitate
+  prin CDP (Network.emulateNetworkConditions, uploadThroughput) pe conexiunea
+  per tab deschisă de archive_cdp_listener; cum Chrome nu are un bucket comun
+  între tab-uri, plafonul global se împarte egal între tab-urile în curs
+  (tab_rate), recalculat când se schimbă limitele sau numărul de tab-uri
+
+Limitele se citesc din bandwidth_limits.json (cel mult o dată la
+CONTROL_CHECK_INTERVAL secunde), deci se pot schimba fără repornirea lotului.
+O valoare care nu e număr (fișier editat de mână) se ignoră cu un avertisment,
+iar limita respectivă rămâne cea de dinainte:
+    python archive_bandwidth.py --global-mbps 4 --per-upload-mbps 2
+    python archive_bandwidth.py --show
+
+Folosire:
+    shaper = BandwidthShaper()
+    body = shaper.wrap(file_reader)   # IAS3: read() așteaptă cât cere plafonul
+    listener = NetworkErrorListener(tab_manager, shaper=shaper)   # Chrome: plafon CDP per tab
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+BANDWIDTH_CONTROL_FILE = "bandwidth_limits.json"
+DEFAULT_GLOBAL_MBPS = 0.0        # 0 = nelimitat
+DEFAULT_PER_UPLOAD_MBPS = 0.0
+CONTROL_CHECK_INTERVAL = 2.0     # Secunde între verificările fișierului de control
+SHAPE_CHUNK_SIZE = 256 * 1024    # Bucăți mici = debit uniform, fără rafale de 1 MB
+BURST_SECONDS = 0.5              # Cât credit se poate acumula cât timp upload-ul stă
+
+
+class TokenBucket:
+    """Token bucket cu datorie: consume() rezervă octeții și întoarce cât trebuie așteptat"""
+
+    def __init__(self, bytes_per_second: float):
+        self.lock = threading.Lock()
+        self.rate = 0.0
+        self.tokens = 0.0
+        self.updated = time.monotonic()
+        self.set_rate(bytes_per_second)
+
+    def set_rate(self, bytes_per_second: float):
+        with self.lock:
+            self._refill()
+            self.rate = max(0.0, bytes_per_second)
+            self.tokens = min(self.tokens, self.rate * BURST_SECONDS)
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate:
+            self.tokens = min(self.tokens + (now - self.updated) * self.rate, self.rate * BURST_SECONDS)
+        self.updated = now
+
+    def consume(self, amount: int) -> float:
+        """Rezervă `amount` octeți; întoarce secundele de așteptat (0 dacă e nelimitat)"""
+        with self.lock:
+            if not self.rate:
+                return 0.0
+            self._refill()
+            self.tokens -= amount
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+
+class ShapedReader:
+    """Corp de cerere care respectă plafonul global și pe cel al upload-ului"""
+
+    def __init__(self, reader, shaper: "BandwidthShaper"):
+        self.reader = reader
+        self.shaper = shaper
+        self.bucket = TokenBucket(shaper.per_upload_rate)
+        self.bytes_sent = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > SHAPE_CHUNK_SIZE:
+            size = SHAPE_CHUNK_SIZE
+        data = self.reader.read(size)
+        if data:
+            self.bytes_sent += len(data)
+            self.shaper.throttle(len(data), self.bucket)
+        return data
+
+
+class BandwidthShaper:
+    """Plafon global + plafon per upload, recitite din fișierul de control"""
+
+    def __init__(self, global_mbps: float = DEFAULT_GLOBAL_MBPS,
+                 per_upload_mbps: float = DEFAULT_PER_UPLOAD_MBPS,
+                 control_file: Optional[str] = BANDWIDTH_CONTROL_FILE):
+        self.control_path = Path(control_file) if control_file else None
+        self.control_mtime: Optional[float] = None
+        self.last_check = 0.0
+        self.lock = threading.Lock()
+        self.readers = weakref.WeakSet()   # Upload-urile în curs (plafonul nou li se aplică imediat)
+        self.tabs = set()                  # Tab-urile Chrome în upload, limitate prin CDP (din toate instanțele)
+        self.global_mbps = global_mbps
+        self.per_upload_mbps = per_upload_mbps
+        self.global_bucket = TokenBucket(self.global_rate)
+        self.reload()
+
+    @property
+    def global_rate(self) -> float:
+        return self.global_mbps * 1024 * 1024
+
+    @property
+    def per_upload_rate(self) -> float:
+        return self.per_upload_mbps * 1024 * 1024
+
+    def set_limits(self, global_mbps: Optional[float] = None, per_upload_mbps: Optional[float] = None):
+        """Schimbă plafoanele; se aplică imediat și upload-urilor în curs"""
+        with self.lock:
+            if global_mbps is not None:
+                self.global_mbps = max(0.0, float(global_mbps))
+            if per_upload_mbps is not None:
+                self.per_upload_mbps = max(0.0, float(per_upload_mbps))
+            self.global_bucket.set_rate(self.global_rate)
+            for reader in list(self.readers):
+                reader.bucket.set_rate(self.per_upload_rate)
+        print(f"🚦 Limită upload: {self.describe()}")
+
+    def describe(self) -> str:
+        def fmt(mbps):
+            return f"{mbps:g} MB/s" if mbps else "nelimitat"
+        return f"global {fmt(self.global_mbps)}, per upload {fmt(self.per_upload_mbps)}"
+
+    def reload(self, force: bool = False):
+        """Recitește fișierul de control dacă s-a modificat"""
+        if self.control_path is None:
+            return
+        now = time.monotonic()
+        if not force and now - self.last_check < CONTROL_CHECK_INTERVAL:
+            return
+        self.last_check = now
+        try:
+            mtime = self.control_path.stat().st_mtime
+        except OSError:
+            return
+        if mtime == self.control_mtime:
+            return
+        self.control_mtime = mtime
+        limits = read_control_file(self.control_path)
+        if limits:
+            # Validate aici, nu în throttle(): un ValueError acolo ar opri upload-ul în mijlocul corpului
+            self.set_limits(parse_limit(limits, "global_mbps", self.control_path),
+                            parse_limit(limits, "per_upload_mbps", self.control_path))
+
+    def throttle(self, amount: int, bucket: Optional[TokenBucket] = None):
+        """Așteaptă până când `amount` octeți pot fi trimiși"""
+        self.reload()
+        wait = self.global_bucket.consume(amount)
+        if bucket is not None:
+            wait = max(wait, bucket.consume(amount))
+        if wait > 0:
+            time.sleep(wait)
+
+    def set_tabs(self, owner: Any, tabs: Iterable[Any]):
+        """Tab-urile în upload ale unui ascultător CDP (owner); restul ascultătorilor își păstrează tab-urile"""
+        tabs = {(owner, tab) for tab in tabs}
+        with self.lock:
+            self.tabs = {entry for entry in self.tabs if entry[0] is not owner} | tabs
+
+    def tab_rate(self) -> float:
+        """Octeți/s pentru fiecare tab Chrome în upload (0 = nelimitat): cota egală din global, cel mult per upload"""
+        self.reload()
+        with self.lock:
+            tabs = max(1, len(self.tabs))
+            rates = [rate for rate in (self.global_rate / tabs, self.per_upload_rate) if rate]
+        return min(rates) if rates else 0.0
+
+    def wrap(self, reader) -> ShapedReader:
+        """Corpul unei cereri de upload, limitat"""
+        shaped = ShapedReader(reader, self)
+        with self.lock:
+            self.readers.add(shaped)
+        return shaped
+
+
+def read_control_file(path: Path) -> Dict[str, Any]:
+    """Limitele din fișierul de control ({} dacă lipsește sau e invalid)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠ Nu am putut citi {path}: {e}")
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def parse_limit(limits: Dict[str, Any], key: str, source: Any = BANDWIDTH_CONTROL_FILE) -> Optional[float]:
+    """Limita `key` ca MB/s >= 0; None (limita rămâne neschimbată) dacă lipsește sau nu e un număr"""
+    if key not in limits:
+        return None
+    value = limits[key]
+    try:
+        if isinstance(value, bool):
+            raise ValueError("valoare booleană")
+        mbps = float(value)
+        if not math.isfinite(mbps):
+            raise ValueError("valoare infinită")
+    except (TypeError, ValueError):
+        print(f"⚠ {source}: {key}={value!r} nu e un număr - păstrez limita anterioară")
+        return None
+    return max(0.0, mbps)
+
+
+def write_control_file(path: Path, limits: Dict[str, Any]):
+    """Scriere atomică: procesul care citește nu vede niciodată un JSON pe jumătate"""
+    temp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(limits, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def main():
+    """Funcția principală"""
+    parser = argparse.ArgumentParser(description="Limitele de bandă pentru upload-urile în curs")
+    parser.add_argument("--global-mbps", type=float, help="Plafon total MB/s (0 = nelimitat)")
+    parser.add_argument("--per-upload-mbps", type=float, help="Plafon MB/s per upload (0 = nelimitat)")
+    parser.add_argument("--control-file", default=BANDWIDTH_CONTROL_FILE)
+    parser.add_argument("--show", action="store_true", help="Afișează limitele curente")
+    args = parser.parse_args()
+
+    path = Path(args.control_file)
+    limits = read_control_file(path) if path.exists() else {}
+    if args.global_mbps is not None:
+        limits["global_mbps"] = max(0.0, args.global_mbps)
+    if args.per_upload_mbps is not None:
+        limits["per_upload_mbps"] = max(0.0, args.per_upload_mbps)
+
+    if args.global_mbps is not None or args.per_upload_mbps is not None:
+        write_control_file(path, limits)
+        print(f"✅ Limite salvate în {path} - upload-urile în curs le preiau în cel mult {CONTROL_CHECK_INTERVAL:g}s")
+    elif not args.show:
+        parser.print_help()
+        return 0
+
+    global_mbps = parse_limit(limits, "global_mbps", path)
+    per_upload_mbps = parse_limit(limits, "per_upload_mbps", path)
+    shaper = BandwidthShaper(DEFAULT_GLOBAL_MBPS if global_mbps is None else global_mbps,
+                             DEFAULT_PER_UPLOAD_MBPS if per_upload_mbps is None else per_upload_mbps,
+                             control_file=None)
+    print(f"🚦 {shaper.describe()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
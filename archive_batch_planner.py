@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Planificator zilnic de upload-uri după un buget de octeți și de timp.
+
+MAX_UPLOADS_PER_DAY numără fișiere (uploads_today += len(unit["all_files"])),
+nu octeți: o zi cu zece cărți de 300 MB și una cu zece broșuri de 1 MB "costă"
+la fel, iar ordinea strict alfabetică ignoră mărimea. Aici:
+- UnitInventory: inventarul unităților de upload ca tabel coloană (NumPy):
+  cale, folder, octeți, număr de fișiere, rang alfabetic
+- plan_day(): lotul zilei sub bugetul de octeți și sub cel de timp (fiecare
+  verificat separat), cu timpul estimat din throughput-ul real al zilelor
+  trecute; greedy:
+  1. unitățile sărite de MAX_SKIPS ori intră primele (nimic nu așteaptă la nesfârșit)
+  2. cel mai lung prefix alfabetic care încape în ambele bugete
+  3. restul bugetelor umplut cu cele mai mici unități din următoarele
+     LOOKAHEAD (alfabetic), ca ordinea să nu sară departe
+  limited_by = bugetul folosit în proporția cea mai mare ("none" dacă a
+  încăput tot inventarul)
+- fișierul de plan (DAILY_PLAN_FILE) e citit de uploader, care procesează doar
+  unitățile din plan; la final record_plan_result() scrie timpul și octeții
+  reali lângă cei estimați, în PLAN_HISTORY_FILE
+
+Folosire:
+    python archive_batch_planner.py g:\\ARHIVA\\C --gb 40 --hours 8
+    python archive_batch_planner.py --history
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+DEFAULT_ROOT = Path(r"g:\ARHIVA\C")
+DAILY_PLAN_FILE = "daily_upload_plan.json"
+PLAN_HISTORY_FILE = "daily_upload_history.json"
+DAILY_BYTE_BUDGET_GB = 40.0
+DAILY_TIME_BUDGET_HOURS = 8.0
+DEFAULT_THROUGHPUT_MBPS = 2.0    # Până există zile măsurate
+ITEM_OVERHEAD_SECONDS = 30.0     # Formular, pornire upload, verificări per unitate
+HISTORY_DAYS = 7                 # Throughput-ul estimat = mediana ultimelor zile
+LOOKAHEAD = 200                  # Cât de departe (alfabetic) se caută unități mici pentru restul bugetului
+MAX_SKIPS = 3                    # După atâtea zile sărite, unitatea intră prima
+IGNORE_EXTENSIONS = ['.jpg', '.png']  # Ca în uploader
+LIMIT_LABELS = {"bytes": "limitat de octeți", "time": "limitat de timp", "none": "tot inventarul încape"}
+
+
+def alphabetical_sort_key(name: str) -> str:
+    """Aceeași cheie ca ArchiveUploader.alphabetical_sort_key"""
+    clean = re.sub(r'[^a-zA-Z\s]', '', name.lower())
+    return re.sub(r'\s+', ' ', clean).strip()
+
+
+def _load_json(path: str, default: Any) -> Any:
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠ Nu am putut citi {path}: {e}")
+        return default
+
+
+def _save_json(path: str, data: Any):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+class UnitInventory:
+    """Unitățile de upload ca tabel coloană: o coloană NumPy per câmp, un rând per unitate"""
+
+    def __init__(self, paths: List[str], folders: List[str], byte_sizes: List[int], file_counts: List[int]):
+        order = sorted(range(len(paths)), key=lambda i: (alphabetical_sort_key(Path(folders[i]).name), paths[i]))
+        self.paths = np.array([paths[i] for i in order], dtype=object)
+        self.folders = np.array([folders[i] for i in order], dtype=object)
+        self.bytes = np.array([byte_sizes[i] for i in order], dtype=np.int64)
+        self.files = np.array([file_counts[i] for i in order], dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @classmethod
+    def scan(cls, root: Path, exclude: Iterable[str] = ()) -> "UnitInventory":
+        """Unitățile cu PDF de sub root (ca scan_folder_structure), fără cele din exclude (normcase)"""
+        excluded = {os.path.normcase(p) for p in exclude}
+        paths, folders, byte_sizes, file_counts = [], [], [], []
+        for folder in (f for f in root.iterdir() if f.is_dir()):
+            for current, _, files in os.walk(folder):
+                if os.path.normcase(current) in excluded:
+                    continue
+                unit_files = [Path(current) / f for f in files if Path(f).suffix.lower() not in IGNORE_EXTENSIONS]
+                if not any(f.suffix.lower() == '.pdf' for f in unit_files):
+                    continue  # Fără PDF: mutare în d:\3, nu upload
+                size = 0
+                for f in unit_files:
+                    try:
+                        size += f.stat().st_size
+                    except OSError:
+                        pass
+                paths.append(current)
+                folders.append(str(folder))
+                byte_sizes.append(size)
+                file_counts.append(len(unit_files))
+        return cls(paths, folders, byte_sizes, file_counts)
+
+    def predicted_seconds(self, throughput_mbps: float) -> "np.ndarray":
+        return self.bytes / (throughput_mbps * 1024 * 1024) + ITEM_OVERHEAD_SECONDS
+
+    def summary(self) -> str:
+        return (f"📚 Inventar: {len(self)} unități, {self.bytes.sum() / 1024 ** 3:.1f} GB, "
+                f"{int(self.files.sum())} fișiere (mediană {np.median(self.bytes) / 1024 ** 2:.1f} MB/unitate)"
+                if len(self) else "📚 Inventar gol")
+
+
+def estimated_throughput(history: Dict[str, Any]) -> float:
+    """MB/s reali din ultimele HISTORY_DAYS zile (mediana), altfel DEFAULT_THROUGHPUT_MBPS"""
+    measured = [day["actual_mbps"] for day in history.get("days", [])[-HISTORY_DAYS:] if day.get("actual_mbps")]
+    return statistics.median(measured) if measured else DEFAULT_THROUGHPUT_MBPS
+
+
+def _fitting_prefix(costs: "np.ndarray", remaining: "np.ndarray") -> int:
+    """Câte rânduri de la început încap în toate bugetele (costs: rânduri × bugete)"""
+    totals = np.cumsum(costs, axis=0)
+    return min(int(np.searchsorted(totals[:, k], remaining[k], side="right")) for k in range(costs.shape[1]))
+
+
+def select_batch(costs: "np.ndarray", budgets: "np.ndarray", skips: "np.ndarray",
+                 lookahead: int = LOOKAHEAD, max_skips: int = MAX_SKIPS) -> "np.ndarray":
+    """Indicii aleși (în ordine alfabetică): sărite întâi, prefix alfabetic, apoi cele mai mici din fereastră.
+
+    costs are o coloană per buget (ex. octeți, secunde); fiecare unitate aleasă încape în toate bugetele.
+    """
+    chosen = np.zeros(len(costs), dtype=bool)
+    remaining = np.array(budgets, dtype=np.float64)
+
+    for i in np.flatnonzero(skips >= max_skips):
+        if (costs[i] <= remaining).all() or not chosen.any():
+            chosen[i] = True
+            remaining -= costs[i]
+
+    free = np.flatnonzero(~chosen)
+    prefix = _fitting_prefix(costs[free], remaining)
+    chosen[free[:prefix]] = True
+    remaining -= costs[free[:prefix]].sum(axis=0)
+
+    # Timpul crește cu mărimea, deci ordinea după prima coloană e "cele mai mici" pentru toate bugetele
+    window = free[prefix:prefix + lookahead]
+    by_size = window[np.argsort(costs[window, 0], kind="stable")]
+    fits = _fitting_prefix(costs[by_size], remaining)
+    chosen[by_size[:fits]] = True
+
+    if not chosen.any() and len(costs):
+        chosen[0] = True  # O unitate mai mare decât tot bugetul primește o zi întreagă
+    return np.flatnonzero(chosen)
+
+
+def plan_day(inventory: UnitInventory, byte_budget: float, time_budget: float,
+             history: Dict[str, Any]) -> Dict[str, Any]:
+    """Planul zilei: unitățile alese, estimările și bugetul care a limitat"""
+    throughput = estimated_throughput(history)
+    seconds = inventory.predicted_seconds(throughput)
+    skip_counts = history.get("skips", {})
+    skips = np.array([skip_counts.get(p, 0) for p in inventory.paths], dtype=np.int32)
+
+    costs = np.column_stack([inventory.bytes.astype(np.float64), seconds])
+    chosen = select_batch(costs, np.array([byte_budget, time_budget], dtype=np.float64), skips)
+
+    # Bugetul care a oprit lotul: cel consumat în proporția cea mai mare
+    used_bytes = int(inventory.bytes[chosen].sum())
+    used_seconds = float(seconds[chosen].sum())
+    if len(chosen) == len(inventory):
+        limited_by = "none"
+    elif used_bytes / max(byte_budget, 1.0) >= used_seconds / max(time_budget, 1.0):
+        limited_by = "bytes"
+    else:
+        limited_by = "time"
+
+    # Unitățile sărite în favoarea celor alese după ele (alfabetic) - li se numără amânările
+    passed_over = np.ones(len(inventory), dtype=bool)
+    passed_over[chosen] = False
+    passed_over[chosen.max() + 1 if len(chosen) else 0:] = False
+    skipped = inventory.paths[passed_over].tolist()
+    return {
+        "date": datetime.now().strftime("%Y-%m-%d"),
+        "created": datetime.now().isoformat(),
+        "throughput_mbps": round(throughput, 3),
+        "budget_bytes": int(byte_budget),
+        "budget_seconds": round(time_budget, 1),
+        "limited_by": limited_by,
+        "predicted_bytes": used_bytes,
+        "predicted_seconds": round(used_seconds, 1),
+        "units": [{"path": inventory.paths[i], "folder": inventory.folders[i], "bytes": int(inventory.bytes[i]),
+                   "files": int(inventory.files[i]), "predicted_seconds": round(float(seconds[i]), 1)}
+                  for i in chosen],
+        "skipped": skipped,
+    }
+
+
+def load_plan(path: str = DAILY_PLAN_FILE) -> Optional[Dict[str, Any]]:
+    """Planul de azi sau None (fără plan, plan vechi sau ilizibil)"""
+    plan = _load_json(path, None)
+    if plan and plan.get("date") == datetime.now().strftime("%Y-%m-%d"):
+        return plan
+    return None
+
+
+def planned_paths(plan: Dict[str, Any]) -> Set[str]:
+    return {os.path.normcase(unit["path"]) for unit in plan["units"]}
+
+
+def planned_folders(plan: Dict[str, Any]) -> Set[str]:
+    return {os.path.normcase(unit["folder"]) for unit in plan["units"]}
+
+
+def record_plan_result(plan: Dict[str, Any], processed_paths: Iterable[str], seconds: float,
+                       plan_file: str = DAILY_PLAN_FILE, history_file: str = PLAN_HISTORY_FILE) -> Dict[str, Any]:
+    """Scrie octeții/timpul reali lângă estimări (în plan și în istoric); întoarce rezultatul"""
+    done = {os.path.normcase(p) for p in processed_paths}
+    units = [u for u in plan["units"] if os.path.normcase(u["path"]) in done]
+    actual_bytes = sum(u["bytes"] for u in units)
+    result = {
+        "date": plan["date"],
+        "units_planned": len(plan["units"]),
+        "units_done": len(units),
+        "predicted_bytes": plan["predicted_bytes"],
+        "predicted_seconds": plan["predicted_seconds"],
+        "predicted_mbps": plan["throughput_mbps"],
+        "actual_bytes": actual_bytes,
+        "actual_seconds": round(seconds, 1),
+        "actual_mbps": round(actual_bytes / 1024 ** 2 / seconds, 3) if seconds > 0 and actual_bytes else 0.0,
+    }
+    plan["actual"] = result
+    _save_json(plan_file, plan)
+
+    history = _load_json(history_file, {"days": [], "skips": {}, "done": []})
+    rerun = any(d["date"] == result["date"] for d in history.get("days", []))
+    history["days"] = [d for d in history.get("days", []) if d["date"] != result["date"]] + [result]
+    history["done"] = sorted(set(history.get("done", [])) | {u["path"] for u in units})
+    skips = history.setdefault("skips", {})
+    for path in ([] if rerun else plan.get("skipped", [])):  # O amânare pe zi, oricâte rulări
+        skips[path] = skips.get(path, 0) + 1
+    for unit in units:
+        skips.pop(unit["path"], None)
+    _save_json(history_file, history)
+    return result
+
+
+def describe_result(result: Dict[str, Any]) -> str:
+    return (f"📐 Plan vs real: {result['units_done']}/{result['units_planned']} unități, "
+            f"{result['actual_bytes'] / 1024 ** 3:.2f}/{result['predicted_bytes'] / 1024 ** 3:.2f} GB, "
+            f"{result['actual_seconds'] / 3600:.2f}/{result['predicted_seconds'] / 3600:.2f} h, "
+            f"{result['actual_mbps']:.2f} MB/s real vs {result['predicted_mbps']:.2f} MB/s estimat")
+
+
+def main():
+    """Funcția principală"""
+    parser = argparse.ArgumentParser(description="Planul zilnic de upload-uri după buget de octeți și timp")
+    parser.add_argument("root", nargs="?", default=str(DEFAULT_ROOT))
+    parser.add_argument("--gb", type=float, default=DAILY_BYTE_BUDGET_GB, help="Buget zilnic în GB")
+    parser.add_argument("--hours", type=float, default=DAILY_TIME_BUDGET_HOURS, help="Buget zilnic în ore")
+    parser.add_argument("--plan", default=DAILY_PLAN_FILE)
+    parser.add_argument("--history", action="store_true", help="Afișează estimările vs realul zilelor trecute")
+    args = parser.parse_args()
+
+    history = _load_json(PLAN_HISTORY_FILE, {"days": [], "skips": {}, "done": []})
+    if args.history:
+        for day in history.get("days", []):
+            print(describe_result(day).replace("📐 Plan vs real", f"📅 {day['date']}"))
+        print(f"⚡ Throughput estimat pentru mâine: {estimated_throughput(history):.2f} MB/s")
+        return 0
+
+    if not NUMPY_AVAILABLE:
+        print("❌ Planificatorul are nevoie de numpy (pip install numpy)")
+        return 1
+    root = Path(args.root)
+    if not root.exists():
+        print(f"❌ Directorul nu există: {root}")
+        return 1
+
+    from archive_near_duplicates import SKIP_LIST_FILE, load_skip_list
+    inventory = UnitInventory.scan(root, exclude=set(history.get("done", [])) | load_skip_list(SKIP_LIST_FILE))
+    print(inventory.summary())
+    if not len(inventory):
+        return 0
+
+    plan = plan_day(inventory, args.gb * 1024 ** 3, args.hours * 3600, history)
+    _save_json(args.plan, plan)
+    print(f"🗓️ Plan {plan['date']}: {len(plan['units'])} unități, {plan['predicted_bytes'] / 1024 ** 3:.2f} GB, "
+          f"~{plan['predicted_seconds'] / 3600:.1f} h la {plan['throughput_mbps']:.2f} MB/s "
+          f"({LIMIT_LABELS[plan['limited_by']]})")
+    if plan["skipped"]:
+        print(f"⏭️ {len(plan['skipped'])} unități mari amânate (intră primele după {MAX_SKIPS} amânări)")
+    print(f"💾 Plan salvat: {args.plan} - uploader-ul procesează doar aceste unități azi")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ascultător CDP (Chrome DevTools Protocol) pentru erorile HTTP ale upload-urilor.
+
+Până acum erorile (400/404/500/503/505, XML-ul S3 SlowDown/BadContent) se
+găseau căutând "not found" etc. în page_source-ul fiecărui tab, după upload -
+scump și cu alarme false pe orice pagină care conține acele cuvinte. Aici
+fiecare tab de upload are o conexiune CDP proprie (websocket-ul din
+/json/list, în paralel cu ChromeDriver), cu Network.enable:
+- Network.requestWillBeSent: PUT-urile către archive.org (URL + metodă)
+- Network.responseReceived cu status >= 400: status + URL, iar la
+  loadingFinished corpul răspunsului (Network.getResponseBody) -> <Code> S3
+- Network.loadingFailed: eroarea de rețea (net::ERR_...)
+Eroarea ajunge imediat, cu unitatea (folderul) care deține tab-ul.
+
+Cu un BandwidthShaper, aceeași conexiune limitează și upload-ul tab-ului
+(Network.emulateNetworkConditions, uploadThroughput): la atașare și apoi la
+fiecare CONTROL_CHECK_INTERVAL secunde, cu cota din archive_bandwidth.tab_rate -
+limitele din bandwidth_limits.json ajung și la upload-urile din Chrome.
+
+Fără dependențe: clientul websocket minimal de mai jos (RFC 6455, doar ce
+folosește CDP: cadre text, fragmentare, ping/close).
+
+Folosire:
+    listener = NetworkErrorListener(tab_manager, shaper=BandwidthShaper())
+    listener.attach(window_handle, folder_name)
+    ...
+    for error in listener.errors():
+        print(error["error_code"], error["url"])
+"""
+
+import base64
+import itertools
+import json
+import os
+import re
+import socket
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+from archive_bandwidth import CONTROL_CHECK_INTERVAL, BandwidthShaper
+from archive_tab_manager import UPLOADING, UploadTabManager
+from archive_upload_monitor import debugger_address, list_targets, target_id
+
+UPLOAD_HOSTS = ("archive.org",)            # s3.us.archive.org, archive.org/upload...
+UPLOAD_METHODS = ("PUT", "POST")
+MAX_ERROR_BODY = 2000
+CDP_CONNECT_TIMEOUT = 5.0
+S3_CODE_RE = re.compile(r"<Code>([^<]+)</Code>")
+S3_MESSAGE_RE = re.compile(r"<Message>([^<]*)</Message>")
+
+
+class WebSocketClosed(Exception):
+    """Conexiunea CDP s-a închis (tab închis sau Chrome oprit)"""
+
+
+class CDPConnection:
+    """Client websocket minimal pentru un target DevTools"""
+
+    def __init__(self, ws_url: str, timeout: float = CDP_CONNECT_TIMEOUT):
+        parsed = urlparse(ws_url)
+        self.sock = socket.create_connection((parsed.hostname, parsed.port or 80), timeout=timeout)
+        key = base64.b64encode(os.urandom(16)).decode()
+        request = (f"GET {parsed.path} HTTP/1.1\r\nHost: {parsed.netloc}\r\nUpgrade: websocket\r\n"
+                   f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n")
+        self.sock.sendall(request.encode())
+        response = b""
+        while b"\r\n\r\n" not in response:
+            chunk = self.sock.recv(1024)
+            if not chunk:
+                raise WebSocketClosed("handshake întrerupt")
+            response += chunk
+        if b" 101 " not in response.split(b"\r\n", 1)[0]:
+            raise WebSocketClosed(response.split(b"\r\n", 1)[0].decode('latin-1'))
+        self.buffer = response.split(b"\r\n\r\n", 1)[1]
+        self.ids = itertools.count(1)  # Comenzi trimise din thread-ul ascultătorului și din cel de limitare
+        self.send_lock = threading.Lock()
+
+    def _recv_exact(self, size: int) -> bytes:
+        while len(self.buffer) < size:
+            chunk = self.sock.recv(max(65536, size - len(self.buffer)))
+            if not chunk:
+                raise WebSocketClosed("conexiune închisă")
+            self.buffer += chunk
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def _send_frame(self, opcode: int, payload: bytes):
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([0x80 | length])
+        elif length < 65536:
+            header += bytes([0x80 | 126]) + struct.pack("!H", length)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack("!Q", length)
+        mask = os.urandom(4)
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        with self.send_lock:
+            self.sock.sendall(header + mask + masked)
+
+    def send(self, method: str, params: Optional[Dict[str, Any]] = None) -> int:
+        """Trimite o comandă CDP; întoarce id-ul ei"""
+        command_id = next(self.ids)
+        message = {"id": command_id, "method": method, "params": params or {}}
+        self._send_frame(0x1, json.dumps(message).encode('utf-8'))
+        return command_id
+
+    def recv(self) -> Dict[str, Any]:
+        """Următorul mesaj CDP (eveniment sau răspuns)"""
+        message = b""
+        while True:
+            first, second = self._recv_exact(2)
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                length = struct.unpack("!H", self._recv_exact(2))[0]
+            elif length == 127:
+                length = struct.unpack("!Q", self._recv_exact(8))[0]
+            payload = self._recv_exact(length)
+            if opcode == 0x8:
+                raise WebSocketClosed("close primit")
+            if opcode == 0x9:
+                self._send_frame(0xA, payload)
+                continue
+            if opcode in (0x1, 0x2, 0x0):
+                message += payload
+                if first & 0x80:
+                    return json.loads(message.decode('utf-8'))
+
+    def close(self):
+        try:
+            self._send_frame(0x8, b"")
+        except OSError:
+            pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+def is_upload_request(method: str, url: str) -> bool:
+    host = urlparse(url).hostname or ""
+    return method in UPLOAD_METHODS and any(host == h or host.endswith("." + h) for h in UPLOAD_HOSTS)
+
+
+def filename_from_url(url: str) -> str:
+    """s3.us.archive.org/<identifier>/<fișier> -> fișier"""
+    parts = [p for p in urlparse(url).path.split('/') if p]
+    return unquote(parts[-1]) if len(parts) >= 2 else "fisier-necunoscut"
+
+
+class TabNetworkListener:
+    """Thread care ascultă evenimentele Network ale unui tab de upload"""
+
+    def __init__(self, ws_url: str, window_handle: str, unit_name: str,
+                 on_error: Callable[[Dict[str, Any]], None]):
+        self.ws_url = ws_url
+        self.window_handle = window_handle
+        self.unit_name = unit_name
+        self.on_error = on_error
+        self.requests: Dict[str, Dict[str, Any]] = {}
+        self.pending_bodies: Dict[int, Dict[str, Any]] = {}
+        self.connection: Optional[CDPConnection] = None
+        self.upload_rate: Optional[float] = None  # Ultimul uploadThroughput trimis (None = niciunul)
+        self.stopped = False
+        self.thread = threading.Thread(target=self._run, name=f"cdp-{unit_name[:20]}", daemon=True)
+
+    def start(self):
+        self.connection = CDPConnection(self.ws_url)
+        self.connection.send("Network.enable", {"maxTotalBufferSize": 10 * 1024 * 1024})
+        self.connection.sock.settimeout(None)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped = True
+        if self.connection:
+            self.connection.close()
+
+    def is_alive(self) -> bool:
+        return not self.stopped and self.thread.is_alive()
+
+    def throttle(self, bytes_per_second: float):
+        """Plafonul de upload al tab-ului (0 = nelimitat); descărcările rămân nelimitate"""
+        if bytes_per_second == self.upload_rate:
+            return
+        self.connection.send("Network.emulateNetworkConditions", {
+            "offline": False, "latency": 0, "downloadThroughput": -1,
+            "uploadThroughput": bytes_per_second if bytes_per_second else -1,
+        })
+        self.upload_rate = bytes_per_second
+
+    def _error(self, request: Dict[str, Any], code: str, status: str, details: str):
+        self.on_error({
+            "filename": filename_from_url(request["url"]),
+            "page_title": self.unit_name,
+            "window_handle": self.window_handle,
+            "unit": self.unit_name,
+            "url": request["url"],
+            "method": request["method"],
+            "error_code": code,
+            "error_status": status,
+            "error_details": details[:MAX_ERROR_BODY],
+            "timestamp": datetime.now().isoformat(),
+        })
+
+    def _run(self):
+        try:
+            while not self.stopped:
+                self._handle(self.connection.recv())
+        except (WebSocketClosed, OSError, ValueError):
+            pass  # Tab închis (succes deja confirmat de monitor) sau Chrome oprit
+
+    def _handle(self, message: Dict[str, Any]):
+        if "id" in message:
+            request = self.pending_bodies.pop(message["id"], None)
+            if request:
+                body = (message.get("result") or {}).get("body", "")
+                code = S3_CODE_RE.search(body)
+                text = S3_MESSAGE_RE.search(body)
+                status = f"HTTP {request['status']}" + (f" {code.group(1)}" if code else "")
+                self._error(request, str(request["status"]), status, (text.group(1) if text else body) or status)
+            return
+
+        method = message.get("method")
+        params = message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            req = params.get("request", {})
+            if is_upload_request(req.get("method", ""), req.get("url", "")):
+                self.requests[params["requestId"]] = {"method": req["method"], "url": req["url"], "status": 0}
+        elif method == "Network.responseReceived":
+            request = self.requests.get(params.get("requestId"))
+            if request:
+                request["status"] = params.get("response", {}).get("status", 0)
+        elif method == "Network.loadingFinished":
+            request = self.requests.pop(params.get("requestId"), None)
+            if request and request["status"] >= 400:
+                command_id = self.connection.send("Network.getResponseBody", {"requestId": params["requestId"]})
+                self.pending_bodies[command_id] = request
+        elif method == "Network.loadingFailed":
+            request = self.requests.pop(params.get("requestId"), None)
+            if request and not params.get("canceled"):
+                error_text = params.get("errorText", "loading failed")
+                code = str(request["status"]) if request["status"] >= 400 else "NETWORK"
+                self._error(request, code, error_text, f"{request['method']} {request['url']}: {error_text}")
+
+
+class NetworkErrorListener:
+    """Câte un TabNetworkListener per tab de upload; erorile strânse într-o listă comună"""
+
+    def __init__(self, tab_manager: UploadTabManager, shaper: Optional[BandwidthShaper] = None):
+        self.tab_manager = tab_manager  # Driver-ul curent (se schimbă la restart-ul Chrome)
+        self.shaper = shaper            # Comun tuturor instanțelor Chrome: plafonul global se împarte între ele
+        self.listeners: Dict[str, TabNetworkListener] = {}
+        self.lock = threading.Lock()
+        self._errors: List[Dict[str, Any]] = []
+        self.shaping: Optional[threading.Thread] = None
+        self.shaping_stop = threading.Event()
+
+    def _record(self, error: Dict[str, Any]):
+        with self.lock:
+            self._errors.append(error)
+        print(f"   🚨 [CDP] {error['unit']}: {error['method']} {error['filename']} -> "
+              f"{error['error_code']} {error['error_status']}")
+
+    def attach(self, window_handle: str, unit_name: str) -> bool:
+        """Pornește ascultarea pentru tab; False dacă DevTools nu e accesibil"""
+        address = debugger_address(self.tab_manager.driver)
+        if not address:
+            return False
+        try:
+            targets = list_targets(address)
+            target = targets.get(target_id(window_handle))
+            if not target or not target.get("webSocketDebuggerUrl"):
+                return False
+            listener = TabNetworkListener(target["webSocketDebuggerUrl"], window_handle, unit_name, self._record)
+            listener.start()
+        except Exception as e:
+            print(f"   ⚠ Nu am putut atașa ascultătorul CDP pentru {unit_name}: {e}")
+            return False
+        self.listeners[window_handle] = listener
+        if self.shaper:
+            self.apply_limits()
+            if self.shaping is None or not self.shaping.is_alive():
+                self.shaping_stop = threading.Event()
+                self.shaping = threading.Thread(target=self._shape_loop, args=(self.shaping_stop,),
+                                                name="cdp-bandwidth", daemon=True)
+                self.shaping.start()
+        return True
+
+    def _uploading(self) -> List[TabNetworkListener]:
+        """Ascultătorii tab-urilor încă în upload (cele terminate nu mai consumă din plafon)"""
+        with self.tab_manager.lock:
+            states = {handle: tab.state for handle, tab in self.tab_manager.tabs.items()}
+        return [listener for handle, listener in list(self.listeners.items())
+                if listener.is_alive() and states.get(handle) == UPLOADING]
+
+    def apply_limits(self):
+        """Cota curentă din plafon, trimisă tab-urilor în upload"""
+        uploading = self._uploading()
+        self.shaper.set_tabs(self, uploading)
+        rate = self.shaper.tab_rate()
+        for listener in uploading:
+            try:
+                listener.throttle(rate)
+            except (WebSocketClosed, OSError):
+                pass  # Tab închis între timp: iese din cotă la următoarea trecere
+
+    def _shape_loop(self, stop: threading.Event):
+        while not stop.wait(CONTROL_CHECK_INTERVAL):
+            self.apply_limits()
+
+    def is_attached(self, window_handle: str) -> bool:
+        """Tab-ul a fost ascultat de la deschidere (erorile lui sunt deja știute)"""
+        return window_handle in self.listeners
+
+    def errors(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return list(self._errors)
+
+    def errors_for(self, window_handle: str) -> List[Dict[str, Any]]:
+        return [e for e in self.errors() if e["window_handle"] == window_handle]
+
+    def errors_by_tab(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Erorile fiecărui tab ascultat - de luat înainte de stop(), care uită tab-urile"""
+        errors = self.errors()
+        return {handle: [e for e in errors if e["window_handle"] == handle] for handle in list(self.listeners)}
+
+    def drain(self, seconds: float = 1.0):
+        """Lasă răspunsurile Network.getResponseBody în curs să ajungă"""
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline and any(l.pending_bodies for l in self.listeners.values()):
+            time.sleep(0.05)
+
+    def stop(self):
+        self.shaping_stop.set()
+        for listener in self.listeners.values():
+            listener.stop()
+        self.listeners = {}
+        if self.shaper:
+            self.shaper.set_tabs(self, [])
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chrome headless separat pentru simulările de upload din checkerele de duplicate.
+
+check_folder_with_chrome (ArchiveHybridChecker) și check_duplicate_with_browser
+(scripturile Grok) se atașau la Chrome-ul interactiv de pe 9222 - profilul
+complet al utilizatorului, cu extensii, imagini și tot UI-ul archive.org,
+doar ca să citească #item_id după alegerea unui fișier. Aici:
+- profil dedicat (CHECK_PROFILE_DIR) pe portul CHECK_DEBUG_PORT, separat de
+  Chrome-ul upload-urilor: headless, fără extensii, fără imagini
+- imaginile, fonturile și analytics blocate prin Network.setBlockedURLs
+- cache pe disc persistent în profil: JS/CSS-ul paginii de upload se descarcă
+  o singură dată, nu la fiecare verificare
+- browser_memory_mb(): memoria totală a Chrome-ului de pe un port (psutil,
+  opțional) pentru comparația cu profilul interactiv (benchmark_check_browser.py)
+
+Profilul trebuie logat o dată pe archive.org (fereastră vizibilă):
+    python archive_check_browser.py --login
+
+Folosire:
+    driver = start_lean_browser()
+    ...
+    print(browser_memory_mb(CHECK_DEBUG_PORT))
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+CHECK_PROFILE_DIR = Path.home() / "AppData" / "Local" / "ArchiveCheckProfile"
+CHECK_DEBUG_PORT = 9230          # Separat de 9222 (upload-uri) și de pool-ul 9222+N
+DISK_CACHE_MB = 200
+LOGIN_URL = "https://archive.org/account/login"
+
+# Resursele de care simularea nu are nevoie (#item_id vine din JS, nu din imagini)
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+]
+
+HEAP_JS = "return performance.memory ? performance.memory.usedJSHeapSize : null;"
+
+
+def lean_chrome_options(profile_dir: Path = CHECK_PROFILE_DIR, headless: bool = True,
+                        debug_port: int = CHECK_DEBUG_PORT) -> Options:
+    """Opțiunile profilului lean: headless, fără extensii și imagini, cache persistent"""
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    options.add_argument(f"--remote-debugging-port={debug_port}")
+    options.add_argument(f"--disk-cache-dir={profile_dir / 'cache'}")
+    options.add_argument(f"--disk-cache-size={DISK_CACHE_MB * 1024 * 1024}")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-component-extensions-with-background-pages")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--disable-sync")
+    options.add_argument("--mute-audio")
+    options.add_argument("--no-first-run")
+    options.add_argument("--no-default-browser-check")
+    options.add_argument("--window-size=1280,900")
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    return options
+
+
+def start_lean_browser(profile_dir: Path = CHECK_PROFILE_DIR, headless: bool = True,
+                       debug_port: int = CHECK_DEBUG_PORT):
+    """Pornește Chrome-ul de verificare (independent de Chrome-ul upload-urilor)"""
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    driver = webdriver.Chrome(options=lean_chrome_options(profile_dir, headless, debug_port))
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"      ⚠ Blocarea resurselor prin CDP nu e disponibilă: {e}")
+    return driver
+
+
+def chrome_processes(debug_port: int) -> List["psutil.Process"]:
+    """Procesul browser-ului de pe portul dat + toate procesele copil (renderere, GPU...)"""
+    if not PSUTIL_AVAILABLE:
+        return []
+    flag = f"--remote-debugging-port={debug_port}"
+    for process in psutil.process_iter(["cmdline"]):
+        cmdline = process.info.get("cmdline") or []
+        if flag in cmdline and not any(arg.startswith("--type=") for arg in cmdline):
+            try:
+                return [process] + process.children(recursive=True)
+            except psutil.Error:
+                return [process]
+    return []
+
+
+def browser_memory_mb(debug_port: int) -> Optional[float]:
+    """RSS total al Chrome-ului de pe port, în MB (None fără psutil sau dacă nu e găsit)"""
+    total = 0
+    processes = chrome_processes(debug_port)
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024) if processes else None
+
+
+def js_heap_mb(driver) -> Optional[float]:
+    """Heap-ul JS al tab-ului curent (performance.memory), când psutil lipsește"""
+    try:
+        used = driver.execute_script(HEAP_JS)
+        return used / (1024 * 1024) if used else None
+    except Exception:
+        return None
+
+
+def main():
+    """Funcția principală"""
+    parser = argparse.ArgumentParser(description="Profilul Chrome headless pentru checkerele de duplicate")
+    parser.add_argument("--login", action="store_true", help="Deschide profilul vizibil pentru logarea pe archive.org")
+    args = parser.parse_args()
+
+    if not args.login:
+        parser.print_help()
+        return 0
+    driver = start_lean_browser(headless=False)
+    try:
+        driver.get(LOGIN_URL)
+        input(f"🔐 Loghează-te pe archive.org în fereastra deschisă ({CHECK_PROFILE_DIR}), apoi apasă Enter...")
+    finally:
+        driver.quit()
+    print("✅ Profilul de verificare e gata - checkerele îl pot folosi headless")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pool de instanțe Chrome, fiecare cu profilul și portul de debug propriu.
+
+Până acum totul trecea printr-un singur Chrome pe 127.0.0.1:9222 (pornit de
+start_chrome_debug.bat): memoria unui singur browser limita câte upload-uri
+puteau rula deodată, iar un crash oprea tot lotul. Aici:
+- ChromeInstance: Chrome pe BASE_DEBUG_PORT + index, cu --user-data-dir separat
+  în POOL_PROFILE_ROOT (instanța 0 se atașează la Chrome-ul deja pornit pe 9222)
+- ChromePool.run(): câte un thread per instanță, toate scot unități din aceeași
+  coadă; starea (state_archive.json) rămâne comună, prin callback-uri
+- o instanță care nu mai răspunde la /json/version se repornește singură
+  (cel mult MAX_INSTANCE_RESTARTS ori); unitatea ei revine în coadă, celelalte
+  instanțe continuă
+
+Profilurile noi trebuie logate o dată pe archive.org:
+    python archive_chrome_pool.py --size 3 --launch
+
+Folosire:
+    pool = ChromePool(size=3)
+    pool.start()
+    for unit, result in pool.run(units, connect, process):
+        ...
+"""
+
+import argparse
+import json
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+CHROME_POOL_SIZE = 3
+BASE_DEBUG_PORT = 9222
+CHROME_PATH = r"C:\Program Files\Google\Chrome\Application\chrome.exe"  # Ca în start_chrome_debug.bat
+POOL_PROFILE_ROOT = Path.home() / "AppData" / "Local" / "ArchiveUploaderPool"
+CHROME_START_TIMEOUT = 30.0      # Secunde până când DevTools trebuie să răspundă după pornire
+RESTART_PAUSE = 5.0              # Pauză între oprirea unei instanțe crăpate și repornire
+MAX_INSTANCE_RESTARTS = 3        # După atâtea reporniri, instanța se retrage; restul cozii merge la celelalte
+MAX_UNIT_ATTEMPTS = 2            # De câte ori se încearcă o unitate pierdută odată cu Chrome
+STOP_RESULT = "limit_reached"    # Rezultatul care oprește toate instanțele
+
+
+def find_chrome() -> Optional[str]:
+    """Executabilul Chrome: CHROME_PATH, altfel din PATH"""
+    if Path(CHROME_PATH).exists():
+        return CHROME_PATH
+    for name in ("chrome", "google-chrome", "google-chrome-stable", "chromium", "chromium-browser"):
+        found = shutil.which(name)
+        if found:
+            return found
+    return None
+
+
+class ChromeInstance:
+    """Un Chrome cu remote debugging pe portul lui și profilul lui"""
+
+    def __init__(self, index: int, port: int, profile_dir: Path, chrome_path: Optional[str] = None):
+        self.index = index
+        self.port = port
+        self.profile_dir = profile_dir
+        self.chrome_path = chrome_path
+        self.process: Optional[subprocess.Popen] = None
+        self.restarts = 0
+        self.processed = 0
+        self.retired = False
+
+    @property
+    def address(self) -> str:
+        return f"127.0.0.1:{self.port}"
+
+    @property
+    def name(self) -> str:
+        return f"Chrome #{self.index + 1} ({self.address})"
+
+    def is_alive(self, timeout: float = 2.0) -> bool:
+        """DevTools răspunde (browser-ul rulează, chiar dacă un tab a crăpat)"""
+        try:
+            with urllib.request.urlopen(f"http://{self.address}/json/version", timeout=timeout) as response:
+                return "Browser" in json.load(response)
+        except Exception:
+            return False
+
+    def command(self) -> List[str]:
+        return [self.chrome_path or "", f"--remote-debugging-port={self.port}",
+                f"--user-data-dir={self.profile_dir}", "--no-first-run", "--no-default-browser-check",
+                "about:blank"]
+
+    def launch(self, timeout: float = CHROME_START_TIMEOUT) -> bool:
+        """Pornește Chrome dacă portul nu e deja servit; True când DevTools răspunde"""
+        if self.is_alive():
+            print(f"   🔗 {self.name}: deja pornit - mă atașez")
+            return True
+        if not self.chrome_path:
+            print(f"   ❌ {self.name}: nu găsesc executabilul Chrome (CHROME_PATH)")
+            return False
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            self.process = subprocess.Popen(self.command(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            print(f"   ❌ {self.name}: pornirea a eșuat ({e})")
+            return False
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.is_alive():
+                print(f"   🚀 {self.name}: pornit cu profilul {self.profile_dir}")
+                return True
+            if self.process.poll() is not None:
+                break
+            time.sleep(0.5)
+        print(f"   ❌ {self.name}: DevTools nu răspunde după {timeout:.0f}s")
+        return False
+
+    def stop(self):
+        """Oprește doar procesul pornit de pool (Chrome-ul utilizatorului nu se atinge)"""
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+
+    def restart(self) -> bool:
+        self.restarts += 1
+        print(f"🔄 {self.name}: repornire {self.restarts}/{MAX_INSTANCE_RESTARTS}...")
+        self.stop()
+        time.sleep(RESTART_PAUSE)
+        return self.launch()
+
+
+class ChromePool:
+    """N instanțe Chrome care consumă aceeași coadă de unități; un crash repornește doar instanța lui"""
+
+    def __init__(self, size: int = CHROME_POOL_SIZE, base_port: int = BASE_DEBUG_PORT,
+                 profile_root: Path = POOL_PROFILE_ROOT, chrome_path: Optional[str] = None):
+        chrome_path = chrome_path or find_chrome()
+        self.instances = [
+            ChromeInstance(i, base_port + i, profile_root / f"profile_{i + 1}", chrome_path)
+            for i in range(max(1, size))
+        ]
+        self.workers: Dict[int, Any] = {}
+        self.queue: "queue.Queue[Tuple[Any, int]]" = queue.Queue()
+        self.results: List[Tuple[Any, Any]] = []
+        self.results_lock = threading.Lock()
+        self.stopped = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def start(self) -> List[ChromeInstance]:
+        """Pornește/atașează toate instanțele; întoarce cele gata de lucru"""
+        print(f"🧩 Pool Chrome: {len(self.instances)} instanțe, porturi "
+              f"{self.instances[0].port}-{self.instances[-1].port}")
+        for instance in self.instances:
+            instance.retired = not instance.launch()
+        return self.ready()
+
+    def ready(self) -> List[ChromeInstance]:
+        return [instance for instance in self.instances if not instance.retired]
+
+    def _record(self, job: Any, result: Any):
+        with self.results_lock:
+            self.results.append((job, result))
+            if result == STOP_RESULT:
+                self.stopped = True
+
+    def _connect(self, instance: ChromeInstance, connect: Callable[[ChromeInstance], Any]) -> bool:
+        try:
+            worker = connect(instance)
+        except Exception as e:
+            print(f"   ❌ {instance.name}: conectarea WebDriver a eșuat ({e})")
+            worker = None
+        if worker is None:
+            return False
+        self.workers[instance.index] = worker
+        return True
+
+    def _recover(self, instance: ChromeInstance, connect: Callable[[ChromeInstance], Any],
+                 on_crash: Optional[Callable[[Any], Iterable[Any]]]) -> bool:
+        """Repornește instanța crăpată; unitățile pierdute odată cu ea revin în coadă"""
+        worker = self.workers.pop(instance.index, None)
+        if on_crash and worker is not None:
+            lost = list(on_crash(worker) or [])
+            for job in lost:
+                self.queue.put((job, 0))
+            if lost:
+                print(f"   ↩ {instance.name}: {len(lost)} upload-uri pierdute odată cu Chrome revin în coadă")
+        while instance.restarts < MAX_INSTANCE_RESTARTS:
+            if instance.restart() and self._connect(instance, connect):
+                return True
+        print(f"⛔ {instance.name}: retrasă după {instance.restarts} reporniri - celelalte instanțe preiau coada")
+        instance.retired = True
+        return False
+
+    def _lane(self, instance: ChromeInstance, connect: Callable[[ChromeInstance], Any],
+              process: Callable[[Any, Any], Any], on_crash: Optional[Callable[[Any], Iterable[Any]]],
+              max_attempts: int):
+        if not self._connect(instance, connect) and not self._recover(instance, connect, on_crash):
+            return
+
+        while not self.stopped:
+            try:
+                job, attempts = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                result = process(self.workers[instance.index], job)
+            except Exception as e:
+                print(f"❌ {instance.name}: eroare la procesare ({e})")
+                result = False
+
+            if not result and not instance.is_alive():
+                print(f"🚨 {instance.name} a crăpat în timpul unității")
+                if attempts + 1 < max_attempts:
+                    self.queue.put((job, attempts + 1))
+                else:
+                    self._record(job, False)
+                if not self._recover(instance, connect, on_crash):
+                    return
+                continue
+
+            instance.processed += 1
+            self._record(job, result)
+
+    def run(self, jobs: Iterable[Any], connect: Callable[[ChromeInstance], Any],
+            process: Callable[[Any, Any], Any], on_crash: Optional[Callable[[Any], Iterable[Any]]] = None,
+            max_attempts: int = MAX_UNIT_ATTEMPTS) -> List[Tuple[Any, Any]]:
+        """
+        Procesează toate unitățile; întoarce [(unitate, rezultat)].
+
+        connect(instance) -> worker (sau None) - se cheamă la pornire și după fiecare restart
+        process(worker, unitate) -> rezultat; STOP_RESULT oprește toate instanțele
+        on_crash(worker) -> unitățile pierdute odată cu Chrome-ul crăpat (se reiau)
+        """
+        for job in jobs:
+            self.queue.put((job, 0))
+        self.started_at = time.monotonic()
+        lanes = [threading.Thread(target=self._lane, args=(instance, connect, process, on_crash, max_attempts),
+                                  name=f"chrome-pool-{instance.index + 1}", daemon=True)
+                 for instance in self.ready()]
+        for lane in lanes:
+            lane.start()
+        for lane in lanes:
+            lane.join()
+        self.finished_at = time.monotonic()
+
+        # Ce a rămas în coadă (limita atinsă sau toate instanțele retrase) nu s-a procesat
+        while True:
+            try:
+                job, _ = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self._record(job, None)
+        return list(self.results)
+
+    def stop(self):
+        for instance in self.instances:
+            instance.stop()
+
+    def summary(self) -> str:
+        elapsed = (self.finished_at or time.monotonic()) - (self.started_at or time.monotonic())
+        lines = [f"🧩 Pool Chrome: {len(self.results)} unități în {elapsed / 60:.1f} min"]
+        for instance in self.instances:
+            status = "retrasă" if instance.retired else "activă"
+            lines.append(f"   {instance.name}: {instance.processed} unități, {instance.restarts} reporniri ({status})")
+        return "\n".join(lines)
+
+
+def main():
+    """Funcția principală"""
+    parser = argparse.ArgumentParser(description="Pool de instanțe Chrome pentru upload-uri")
+    parser.add_argument("--size", type=int, default=CHROME_POOL_SIZE, help="Numărul de instanțe")
+    parser.add_argument("--base-port", type=int, default=BASE_DEBUG_PORT)
+    parser.add_argument("--profile-root", default=str(POOL_PROFILE_ROOT))
+    parser.add_argument("--launch", action="store_true", help="Pornește instanțele (pentru logarea pe archive.org)")
+    args = parser.parse_args()
+
+    pool = ChromePool(args.size, args.base_port, Path(args.profile_root))
+    if args.launch:
+        ready = pool.start()
+        print(f"✅ {len(ready)}/{len(pool.instances)} instanțe gata - loghează-te pe archive.org în fiecare profil nou")
+    for instance in pool.instances:
+        state = "✅ răspunde" if instance.is_alive() else "❌ oprit"
+        print(f"   {instance.name}: {state} - profil {instance.profile_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
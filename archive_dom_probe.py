@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sondă DOM într-un singur apel per tab, rulată în paralel pe toate tab-urile prin CDP.
+
+check_single_tab_for_errors face, per tab: switch_to.window + sleep(1),
+page_source întreg coborât la lowercase, șase selectori CSS cu find_elements și
+is_displayed pe fiecare element, plus încă sleep(2) în bucla de verificare -
+peste zece minute la 150 de tab-uri. Aici:
+- ERROR_PROBE_JS întoarce starea relevantă ca un singur obiect JSON:
+  overlay_alert, upload_error_code/status/text/details, progress_msg și
+  elementele de eroare vizibile
+- probe_tabs() îl rulează cu Runtime.evaluate pe websocket-ul DevTools al
+  fiecărui tab, în paralel (PROBE_WORKERS), fără switch_to.window
+- classify_probe() aplică aceleași reguli ca check_single_tab_for_errors,
+  fără căutarea de subșiruri în page_source (alarmele false "not found")
+
+Folosire:
+    probes = probe_tabs(debugger_address(driver), window_handles)
+    for handle, probe in probes.items():
+        error = classify_probe(probe)
+"""
+
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional
+
+from archive_cdp_listener import CDPConnection
+from archive_upload_monitor import list_targets, target_id
+
+PROBE_WORKERS = 16
+PROBE_TIMEOUT = 10.0
+ERROR_CODES = ["400", "404", "500", "503", "505"]
+ERROR_CODE_RE = re.compile(r'\b(400|404|500|503|505)\b')
+UPLOAD_OF_RE = re.compile(r"Your upload of ([^\s]+) from username")
+MEMORY_ERROR_TITLES = ["not enough memory", "out of memory", "aw, snap"]
+UPLOAD_PAGE_TITLE = "Upload to Internet Archive"
+
+# Selectorii din check_single_tab_for_errors, în aceeași ordine
+ERROR_SELECTORS = ["#progress_msg", "#upload_error_text", ".error-message", ".upload-error",
+                   "[class*='error']", "[id*='error']"]
+
+ERROR_PROBE_JS = """
+(function (selectors) {
+    function visible(el) { return !!(el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length)); }
+    function text(id) { var el = document.getElementById(id); return el ? (el.innerText || el.textContent || '').trim() : ''; }
+    var overlay = document.getElementById('overlay_alert');
+    var details = document.getElementById('upload_error_details');
+    var pre = details ? details.querySelector('pre') : null;
+    var found = [];
+    selectors.forEach(function (selector) {
+        document.querySelectorAll(selector).forEach(function (el) {
+            if (found.length < 20 && visible(el)) {
+                var t = (el.innerText || '').trim();
+                if (t) { found.push({ selector: selector, text: t.slice(0, 500) }); }
+            }
+        });
+    });
+    return {
+        url: location.href,
+        title: document.title,
+        overlay_present: !!overlay,
+        overlay_visible: visible(overlay),
+        error_code: text('upload_error_code'),
+        error_status: text('upload_error_status'),
+        error_text: text('upload_error_text'),
+        error_details: pre ? (pre.textContent || '').trim() : '',
+        progress_msg: text('progress_msg'),
+        visible_errors: found
+    };
+})(%s)
+"""
+
+
+def _probe_expression() -> str:
+    return ERROR_PROBE_JS % json.dumps(ERROR_SELECTORS)
+
+
+def evaluate(ws_url: str, expression: str, timeout: float = PROBE_TIMEOUT) -> Any:
+    """Runtime.evaluate pe un tab; întoarce valoarea (returnByValue)"""
+    connection = CDPConnection(ws_url, timeout=timeout)
+    try:
+        connection.sock.settimeout(timeout)
+        command_id = connection.send("Runtime.evaluate", {"expression": expression, "returnByValue": True})
+        while True:
+            message = connection.recv()
+            if message.get("id") != command_id:
+                continue  # Evenimente de la alte domenii
+            if "error" in message:
+                raise RuntimeError(message["error"].get("message", "Runtime.evaluate eșuat"))
+            result = message.get("result", {})
+            if "exceptionDetails" in result:
+                raise RuntimeError(result["exceptionDetails"].get("text", "excepție JS"))
+            return result.get("result", {}).get("value")
+    finally:
+        connection.close()
+
+
+def probe_tabs(address: str, handles: Iterable[str], workers: int = PROBE_WORKERS,
+               targets: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Dict[str, Any]]:
+    """handle -> obiectul sondei; {'closed': True} pentru tab-uri dispărute, {'error': ...} dacă sonda a eșuat"""
+    if targets is None:
+        targets = list_targets(address)
+    expression = _probe_expression()
+
+    def run(handle: str) -> Dict[str, Any]:
+        target = targets.get(target_id(handle))
+        if target is None:
+            return {"closed": True}
+        if not target.get("webSocketDebuggerUrl"):
+            return {"error": "tab fără webSocketDebuggerUrl (DevTools deschis pe el?)",
+                    "url": target.get("url", ""), "title": target.get("title", "")}
+        try:
+            return evaluate(target["webSocketDebuggerUrl"], expression) or {"error": "rezultat gol"}
+        except Exception as e:
+            return {"error": str(e) or type(e).__name__, "url": target.get("url", ""), "title": target.get("title", "")}
+
+    handles = list(handles)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(handles) or 1))) as pool:
+        return dict(zip(handles, pool.map(run, handles)))
+
+
+def filename_from_probe(probe: Dict[str, Any]) -> str:
+    """Ca extract_filename_from_xml: din XML-ul erorii, altfel din titlul paginii"""
+    match = UPLOAD_OF_RE.search(probe.get("error_details", ""))
+    if match:
+        return match.group(1)
+    title = probe.get("title", "")
+    if title and title != UPLOAD_PAGE_TITLE:
+        return title
+    return "fisier-necunoscut"
+
+
+def classify_probe(probe: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """Eroarea din sondă ({error_code, error_status, error_details, filename}) sau None"""
+    title = probe.get("title", "")
+    if any(pattern in title.lower() for pattern in MEMORY_ERROR_TITLES):
+        return {"error_code": "OUT_OF_MEMORY", "error_status": "Chrome memory exhausted",
+                "error_details": "Browser ran out of memory, needs restart", "filename": "memory-error-detected"}
+
+    # Pagina însăși e o pagină de eroare HTTP (titlul, nu orice text din pagină)
+    title_code = ERROR_CODE_RE.search(title)
+    if title_code and UPLOAD_PAGE_TITLE not in title:
+        return {"error_code": title_code.group(1), "error_status": title,
+                "error_details": f"Pagină de eroare: {title}", "filename": filename_from_probe(probe)}
+
+    details = probe.get("error_details", "")
+    for found in probe.get("visible_errors", []):
+        code = ERROR_CODE_RE.search(found["text"])
+        if code:
+            return {"error_code": code.group(1), "error_status": probe.get("error_status") or found["text"][:200],
+                    "error_details": details or f"Error found in {found['selector']}: {found['text']}",
+                    "filename": filename_from_probe(probe)}
+
+    if probe.get("overlay_visible") and probe.get("error_code") in ERROR_CODES:
+        return {"error_code": probe["error_code"], "error_status": probe.get("error_status", ""),
+                "error_details": details or "Eroare detectată din overlay_alert", "filename": filename_from_probe(probe)}
+    return None
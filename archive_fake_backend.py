@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Backend de upload fals și arhivă sintetică, pentru măsurarea buclei ArchiveUploader offline.
+
+Bucla completă (run -> process_folder -> process_single_unit -> upload) cerea
+Chrome real și upload-uri reale, deci schimbările de scanare, stare sau pauze
+nu se puteau măsura. Aici:
+- FakeUploadBackend.upload_item(): aceeași semnătură și același rezultat ca
+  IAS3Uploader.upload_item, cu timp de transfer simulat (overhead per item +
+  MB / mb_per_second) și erori injectate (SlowDown 503, BadContent 400, rețea)
+  în formatul IAS3Error, ca să treacă prin aceeași cale de reîncercare
+- generate_archive(): arbore autor/carte ca g:\\ARHIVA\\C - PDF-uri valide
+  structural (trec de archive_file_validator.py), EPUB, DJVU, MOBI/DOCX
+  (unități fără PDF, mutate în d:\\3), JPG/PNG ignorate, mărimi log-normale,
+  o fracțiune configurabilă de PDF-uri trunchiate (oprite de validare) și de
+  PDF-uri criptate cu object stream-uri (care trebuie să treacă de validare)
+
+Uploader-ul folosește backend-ul cu ArchiveUploader(backend="fake") - nu și din
+linia de comandă, ca o rulare simulată să nu marcheze unități reale ca încărcate.
+benchmark_uploader_loop.py generează arhiva, rulează bucla și raportează
+unități/oră și timpul pe etape.
+
+Folosire:
+    python archive_fake_backend.py generate D:\\tmp\\arhiva --authors 20 --books 5 --median-mb 2
+"""
+
+import argparse
+import io
+import math
+import random
+import sys
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from archive_identifier_predictor import identifier_from_title
+
+FAKE_MB_PER_SECOND = 20.0        # Transferul simulat
+FAKE_ITEM_OVERHEAD = 0.5         # Secunde per upload (formular, metadate, verificări)
+FAKE_FAILURE_RATE = 0.0          # Fracțiunea de upload-uri eșuate
+# (cod HTTP, cod S3, mesaj) - ca răspunsurile archive.org văzute în rapoartele de erori
+FAKE_FAILURES = [
+    ("503", "SlowDown", "Please reduce your request rate."),
+    ("400", "BadContent", "The uploaded content is not acceptable."),
+    ("NETWORK", "", "net::ERR_CONNECTION_RESET"),
+]
+
+AUTHOR_FIRST = ['Ion', 'Maria', 'Radu', 'Ana', 'Dan', 'Elena', 'Mihai', 'Ioana', 'Vlad', 'Carmen']
+AUTHOR_LAST = ['Popescu', 'Ionescu', 'Dumitrescu', 'Stanescu', 'Vasilescu', 'Georgescu', 'Marin',
+               'Constantinescu', 'Preda', 'Munteanu', 'Eliade', 'Noica']
+TITLE_WORDS = ['umbra', 'cetatii', 'pierdute', 'jurnal', 'calatorie', 'ultimul', 'anotimp', 'cronica',
+               'tacerii', 'noptii', 'arhipelag', 'memorii', 'oglinda', 'vanatorii', 'istoria', 'filozofia']
+TECH_SUFFIXES = ['', '', '', ' - ctrl', ' - retail', ' - scan']
+EXTRA_EXTENSIONS = ['.epub', '.djvu', '.jpg', '.png']   # Pe lângă PDF, în unitățile de upload
+NO_PDF_EXTENSIONS = ['.mobi', '.docx', '.epub']         # Unități fără PDF (mutare în d:\3)
+
+
+class FakeUploadBackend:
+    """Înlocuitor pentru IAS3Uploader: timp de transfer simulat și erori injectate, fără rețea"""
+
+    def __init__(self, mb_per_second: float = FAKE_MB_PER_SECOND, item_overhead: float = FAKE_ITEM_OVERHEAD,
+                 failure_rate: float = FAKE_FAILURE_RATE, failures: Optional[List[Tuple[str, str, str]]] = None,
+                 seed: Optional[int] = None):
+        self.mb_per_second = mb_per_second
+        self.item_overhead = item_overhead
+        self.failure_rate = failure_rate
+        self.failures = failures or FAKE_FAILURES
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()  # Planificatorul IAS3 poate chema upload_item din mai multe thread-uri
+        self.uploads = 0
+        self.failed = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def describe(self) -> str:
+        return (f"{self.mb_per_second:g} MB/s, {self.item_overhead:g}s per item, "
+                f"{self.failure_rate:.0%} erori injectate")
+
+    def transfer_seconds(self, size: int) -> float:
+        return self.item_overhead + size / (1024 * 1024) / self.mb_per_second if self.mb_per_second > 0 else self.item_overhead
+
+    def upload_item(self, files: List[Path], metadata: Dict[str, Any], **_: Any) -> Dict[str, Any]:
+        """Ca IAS3Uploader.upload_item: {success, identifier, bytes, seconds, error}"""
+        size = sum(f.stat().st_size for f in files if f.exists())
+        with self.lock:
+            fails = self.rng.random() < self.failure_rate
+            failure = self.rng.choice(self.failures) if fails else None
+            # Un upload eșuat se oprește undeva pe parcurs
+            fraction = self.rng.uniform(0.1, 0.9) if fails else 1.0
+        seconds = self.transfer_seconds(size) * fraction
+        time.sleep(seconds)
+
+        result = {"success": not fails, "identifier": identifier_from_title(metadata.get("title", "")),
+                  "bytes": size if not fails else int(size * fraction), "seconds": seconds, "error": ""}
+        if failure:
+            status, code, message = failure
+            # Formatul IAS3Error ("HTTP 503: SlowDown ...") - clasificat la fel de archive_retry.py
+            result["error"] = f"HTTP {status}: {code} {message}".strip() if status.isdigit() else message
+        with self.lock:
+            self.uploads += 1
+            self.failed += bool(fails)
+            self.bytes += result["bytes"]
+            self.seconds += seconds
+        return result
+
+    def summary(self) -> str:
+        mb = self.bytes / (1024 * 1024)
+        return (f"🧪 Backend fals: {self.uploads} upload-uri ({self.failed} eșuate), {mb:.1f} MB "
+                f"în {self.seconds:.1f}s simulate")
+
+
+# ---------- arhiva sintetică ----------
+
+def pdf_bytes(size: int, pages: int = 1) -> bytes:
+    """PDF minim, valid structural (catalog, arbore de pagini, xref corect), umplut până la ~size octeți"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>",
+               b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % (4 + i) for i in range(pages))
+               + b"] /Count %d >>" % pages]
+    padding = max(0, size - 400 - 80 * pages)
+    objects.append(b"<< /Length %d >>\nstream\n" % padding + b"\0" * padding + b"\nendstream")
+    objects += [b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>"] * pages
+    return _pdf_file(objects, b"/Root 1 0 R")
+
+
+def encrypted_pdf_bytes(size: int, rng: random.Random) -> bytes:
+    """Ca un ebook "securizat" (parolă de utilizator goală): catalogul și arborele de pagini sunt într-un
+    object stream criptat, deci nu se pot decomprima fără cheie - trebuie să treacă totuși de validare"""
+    encrypted = rng.randbytes(2048)
+    padding = max(0, size - 2048 - 600)
+    objects = [b"<< /Type /ObjStm /N 2 /First 10 /Filter /FlateDecode /Length %d >>\nstream\n" % len(encrypted)
+               + encrypted + b"\nendstream",
+               b"<< /Filter /Standard /V 4 /R 4 /Length 128 /P -1036 >>",
+               b"<< /Length %d >>\nstream\n" % padding + b"\0" * padding + b"\nendstream"]
+    return _pdf_file(objects, b"/Root 4 0 R /Encrypt 2 0 R")
+
+
+def _pdf_file(objects: List[bytes], trailer: bytes) -> bytes:
+    """Obiectele numerotate de la 1, tabela xref cu offset-urile lor, trailer, startxref, %%EOF"""
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d %s >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, trailer, xref))
+    return out.getvalue()
+
+
+def epub_bytes(size: int) -> bytes:
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, 'w') as archive:
+        archive.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        archive.writestr("META-INF/container.xml",
+                         '<?xml version="1.0"?><container version="1.0" '
+                         'xmlns="urn:oasis:names:tc:opendocument:xmlns:container"><rootfiles>'
+                         '<rootfile full-path="content.opf" media-type="application/oebps-package+xml"/>'
+                         '</rootfiles></container>')
+        archive.writestr("content.xhtml", b"\0" * max(0, size - 600), compress_type=zipfile.ZIP_STORED)
+    return out.getvalue()
+
+
+def djvu_bytes(size: int) -> bytes:
+    size = max(size, 32)
+    return b"AT&TFORM" + (size - 12).to_bytes(4, 'big') + b"DJVU" + b"\0" * (size - 16)
+
+
+def write_file(path: Path, ext: str, size: int, truncated: bool = False, rng: Optional[random.Random] = None):
+    """Fișier de tipul dat, ~size octeți; truncated=True taie finalul (fără %%EOF, ca la o copiere întreruptă)"""
+    if ext == '.pdf' and rng:
+        path.write_bytes(encrypted_pdf_bytes(size, rng))
+    elif ext == '.pdf':
+        path.write_bytes(pdf_bytes(size))
+    elif ext == '.epub':
+        path.write_bytes(epub_bytes(size))
+    elif ext == '.djvu':
+        path.write_bytes(djvu_bytes(size))
+    else:
+        with open(path, 'wb') as f:
+            f.truncate(size)
+    if truncated:
+        with open(path, 'r+b') as f:
+            f.truncate(max(1, int(path.stat().st_size * 0.6)))
+
+
+def file_size(rng: random.Random, median_mb: float, max_mb: float) -> int:
+    """Mărimi log-normale: multe cărți mici, câteva foarte mari (ca arhiva reală)"""
+    mb = min(max_mb, rng.lognormvariate(math.log(max(median_mb, 0.01)), 1.0))
+    return max(2048, int(mb * 1024 * 1024))
+
+
+def generate_archive(root: Path, authors: int = 20, books: int = 5, median_mb: float = 2.0,
+                     max_mb: float = 50.0, no_pdf_ratio: float = 0.15, corrupt_ratio: float = 0.02,
+                     seed: int = 1, encrypted_ratio: float = 0.05) -> Dict[str, Any]:
+    """Arbore autor/carte sub root; întoarce numărul de foldere, unități, fișiere și octeți"""
+    rng = random.Random(seed)
+    stats = {"folders": 0, "units": 0, "upload_units": 0, "files": 0, "bytes": 0, "corrupt": 0, "encrypted": 0}
+    root.mkdir(parents=True, exist_ok=True)
+    for a in range(authors):
+        author = f"{rng.choice(AUTHOR_LAST)}, {rng.choice(AUTHOR_FIRST)} {a + 1}"
+        author_dir = root / author
+        author_dir.mkdir(exist_ok=True)
+        stats["folders"] += 1
+        for b in range(books):
+            title = " ".join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(2, 4))).capitalize()
+            # O parte din cărți stau direct în folderul autorului, restul în subfoldere (ca arhiva reală)
+            book_dir = author_dir if b == 0 and rng.random() < 0.3 else author_dir / f"{title} {b + 1}"
+            book_dir.mkdir(exist_ok=True)
+            base = f"{author} - {title}{rng.choice(TECH_SUFFIXES)}"
+            if rng.random() < no_pdf_ratio:
+                files = [(base, rng.choice(NO_PDF_EXTENSIONS))]
+            else:
+                files = [(base, '.pdf')] + [(base, ext) for ext in EXTRA_EXTENSIONS if rng.random() < 0.3]
+                stats["upload_units"] += 1
+            for name, ext in files:
+                path = book_dir / f"{name}{ext}"
+                if path.exists():
+                    continue
+                corrupt = ext == '.pdf' and rng.random() < corrupt_ratio
+                encrypted = ext == '.pdf' and not corrupt and rng.random() < encrypted_ratio
+                size = file_size(rng, median_mb, max_mb) if ext in ('.pdf', '.djvu') else rng.randint(20, 400) * 1024
+                write_file(path, ext, size, truncated=corrupt, rng=rng if encrypted else None)
+                stats["files"] += 1
+                stats["bytes"] += path.stat().st_size
+                stats["corrupt"] += corrupt
+                stats["encrypted"] += encrypted
+            stats["units"] += 1
+    return stats
+
+
+def main():
+    """Funcția principală"""
+    parser = argparse.ArgumentParser(description="Arhivă sintetică pentru backend-ul de upload fals")
+    sub = parser.add_subparsers(dest="command")
+    gen = sub.add_parser("generate", help="Generează un arbore autor/carte")
+    gen.add_argument("root")
+    gen.add_argument("--authors", type=int, default=20)
+    gen.add_argument("--books", type=int, default=5, help="Cărți per autor")
+    gen.add_argument("--median-mb", type=float, default=2.0)
+    gen.add_argument("--max-mb", type=float, default=50.0)
+    gen.add_argument("--no-pdf-ratio", type=float, default=0.15)
+    gen.add_argument("--corrupt-ratio", type=float, default=0.02)
+    gen.add_argument("--encrypted-ratio", type=float, default=0.05, help="PDF-uri criptate cu object stream-uri")
+    gen.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.command != "generate":
+        parser.print_help()
+        return 0
+    started = time.perf_counter()
+    stats = generate_archive(Path(args.root), args.authors, args.books, args.median_mb, args.max_mb,
+                             args.no_pdf_ratio, args.corrupt_ratio, args.seed, args.encrypted_ratio)
+    print(f"📚 {stats['folders']} foldere, {stats['units']} unități ({stats['upload_units']} cu PDF), "
+          f"{stats['files']} fișiere, {stats['bytes'] / 1024 ** 2:.1f} MB, {stats['corrupt']} PDF-uri trunchiate, {stats['encrypted']} criptate "
+          f"în {time.perf_counter() - started:.1f}s -> {args.root}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Index de nume de fișiere construit o singură dată per rulare.
+
+Înlocuiește scanarea completă (os.walk + difflib pe fiecare fișier) făcută
+pentru fiecare eroare în `find_original_file_for_error`:
+- cheie normalizată (normalize_filename_for_matching) -> căi, pentru potrivirea exactă
+- postings de trigrame -> chei, pentru fallback-ul fuzzy; difflib rulează doar pe
+  cei mai apropiați candidați, cu același threshold (0.6)
+
+Folosire:
+    index = FileNameIndex(uploader.normalize_filename_for_matching).build(folders)
+    candidates = index.find(normalized_error)
+"""
+
+import difflib
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Set
+
+INDEX_EXTENSIONS = ['.pdf', '.epub', '.mobi', '.djvu', '.docx', '.doc']
+SIMILARITY_THRESHOLD = 0.6
+MAX_FUZZY_CANDIDATES = 50  # Chei verificate cu difflib după clasamentul pe trigrame
+
+
+def trigrams(key: str) -> Set[str]:
+    """Trigramele unei chei (cheile scurte sunt propria lor trigramă)"""
+    if len(key) < 3:
+        return {key} if key else set()
+    return {key[i:i + 3] for i in range(len(key) - 2)}
+
+
+class FileNameIndex:
+    """Cheie normalizată -> fișiere, cu postings de trigrame pentru căutarea fuzzy"""
+
+    def __init__(self, normalize: Callable[[str], str], extensions: List[str] = INDEX_EXTENSIONS):
+        self.normalize = normalize
+        self.extensions = set(extensions)
+        self.keys: List[str] = []
+        self.key_ids: Dict[str, int] = {}
+        self.paths: Dict[str, List[Path]] = {}
+        self.postings: Dict[str, Set[int]] = {}
+        self.key_trigrams: List[Set[str]] = []
+        self.files = 0
+        self.build_seconds = 0.0
+
+    def add(self, file_path: Path):
+        """Adaugă un fișier în index (ordinea de adăugare decide la egalitate de scor)"""
+        key = self.normalize(file_path.name)
+        if key not in self.key_ids:
+            key_id = len(self.keys)
+            self.keys.append(key)
+            self.key_ids[key] = key_id
+            self.paths[key] = []
+            grams = trigrams(key)
+            self.key_trigrams.append(grams)
+            for gram in grams:
+                self.postings.setdefault(gram, set()).add(key_id)
+        self.paths[key].append(file_path)
+        self.files += 1
+
+    def build(self, folders: List[Path]) -> "FileNameIndex":
+        """Parcurge o singură dată folderele; subfolderele deja indexate nu se reiau"""
+        started = time.time()
+        walked: Set[Path] = set()
+        seen: Set[Path] = set()
+
+        for folder_path in folders:
+            if folder_path in walked or not folder_path.exists():
+                continue
+            try:
+                for root, dirs, files in os.walk(folder_path):
+                    root_path = Path(root)
+                    # Folderele procesate sunt în ARHIVA - nu le mai parcurgem a doua oară
+                    dirs[:] = [d for d in dirs if root_path / d not in walked]
+                    for file in files:
+                        file_path = root_path / file
+                        if file_path.suffix.lower() in self.extensions and file_path not in seen:
+                            seen.add(file_path)
+                            self.add(file_path)
+                walked.add(folder_path)
+            except Exception as e:
+                print(f"   ⚠️ Eroare la indexarea folderului {folder_path}: {e}")
+
+        self.build_seconds = time.time() - started
+        return self
+
+    def find(self, normalized_name: str, threshold: float = SIMILARITY_THRESHOLD) -> List[Dict]:
+        """Candidații cu similaritate > threshold, sortați descrescător (ca varianta cu difflib)"""
+        if normalized_name in self.key_ids:
+            return [{'path': path, 'similarity': 1.0, 'normalized_name': normalized_name}
+                    for path in self.paths[normalized_name]]
+
+        # Clasează cheile după coeficientul Dice pe trigrame, apoi difflib doar pe primele
+        query_grams = trigrams(normalized_name)
+        shared: Dict[int, int] = {}
+        for gram in query_grams:
+            for key_id in self.postings.get(gram, ()):
+                shared[key_id] = shared.get(key_id, 0) + 1
+
+        ranked = sorted(shared, key=lambda k: (-2.0 * shared[k] / (len(query_grams) + len(self.key_trigrams[k])), k))
+
+        candidates = []
+        # Aceeași orientare (a=eroare, b=fișier) ca apelul original difflib
+        matcher = difflib.SequenceMatcher(None, normalized_name)
+        for key_id in ranked[:MAX_FUZZY_CANDIDATES]:
+            key = self.keys[key_id]
+            matcher.set_seq2(key)
+            similarity = matcher.ratio()
+            if similarity > threshold:
+                for path in self.paths[key]:
+                    candidates.append({'path': path, 'similarity': similarity, 'normalized_name': key,
+                                       'order': key_id})
+
+        candidates.sort(key=lambda c: (-c['similarity'], c['order']))
+        for candidate in candidates:
+            del candidate['order']
+        return candidates
+
+    def summary(self) -> str:
+        """Linie de raport despre index"""
+        return (f"🗂️ Index nume fișiere: {self.files} fișiere, {len(self.keys)} chei, "
+                f"{len(self.postings)} trigrame ({self.build_seconds:.1f}s)")
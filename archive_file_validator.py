@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Validarea fișierelor înainte de upload, în paralel (ProcessPoolExecutor).
+
+Un PDF corupt sau trunchiat se vedea abia după upload-ul complet: eroare
+BadContent sau derive eșuat, bandă și un tab irosite, apoi
+copy_error_files_to_temp îl copia în g:\\TEMP. Aici fiecare PDF/EPUB/DJVU
+e verificat structural înainte să plece vreun octet:
+- PDF: antet %PDF-, %%EOF la final (trunchiere), startxref care indică o
+  tabelă xref/un obiect, arborele de pagini (/Type /Pages cu /Count > 0,
+  căutat și în object stream-urile comprimate; la PDF-urile criptate cu
+  object stream-uri arborele nu se poate citi - doar avertisment)
+- EPUB: arhivă ZIP cu CRC-uri corecte, mimetype și META-INF/container.xml
+- DJVU: antet AT&TFORM cu lungimea declarată <= mărimea fișierului
+- orice fișier: mărime minimă
+
+Rezultatele se păstrează în VALIDATION_CACHE_FILE după (cale, mărime, mtime),
+deci un fișier neschimbat nu se mai citește la rularea următoare.
+
+Folosire:
+    validator = FileValidator()
+    results = validator.validate(paths)
+    if not results[str(path)]["valid"]:
+        print(results[str(path)]["errors"])
+"""
+
+import json
+import mmap
+import os
+import re
+import sys
+import time
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+VALIDATION_CACHE_FILE = "file_validation_cache.json"
+VALIDATOR_VERSION = 2            # Crește la schimbarea regulilor - rezultatele vechi din cache se refac
+VALIDATION_WORKERS = max(1, min(8, (os.cpu_count() or 2) - 1))
+VALIDATED_EXTENSIONS = ['.pdf', '.epub', '.djvu']
+MIN_FILE_SIZE = 1024             # Sub 1 KB nu e o carte
+PDF_HEADER_WINDOW = 1024         # %PDF- poate fi precedat de câțiva octeți
+PDF_TAIL_WINDOW = 4096           # %%EOF + startxref în ultimii octeți
+MAX_OBJSTM_BYTES = 4 * 1024 * 1024
+
+PDF_HEADER_RE = re.compile(rb'%PDF-(\d\.\d)')
+STARTXREF_RE = re.compile(rb'startxref\s+(\d+)')
+PAGES_RE = re.compile(rb'/Type\s*/Pages\b')
+COUNT_RE = re.compile(rb'/Count\s+(\d+)')
+OBJSTM_RE = re.compile(rb'/Type\s*/ObjStm\b')
+ENCRYPT_RE = re.compile(rb'/Encrypt\b')
+STREAM_RE = re.compile(rb'stream\r?\n')
+XREF_TARGET_RE = re.compile(rb'\s*(xref|\d+\s+\d+\s+obj)')
+DJVU_FORMS = (b'DJVU', b'DJVM')
+
+
+def _result(size: int, errors: List[str], warnings: List[str], details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return {"valid": not errors, "size": size, "errors": errors, "warnings": warnings, "details": details or {}}
+
+
+def _page_counts(data: Any) -> List[int]:
+    """/Count din dicționarele /Type /Pages dintr-un bloc de octeți"""
+    counts = []
+    for match in PAGES_RE.finditer(data):
+        start = data.rfind(b'<<', 0, match.start())
+        end = data.find(b'>>', match.end())
+        window = data[max(start, 0):end if end != -1 else match.end() + 200]
+        count = COUNT_RE.search(window)
+        if count:
+            counts.append(int(count.group(1)))
+    return counts
+
+
+def _objstm_page_counts(data: Any) -> Tuple[List[int], int]:
+    """Arborele de pagini din object stream-urile comprimate (PDF 1.5+); și câte stream-uri nu s-au putut decomprima"""
+    counts = []
+    undecoded = 0
+    for match in OBJSTM_RE.finditer(data):
+        stream = STREAM_RE.search(data, match.end(), match.end() + 2048)
+        if not stream:
+            continue
+        try:
+            decompressor = zlib.decompressobj()
+            content = decompressor.decompress(data[stream.end():stream.end() + MAX_OBJSTM_BYTES], MAX_OBJSTM_BYTES)
+        except zlib.error:
+            undecoded += 1  # Criptat (RC4/AES) sau alt filtru decât Flate
+            continue
+        counts.extend(_page_counts(content))
+        if counts:
+            break
+    return counts, undecoded
+
+
+def _is_encrypted(data: Any, xref_offset: Optional[int]) -> bool:
+    """/Encrypt în trailer: la final, în dicționarul xref stream-ului de la startxref sau la început (liniarizat)"""
+    windows = [data[-PDF_TAIL_WINDOW:], data[:PDF_TAIL_WINDOW]]
+    if xref_offset is not None:
+        windows.append(data[xref_offset:xref_offset + PDF_TAIL_WINDOW])
+    return any(ENCRYPT_RE.search(window) for window in windows)
+
+
+def validate_pdf(path: Path, size: int) -> Dict[str, Any]:
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return _validate_pdf_data(data, size)
+
+
+def _validate_pdf_data(data: Any, size: int) -> Dict[str, Any]:
+    """Regulile PDF pe conținutul mapat în memorie (fără copierea fișierelor mari)"""
+    errors: List[str] = []
+    warnings: List[str] = []
+    header = PDF_HEADER_RE.search(data[:PDF_HEADER_WINDOW])
+    if not header:
+        errors.append("antet %PDF- lipsă (nu e PDF sau început corupt)")
+    tail = data[-PDF_TAIL_WINDOW:]
+    if b'%%EOF' not in tail:
+        errors.append("%%EOF lipsă la final (fișier trunchiat)")
+
+    startxrefs = STARTXREF_RE.findall(tail)
+    xref_offset = None
+    if not startxrefs:
+        errors.append("startxref lipsă (tabela xref nu poate fi găsită)")
+    else:
+        offset = int(startxrefs[-1])
+        if offset >= size:
+            errors.append(f"startxref {offset} după sfârșitul fișierului ({size} octeți)")
+        else:
+            xref_offset = offset
+            if not XREF_TARGET_RE.match(data, offset):
+                warnings.append(f"startxref {offset} nu indică o tabelă xref (reparabil de cititoare)")
+
+    counts = _page_counts(data)
+    undecoded = 0
+    if not counts and OBJSTM_RE.search(data):
+        counts, undecoded = _objstm_page_counts(data)
+    encrypted = _is_encrypted(data, xref_offset)
+    if not counts and (encrypted or undecoded):
+        # Arborele de pagini e în object stream-uri criptate (ebook-uri "securizate"): nu se poate verifica fără cheie
+        reason = "PDF criptat" if encrypted else f"{undecoded} object stream-uri nedecomprimabile"
+        warnings.append(f"arborele de pagini nu poate fi verificat ({reason})")
+    elif not counts:
+        errors.append("arborele de pagini (/Type /Pages) lipsește")
+    elif max(counts) == 0:
+        errors.append("arborele de pagini are /Count 0")
+
+    details = {"version": header.group(1).decode() if header else "", "pages": max(counts) if counts else 0,
+               "encrypted": encrypted}
+    return _result(size, errors, warnings, details)
+
+
+def validate_epub(path: Path, size: int) -> Dict[str, Any]:
+    errors: List[str] = []
+    warnings: List[str] = []
+    try:
+        with zipfile.ZipFile(path) as archive:
+            names = archive.namelist()
+            broken = archive.testzip()
+            if broken:
+                errors.append(f"CRC greșit în arhivă: {broken}")
+            if "META-INF/container.xml" not in names:
+                errors.append("META-INF/container.xml lipsă")
+            if "mimetype" not in names:
+                warnings.append("fișierul mimetype lipsește")
+            elif archive.read("mimetype").strip() != b"application/epub+zip":
+                warnings.append("mimetype diferit de application/epub+zip")
+    except (zipfile.BadZipFile, EOFError, zlib.error) as e:
+        errors.append(f"arhivă ZIP coruptă: {e}")
+    return _result(size, errors, warnings)
+
+
+def validate_djvu(path: Path, size: int) -> Dict[str, Any]:
+    errors: List[str] = []
+    with open(path, 'rb') as f:
+        header = f.read(16)
+    if len(header) < 16 or header[:8] != b'AT&TFORM':
+        errors.append("antet AT&TFORM lipsă (nu e DJVU)")
+    else:
+        declared = int.from_bytes(header[8:12], 'big')
+        if header[12:16] not in DJVU_FORMS:
+            errors.append(f"formă DJVU necunoscută: {header[12:16]!r}")
+        if declared + 12 > size:
+            errors.append(f"trunchiat: {declared + 12} octeți declarați, {size} pe disc")
+    return _result(size, errors, [])
+
+
+VALIDATORS = {'.pdf': validate_pdf, '.epub': validate_epub, '.djvu': validate_djvu}
+
+
+def validate_file(path: str) -> Dict[str, Any]:
+    """Validează un fișier (funcție de nivel modul, ca să poată rula în procesele din pool)"""
+    file_path = Path(path)
+    try:
+        size = file_path.stat().st_size
+        if size < MIN_FILE_SIZE:
+            return _result(size, [f"prea mic ({size} octeți)"], [])
+        validator = VALIDATORS.get(file_path.suffix.lower())
+        return validator(file_path, size) if validator else _result(size, [], [])
+    except OSError as e:
+        return _result(0, [f"nu poate fi citit: {e}"], [])
+
+
+class FileValidator:
+    """Validare în paralel cu cache persistent după (cale, mărime, mtime)"""
+
+    def __init__(self, cache_file: Optional[str] = VALIDATION_CACHE_FILE, workers: int = VALIDATION_WORKERS):
+        self.cache_file = cache_file
+        self.workers = max(1, workers)
+        self.cache: Dict[str, Dict[str, Any]] = self._load_cache()
+        self.checked = 0
+        self.cache_hits = 0
+        self.seconds = 0.0
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                loaded = json.load(f)
+            return loaded.get("files", {}) if loaded.get("version") == VALIDATOR_VERSION else {}
+        except Exception as e:
+            print(f"⚠ Cache-ul de validare nu poate fi citit ({e}) - validez din nou")
+            return {}
+
+    def _save_cache(self):
+        if not self.cache_file:
+            return
+        temp_file = f"{self.cache_file}.tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump({"version": VALIDATOR_VERSION, "files": self.cache}, f, ensure_ascii=False)
+            os.replace(temp_file, self.cache_file)
+        except Exception as e:
+            print(f"⚠ Nu am putut salva cache-ul de validare: {e}")
+
+    @staticmethod
+    def _fingerprint(path: Path) -> Optional[Dict[str, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _run(self, paths: List[str]) -> List[Dict[str, Any]]:
+        if len(paths) == 1 or self.workers == 1:
+            return [validate_file(p) for p in paths]
+        try:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(paths))) as pool:
+                return list(pool.map(validate_file, paths, chunksize=4))
+        except (BrokenProcessPool, OSError) as e:
+            print(f"⚠ Pool-ul de procese a eșuat ({e}) - validez în procesul curent")
+            return [validate_file(p) for p in paths]
+
+    def validate(self, paths: Iterable[Path]) -> Dict[str, Dict[str, Any]]:
+        """cale -> {valid, size, errors, warnings, details}; doar fișierele noi/schimbate se citesc"""
+        started = time.perf_counter()
+        results: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, Dict[str, int]] = {}
+        for path in paths:
+            key = str(path)
+            fingerprint = self._fingerprint(Path(path))
+            cached = self.cache.get(key)
+            if fingerprint and cached and cached["fingerprint"] == fingerprint:
+                results[key] = cached["result"]
+                self.cache_hits += 1
+            elif fingerprint:
+                pending[key] = fingerprint
+            else:
+                results[key] = _result(0, ["fișierul nu există"], [])
+
+        if pending:
+            keys = list(pending)
+            for key, result in zip(keys, self._run(keys)):
+                results[key] = result
+                self.cache[key] = {"fingerprint": pending[key], "result": result}
+            self.checked += len(keys)
+            self._save_cache()
+        self.seconds += time.perf_counter() - started
+        return results
+
+    def validate_units(self, units: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Validează fișierele tuturor unităților deodată; întoarce unitățile invalide (cu unit['invalid_files'])"""
+        paths = [f for unit in units for f in unit["all_files"] if f.suffix.lower() in VALIDATED_EXTENSIONS]
+        results = self.validate(paths)
+        invalid = []
+        for unit in units:
+            bad = [(f, results[str(f)]) for f in unit["all_files"]
+                   if str(f) in results and not results[str(f)]["valid"]]
+            if bad:
+                unit["invalid_files"] = bad
+                invalid.append(unit)
+        return invalid
+
+    def summary(self) -> str:
+        return (f"🩺 Validare: {self.checked} fișiere citite, {self.cache_hits} din cache "
+                f"în {self.seconds:.1f}s ({self.workers} procese)")
+
+
+def main():
+    """Validează fișierele/folderele date (python archive_file_validator.py g:\\ARHIVA\\C)"""
+    targets = [Path(arg) for arg in sys.argv[1:]]
+    if not targets:
+        print(main.__doc__)
+        return 0
+    paths = []
+    for target in targets:
+        if target.is_dir():
+            paths.extend(p for p in target.rglob('*') if p.suffix.lower() in VALIDATED_EXTENSIONS)
+        else:
+            paths.append(target)
+
+    validator = FileValidator()
+    results = validator.validate(paths)
+    invalid = {path: r for path, r in results.items() if not r["valid"]}
+    for path, result in sorted(invalid.items()):
+        print(f"❌ {path}: {'; '.join(result['errors'])}")
+    print(f"\n📊 {len(results)} fișiere, {len(invalid)} invalide")
+    print(validator.summary())
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
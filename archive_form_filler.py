@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Completarea formularului de upload archive.org dintr-un singur script JS.
+
+În loc de zeci de apeluri WebDriver per item (click pe #description, #subjects,
+#date_text, switch în iframe, execute_script separat pentru date_month/date_day,
+cinci execute_script la fiecare verificare), un singur execute_async_script:
+- citește titlul completat de uploader (#page_title)
+- activează și completează description (editorul din iframe sau din pagină),
+  subjects, date (1983-12-13) și collection (texts:opensource)
+- trimite evenimentele input/change/blur pe care le ascultă pagina
+- întoarce un obiect de verificare cu valorile citite înapoi din DOM
+
+Dacă un câmp nu apare în FORM_SCRIPT_TIMEOUT, rezultatul are ok=False și
+fill_form_fields continuă cu completarea pas cu pas.
+
+Folosire:
+    result = fill_form_script(driver, "Autor - Titlu")
+    if result["ok"]:
+        ...  # direct la butonul de upload
+"""
+
+import time
+from typing import Any, Dict, List
+
+from archive_ias3 import FORM_COLLECTION, FORM_DATE, FORM_MEDIATYPE
+
+FORM_SCRIPT_TIMEOUT = 3.0          # Secunde în care editoarele trebuie să apară după activare
+FORM_FIELDS = ("description", "subjects", "date", "collection")
+
+FILL_AND_VERIFY_JS = r"""
+var fallbackTitle = arguments[0], date = arguments[1], collection = arguments[2],
+    timeoutMs = arguments[3], done = arguments[arguments.length - 1];
+var started = Date.now();
+
+function fire(el, names) {
+    names.forEach(function (name) { el.dispatchEvent(new Event(name, { bubbles: true })); });
+}
+function enable(el) {
+    el.disabled = false;
+    el.readOnly = false;
+    el.classList.remove('disabled');
+    el.removeAttribute('disabled');
+    el.removeAttribute('readonly');
+}
+function setValue(el, value) {
+    enable(el);
+    el.focus();
+    el.value = value;
+    fire(el, ['input', 'change', 'blur']);
+    return el.value;
+}
+function activate(selector) {
+    var el = document.querySelector(selector);
+    if (el) { el.click(); }
+    return !!el;
+}
+// Așteaptă un element fără să țină ocupat WebDriver-ul (totul rămâne un singur apel)
+function waitFor(find, callback) {
+    var found = null;
+    try { found = find(); } catch (e) { found = null; }
+    if (found) { return callback(found); }
+    if (Date.now() - started > timeoutMs) { return callback(null); }
+    setTimeout(function () { waitFor(find, callback); }, 25);
+}
+function editorBody() {
+    var frames = document.querySelectorAll('iframe');
+    for (var i = 0; i < frames.length; i++) {
+        try {
+            var body = frames[i].contentDocument && frames[i].contentDocument.querySelector('body.wysiwyg');
+            if (body) { return body; }
+        } catch (e) { /* iframe din alt domeniu */ }
+    }
+    return document.querySelector('body.wysiwyg');
+}
+function subjectsInput() {
+    var input = document.querySelector("input[placeholder*='Add keywords'], input.input_field");
+    if (input) { return input; }
+    var inputs = document.querySelectorAll('input');
+    for (var i = 0; i < inputs.length; i++) {
+        var ph = (inputs[i].getAttribute('placeholder') || '').toLowerCase();
+        if (ph.indexOf('keywords') >= 0 || ph.indexOf('tags') >= 0) { return inputs[i]; }
+    }
+    return null;
+}
+
+var titleEl = document.querySelector('#page_title, span.mdata_value.edit_text.required.x-archive-meta-title');
+var title = (titleEl && ((titleEl.textContent || '').trim() || titleEl.getAttribute('title'))) || fallbackTitle;
+var parts = date.split('-');
+var result = { title: title, description: '', subjects: '', year: '', month: '', day: '', collection: '' };
+
+activate('#description, span#description');
+waitFor(editorBody, function (body) {
+    if (body) {
+        body.innerText = title;
+        fire(body, ['input', 'keyup']);
+        result.description = (body.innerText || '').trim();
+    }
+    activate('#subjects, span#subjects');
+    waitFor(subjectsInput, function (input) {
+        if (input) { result.subjects = setValue(input, title); }
+        activate('#date_text, span#date_text');
+        waitFor(function () { return document.getElementById('date_year'); }, function (year) {
+            var month = document.getElementById('date_month'), day = document.getElementById('date_day');
+            if (year && month && day) {
+                result.year = setValue(year, parts[0]);
+                result.month = setValue(month, parts[1]);
+                result.day = setValue(day, parts[2]);
+            }
+            var select = document.querySelector('select.mediatypecollection, select[name="mediatypecollection"]');
+            if (select) {
+                select.value = collection;
+                fire(select, ['change']);
+                result.collection = select.value;
+            }
+            result.elapsed_ms = Date.now() - started;
+            done(result);
+        });
+    });
+});
+"""
+
+
+def verify_form_values(values: Dict[str, Any], title: str) -> Dict[str, bool]:
+    """Câmp -> completat corect, din valorile citite înapoi din DOM"""
+    year, month, day = FORM_DATE.split('-')
+    return {
+        "description": bool(values.get("description")) and values.get("description") == title.strip(),
+        "subjects": bool(values.get("subjects")),
+        "date": (values.get("year"), values.get("month"), values.get("day")) == (year, month, day),
+        "collection": values.get("collection") == f"{FORM_MEDIATYPE}:{FORM_COLLECTION}",
+    }
+
+
+def missing_fields(result: Dict[str, Any]) -> List[str]:
+    """Câmpurile pe care scriptul nu le-a putut completa"""
+    return [field for field in FORM_FIELDS if not result.get("fields", {}).get(field)]
+
+
+def fill_form_script(driver, fallback_title: str, timeout: float = FORM_SCRIPT_TIMEOUT) -> Dict[str, Any]:
+    """Completează și verifică formularul într-un singur apel; ok=False dacă trebuie fallback"""
+    started = time.perf_counter()
+    try:
+        driver.set_script_timeout(timeout + 2)
+        values = driver.execute_async_script(
+            FILL_AND_VERIFY_JS, fallback_title, FORM_DATE, f"{FORM_MEDIATYPE}:{FORM_COLLECTION}",
+            int(timeout * 1000)) or {}
+        error = ""
+    except Exception as e:
+        values, error = {}, str(e).splitlines()[0] if str(e) else type(e).__name__
+
+    title = values.get("title") or fallback_title
+    fields = verify_form_values(values, title)
+    return {
+        "ok": not error and all(fields.values()),
+        "title": title,
+        "fields": fields,
+        "values": values,
+        "seconds": time.perf_counter() - started,
+        "error": error,
+    }
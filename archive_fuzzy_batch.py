@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scor fuzzy agresiv calculat în lot (rapidfuzz.process.cpdist/cdist + NumPy).
+
+Reproduce exact `calculate_aggressive_fuzzy_relevance` din scanerul agresiv
+(`Cauta fisierele 3/++FINAL 1 BUN ...py`), dar pentru tot folderul deodată:
+un lot per strategie (12 documente) era prea mic - costul apelurilor cdist și
+al indexării NumPy per document depășea câștigul (0.84x față de scorarea per
+document). Aici, pentru toate strategiile unui folder:
+- cele 4 scoruri (ratio, partial, token_sort, token_set) = câte un cpdist pe
+  toate perechile (interogare, document) ale folderului
+- potrivirea pe cuvinte = un singur cdist (cuvintele lungi ale tuturor
+  interogărilor × vocabularul titlurilor) și un produs de matrice cu incidența
+  cuvânt-document, în loc de câte un `process.extractOne` per cuvânt și document
+- titlurile repetate între strategii se curăță o singură dată
+
+Scorurile rămân identice la bit; timpul rămas e dominat de scorerele rapidfuzz
+(partial_ratio în special), așa că accelerarea e modestă (~1.35-1.4x, vezi
+benchmark_fuzzy_scoring.py).
+
+Folosire:
+    groups = [(query_words, [(title, creator), ...]), ...]   # câte unul per strategie
+    for scores in score_strategies(groups):
+        for score, details in scores:
+            ...
+"""
+
+import re
+from itertools import chain
+from typing import Dict, List, Tuple
+
+try:
+    import numpy as np
+    from rapidfuzz import fuzz
+    from rapidfuzz.process import cdist, cpdist
+    BATCH_AVAILABLE = True
+except ImportError:
+    BATCH_AVAILABLE = False
+
+NON_WORD_RE = re.compile(r'[^\w\s]')
+WORD_MATCH_CUTOFF = 60  # Același threshold ca extractOne din varianta originală
+
+
+def clean_text(text: str) -> str:
+    """Lowercase + semnele de punctuație înlocuite cu spații (ca în scorerul original)"""
+    return NON_WORD_RE.sub(' ', text.lower())
+
+
+def _word_matches(group_words: List[List[str]], owner: "np.ndarray",
+                  doc_words: List[List[str]]) -> "np.ndarray":
+    """Câte cuvinte (> 2 caractere) ale interogării au un cuvânt apropiat în fiecare document"""
+    matches = np.zeros(len(doc_words), dtype=np.float64)
+    long_words = sorted({word for words in group_words for word in words if len(word) > 2})
+    flat = list(chain.from_iterable(doc_words))
+    if not long_words or not flat:
+        return matches
+
+    vocabulary: Dict[str, int] = {}
+    columns = [vocabulary.setdefault(word, len(vocabulary)) for word in flat]
+    incidence = np.zeros((len(vocabulary), len(doc_words)), dtype=np.float64)
+    incidence[columns, np.repeat(np.arange(len(doc_words)), [len(words) for words in doc_words])] = 1
+
+    hits = cdist(long_words, list(vocabulary), scorer=fuzz.ratio, processor=None,
+                 score_cutoff=WORD_MATCH_CUTOFF, dtype=np.float64) >= WORD_MATCH_CUTOFF
+    found = (hits @ incidence) > 0  # cuvânt interogare × document
+
+    # De câte ori apare fiecare cuvânt lung în interogarea fiecărei strategii (extractOne rula per apariție)
+    position = {word: index for index, word in enumerate(long_words)}
+    counts = np.zeros((len(group_words), len(long_words)), dtype=np.float64)
+    for group, words in enumerate(group_words):
+        for word in words:
+            if len(word) > 2:
+                counts[group, position[word]] += 1
+    return (counts[owner] * found.T).sum(axis=1)
+
+
+def score_strategies(groups: List[Tuple[List[str], List[Tuple[str, str]]]]) -> List[List[Tuple[float, Dict[str, float]]]]:
+    """Pentru fiecare (cuvinte interogare, [(titlu, creator)]): lista de (scor final, detalii), în ordinea primită"""
+    queries = [clean_text(' '.join(query_words)) for query_words, _ in groups]
+    cleaned: Dict[str, str] = {}
+    pair_queries, titles, owner = [], [], []
+    for group, (_, docs) in enumerate(groups):
+        for title, creator in docs:
+            text = title + " " + creator
+            if text not in cleaned:
+                cleaned[text] = clean_text(text)
+            titles.append(cleaned[text])
+        pair_queries.extend([queries[group]] * len(docs))
+        owner.extend([group] * len(docs))
+    results: List[List[Tuple[float, Dict[str, float]]]] = [[] for _ in groups]
+    if not titles:
+        return results
+
+    # processor=None: textele sunt deja curățate, exact ca apelurile fuzz.* directe
+    ratio, partial, token_sort, token_set = (
+        cpdist(pair_queries, titles, scorer=scorer, processor=None, dtype=np.float64) / 100
+        for scorer in (fuzz.ratio, fuzz.partial_ratio, fuzz.token_sort_ratio, fuzz.token_set_ratio)
+    )
+
+    group_words = [query.split() for query in queries]
+    owner = np.array(owner)
+    query_lengths = np.array([len(words) for words in group_words], dtype=np.float64)[owner]
+    word_match = np.divide(_word_matches(group_words, owner, [title.split() for title in titles]), query_lengths,
+                           out=np.zeros(len(titles), dtype=np.float64), where=query_lengths > 0)
+
+    # Aceeași ordine a operațiilor ca în varianta originală => scoruri identice la bit
+    final = (
+        ratio * 0.15 +
+        partial * 0.35 +
+        token_sort * 0.25 +
+        token_set * 0.15 +
+        word_match * 0.1
+    )
+    final = np.where(partial > 0.8, final + 0.1, final)
+    final = np.where(token_set > 0.7, final + 0.05, final)
+    final = np.minimum(final, 1.0)
+
+    for values in zip(final.tolist(), ratio.tolist(), partial.tolist(), token_sort.tolist(),
+                      token_set.tolist(), word_match.tolist(), owner.tolist(), query_lengths.tolist()):
+        score, ratio_score, partial_score, token_sort_score, token_set_score, word_score, group, length = values
+        results[group].append((score, {
+            'ratio': ratio_score,
+            'partial': partial_score,
+            'token_sort': token_sort_score,
+            'token_set': token_set_score,
+            'word_match': word_score if length else 0
+        }))
+    return results
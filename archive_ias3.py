@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Upload direct prin API-ul S3 al archive.org (IAS3), fără Chrome și fără formular.
+
+Trimite aceleași metadate pe care fill_form_fields le completează în pagina de upload:
+- title: titlul completat automat de uploader (din primul fișier)
+- description, subject: același titlu
+- date: 1983-12-13
+- collection / mediatype: opensource / texts ("Community texts")
+
+Primul PUT creează item-ul (x-archive-auto-make-bucket) cu header-ele
+x-archive-meta-*; restul fișierelor se adaugă în același item. Derive-ul rulează
+o singură dată, după ultimul fișier.
+
+Fișierele mari (peste MULTIPART_THRESHOLD) merg prin multipart upload S3: ETag-ul
+fiecărei părți confirmate se salvează în ias3_multipart_state.json, iar după o
+întrerupere (crash, rețea) upload-ul se reia de la prima parte lipsă, cu același
+uploadId și același identifier. Primul PUT al unei încercări eșuate a creat deja
+item-ul, deci reîncercarea trebuie să primească identifier-ul ales atunci
+(on_identifier îl dă apelantului înaintea primului PUT) - altfel choose_identifier
+l-ar vedea ocupat și ar trece la <bază>_YYYYMM, cu un item dublat.
+
+Cu un BandwidthShaper (archive_bandwidth.py), corpul fiecărui PUT respectă
+plafonul global și pe cel per upload, modificabile din bandwidth_limits.json.
+
+Cheile S3 (https://archive.org/account/s3.php) se citesc din IA_ACCESS_KEY_ID /
+IA_SECRET_ACCESS_KEY sau din ia.ini (secțiunea [s3], ca la utilitarul `ia`).
+
+Folosire:
+    python archive_ias3.py "g:\\ARHIVA\\C\\Autor\\Titlu"            # upload real
+    python archive_ias3.py "g:\\ARHIVA\\C\\Autor\\Titlu" --mock     # contra mock-ului local
+"""
+
+import argparse
+import configparser
+import http.client
+import json
+import math
+import os
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlparse
+
+from archive_bandwidth import BandwidthShaper
+from archive_identifier_predictor import identifier_from_title, upload_order_first, upload_title_from_filename
+
+IAS3_ENDPOINT = "https://s3.us.archive.org"
+METADATA_URL = "https://archive.org/metadata"
+IA_CONFIG_FILES = [
+    Path.home() / ".config" / "internetarchive" / "ia.ini",
+    Path.home() / ".config" / "ia.ini",
+    Path.home() / ".ia",
+]
+
+# Valorile setate de fill_form_fields în formularul de upload
+FORM_DATE = "1983-12-13"
+FORM_COLLECTION = "opensource"
+FORM_MEDIATYPE = "texts"
+
+REQUEST_TIMEOUT = 120
+MAX_RETRIES = 3
+RETRY_STATUSES = {429, 500, 502, 503, 504}   # 503 SlowDown = archive.org cere încetinire
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+
+# Multipart: fișierele de 200+ MB durează 30+ minute, o întrerupere nu mai înseamnă reluare de la zero
+MULTIPART_THRESHOLD = 100 * 1024 * 1024
+MULTIPART_PART_SIZE = 32 * 1024 * 1024
+MULTIPART_STATE_FILE = "ias3_multipart_state.json"
+
+
+class IAS3Error(Exception):
+    """Eroare întoarsă de API-ul S3 archive.org"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
+
+def load_credentials() -> Optional[Tuple[str, str]]:
+    """(access, secret) din variabile de mediu sau ia.ini"""
+    access = os.environ.get("IA_ACCESS_KEY_ID")
+    secret = os.environ.get("IA_SECRET_ACCESS_KEY")
+    if access and secret:
+        return access, secret
+
+    for config_file in IA_CONFIG_FILES:
+        if not config_file.exists():
+            continue
+        config = configparser.ConfigParser()
+        try:
+            config.read(config_file, encoding='utf-8')
+        except configparser.Error as e:
+            print(f"⚠ Nu am putut citi {config_file}: {e}")
+            continue
+        if config.has_option("s3", "access") and config.has_option("s3", "secret"):
+            return config.get("s3", "access"), config.get("s3", "secret")
+    return None
+
+
+def retry_after_seconds(value: Optional[str], default: float) -> float:
+    """Retry-After în secunde: număr ("120") sau dată HTTP ("Wed, 21 Oct 2015 07:28:00 GMT"); altfel default"""
+    if not value:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return default
+        if when is None:
+            return default
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return max(0.0, seconds) if math.isfinite(seconds) else default
+
+
+def encode_header_value(value: str) -> str:
+    """Valorile non-ASCII merg ca uri(...), convenția IAS3"""
+    if value.isascii() and '\n' not in value:
+        return value
+    return f"uri({quote(value)})"
+
+
+def metadata_headers(metadata: Dict[str, Any]) -> Dict[str, str]:
+    """x-archive-meta-* (listele devin x-archive-meta01-subject, meta02-...)"""
+    headers = {}
+    for key, value in metadata.items():
+        if isinstance(value, (list, tuple)):
+            for index, item in enumerate(value, 1):
+                headers[f"x-archive-meta{index:02d}-{key}"] = encode_header_value(str(item))
+        else:
+            headers[f"x-archive-meta-{key}"] = encode_header_value(str(value))
+    return headers
+
+
+def form_metadata(files: List[Path], fallback_title: str = "") -> Dict[str, Any]:
+    """Aceleași metadate pe care le pune fill_form_fields"""
+    first_file = upload_order_first(files)
+    title = upload_title_from_filename(first_file.name) if first_file else fallback_title
+    title = title or fallback_title
+    return {
+        "title": title,
+        "description": title,
+        "subject": title,
+        "date": FORM_DATE,
+        "collection": FORM_COLLECTION,
+        "mediatype": FORM_MEDIATYPE,
+    }
+
+
+def _xml_text(payload: bytes, tag: str) -> List[str]:
+    """Textele elementelor `tag` dintr-un răspuns XML S3 (indiferent de namespace)"""
+    try:
+        root = ET.fromstring(payload)
+    except ET.ParseError:
+        return []
+    return [(el.text or "").strip() for el in root.iter() if el.tag.rsplit('}', 1)[-1] == tag]
+
+
+class MultipartState:
+    """Upload-urile multipart în curs: uploadId + ETag-ul fiecărei părți confirmate"""
+
+    def __init__(self, path: str = MULTIPART_STATE_FILE):
+        self.path = Path(path)
+        self.uploads: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.RLock()  # Mai multe upload-uri pot rula în paralel
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.uploads = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠ Nu am putut citi {self.path} ({e}), pornesc fără upload-uri de reluat")
+
+    def _save(self):
+        # Scriere atomică: un crash în timpul salvării nu strică ETag-urile deja confirmate
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with self.lock:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.uploads, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+
+    @staticmethod
+    def _signature(file_path: Path) -> Tuple[int, float]:
+        stat = file_path.stat()
+        return stat.st_size, stat.st_mtime
+
+    def get(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Upload-ul în curs pentru fișier (None dacă fișierul s-a schimbat între timp)"""
+        entry = self.uploads.get(str(file_path))
+        if entry and tuple(entry["signature"]) != self._signature(file_path):
+            self.finish(file_path)
+            return None
+        return entry
+
+    def pending_identifier(self, files: List[Path]) -> Optional[str]:
+        """Identifier-ul unui upload întrerupt pentru unul dintre fișiere"""
+        for file_path in files:
+            entry = self.get(file_path)
+            if entry:
+                return entry["identifier"]
+        return None
+
+    def start(self, file_path: Path, identifier: str, upload_id: str, part_size: int) -> Dict[str, Any]:
+        entry = {"identifier": identifier, "upload_id": upload_id, "part_size": part_size,
+                 "signature": list(self._signature(file_path)), "parts": {},
+                 "started_at": datetime.now().isoformat()}
+        with self.lock:
+            self.uploads[str(file_path)] = entry
+            self._save()
+        return entry
+
+    def record_part(self, file_path: Path, number: int, etag: str):
+        with self.lock:
+            self.uploads[str(file_path)]["parts"][str(number)] = etag
+            self._save()
+
+    def finish(self, file_path: Path):
+        with self.lock:
+            if self.uploads.pop(str(file_path), None) is not None:
+                self._save()
+
+
+class _LimitedReader:
+    """Citește cel mult `length` octeți dintr-un fișier (corp de cerere în streaming)"""
+
+    def __init__(self, handle, length: int):
+        self.handle = handle
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.handle.read(size)
+        self.remaining -= len(data)
+        return data
+
+
+class IAS3Uploader:
+    """Client minimal IAS3: PUT pe fișier, item creat la primul fișier"""
+
+    def __init__(self, endpoint: str = IAS3_ENDPOINT, metadata_url: str = METADATA_URL,
+                 credentials: Optional[Tuple[str, str]] = None, timeout: int = REQUEST_TIMEOUT,
+                 multipart_state: Optional[MultipartState] = None,
+                 multipart_threshold: int = MULTIPART_THRESHOLD, part_size: int = MULTIPART_PART_SIZE,
+                 shaper: Optional[BandwidthShaper] = None):
+        self.endpoint = endpoint.rstrip('/')
+        self.metadata_url = metadata_url.rstrip('/')
+        self.credentials = credentials or load_credentials()
+        self.timeout = timeout
+        self.multipart = multipart_state or MultipartState()
+        self.multipart_threshold = multipart_threshold
+        self.part_size = part_size
+        self.shaper = shaper
+
+    # ---------- HTTP ----------
+
+    def _connection(self, url: str) -> Tuple[http.client.HTTPConnection, str]:
+        parsed = urlparse(url)
+        if parsed.scheme == "https":
+            conn = http.client.HTTPSConnection(parsed.netloc, timeout=self.timeout, blocksize=UPLOAD_BLOCK_SIZE)
+        else:
+            conn = http.client.HTTPConnection(parsed.netloc, timeout=self.timeout, blocksize=UPLOAD_BLOCK_SIZE)
+        path = parsed.path or "/"
+        if parsed.query:
+            path += f"?{parsed.query}"
+        return conn, path
+
+    def _request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                 body_path: Optional[Path] = None, body_range: Optional[Tuple[int, int]] = None,
+                 body: Optional[bytes] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """Cerere cu reîncercare pe 429/5xx; corpul se citește în streaming din fișier"""
+        for attempt in range(1, MAX_RETRIES + 1):
+            conn, path = self._connection(url)
+            try:
+                if body_path is not None:
+                    with open(body_path, 'rb') as handle:
+                        offset, length = body_range if body_range else (0, body_path.stat().st_size)
+                        handle.seek(offset)
+                        request_headers = dict(headers or {}, **{"Content-Length": str(length)})
+                        request_body = _LimitedReader(handle, length)
+                        if self.shaper:
+                            request_body = self.shaper.wrap(request_body)
+                        conn.request(method, path, body=request_body, headers=request_headers)
+                        response = conn.getresponse()
+                else:
+                    conn.request(method, path, body=body, headers=headers or {})
+                    response = conn.getresponse()
+                payload = response.read()
+                response_headers = {k.lower(): v for k, v in response.getheaders()}
+            except (OSError, http.client.HTTPException) as e:
+                if attempt == MAX_RETRIES:
+                    raise IAS3Error(0, str(e))
+                print(f"   ⚠ Eroare de rețea ({e}), reîncerc ({attempt}/{MAX_RETRIES})...")
+                time.sleep(2 ** attempt)
+                continue
+            finally:
+                conn.close()
+
+            if response.status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                retry_after = retry_after_seconds(response_headers.get("retry-after"), 2 ** attempt)
+                print(f"   ⏳ HTTP {response.status}, reîncerc în {retry_after:.0f}s ({attempt}/{MAX_RETRIES})...")
+                time.sleep(retry_after)
+                continue
+            return response.status, response_headers, payload
+        raise IAS3Error(0, "reîncercări epuizate")
+
+    def _auth_headers(self) -> Dict[str, str]:
+        if not self.credentials:
+            raise IAS3Error(403, "lipsesc cheile S3 (IA_ACCESS_KEY_ID / IA_SECRET_ACCESS_KEY sau ia.ini)")
+        access, secret = self.credentials
+        return {"authorization": f"LOW {access}:{secret}"}
+
+    def object_url(self, identifier: str, filename: str) -> str:
+        return f"{self.endpoint}/{identifier}/{quote(filename)}"
+
+    # ---------- item ----------
+
+    def item_exists(self, identifier: str) -> bool:
+        """archive.org întoarce {} la /metadata pentru item-urile inexistente"""
+        status, _, payload = self._request("GET", f"{self.metadata_url}/{identifier}")
+        if status != 200:
+            raise IAS3Error(status, f"nu pot verifica identifier-ul {identifier}")
+        return payload.strip() not in (b"", b"{}")
+
+    def choose_identifier(self, title: str) -> str:
+        """Identifier-ul pe care l-ar alege uploader-ul web (cu sufix de dată dacă e ocupat)"""
+        base = identifier_from_title(title)
+        now = datetime.now()
+        for candidate in (base, f"{base}_{now:%Y%m}", f"{base}_{now:%Y%m%d}"):
+            if not self.item_exists(candidate):
+                return candidate
+        return f"{base}_{now:%Y%m%d%H%M%S}"
+
+    def put_file(self, identifier: str, file_path: Path, headers: Dict[str, str]) -> str:
+        """PUT pentru un fișier; întoarce ETag-ul"""
+        status, response_headers, payload = self._request(
+            "PUT", self.object_url(identifier, file_path.name), headers=headers, body_path=file_path)
+        if status != 200:
+            raise IAS3Error(status, payload.decode('utf-8', 'replace')[:300])
+        return response_headers.get("etag", "").strip('"')
+
+    # ---------- multipart ----------
+
+    def _initiate_multipart(self, url: str, headers: Dict[str, str]) -> str:
+        status, _, payload = self._request("POST", f"{url}?uploads", headers=headers, body=b"")
+        upload_ids = _xml_text(payload, "UploadId")
+        if status != 200 or not upload_ids:
+            raise IAS3Error(status, f"inițiere multipart eșuată: {payload[:300]!r}")
+        return upload_ids[0]
+
+    def _server_parts(self, url: str, upload_id: str, auth: Dict[str, str]) -> Optional[Dict[str, str]]:
+        """Părțile pe care serverul le are deja (None dacă uploadId-ul nu mai există)"""
+        status, _, payload = self._request("GET", f"{url}?uploadId={upload_id}", headers=auth)
+        if status != 200:
+            return None
+        numbers = _xml_text(payload, "PartNumber")
+        etags = _xml_text(payload, "ETag")
+        return {number: etag.strip('"') for number, etag in zip(numbers, etags)}
+
+    def put_file_multipart(self, identifier: str, file_path: Path, headers: Dict[str, str]) -> str:
+        """Multipart cu reluare: părțile confirmate (din ias3_multipart_state.json) nu se retrimit"""
+        url = self.object_url(identifier, file_path.name)
+        auth = self._auth_headers()
+        size = file_path.stat().st_size
+
+        entry = self.multipart.get(file_path)
+        if entry and entry["identifier"] == identifier:
+            server_parts = self._server_parts(url, entry["upload_id"], auth)
+            if server_parts is None:
+                print(f"   ⚠ Upload-ul multipart anterior a expirat pe server, îl reîncep")
+                self.multipart.finish(file_path)
+                entry = None
+            else:
+                # Doar părțile confirmate și local, și de server
+                entry["parts"] = {n: etag for n, etag in entry["parts"].items() if server_parts.get(n) == etag}
+        elif entry:
+            self.multipart.finish(file_path)
+            entry = None
+
+        if entry is None:
+            upload_id = self._initiate_multipart(url, headers)
+            entry = self.multipart.start(file_path, identifier, upload_id, self.part_size)
+
+        part_size = entry["part_size"]
+        total_parts = max(1, -(-size // part_size))
+        done = len(entry["parts"])
+        if done:
+            print(f"   🔁 Reiau {file_path.name}: {done}/{total_parts} părți deja confirmate "
+                  f"({done * part_size / (1024 * 1024):.0f} MB nu se mai trimit)")
+
+        for number in range(1, total_parts + 1):
+            if str(number) in entry["parts"]:
+                continue
+            offset = (number - 1) * part_size
+            length = min(part_size, size - offset)
+            status, response_headers, payload = self._request(
+                "PUT", f"{url}?partNumber={number}&uploadId={entry['upload_id']}",
+                headers=auth, body_path=file_path, body_range=(offset, length))
+            if status != 200:
+                raise IAS3Error(status, f"partea {number}/{total_parts}: {payload[:300]!r}")
+            self.multipart.record_part(file_path, number, response_headers.get("etag", "").strip('"'))
+            print(f"   📦 Partea {number}/{total_parts} confirmată ({length / (1024 * 1024):.1f} MB)")
+
+        parts_xml = "".join(f"<Part><PartNumber>{n}</PartNumber><ETag>\"{entry['parts'][str(n)]}\"</ETag></Part>"
+                            for n in range(1, total_parts + 1))
+        complete_headers = dict(auth)
+        if "x-archive-queue-derive" in headers:
+            complete_headers["x-archive-queue-derive"] = headers["x-archive-queue-derive"]
+        status, _, payload = self._request(
+            "POST", f"{url}?uploadId={entry['upload_id']}", headers=complete_headers,
+            body=f"<CompleteMultipartUpload>{parts_xml}</CompleteMultipartUpload>".encode('utf-8'))
+        if status != 200:
+            raise IAS3Error(status, f"finalizare multipart eșuată: {payload[:300]!r}")
+        self.multipart.finish(file_path)
+        etags = _xml_text(payload, "ETag")
+        return etags[0].strip('"') if etags else ""
+
+    def upload_item(self, files: List[Path], metadata: Dict[str, Any], identifier: Optional[str] = None,
+                    on_identifier: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Încarcă toate fișierele unui item; rezultatul conține identifier, octeți și durata
+
+        on_identifier primește identifier-ul ales înaintea primului PUT (de păstrat pentru reîncercări)
+        """
+        started = time.time()
+        files = sorted(files, key=lambda f: f.name.casefold())  # Aceeași ordine ca în formular
+        total_bytes = sum(f.stat().st_size for f in files if f.exists())
+        result = {"success": False, "identifier": identifier, "files": 0, "bytes": 0,
+                  "seconds": 0.0, "error": ""}
+
+        try:
+            auth = self._auth_headers()
+            # Un upload multipart întrerupt își păstrează identifier-ul
+            identifier = (identifier or self.multipart.pending_identifier(files)
+                          or self.choose_identifier(metadata["title"]))
+            result["identifier"] = identifier
+            print(f"   🆔 Identifier: {identifier}")
+            if on_identifier:
+                on_identifier(identifier)
+
+            for index, file_path in enumerate(files):
+                headers = dict(auth)
+                if index == 0:
+                    headers.update(metadata_headers(metadata))
+                    headers["x-archive-auto-make-bucket"] = "1"
+                    headers["x-archive-size-hint"] = str(total_bytes)
+                if index < len(files) - 1:
+                    headers["x-archive-queue-derive"] = "0"
+
+                size_mb = file_path.stat().st_size / (1024 * 1024)
+                file_started = time.time()
+                if file_path.stat().st_size > self.multipart_threshold:
+                    etag = self.put_file_multipart(identifier, file_path, headers)
+                else:
+                    etag = self.put_file(identifier, file_path, headers)
+                elapsed = max(time.time() - file_started, 1e-6)
+                print(f"   ✅ {file_path.name} ({size_mb:.1f} MB, {size_mb / elapsed:.1f} MB/s) ETag {etag[:12]}")
+                result["files"] += 1
+                result["bytes"] += file_path.stat().st_size
+
+            result["success"] = True
+        except IAS3Error as e:
+            result["error"] = str(e)
+            print(f"   ❌ Upload IAS3 eșuat: {e}")
+        except OSError as e:
+            result["error"] = str(e)
+            print(f"   ❌ Eroare la citirea fișierului: {e}")
+
+        result["seconds"] = time.time() - started
+        return result
+
+
+def main():
+    """Funcția principală"""
+    parser = argparse.ArgumentParser(description="Upload archive.org prin API-ul S3 (fără Chrome)")
+    parser.add_argument("folder", help="Folderul (unitatea) de încărcat")
+    parser.add_argument("--identifier", help="Identifier explicit (implicit: ca uploader-ul web)")
+    parser.add_argument("--endpoint", default=IAS3_ENDPOINT)
+    parser.add_argument("--metadata-url", default=METADATA_URL)
+    parser.add_argument("--mock", action="store_true", help="Încarcă în mock-ul local archive.org")
+    parser.add_argument("--max-mbps", type=float, default=0.0, help="Plafon de upload MB/s (0 = nelimitat)")
+    args = parser.parse_args()
+
+    folder = Path(args.folder)
+    files = [f for f in folder.iterdir() if f.is_file() and f.suffix.lower() not in ('.jpg', '.png')]
+    if not files:
+        print(f"❌ Niciun fișier de încărcat în {folder}")
+        return 1
+
+    metadata = form_metadata(files, folder.name)
+    print(f"📤 {len(files)} fișiere, titlu: '{metadata['title']}'")
+
+    if args.mock:
+        from archive_mock_server import MockArchiveServer
+        with MockArchiveServer() as server:
+            uploader = IAS3Uploader(f"{server.base_url}/s3", f"{server.base_url}/metadata", ("mock", "mock"),
+                                    shaper=BandwidthShaper(args.max_mbps))
+            result = uploader.upload_item(files, metadata, args.identifier)
+            if result["success"]:
+                item = server.archive.items[result["identifier"]]
+                print(f"🧪 Mock: item creat cu {len(item.get('files', []))} fișiere, metadate {item['title']!r}")
+    else:
+        uploader = IAS3Uploader(args.endpoint, args.metadata_url, shaper=BandwidthShaper(args.max_mbps))
+        result = uploader.upload_item(files, metadata, args.identifier)
+
+    mb = result["bytes"] / (1024 * 1024)
+    print(f"{'✅' if result['success'] else '❌'} {result['identifier']}: {result['files']}/{len(files)} fișiere, "
+          f"{mb:.1f} MB în {result['seconds']:.1f}s")
+    return 0 if result["success"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Predictor exact pentru identifier-ul pe care archive.org îl dă unui upload.
+
+Uploader-ul web archive.org derivă titlul din primul fișier trimis, apoi
+identifier-ul din titlu. Regulile de mai jos sunt deduse din cele 5 upload-uri
+reale cunoscute (benchmark_identifier_predictor.KNOWN_UPLOADS); validarea pe mai
+multe perechi cere înregistrarea lor (archive_mock_server.py record --pairs):
+- titlu: numele fișierului fără extensie, '-' și '_' devin spațiu, după "J." /
+  "v." urmat de literă sau cifră se inserează spațiu ("J.C." -> "J. C.", "v.1.0" -> "V. 1.0")
+- identifier: lowercase, spațiile devin '-', se păstrează doar [a-z0-9._-],
+  liniuțele consecutive se comasează, tăiere la exact 80 de caractere (nu la cuvânt)
+- sufixele tehnice din numele fișierului (ctrl, retail, scan...) rămân în identifier;
+  duplicatele primesc sufix de dată (_202508), găsit separat prin căutarea pe prefix
+
+În loc de ~60 de variante testate orb, fiecare folder are 1-2 candidați:
+forma tăiată la 80 plus, când e cazul, forma netăiată (upload-uri vechi, limita de
+100) sau forma transliterată (titluri cu diacritice).
+
+Folosire:
+    from archive_identifier_predictor import predict_identifiers, predict_for_files
+    predict_identifiers("Chatterji, J.C. - Filozofia ezoterica a Indiei - ctrl.pdf")
+    # ['chatterji-j.-c.-filozofia-ezoterica-a-indiei-ctrl']
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from archive_title_normalizer import remove_diacritics
+
+CACHE_SIZE = 65536
+IDENTIFIER_MAX_LENGTH = 80        # Tăierea făcută de uploader-ul web
+IDENTIFIER_HARD_LIMIT = 100       # Limita archive.org (upload-uri făcute altfel decât din uploader)
+MAX_PREDICTIONS = 2
+
+# Sufixele pe care archive.org le adaugă când identifier-ul e deja ocupat
+DATE_SUFFIX_RE = re.compile(r'_\d{6}(?:\d{2})?$')
+
+TITLE_SEPARATORS_RE = re.compile(r'[-_]+')
+LETTER_DOT_RE = re.compile(r'(?<=[^\W\d_])\.(?=\w)')   # "J.C" / "v.1" - nu și "1.0"
+OPEN_PAREN_RE = re.compile(r'\((?=\S)')
+IDENTIFIER_INVALID_RE = re.compile(r'[^a-z0-9._-]')
+DASHES_RE = re.compile(r'-+')
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def upload_title_from_filename(filename: str) -> str:
+    """Titlul completat automat de uploader-ul archive.org pentru un fișier"""
+    title = Path(filename).stem
+    title = TITLE_SEPARATORS_RE.sub(' ', title)
+    title = LETTER_DOT_RE.sub('. ', title)
+    title = OPEN_PAREN_RE.sub('( ', title)
+    return ' '.join(word[:1].upper() + word[1:] for word in title.split())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def identifier_from_title(title: str, max_length: int = IDENTIFIER_MAX_LENGTH,
+                          transliterate: bool = False) -> str:
+    """Identifier-ul derivat de archive.org din titlu"""
+    identifier = title.lower()
+    if transliterate:
+        identifier = remove_diacritics(identifier)
+    identifier = '-'.join(identifier.split())
+    identifier = IDENTIFIER_INVALID_RE.sub('', identifier)
+    identifier = DASHES_RE.sub('-', identifier).strip('-')
+    return identifier[:max_length]
+
+
+def strip_date_suffix(identifier: str) -> str:
+    """Identifier-ul fără sufixul de duplicat (_202508 / _20250806)"""
+    return DATE_SUFFIX_RE.sub('', identifier)
+
+
+def predict_identifiers(filename: str, limit: int = MAX_PREDICTIONS) -> List[str]:
+    """Candidații de identifier pentru un fișier, în ordinea probabilității (cel mult `limit`)"""
+    title = upload_title_from_filename(filename)
+    candidates = [identifier_from_title(title)]
+    if not title.isascii():
+        candidates.append(identifier_from_title(title, transliterate=True))
+    candidates.append(identifier_from_title(title, max_length=IDENTIFIER_HARD_LIMIT))
+
+    predictions = []
+    for candidate in candidates:
+        if candidate and candidate not in predictions:
+            predictions.append(candidate)
+    return predictions[:limit]
+
+
+def upload_order_first(files: Iterable[Path]) -> Optional[Path]:
+    """Primul fișier trimis la upload (ordinea din os.walk pe NTFS = alfabetică)"""
+    files = list(files)
+    if not files:
+        return None
+    return min(files, key=lambda f: f.name.casefold())
+
+
+def predict_for_files(priority_file: Path, all_files: Iterable[Path] = (),
+                      limit: int = MAX_PREDICTIONS) -> List[str]:
+    """Candidații pentru un folder: titlul vine din primul fișier din același director"""
+    siblings = [f for f in all_files if f.parent == priority_file.parent]
+    upload_file = upload_order_first(siblings) or priority_file
+
+    predictions = predict_identifiers(upload_file.name, limit)
+    if upload_file != priority_file and len(predictions) < limit:
+        for candidate in predict_identifiers(priority_file.name, limit):
+            if candidate not in predictions:
+                predictions.append(candidate)
+    return predictions[:limit]
+
+
+def cache_clear():
+    """Golește cache-urile (pentru benchmark-uri)"""
+    upload_title_from_filename.cache_clear()
+    identifier_from_title.cache_clear()
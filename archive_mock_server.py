@@ -0,0 +1,681 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Server local care imită API-urile archive.org folosite de checkere și uploadere.
+
+Servește din fixture-uri (fixtures/archive_mock_fixtures.json):
+- /advancedsearch.php          (q, fl[], rows, output=json)
+- /details/<identifier>        (HEAD/GET: 200 dacă există, 404 altfel)
+- /services/search/v1/scrape   (q, fields, count)
+- /metadata/<identifier>       ({} dacă nu există, ca pe archive.org)
+- /search?query=...            (HTML minimal cu h4.truncated, pentru metoda 1)
+- /s3/<identifier>/<fișier>    (PUT IAS3: autentificare LOW, x-archive-auto-make-bucket,
+                                x-archive-meta-*; item-ul apare apoi în /details și /metadata;
+                                multipart: POST ?uploads, PUT ?partNumber&uploadId,
+                                GET ?uploadId (ListParts), POST ?uploadId (Complete))
+
+Condiții de rețea configurabile: latență (bază + jitter), rată de erori 503 și
+throttling (peste max_rps cererile primesc 429 SlowDown).
+
+Folosire:
+    python archive_mock_server.py serve --port 8765 --latency-ms 80 --error-rate 0.02 --max-rps 20
+    python archive_mock_server.py record --from-logs "Cauta fisierele 3"
+    python archive_mock_server.py record --query "chatterji" --query "panaitescu"
+    python archive_mock_server.py record --pairs --query "creator:(chatterji)"
+
+record --pairs nu scrie fixture-uri pentru server: salvează perechi reale
+(primul fișier original al item-ului -> identifier) în fixtures/identifier_pairs.json,
+pentru benchmark_identifier_predictor.py.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from difflib import SequenceMatcher
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+FIXTURES_FILE = Path(__file__).resolve().parent / "fixtures" / "archive_mock_fixtures.json"
+IDENTIFIER_PAIRS_FILE = FIXTURES_FILE.parent / "identifier_pairs.json"
+REAL_SCRAPE_URL = "https://archive.org/services/search/v1/scrape"
+REAL_METADATA_URL = "https://archive.org/metadata/"
+# Fișierele generate de archive.org (nu cele trimise la upload)
+GENERATED_FILE_RE = re.compile(r'_(?:meta\.xml|meta\.sqlite|files\.xml|reviews\.xml)$|^__ia_thumb\.jpg$')
+
+# Sufixele pe care archive.org le adaugă când identifier-ul este deja ocupat
+RECORDED_DATE_SUFFIXES = ['_202508', '_20250806', '_202507']
+RECORDED_TECH_SUFFIXES = ['-ctrl', '-retail', '-scan']
+
+
+def archive_identifier_from_title(title: str) -> str:
+    """Derivă un identifier din titlu după regulile observate pe archive.org"""
+    identifier = title.lower()
+    identifier = re.sub(r'\s+', '-', identifier)
+    identifier = re.sub(r'[^a-z0-9._-]', '', identifier)
+    identifier = re.sub(r'-+', '-', identifier).strip('-')
+    return identifier[:80]
+
+
+class TokenBucket:
+    """Limitator simplu de rată (cereri/secundă) pentru throttling"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def try_take(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class MockArchive:
+    """Datele din fixture-uri și logica de căutare"""
+
+    def __init__(self, items: List[Dict[str, Any]]):
+        self.items = {item["identifier"]: item for item in items}
+        self._tokens = {}
+        for identifier, item in self.items.items():
+            text = f"{item.get('title', '')} {item.get('creator', '')} {identifier}"
+            self._tokens[identifier] = set(re.findall(r'\w+', text.lower().replace('-', ' ')))
+
+    def add_item(self, item: Dict[str, Any]):
+        """Adaugă un item (copy-on-write, căutările în curs nu văd dicționarul modificat)"""
+        identifier = item["identifier"]
+        text = f"{item.get('title', '')} {item.get('creator', '')} {identifier}"
+        tokens = dict(self._tokens)
+        tokens[identifier] = set(re.findall(r'\w+', text.lower().replace('-', ' ')))
+        items = dict(self.items)
+        items[identifier] = item
+        self._tokens = tokens
+        self.items = items
+
+    @classmethod
+    def from_file(cls, path: Path = FIXTURES_FILE) -> "MockArchive":
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get("items", []))
+
+    def _term_matches(self, term: str, tokens: set) -> bool:
+        fuzzy = term.endswith('~')
+        term = term.rstrip('~')
+        if not term:
+            return True
+        if term in tokens:
+            return True
+        if fuzzy:
+            return any(SequenceMatcher(None, term, token).ratio() >= 0.75 for token in tokens)
+        return False
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Interpretează un subset al sintaxei Lucene folosite de scripturi"""
+        query = query.strip()
+
+        # identifier:(prefix*) sau identifier:prefix*
+        match = re.match(r'^identifier:\(?([^)\s*]+)\*?\)?$', query)
+        if match:
+            prefix = match.group(1).lower()
+            return [item for identifier, item in self.items.items() if identifier.startswith(prefix)]
+
+        # title:"fraza" sau title:(cuvinte)
+        phrase = None
+        match = re.match(r'^title:\s*(["(])(.*)[")]$', query)
+        if match:
+            query = match.group(2)
+            if match.group(1) == '"':
+                phrase = query
+        elif len(query) > 1 and query.startswith('"') and query.endswith('"'):
+            phrase = query.strip('"')
+
+        terms = [t for t in re.split(r'\s+', re.sub(r'["()]', ' ', query.lower())) if t and t not in ('and', 'or')]
+        terms = [re.sub(r'[^\w~]', '', t) for t in terms]
+        terms = [t for t in terms if t.rstrip('~')]
+        normalized_phrase = ' '.join(re.sub(r'[^\w\s]', ' ', (phrase or '').lower()).split())
+
+        results = []
+        for identifier, item in self.items.items():
+            if phrase is not None:
+                haystack = f"{item.get('title', '')} {item.get('creator', '')}".lower()
+                if normalized_phrase and normalized_phrase in ' '.join(re.sub(r'[^\w\s]', ' ', haystack).split()):
+                    results.append(item)
+                continue
+            tokens = self._tokens[identifier]
+            if terms and all(self._term_matches(term, tokens) for term in terms):
+                results.append(item)
+        return results
+
+
+class MockArchiveServer:
+    """Server HTTP local (thread separat) cu latență, erori și throttling configurabile"""
+
+    def __init__(self, archive: Optional[MockArchive] = None, host: str = "127.0.0.1", port: int = 0,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 max_rps: Optional[float] = None, seed: Optional[int] = None):
+        self.archive = archive or MockArchive.from_file()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle = TokenBucket(max_rps) if max_rps else None
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.s3_lock = threading.Lock()
+        self.multipart_uploads: Dict[str, Dict[str, Any]] = {}
+
+        self.stats_lock = threading.Lock()
+        self.request_log: List[Tuple[str, str, int, float]] = []  # (metodă, endpoint, status, secunde)
+
+        handler = type("BoundMockArchiveHandler", (MockArchiveHandler,), {"server_ref": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockArchiveServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="MockArchiveServer", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---------- condiții de rețea ----------
+
+    def injected_delay(self) -> float:
+        with self.random_lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000.0
+
+    def should_fail(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self.random_lock:
+            return self.random.random() < self.error_rate
+
+    def record(self, method: str, endpoint: str, status: int, seconds: float):
+        with self.stats_lock:
+            self.request_log.append((method, endpoint, status, seconds))
+
+    def reset_stats(self):
+        with self.stats_lock:
+            self.request_log = []
+
+    def stats(self) -> Dict[str, Any]:
+        """Contoare per endpoint/status și latențele observate pe server"""
+        with self.stats_lock:
+            log = list(self.request_log)
+        by_endpoint: Dict[str, int] = {}
+        by_status: Dict[int, int] = {}
+        for method, endpoint, status, _ in log:
+            key = f"{method} {endpoint}"
+            by_endpoint[key] = by_endpoint.get(key, 0) + 1
+            by_status[status] = by_status.get(status, 0) + 1
+        return {
+            "requests": len(log),
+            "by_endpoint": by_endpoint,
+            "by_status": by_status,
+            "latencies": [entry[3] for entry in log],
+        }
+
+
+class MockArchiveHandler(BaseHTTPRequestHandler):
+    """Rutează cererile către endpoint-urile imitate"""
+
+    server_ref: MockArchiveServer = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # Fără zgomot în consolă
+
+    # ---------- utilitare răspuns ----------
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/json",
+              headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD" and body:
+            self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Any):
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+
+    def _query(self) -> Dict[str, List[str]]:
+        return parse_qs(urlparse(self.path).query, keep_blank_values=True)
+
+    # ---------- dispecer ----------
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_HEAD(self):
+        self._dispatch("HEAD")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str):
+        server = self.server_ref
+        started = time.perf_counter()
+        path = urlparse(self.path).path
+        endpoint = self._endpoint_name(path)
+        status = 500
+        try:
+            time.sleep(server.injected_delay())
+            if server.throttle and not server.throttle.try_take():
+                self._drain_body()
+                status = 429
+                self._send(status, b"<Error><Code>SlowDown</Code><Message>Please reduce your request rate.</Message></Error>",
+                           "application/xml", {"Retry-After": "1"})
+            elif server.should_fail():
+                self._drain_body()
+                status = 503
+                self._send(status, b"Service Unavailable", "text/plain")
+            else:
+                status = self._route(method, path)
+        finally:
+            server.record(method, endpoint, status, time.perf_counter() - started)
+
+    def _endpoint_name(self, path: str) -> str:
+        for prefix in ("/details/", "/metadata/"):
+            if path.startswith(prefix):
+                return prefix + "<id>"
+        if path.startswith("/s3/"):
+            return "/s3/<id>/<file>"
+        return path
+
+    def _drain_body(self) -> Tuple[int, str]:
+        """Consumă corpul cererii (PUT); întoarce (octeți, md5)"""
+        remaining = int(self.headers.get("Content-Length", 0) or 0)
+        digest = hashlib.md5()
+        total = 0
+        while remaining > 0:
+            chunk = self.rfile.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                break
+            digest.update(chunk)
+            total += len(chunk)
+            remaining -= len(chunk)
+        return total, digest.hexdigest()
+
+    def _route(self, method: str, path: str) -> int:
+        archive = self.server_ref.archive
+
+        if path.startswith("/s3/"):
+            return self._s3(method, path)
+        if method in ("PUT", "POST"):
+            self._drain_body()
+            self._send(405, b"Method Not Allowed", "text/plain")
+            return 405
+        if path == "/advancedsearch.php":
+            return self._advancedsearch()
+        if path == "/services/search/v1/scrape":
+            return self._scrape()
+        if path.startswith("/details/"):
+            identifier = unquote(path[len("/details/"):]).strip('/')
+            if identifier in archive.items:
+                item = archive.items[identifier]
+                body = f"<html><head><title>{item.get('title', '')}</title></head><body></body></html>"
+                self._send(200, body.encode('utf-8'), "text/html; charset=utf-8")
+                return 200
+            self._send(404, b"<html><body>Item cannot be found.</body></html>", "text/html")
+            return 404
+        if path.startswith("/metadata/"):
+            identifier = unquote(path[len("/metadata/"):]).strip('/')
+            item = archive.items.get(identifier)
+            if not item:
+                self._send_json(200, {})
+                return 200
+            metadata = {k: v for k, v in item.items() if k not in ("files",)}
+            self._send_json(200, {"metadata": metadata, "files": item.get("files", [])})
+            return 200
+        if path == "/search":
+            return self._search_html()
+
+        self._send(404, b"Not Found", "text/plain")
+        return 404
+
+    def _s3_error(self, status: int, code: str, message: str) -> int:
+        body = f"<Error><Code>{code}</Code><Message>{message}</Message></Error>".encode('utf-8')
+        self._send(status, body, "application/xml")
+        return status
+
+    def _s3_metadata(self) -> Dict[str, Any]:
+        """x-archive-meta-* / x-archive-metaNN-* -> metadate (uri(...) decodat)"""
+        metadata: Dict[str, Any] = {}
+        for name, value in self.headers.items():
+            match = re.match(r'^x-archive-meta(\d*)-(.+)$', name.lower())
+            if not match:
+                continue
+            if value.startswith("uri(") and value.endswith(")"):
+                value = unquote(value[4:-1])
+            key = match.group(2)
+            if match.group(1):
+                metadata.setdefault(key, []).append(value)
+            else:
+                metadata[key] = value
+        return metadata
+
+    def _s3_store(self, identifier: str, filename: str, size: int, etag: str,
+                  metadata: Dict[str, Any], auto_make_bucket: bool) -> bool:
+        """Adaugă fișierul în item (creat la nevoie); False dacă bucket-ul lipsește"""
+        server = self.server_ref
+        with server.s3_lock:
+            item = server.archive.items.get(identifier)
+            if item is None:
+                if not auto_make_bucket:
+                    return False
+                item = dict(metadata, identifier=identifier, item_size=0, files=[])
+                if isinstance(item.get("collection"), str):
+                    item["collection"] = [item["collection"]]
+                server.archive.add_item(item)
+            # Un PUT pe aceeași cheie înlocuiește fișierul, ca pe S3
+            files = [f for f in item.get("files", []) if f["name"] != filename]
+            files.append({"name": filename, "size": size, "md5": etag})
+            item["files"] = files
+            item["item_size"] = sum(f["size"] for f in files)
+        return True
+
+    def _s3(self, method: str, path: str) -> int:
+        """Subsetul IAS3 folosit de archive_ias3: PUT simplu și multipart pe /<identifier>/<fișier>"""
+        server = self.server_ref
+        parts = path[len("/s3/"):].split('/', 1)
+        identifier = unquote(parts[0])
+        filename = unquote(parts[1]) if len(parts) > 1 else ""
+        params = self._query()
+        upload_id = params.get("uploadId", [""])[0]
+
+        if method not in ("PUT", "POST", "GET") or not filename:
+            self._drain_body()
+            return self._s3_error(405, "MethodNotAllowed", "Only /<bucket>/<key> object operations are supported")
+        if not (self.headers.get("Authorization") or "").startswith("LOW "):
+            self._drain_body()
+            return self._s3_error(403, "AccessDenied", "Missing LOW authorization")
+
+        # Inițiere multipart: metadatele și auto-make-bucket vin acum, item-ul apare la Complete
+        if method == "POST" and "uploads" in params:
+            self._drain_body()
+            upload_id = uuid.uuid4().hex
+            with server.s3_lock:
+                server.multipart_uploads[upload_id] = {
+                    "identifier": identifier, "filename": filename, "parts": {},
+                    "metadata": self._s3_metadata(),
+                    "auto_make_bucket": self.headers.get("x-archive-auto-make-bucket") == "1",
+                }
+            body = (f"<InitiateMultipartUploadResult><Bucket>{identifier}</Bucket><Key>{filename}</Key>"
+                    f"<UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>")
+            self._send(200, body.encode('utf-8'), "application/xml")
+            return 200
+
+        upload = server.multipart_uploads.get(upload_id) if upload_id else None
+        if upload_id and upload is None:
+            self._drain_body()
+            return self._s3_error(404, "NoSuchUpload", "The specified multipart upload does not exist")
+
+        if method == "GET":
+            if upload is None:
+                return self._s3_error(405, "MethodNotAllowed", "Object download is not supported")
+            with server.s3_lock:
+                listed = sorted(upload["parts"].items())
+            rows = "".join(f'<Part><PartNumber>{n}</PartNumber><ETag>"{md5}"</ETag><Size>{size}</Size></Part>'
+                           for n, (size, md5) in listed)
+            self._send(200, f"<ListPartsResult><UploadId>{upload_id}</UploadId>{rows}</ListPartsResult>".encode('utf-8'),
+                       "application/xml")
+            return 200
+
+        if method == "PUT" and upload is not None:
+            number = int(params.get("partNumber", ["0"])[0] or 0)
+            size, md5 = self._drain_body()
+            with server.s3_lock:
+                upload["parts"][number] = (size, md5)
+            self._send(200, b"", "text/plain", {"ETag": f'"{md5}"'})
+            return 200
+
+        if method == "POST" and upload is not None:
+            length = int(self.headers.get("Content-Length", 0) or 0)
+            requested = re.findall(r'<PartNumber>(\d+)</PartNumber>', self.rfile.read(length).decode('utf-8', 'replace'))
+            with server.s3_lock:
+                stored = upload["parts"]
+                if [int(n) for n in requested] != sorted(stored) or not stored:
+                    return self._s3_error(400, "InvalidPart", "One or more of the specified parts could not be found")
+                size = sum(part[0] for part in stored.values())
+                digest = hashlib.md5(b"".join(bytes.fromhex(stored[n][1]) for n in sorted(stored)))
+                etag = f"{digest.hexdigest()}-{len(stored)}"
+                del server.multipart_uploads[upload_id]
+            if not self._s3_store(identifier, filename, size, etag, upload["metadata"], upload["auto_make_bucket"]):
+                return self._s3_error(404, "NoSuchBucket", "The specified bucket does not exist")
+            body = f'<CompleteMultipartUploadResult><Key>{filename}</Key><ETag>"{etag}"</ETag></CompleteMultipartUploadResult>'
+            self._send(200, body.encode('utf-8'), "application/xml")
+            return 200
+
+        if method != "PUT":
+            self._drain_body()
+            return self._s3_error(405, "MethodNotAllowed", "Unsupported operation")
+
+        size, md5 = self._drain_body()
+        if not self._s3_store(identifier, filename, size, md5, self._s3_metadata(),
+                              self.headers.get("x-archive-auto-make-bucket") == "1"):
+            return self._s3_error(404, "NoSuchBucket", "The specified bucket does not exist")
+        self._send(200, b"", "text/plain", {"ETag": f'"{md5}"'})
+        return 200
+
+    def _advancedsearch(self) -> int:
+        params = self._query()
+        query = params.get("q", [""])[0]
+        rows = int(params.get("rows", ["50"])[0] or 50)
+        fields = params.get("fl[]", []) or ["identifier", "title", "creator"]
+        started = time.perf_counter()
+        matches = self.server_ref.archive.search(query)
+        docs = [{field: item[field] for field in fields if field in item} for item in matches[:rows]]
+        self._send_json(200, {
+            "responseHeader": {
+                "status": 0,
+                "QTime": int((time.perf_counter() - started) * 1000),
+                "params": {"query": query, "rows": str(rows), "wt": "json"},
+            },
+            "response": {"numFound": len(matches), "start": 0, "docs": docs},
+        })
+        return 200
+
+    def _scrape(self) -> int:
+        params = self._query()
+        query = params.get("q", [""])[0]
+        count = int(params.get("count", ["100"])[0] or 100)
+        fields = (params.get("fields", ["identifier"])[0] or "identifier").split(',')
+        matches = self.server_ref.archive.search(query)
+        items = [{field: item[field] for field in fields if field in item} for item in matches[:count]]
+        self._send_json(200, {"items": items, "count": len(items), "total": len(matches)})
+        return 200
+
+    def _search_html(self) -> int:
+        query = self._query().get("query", [""])[0]
+        matches = self.server_ref.archive.search(query)[:50]
+        rows = "".join(
+            f'<a href="/details/{item["identifier"]}"><h4 class="truncated" title="{item.get("title", "")}">'
+            f'{item.get("title", "")}</h4></a>'
+            for item in matches
+        )
+        self._send(200, f"<html><body>{rows}</body></html>".encode('utf-8'), "text/html; charset=utf-8")
+        return 200
+
+
+# ============= FIXTURE-URI =============
+
+def build_fixtures_from_logs(log_folder: str, limit: int = 600) -> List[Dict[str, Any]]:
+    """Construiește fixture-uri din rapoartele deleted_folders_*.json ale scanerului agresiv"""
+    items: Dict[str, Dict[str, Any]] = {}
+    for log_path in sorted(glob.glob(os.path.join(log_folder, "deleted_folders_*.json"))):
+        with open(log_path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        for entry in entries:
+            title = (entry.get("best_match") or "").strip()
+            if not title:
+                continue
+            identifier = archive_identifier_from_title(title)
+            if not identifier or identifier in items:
+                continue
+            items[identifier] = {
+                "identifier": identifier,
+                "title": title,
+                "creator": entry.get("name", ""),
+                "mediatype": "texts",
+                "collection": ["opensource"],
+                "item_size": entry.get("size", 0),
+            }
+            if len(items) >= limit:
+                break
+        if len(items) >= limit:
+            break
+
+    # Dubluri cu sufix, ca la încărcările repetate
+    base_items = list(items.values())
+    for index, item in enumerate(base_items[::7]):
+        suffix = RECORDED_DATE_SUFFIXES[index % len(RECORDED_DATE_SUFFIXES)] if index % 2 == 0 \
+            else RECORDED_TECH_SUFFIXES[index % len(RECORDED_TECH_SUFFIXES)]
+        duplicate = dict(item, identifier=item["identifier"] + suffix)
+        items[duplicate["identifier"]] = duplicate
+    return list(items.values())
+
+
+def record_from_archive(queries: List[str], rows: int = 100) -> List[Dict[str, Any]]:
+    """Înregistrează un snapshot real din scrape API-ul archive.org"""
+    import requests
+
+    items: Dict[str, Dict[str, Any]] = {}
+    for query in queries:
+        params = {"q": query, "fields": "identifier,title,creator,mediatype,collection,date", "count": max(rows, 100)}
+        print(f"📥 Înregistrez: '{query}'")
+        response = requests.get(REAL_SCRAPE_URL, params=params, timeout=30)
+        response.raise_for_status()
+        for item in response.json().get("items", [])[:rows]:
+            for field in ("title", "creator"):
+                if isinstance(item.get(field), list):
+                    item[field] = ", ".join(item[field])
+            items[item["identifier"]] = item
+        time.sleep(1)
+    return list(items.values())
+
+
+def record_identifier_pairs(queries: List[str], rows: int = 100) -> List[Dict[str, Any]]:
+    """Perechi reale fișier -> identifier: primul fișier original (ordinea uploader-ului) din /metadata"""
+    import requests
+
+    pairs: Dict[str, Dict[str, Any]] = {}
+    for item in record_from_archive(queries, rows):
+        identifier = item["identifier"]
+        if identifier in pairs:
+            continue
+        response = requests.get(REAL_METADATA_URL + identifier, timeout=30)
+        response.raise_for_status()
+        originals = [f["name"] for f in response.json().get("files", [])
+                     if f.get("source") == "original" and not GENERATED_FILE_RE.search(f.get("name", ""))]
+        if not originals:
+            continue
+        pairs[identifier] = {
+            "filename": min(originals, key=str.casefold).rsplit('/', 1)[-1],
+            "identifier": identifier,
+            "title": item.get("title", ""),
+            "files": len(originals),
+        }
+        time.sleep(0.5)
+    return list(pairs.values())
+
+
+def save_fixtures(items: List[Dict[str, Any]], path: Path = FIXTURES_FILE, source: str = ""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"source": source, "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "items": items},
+                  f, ensure_ascii=False, indent=1)
+    print(f"💾 {len(items)} iteme salvate în {path}")
+
+
+def main():
+    """Funcția principală"""
+    parser = argparse.ArgumentParser(description="Server local care imită archive.org")
+    sub = parser.add_subparsers(dest="command")
+
+    serve = sub.add_parser("serve", help="Pornește serverul")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--fixtures", default=str(FIXTURES_FILE))
+    serve.add_argument("--latency-ms", type=float, default=0.0)
+    serve.add_argument("--jitter-ms", type=float, default=0.0)
+    serve.add_argument("--error-rate", type=float, default=0.0)
+    serve.add_argument("--max-rps", type=float, default=None)
+
+    record = sub.add_parser("record", help="Înregistrează fixture-uri")
+    record.add_argument("--from-logs", help="Folder cu deleted_folders_*.json")
+    record.add_argument("--query", action="append", default=[], help="Interogare reală scrape API (repetabil)")
+    record.add_argument("--limit", type=int, default=600)
+    record.add_argument("--pairs", action="store_true",
+                        help="Perechi reale fișier -> identifier pentru benchmark_identifier_predictor.py")
+    record.add_argument("--output", default=None)
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        if args.pairs:
+            items = record_identifier_pairs(args.query)
+            source = f"scrape + metadata API: {', '.join(args.query)}"
+            output = args.output or IDENTIFIER_PAIRS_FILE
+        elif args.from_logs:
+            items = build_fixtures_from_logs(args.from_logs, args.limit)
+            source = f"deleted_folders logs: {args.from_logs}"
+            output = args.output or FIXTURES_FILE
+        else:
+            items = record_from_archive(args.query)
+            source = f"scrape API: {', '.join(args.query)}"
+            output = args.output or FIXTURES_FILE
+        save_fixtures(items, Path(output), source)
+        return
+
+    if args.command != "serve":
+        parser.print_help()
+        return
+
+    server = MockArchiveServer(MockArchive.from_file(Path(args.fixtures)), port=args.port,
+                               latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                               error_rate=args.error_rate, max_rps=args.max_rps)
+    print(f"🧪 Mock archive.org pornit pe {server.base_url} ({len(server.archive.items)} iteme)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⚠ Oprit de utilizator")
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Index MinHash/LSH pentru cărțile duplicate local sub nume ușor diferite.
+
+Același titlu ajunge des în două foldere (ex: "Panaitescu, P P" și
+"Panaitescu, P", sau autor/titlu inversate), uneori sub litere diferite din
+ARHIVA. Comparația fuzzy a tuturor perechilor e pătratică; aici fiecare
+titlu normalizat primește o semnătură MinHash peste shingle-uri de caractere,
+iar benzile LSH aduc doar perechile candidate (timp aproape liniar).
+
+Rezultat:
+- raport JSON cu clusterele (folder păstrat + duplicate, similaritate estimată)
+- opțional, lista de foldere de sărit, citită de uploader ("+FINAL 3")
+
+Titlurile care diferă prin numere (volume, ediții, ani) nu sunt considerate duplicate.
+
+Folosire:
+    python archive_near_duplicates.py g:\\ARHIVA
+    python archive_near_duplicates.py g:\\ARHIVA --threshold 0.85 --write-skip-list
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from archive_title_normalizer import clean_title_uploader, remove_diacritics
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+DEFAULT_ROOT = Path(r"g:\ARHIVA")
+REPORT_FILE = "near_duplicates_report.json"
+SKIP_LIST_FILE = "near_duplicates_skip.json"
+
+BOOK_EXTENSIONS = ['.pdf', '.epub', '.mobi', '.djvu', '.docx', '.doc', '.lit', '.rtf']
+SHINGLE_SIZE = 3
+NUM_PERM = 128
+BANDS = 16  # 16 benzi × 8 rânduri => prag LSH ≈ 0.71
+THRESHOLD = 0.8  # Similaritate Jaccard estimată minimă pentru duplicat
+MAX_BUCKET_PAIRS = 50  # Peste această mărime, bucket-ul e legat liniar (nu toate perechile)
+
+MERSENNE_PRIME = (1 << 31) - 1
+NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+NUMBERS_RE = re.compile(r'\d+')
+
+
+def normalize_title(filename: str) -> str:
+    """Titlul folosit la comparație: curățat, fără diacritice, doar litere/cifre"""
+    title = remove_diacritics(clean_title_uploader(filename)).lower()
+    return ' '.join(NON_ALNUM_RE.sub(' ', title).split())
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """Shingle-uri de caractere, hash-uite stabil (crc32) în [0, 2^31 - 1)"""
+    text = f" {text} "
+    if len(text) <= size:
+        return {zlib.crc32(text.encode('utf-8')) % MERSENNE_PRIME}
+    return {zlib.crc32(text[i:i + size].encode('utf-8')) % MERSENNE_PRIME
+            for i in range(len(text) - size + 1)}
+
+
+class MinHasher:
+    """Semnături MinHash cu permutări (a*x + b) mod p"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.a = [rng.randrange(1, MERSENNE_PRIME) for _ in range(num_perm)]
+        self.b = [rng.randrange(0, MERSENNE_PRIME) for _ in range(num_perm)]
+        if NUMPY_AVAILABLE:
+            self._a = np.array(self.a, dtype=np.uint64)[:, None]
+            self._b = np.array(self.b, dtype=np.uint64)[:, None]
+
+    def signature(self, hashes: Set[int]) -> Tuple[int, ...]:
+        if NUMPY_AVAILABLE:
+            values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))[None, :]
+            # a, x < 2^31 => a*x + b < 2^63, fără overflow pe uint64
+            return tuple(((self._a * values + self._b) % MERSENNE_PRIME).min(axis=1).tolist())
+        return tuple(min((a * x + b) % MERSENNE_PRIME for x in hashes) for a, b in zip(self.a, self.b))
+
+
+class NearDuplicateIndex:
+    """MinHash + benzi LSH; clusterele se formează cu union-find peste perechile verificate"""
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS, threshold: float = THRESHOLD):
+        if num_perm % bands:
+            raise ValueError("num_perm trebuie să fie multiplu de bands")
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.keys: List[str] = []
+        self.titles: List[str] = []
+        self.numbers: List[Tuple[str, ...]] = []
+        self.signatures: List[Tuple[int, ...]] = []
+        self.buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(bands)]
+
+    def add(self, key: str, title: str):
+        """Adaugă un titlu normalizat sub o cheie (ex: calea folderului)"""
+        item = len(self.keys)
+        signature = self.hasher.signature(shingles(title))
+        self.keys.append(key)
+        self.titles.append(title)
+        self.numbers.append(tuple(NUMBERS_RE.findall(title)))
+        self.signatures.append(signature)
+        for band in range(self.bands):
+            band_key = signature[band * self.rows:(band + 1) * self.rows]
+            self.buckets[band].setdefault(band_key, []).append(item)
+
+    def similarity(self, i: int, j: int) -> float:
+        """Jaccard estimat din semnături"""
+        sig_i, sig_j = self.signatures[i], self.signatures[j]
+        return sum(1 for x, y in zip(sig_i, sig_j) if x == y) / len(sig_i)
+
+    def candidate_pairs(self) -> Iterable[Tuple[int, int]]:
+        seen: Set[Tuple[int, int]] = set()
+        for band_buckets in self.buckets:
+            for members in band_buckets.values():
+                if len(members) < 2:
+                    continue
+                if len(members) <= MAX_BUCKET_PAIRS:
+                    pairs = ((members[x], members[y]) for x in range(len(members))
+                             for y in range(x + 1, len(members)))
+                else:
+                    pairs = ((members[0], m) for m in members[1:])
+                for pair in pairs:
+                    if pair not in seen:
+                        seen.add(pair)
+                        yield pair
+
+    def clusters(self) -> List[Dict[str, Any]]:
+        """Clusterele de duplicate (>= 2 membri), cu similaritatea minimă verificată"""
+        parent = list(range(len(self.keys)))
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        pair_scores: Dict[int, float] = {}
+        for i, j in self.candidate_pairs():
+            if self.numbers[i] != self.numbers[j]:
+                continue  # Volume/ediții diferite
+            score = self.similarity(i, j)
+            if score >= self.threshold:
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j:
+                    parent[root_j] = root_i
+                    pair_scores[root_i] = min(pair_scores.get(root_i, 1.0), pair_scores.get(root_j, 1.0), score)
+
+        groups: Dict[int, List[int]] = {}
+        for item in range(len(self.keys)):
+            groups.setdefault(find(item), []).append(item)
+
+        result = []
+        for root, members in groups.items():
+            if len(members) > 1:
+                result.append({"members": members, "min_similarity": round(pair_scores.get(root, 1.0), 3)})
+        return result
+
+
+def scan_inventory(root: Path) -> List[Dict[str, Any]]:
+    """O intrare per folder cu cărți: fișierul reprezentativ (primul PDF sau extensia prioritară)"""
+    units = []
+    for current, dirs, files in os.walk(root):
+        books = [f for f in files if os.path.splitext(f)[1].lower() in BOOK_EXTENSIONS]
+        if not books:
+            continue
+        books.sort()
+        pdfs = [f for f in books if f.lower().endswith('.pdf')]
+        if pdfs:
+            representative = pdfs[0]
+        else:
+            representative = min(books, key=lambda f: BOOK_EXTENSIONS.index(os.path.splitext(f)[1].lower()))
+        size = 0
+        for f in books:
+            try:
+                size += os.path.getsize(os.path.join(current, f))
+            except OSError:
+                pass
+        units.append({"path": current, "representative": representative, "files": len(books), "size": size})
+    return units
+
+
+def find_near_duplicates(units: List[Dict[str, Any]], threshold: float = THRESHOLD) -> List[Dict[str, Any]]:
+    """Clusterele de foldere duplicate; păstrează folderul cu mai multe fișiere / mai mare"""
+    index = NearDuplicateIndex(threshold=threshold)
+    for unit in units:
+        title = normalize_title(unit["representative"])
+        if title:
+            index.add(unit["path"], title)
+
+    by_path = {unit["path"]: unit for unit in units}
+    clusters = []
+    for cluster in index.clusters():
+        members = [by_path[index.keys[i]] for i in cluster["members"]]
+        members.sort(key=lambda u: (-u["files"], -u["size"], u["path"]))
+        clusters.append({
+            "keep": members[0],
+            "duplicates": members[1:],
+            "title": normalize_title(members[0]["representative"]),
+            "min_similarity": cluster["min_similarity"],
+        })
+    clusters.sort(key=lambda c: (-len(c["duplicates"]), c["title"]))
+    return clusters
+
+
+def save_report(clusters: List[Dict[str, Any]], root: Path, units: int, seconds: float, path: str = REPORT_FILE):
+    report = {
+        "generated": datetime.now().isoformat(),
+        "root": str(root),
+        "units_scanned": units,
+        "clusters": len(clusters),
+        "duplicate_folders": sum(len(c["duplicates"]) for c in clusters),
+        "seconds": round(seconds, 2),
+        "results": clusters,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def save_skip_list(clusters: List[Dict[str, Any]], path: str = SKIP_LIST_FILE):
+    """Folderele duplicate (nu cel păstrat), în formatul citit de load_skip_list"""
+    skip = sorted(os.path.normcase(d["path"]) for c in clusters for d in c["duplicates"])
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"generated": datetime.now().isoformat(), "skip": skip}, f, ensure_ascii=False, indent=2)
+    return skip
+
+
+def load_skip_list(path: str = SKIP_LIST_FILE) -> Set[str]:
+    """Căile de sărit (normcase); set gol dacă lista nu a fost generată"""
+    if not os.path.exists(path):
+        return set()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return {os.path.normcase(p) for p in json.load(f).get("skip", [])}
+    except Exception as e:
+        print(f"⚠ Nu am putut citi lista de duplicate locale {path}: {e}")
+        return set()
+
+
+def main():
+    """Funcția principală"""
+    parser = argparse.ArgumentParser(description="Duplicate locale (MinHash/LSH) în toată ARHIVA")
+    parser.add_argument("root", nargs="?", default=str(DEFAULT_ROOT))
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--report", default=REPORT_FILE)
+    parser.add_argument("--write-skip-list", action="store_true",
+                        help=f"Scrie {SKIP_LIST_FILE} (folosit de uploader pentru a sări duplicatele)")
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    if not root.exists():
+        print(f"❌ Directorul nu există: {root}")
+        return 1
+
+    started = time.time()
+    print(f"📂 Scanez inventarul din {root}...")
+    units = scan_inventory(root)
+    print(f"📚 {len(units)} foldere cu cărți")
+    if not NUMPY_AVAILABLE:
+        print("⚠️ numpy lipsește - semnăturile MinHash se calculează mai lent (pip install numpy)")
+
+    clusters = find_near_duplicates(units, args.threshold)
+    seconds = time.time() - started
+    save_report(clusters, root, len(units), seconds, args.report)
+
+    print(f"\n🔍 {len(clusters)} clustere, {sum(len(c['duplicates']) for c in clusters)} foldere duplicate ({seconds:.1f}s)")
+    for cluster in clusters[:20]:
+        print(f"\n📖 {cluster['title']} (similaritate ≥ {cluster['min_similarity']:.2f})")
+        print(f"   ✅ Păstrez: {cluster['keep']['path']}")
+        for duplicate in cluster["duplicates"]:
+            print(f"   🔁 Duplicat: {duplicate['path']}")
+    print(f"\n💾 Raport: {args.report}")
+
+    if args.write_skip_list:
+        skip = save_skip_list(clusters)
+        print(f"⏭️ Lista de sărit ({len(skip)} foldere): {SKIP_LIST_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
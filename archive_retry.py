@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reîncercarea automată a upload-urilor eșuate, cu backoff după clasa erorii.
+
+copy_error_files_to_temp copia fiecare fișier cu eroare (plus un _INFO.txt) în
+g:\\TEMP, de unde era reîncărcat de mână într-o rulare ulterioară - gigaocteți
+dublați pe disc și un drum manual. Aici unitatea eșuată revine în coada de
+lucru (archive_work_queue.py) cu un moment de reîncercare:
+- SlowDown / 503 / 500 / erori de rețea: reîncercare curând, backoff exponențial
+- 400 / BadContent / InvalidArgument: doar după ce fișierele trec din nou de
+  validarea structurală (archive_file_validator.py)
+- 403 / AccessDenied: fără reîncercare (cheile sau drepturile, nu fișierul)
+- TAB_CLOSED / TAB_LOST: fără reîncercare - upload-ul poate să fi reușit, o
+  reîncărcare ar dubla item-ul
+După MAX_UPLOAD_ATTEMPTS lansări unitatea rămâne failed, cu istoricul erorilor.
+report() arată, per unitate: încercări, erorile fiecăreia și rezultatul final.
+
+Folosire:
+    retry = RetryEngine(work_queue)
+    retry.record_failure("Autor\\Carte", [error_info])
+    for name in retry.wait_for_due():
+        ...
+    print("\\n".join(retry.report()))
+"""
+
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from archive_work_queue import FAILED, INVALID, QUEUED, VERIFIED, WorkQueue
+
+MAX_UPLOAD_ATTEMPTS = 3          # Lansări per unitate, inclusiv prima
+BACKOFF_FACTOR = 2.0             # Întârzierea se dublează la fiecare încercare
+MAX_RETRY_DELAY = 60 * 60        # Plafonul backoff-ului
+RETRY_MAX_WAIT = 30 * 60         # Cât așteaptă rularea curentă o reîncercare; peste, rămâne pentru rularea următoare
+
+# Clasa erorii -> politica: reîncercare, întârzierea de bază (secunde), validare înainte
+RETRY_POLICIES = {
+    "throttled": {"retry": True, "base_delay": 120, "validate": False},
+    "server": {"retry": True, "base_delay": 300, "validate": False},
+    "network": {"retry": True, "base_delay": 60, "validate": False},
+    "browser": {"retry": True, "base_delay": 30, "validate": False},
+    "content": {"retry": True, "base_delay": 60, "validate": True},
+    "auth": {"retry": False, "base_delay": 0, "validate": False},
+    "unknown_outcome": {"retry": False, "base_delay": 0, "validate": False},
+}
+
+# Codurile S3 (<Code> din XML, text din IAS3Error) au prioritate față de statusul HTTP
+S3_CODE_CLASSES = {
+    "SlowDown": "throttled", "ServiceUnavailable": "throttled", "TooManyRequests": "throttled",
+    "InternalError": "server", "RequestTimeout": "network",
+    "BadContent": "content", "InvalidArgument": "content", "MalformedXML": "content",
+    "InvalidDigest": "content", "EntityTooLarge": "content",
+    "AccessDenied": "auth", "InvalidAccessKeyId": "auth", "SignatureDoesNotMatch": "auth",
+}
+ERROR_CODE_CLASSES = {
+    "503": "throttled", "429": "throttled",
+    "500": "server", "502": "server", "504": "server", "505": "server", "404": "server",
+    "400": "content", "411": "content",
+    "401": "auth", "403": "auth",
+    "NETWORK": "network", "OUT_OF_MEMORY": "browser",
+    "TAB_CLOSED": "unknown_outcome", "TAB_LOST": "unknown_outcome",
+}
+S3_CODE_RE = re.compile(r'\b(' + '|'.join(S3_CODE_CLASSES) + r')\b')
+HTTP_STATUS_RE = re.compile(r'\bHTTP (\d{3})\b')
+
+
+def classify_error(error: Dict[str, Any]) -> str:
+    """Clasa erorii (cheie din RETRY_POLICIES) din error_code / error_status / error_details"""
+    text = " ".join(str(error.get(key, "")) for key in ("error_status", "error_details"))
+    s3_code = S3_CODE_RE.search(text)
+    if s3_code:
+        return S3_CODE_CLASSES[s3_code.group(1)]
+    code = str(error.get("error_code", ""))
+    status = HTTP_STATUS_RE.search(text)
+    if status and code in ("", "NETWORK"):
+        code = status.group(1)  # Răspuns HTTP ajuns printr-o eroare de transport (IAS3, loadingFailed)
+    if code in ERROR_CODE_CLASSES:
+        return ERROR_CODE_CLASSES[code]
+    if "net::err" in text.lower() or "timed out" in text.lower():
+        return "network"
+    return "server"
+
+
+def retry_delay(error_class: str, attempt: int) -> float:
+    """Backoff exponențial per clasă: base_delay * BACKOFF_FACTOR^(încercare-1), plafonat"""
+    base = RETRY_POLICIES[error_class]["base_delay"]
+    return min(MAX_RETRY_DELAY, base * BACKOFF_FACTOR ** max(0, attempt - 1))
+
+
+class RetryEngine:
+    """Decide, per unitate eșuată, reîncercarea (cu moment și validare) sau eșecul final"""
+
+    def __init__(self, work_queue: WorkQueue, max_attempts: int = MAX_UPLOAD_ATTEMPTS):
+        self.work_queue = work_queue
+        self.max_attempts = max_attempts
+
+    def record_failure(self, name: str, errors: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Înregistrează erorile încercării curente; întoarce decizia {outcome, error_class, retry_at}"""
+        error = errors[0]
+        error_classes = [classify_error(e) for e in errors]
+        # Cea mai restrictivă clasă decide: o eroare fără reîncercare bate una trecătoare
+        error_class = next((c for c in error_classes if not RETRY_POLICIES[c]["retry"]),
+                           next((c for c in error_classes if RETRY_POLICIES[c]["validate"]), error_classes[0]))
+        policy = RETRY_POLICIES[error_class]
+
+        with self.work_queue.lock:
+            entry = self.work_queue.entries.get(name)
+            if entry is None:
+                return {"outcome": "unknown", "error_class": error_class, "retry_at": "", "detail": "nu e în coadă"}
+            attempt = max(1, entry["attempts"])
+            entry.setdefault("errors", []).append({
+                "attempt": attempt, "error_code": str(error.get("error_code", "")), "error_class": error_class,
+                "status": str(error.get("error_status", ""))[:200], "at": datetime.now().isoformat(),
+            })
+
+        if not policy["retry"]:
+            outcome, retry_at = "final", ""
+            detail = f"{error.get('error_code')} ({error_class}) - fără reîncercare automată"
+        elif attempt >= self.max_attempts:
+            outcome, retry_at = "final", ""
+            detail = f"{error.get('error_code')} ({error_class}) - {attempt}/{self.max_attempts} încercări epuizate"
+        else:
+            outcome = "retry"
+            retry_at = (datetime.now() + timedelta(seconds=retry_delay(error_class, attempt))).isoformat()
+            detail = f"{error.get('error_code')} ({error_class}) - reîncercare {attempt + 1}/{self.max_attempts}"
+
+        if outcome == "retry":
+            self.work_queue.transition(name, QUEUED, tab="", address="", detail=detail, retry_at=retry_at,
+                                       needs_validation=policy["validate"], outcome="")
+        else:
+            self.work_queue.transition(name, FAILED, detail=detail, retry_at="", outcome="failed")
+        return {"outcome": outcome, "error_class": error_class, "retry_at": retry_at, "detail": detail}
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Unitățile queued cu reîncercare programată (cele peste limită trec în failed)"""
+        pending = []
+        for entry in self.work_queue.in_state(QUEUED):
+            if not entry.get("retry_at"):
+                continue
+            if entry["attempts"] >= self.max_attempts:
+                self.work_queue.transition(entry["name"], FAILED, retry_at="", outcome="failed",
+                                           detail=f"{entry['attempts']}/{self.max_attempts} încercări epuizate")
+            else:
+                pending.append(entry)
+        return pending
+
+    def wait_for_due(self, max_wait: float = RETRY_MAX_WAIT) -> List[str]:
+        """Așteaptă prima reîncercare (dacă vine în max_wait); întoarce unitățile scadente, în ordinea cozii"""
+        pending = self.pending()
+        if not pending:
+            return []
+        earliest = min(datetime.fromisoformat(entry["retry_at"]) for entry in pending)
+        wait = (earliest - datetime.now()).total_seconds()
+        if wait > max_wait:
+            print(f"⏰ {len(pending)} reîncercări programate, prima la {earliest:%H:%M} - rămân pentru rularea următoare")
+            return []
+        if wait > 0:
+            print(f"⏳ Backoff: aștept {wait:.0f}s până la următoarea reîncercare ({len(pending)} programate)...")
+            time.sleep(wait)
+        now = datetime.now().isoformat()
+        return [entry["name"] for entry in self.pending() if entry["retry_at"] <= now]
+
+    def needs_validation(self, name: str) -> bool:
+        with self.work_queue.lock:
+            return self.work_queue.entries.get(name, {}).get("needs_validation", False)
+
+    def report(self) -> List[str]:
+        """Câte o linie per unitate reîncercată/eșuată: încercări, erori, rezultat"""
+        lines = []
+        with self.work_queue.lock:
+            entries = [dict(e) for e in self.work_queue.entries.values() if e.get("errors")]
+        for entry in entries:
+            codes = ", ".join(f"#{e['attempt']} {e['error_code']}" for e in entry["errors"])
+            if entry["state"] == VERIFIED:
+                icon, outcome = "✅", "reușit"
+            elif entry["state"] == FAILED:
+                icon, outcome = "❌", f"eșec final: {entry['detail']}"
+            elif entry["state"] == INVALID:
+                icon, outcome = "🩺", "fișiere invalide la revalidare - neîncărcată"
+            elif entry["state"] == QUEUED and entry.get("retry_at"):
+                icon, outcome = "⏰", f"reîncercare la {entry['retry_at'][11:16]}"
+            else:
+                icon, outcome = "⏳", entry["state"]
+            lines.append(f"{icon} {entry['name']}: {entry['attempts']} încercări ({codes}) - {outcome}")
+        return lines
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Coalescing pentru cererile identice către archive.org (singleflight).
+
+Cărțile aceluiași autor generează des interogări identice (strategia
+`autor_titlu` pentru lucrări în mai multe volume, prefixele de 2/4 cuvinte din
+`exists_on_archive` etc.). Când o cerere cu aceeași cheie este deja în zbor,
+apelanții următori așteaptă același Future în loc să trimită o cerere duplicat.
+
+Folosire:
+    flight = SingleFlight("advancedsearch")
+    data = flight.do(request_key("GET", url, params), fetch_json, url, params)
+    print(flight.summary())
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def request_key(method: str, url: str, params: Optional[Dict[str, Any]] = None) -> Tuple:
+    """Construiește o cheie canonică (hashable) pentru o cerere HTTP"""
+    items = []
+    for name, value in sorted((params or {}).items()):
+        if isinstance(value, (list, tuple)):
+            value = tuple(str(v) for v in value)
+        else:
+            value = str(value)
+        items.append((name, value))
+    return (method.upper(), url, tuple(items))
+
+
+class SingleFlight:
+    """Execută o singură dată cererile identice aflate simultan în zbor"""
+
+    def __init__(self, name: str = "archive.org"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+
+        # Statistici
+        self.calls = 0
+        self.executed = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Rulează fn(*args, **kwargs) sau așteaptă rezultatul cererii identice deja în zbor"""
+        with self._lock:
+            self.calls += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._inflight[key] = future
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            # Excepția cererii originale ajunge și la apelanții coalescați
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                self.errors += 1
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        # Scoate cheia ÎNAINTE de a publica rezultatul, ca apelurile ulterioare să pornească o cerere nouă
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_result(result)
+        return result
+
+    def in_flight(self) -> int:
+        """Numărul de cereri distincte aflate acum în zbor"""
+        with self._lock:
+            return len(self._inflight)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returnează statisticile de coalescing"""
+        with self._lock:
+            calls = self.calls
+            return {
+                "name": self.name,
+                "calls": calls,
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "coalesced_pct": round(self.coalesced * 100.0 / calls, 1) if calls else 0.0,
+            }
+
+    def summary(self) -> str:
+        """Linie de raport cu numărul de cereri coalescate"""
+        s = self.stats()
+        return (f"🔁 Coalescing {s['name']}: {s['calls']} cereri, {s['executed']} trimise, "
+                f"{s['coalesced']} coalescate ({s['coalesced_pct']:.1f}%), {s['errors']} erori")
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ciclul de viață al tab-urilor de upload din Chrome.
+
+Politica "ZERO TAB CLOSURES" făcea ca upload_tabs să crească la nesfârșit până
+când Chrome murea cu out-of-memory (raportat apoi ca OUT_OF_MEMORY de
+check_single_tab_for_errors) și toate tab-urile se pierdeau la restart.
+Aici fiecare tab are o stare:
+- uploading: upload în curs - nu se atinge
+- succeeded: succes confirmat pozitiv (redirect la /details/<id> sau mesaj de
+  upload terminat în #progress_msg) - tab-ul se închide
+- failed: eroare vizibilă în pagină sau tab închis - tab-ul rămâne deschis
+  pentru check_for_errors_after_upload și investigare
+
+Cel mult MAX_LIVE_UPLOAD_TABS upload-uri în curs; wait_for_capacity() ține
+upload-ul nou până se eliberează un loc. Un tab fără semnal clar rămâne
+uploading - niciun tab nu se închide pe presupuneri, iar o sondă care nu
+răspunde (timeout WebDriver, referință stale) nu îl face failed.
+
+Folosire:
+    tabs = UploadTabManager(driver)
+    tabs.wait_for_capacity()
+    ... deschide tab-ul, pornește upload-ul ...
+    tabs.register(handle, folder_name)
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+MAX_LIVE_UPLOAD_TABS = 8
+TAB_POLL_INTERVAL = 15           # Secunde între verificările tab-urilor când nu mai e loc
+MAX_CAPACITY_WAIT = 2 * 60 * 60  # După 2 ore de așteptare, upload-ul nou pornește oricum
+
+UPLOADING = "uploading"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+LAUNCH_FAILED = "LAUNCH_FAILED"  # Detaliul tab-urilor în care upload-ul nu a pornit (rămân pe /upload)
+
+# Textele din #progress_msg care confirmă finalizarea (lowercase)
+SUCCESS_MESSAGES = ["upload complete", "upload successful", "successfully uploaded", "your item is ready"]
+FAILURE_MESSAGES = ["network problem", "there was an error", "upload failed", "please try again"]
+MEMORY_ERROR_TITLES = ["not enough memory", "out of memory", "aw, snap"]
+
+PROBE_JS = """
+var progress = document.getElementById('progress_msg');
+var overlay = document.getElementById('overlay_alert');
+return {
+    url: location.href,
+    title: document.title,
+    progress: progress ? (progress.textContent || '').trim() : '',
+    overlay: !!(overlay && overlay.offsetParent !== null),
+    upload_button: !!document.getElementById('upload_button')
+};
+"""
+
+
+class UploadTab:
+    """Un tab de upload și starea lui"""
+
+    def __init__(self, handle: str, folder_name: str):
+        self.handle = handle
+        self.folder_name = folder_name
+        self.state = UPLOADING
+        self.detail = ""
+        self.identifier = ""
+        self.opened_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.closed = False
+
+    def minutes_open(self) -> float:
+        end = self.finished_at or datetime.now()
+        return (end - self.opened_at).total_seconds() / 60
+
+
+def classify_tab(probe: Dict[str, Any]) -> Dict[str, str]:
+    """Starea unui tab din valorile citite în pagină: {'state', 'detail', 'identifier'}"""
+    parsed = urlparse(probe.get("url") or "")
+    path_parts = [p for p in parsed.path.split('/') if p]
+    title = (probe.get("title") or "").lower()
+    progress = (probe.get("progress") or "").lower()
+
+    if "archive.org" in parsed.netloc and len(path_parts) >= 2 and path_parts[0] == "details":
+        return {"state": SUCCEEDED, "detail": f"redirect la /details/{path_parts[1]}", "identifier": path_parts[1]}
+    if any(text in progress for text in SUCCESS_MESSAGES):
+        return {"state": SUCCEEDED, "detail": probe.get("progress", ""), "identifier": ""}
+    if any(text in title for text in MEMORY_ERROR_TITLES):
+        return {"state": FAILED, "detail": "OUT_OF_MEMORY", "identifier": ""}
+    if probe.get("overlay") or any(text in progress for text in FAILURE_MESSAGES):
+        return {"state": FAILED, "detail": probe.get("progress") or "overlay_alert vizibil", "identifier": ""}
+    return {"state": UPLOADING, "detail": probe.get("progress", ""), "identifier": ""}
+
+
+class UploadTabManager:
+    """Urmărește tab-urile de upload, închide doar ce s-a terminat confirmat, limitează tab-urile vii"""
+
+    def __init__(self, driver: Any = None, max_live_tabs: int = MAX_LIVE_UPLOAD_TABS,
+                 poll_interval: float = TAB_POLL_INTERVAL, on_settle: Optional[Callable[[UploadTab], None]] = None):
+        self.driver = driver
+        self.on_settle = on_settle  # Ex. WorkQueue.settle_tab: starea finală ajunge și în coada persistentă
+        self.max_live_tabs = max(1, max_live_tabs)
+        self.poll_interval = poll_interval
+        self.tabs: Dict[str, UploadTab] = {}
+        self.closed = 0
+        self.lock = threading.RLock()  # Starea poate fi actualizată și de UploadMonitor (alt thread)
+
+    def attach(self, driver: Any):
+        """Driver nou după restart: tab-urile vechi s-au pierdut odată cu Chrome"""
+        self.driver = driver
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.tabs = {}
+
+    def register(self, handle: str, folder_name: str) -> UploadTab:
+        tab = UploadTab(handle, folder_name)
+        with self.lock:
+            self.tabs[handle] = tab
+        return tab
+
+    def handles(self) -> List[str]:
+        """Tab-urile încă deschise (în curs sau eșuate)"""
+        with self.lock:
+            return [handle for handle, tab in self.tabs.items() if not tab.closed]
+
+    def uploading(self) -> List[UploadTab]:
+        with self.lock:
+            return [tab for tab in self.tabs.values() if tab.state == UPLOADING]
+
+    def failed(self) -> List[UploadTab]:
+        with self.lock:
+            return [tab for tab in self.tabs.values() if tab.state == FAILED]
+
+    def settle(self, tab: UploadTab, status: Dict[str, str]) -> bool:
+        """Trece tab-ul în starea finală o singură dată; True dacă starea s-a schimbat acum"""
+        with self.lock:
+            if tab.state != UPLOADING or status["state"] == UPLOADING:
+                return False
+            tab.state = status["state"]
+            tab.detail = status["detail"]
+            tab.identifier = status["identifier"]
+            tab.finished_at = datetime.now()
+        if self.on_settle:
+            self.on_settle(tab)
+        if tab.state == SUCCEEDED:
+            print(f"   ✅ Upload confirmat pentru {tab.folder_name} ({tab.detail}, {tab.minutes_open():.0f} min)")
+        else:
+            print(f"   🚨 Upload eșuat pentru {tab.folder_name}: {tab.detail} - tab-ul rămâne deschis pentru verificare")
+        return True
+
+    def launch_failed(self, handle: str, reason: str = "") -> bool:
+        """Upload-ul nu a pornit (navigare, input de fișiere, formular): tab-ul nu mai ocupă un loc de upload"""
+        with self.lock:
+            tab = self.tabs.get(handle)
+        if tab is None:
+            return False
+        detail = f"{LAUNCH_FAILED}: {reason}" if reason else LAUNCH_FAILED
+        return self.settle(tab, {"state": FAILED, "detail": detail, "identifier": ""})
+
+    def _home_handle(self, exclude: str = "") -> Optional[str]:
+        """Un tab care nu e de upload (sau primul rămas), pentru a reveni după verificare"""
+        handles = [h for h in self.driver.window_handles if h != exclude]
+        for handle in handles:
+            if handle not in self.tabs:
+                return handle
+        return handles[0] if handles else None
+
+    def _probe(self, tab: UploadTab) -> Dict[str, str]:
+        try:
+            if tab.handle not in self.driver.window_handles:
+                return {"state": FAILED, "detail": "TAB_CLOSED", "identifier": ""}
+            self.driver.switch_to.window(tab.handle)
+            return classify_tab(self.driver.execute_script(PROBE_JS) or {})
+        except Exception as e:
+            if type(e).__name__ == "NoSuchWindowException":  # Fără import selenium: modulul merge și fără el
+                return {"state": FAILED, "detail": "TAB_CLOSED", "identifier": ""}
+            # Timeout WebDriver, referință stale: sondă neconcludentă, tab-ul poate încă încărca -
+            # un FAILED aici ar reîncărca (RetryEngine) un item al cărui transfer rulează încă
+            detail = str(e).splitlines()[0] if str(e) else type(e).__name__
+            return {"state": UPLOADING, "detail": f"sondă neconcludentă: {detail}", "identifier": ""}
+
+    def _close(self, tab: UploadTab):
+        try:
+            self.driver.switch_to.window(tab.handle)
+            self.driver.close()
+            tab.closed = True
+            self.closed += 1
+        except Exception as e:
+            print(f"   ⚠ Nu am putut închide tab-ul {tab.handle}: {e}")
+
+    def to_close(self) -> List[UploadTab]:
+        """Tab-urile terminate cu succes și încă deschise"""
+        with self.lock:
+            return [tab for tab in self.tabs.values() if tab.state == SUCCEEDED and not tab.closed]
+
+    def refresh(self, probe: bool = True) -> Dict[str, int]:
+        """Verifică tab-urile în curs prin driver (probe=False: doar închide ce e deja confirmat)"""
+        if not self.driver or not (self.to_close() or (probe and self.uploading())):
+            return self.counts()
+        try:
+            current = self.driver.current_window_handle
+        except Exception:
+            current = None
+
+        if probe:
+            for tab in self.uploading():
+                self.settle(tab, self._probe(tab))
+        for tab in self.to_close():
+            print(f"   🗙 Închid tab-ul upload-ului terminat: {tab.folder_name}")
+            self._close(tab)
+
+        try:
+            target = current if current in self.driver.window_handles else self._home_handle()
+            if target:
+                self.driver.switch_to.window(target)
+        except Exception:
+            pass
+        return self.counts()
+
+    def wait_for_capacity(self) -> bool:
+        """Așteaptă un loc liber pentru un upload nou; False dacă s-a depășit MAX_CAPACITY_WAIT"""
+        started = time.monotonic()
+        self.refresh()
+        announced = False
+        while len(self.uploading()) >= self.max_live_tabs:
+            if time.monotonic() - started > MAX_CAPACITY_WAIT:
+                print(f"⚠ {len(self.uploading())} upload-uri tot în curs după {MAX_CAPACITY_WAIT // 60} min - pornesc oricum")
+                return False
+            if not announced:
+                print(f"⏳ {len(self.uploading())}/{self.max_live_tabs} tab-uri de upload în curs - aștept să se termine unul...")
+                announced = True
+            time.sleep(self.poll_interval)
+            self.refresh()
+        return True
+
+    def counts(self) -> Dict[str, int]:
+        with self.lock:
+            states = [tab.state for tab in self.tabs.values()]
+        return {state: states.count(state) for state in (UPLOADING, SUCCEEDED, FAILED)}
+
+    def summary(self) -> str:
+        c = self.counts()
+        return (f"📋 Tab-uri de upload: {c[UPLOADING]} în curs, {c[SUCCEEDED]} terminate (închise), "
+                f"{c[FAILED]} eșuate (păstrate deschise)")
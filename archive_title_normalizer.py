@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Normalizarea titlurilor/numelor de fișiere, comună tuturor scripturilor.
+
+Fiecare curățitor existent are aici un profil care îi reproduce exact
+rezultatul, dar cu pattern-uri precompilate și cache LRU pe numele de fișier
+(același fișier e curățat de mai multe ori pe rulare: scanare, căutare, raport).
+
+Profile:
+    uploader_search     clean_title_for_search din FINAL 5 / FINAL 6
+    pure_web_search     clean_title_for_search din "Fara chrome cauta titluri cu sufixe 2"
+    alternativa_search  clean_title_for_search din "Alternativa ultima ClaudeAI FINAL BEST"
+    complex_normalize   _normalize_title din "archive_duplicate_checker-COMPLEX FINAL"
+    cleaner             _clean_title din archive_duplicate_checker.py
+    process_filename    process_filename din "Fara chrome cauta titluri cu sufixe 3 BUN" (și variantele identice)
+    aggressive_extract  extract_title_from_filename_improved din "++FINAL 1 BUN"
+    sanitize_title      sanitize_title din uploadere
+    match_key           normalize_filename_for_matching din uploadere
+    identifier_base     generate_identifier_base din "Fara chrome cauta titluri cu sufixe 2"
+    remove_diacritics   remove_diacritics din "Fara chrome cauta titluri cu sufixe 2"
+
+Folosire:
+    from archive_title_normalizer import normalize
+    title = normalize("uploader_search", filename)
+"""
+
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+CACHE_SIZE = 65536
+
+# Pattern-uri comune
+# - ' '.join(x.split()) == re.sub(r'\s+', ' ', x).strip() (același \s Unicode), dar mai rapid
+# - lookahead-ul (?=[...]) cu primele litere ale alternativelor nu schimbă potrivirile,
+#   dar evită încercarea tuturor alternativelor la fiecare poziție
+SPACES_RE = re.compile(r'\s+')
+DATE_SUFFIX_RE = re.compile(r'[_-]\d{6,8}$')
+NON_WORD_RE = re.compile(r'[^\w\s]')
+NON_WORD_DASH_RE = re.compile(r'[^\w\s-]')
+ROUND_BRACKETS_RE = re.compile(r'\s*\([^)]*\)')
+SQUARE_BRACKETS_RE = re.compile(r'\s*\[[^\]]*\]')
+
+# uploader_search (FINAL 5 / FINAL 6)
+UPLOADER_SUFFIXES = ['scan', 'ctrl', 'retail', r'cop\d+', 'Vp', 'draft', 'final', 'ocr', 'edit',
+                     'proof', 'beta', 'alpha', 'test', 'demo', 'sample', 'preview', 'full',
+                     'complete', 'fix', 'corrected']
+UPLOADER_BRACKETS_RE = re.compile(r'\s*[\(\[].*?[\)\]]')
+UPLOADER_VERSION_RE = re.compile(r'\b[vV]\.?\s*\d+([\.\-]\d+)*\b')
+UPLOADER_SUFFIX_RE = re.compile(r'\b(?=[scrvdfoepbat])(' + '|'.join(UPLOADER_SUFFIXES) + r')\b', re.IGNORECASE)
+UPLOADER_TRAILING_DASH_RE = re.compile(r'\s+[-–]\s*$')
+
+# pure_web_search
+PURE_WEB_SUFFIXES = {'retail', 'scan', 'ctrl', 'ocr', 'vp', 'draft', 'final', 'edit', 'copy', 'backup'}
+PURE_WEB_VERSION_RE = re.compile(r'^v\.?\d')
+
+# alternativa_search
+ALTERNATIVA_SUFFIXES = [
+    'scan', 'ctrl', 'retail', r'cop\d+', 'Vp', 'draft', 'final',
+    'ocr', 'OCR', 'edit', 'edited', 'rev', 'revised', 'proof',
+    'beta', 'alpha', 'test', 'demo', 'sample', 'preview',
+    'full', 'complete', 'fix', 'fixed', 'corrected'
+]
+ALTERNATIVA_DASH_VERSION_RE = re.compile(r'\s*[-–]\s*[vV]\.?\s*[\d\.]+[\d\.\-]*(?:\s+[A-Z]+)?(?:\s*[-–]\s*\d+)?$')
+ALTERNATIVA_VERSION_RE = re.compile(r'\s+[vV]\.?\s*[\d\.]+[\d\.\-]*(?:\s+[A-Z]+)?$')
+ALTERNATIVA_SUFFIX_RE = re.compile(f'^({"|".join(ALTERNATIVA_SUFFIXES)})$', re.IGNORECASE)
+LEADING_NUMBER_RE = re.compile(r'^\d+\.\s*')
+ALTERNATIVA_TRAILING_DASH_RE = re.compile(r'\s*[-–]\s*$')
+
+# complex_normalize
+COMPLEX_PATTERNS = [re.compile(p, re.IGNORECASE) for p in [
+    r'[_-]\d{6,8}$',  # Date
+    r'[\(\[].*?[\)\]]',  # Paranteze
+    r'\b(?=[vpn])(vol|volume|part|nr|no|v|ver|version)\.?\s*\d+\b',  # Volume/version
+    r'\b(?=[er])(ed|edit|edition|rev|revised)\b.*$',  # Ediții
+    r'\b(?=[sodcrfp])(scan(ned)?|ocr|digital|copy|retail|draft|final|proof)\b',  # Metadata
+    r'[_\s\-]+$'  # Separatori finale
+]]
+COMPLEX_SEPARATORS_RE = re.compile(r'[\s_\-]+')
+COMPLEX_MAIN_SEPARATOR_RE = re.compile(r'\s+-\s+')
+
+# cleaner (archive_duplicate_checker.py)
+CLEANER_PATTERNS = [re.compile(p, re.IGNORECASE) for p in [
+    r'[_-]\d{6,8}$',  # Data la sfârșit
+    r'\s*[\(\[].*?[\)\]]',  # Conținut între paranteze
+    r'\b[vV]\.?\s*\d+([\.\-]\d+)*\b',  # Numere de versiune
+    r'\b(?=[ev])(ed|edit|edition|version)\b.*$',  # Mențiuni de ediție
+    r'\b(?=[sodcr])(scan(ned)?|ocr|digital|copy|retail)\b',  # Termeni tehnici
+    r'[_\s]+$'  # Spații sau underscore la sfârșit
+]]
+CLEANER_SEPARATOR_RE = re.compile(r'\s+[-–]\s*')
+
+# process_filename
+PROCESS_WORDS_TO_REMOVE = {'retail', 'scan', 'ctrl', 'ocr', 'vp', 'istor',
+                           'trad', 'trad.', 'ed', 'edition', 'vol', 'tome'}
+PROCESS_PARENS_RE = re.compile(r'\([^)]*\)')
+DIGITS_RE = re.compile(r'\d+')
+WORD_RE = re.compile(r'\w+')
+
+# aggressive_extract (++FINAL 1)
+AGGRESSIVE_CLEANUP_WORDS = ['scan', 'ctrl', 'ocr', 'retail', 'foto', 'conv', 'convert',
+                            'epub', 'pdf', 'djvu', 'mobi', 'mmxii', 'mmxi', 'mmxx']
+# Cuvintele sunt delimitate de \b, deci o singură alternare = eliminările succesive originale
+AGGRESSIVE_CLEANUP_RE = re.compile(r'\b(?=[scorfepdm])(?:' + '|'.join(AGGRESSIVE_CLEANUP_WORDS) + r')\b', re.IGNORECASE)
+ISOLATED_NUMBER_RE = re.compile(r'\b\d+\b')
+AGGRESSIVE_SEPARATORS_RE = re.compile(r'[._\-]+')
+
+# identifier_base
+IDENTIFIER_INVALID_RE = re.compile(r'[^a-z0-9\s\.]')
+DASHES_RE = re.compile(r'-+')
+IDENTIFIER_MAX_LENGTH = 80
+
+
+class _DiacriticsTable(dict):
+    """Tabel de translatare completat la cerere: caracter -> NFD fără semnele combinante (Mn)"""
+
+    def __missing__(self, code: int) -> str:
+        value = ''.join(c for c in unicodedata.normalize('NFD', chr(code))
+                        if unicodedata.category(c) != 'Mn')
+        self[code] = value
+        return value
+
+
+DIACRITICS_TABLE = _DiacriticsTable()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def remove_diacritics(text: str) -> str:
+    """Elimină diacriticele din text"""
+    if text.isascii():
+        return text
+    return text.translate(DIACRITICS_TABLE)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def clean_title_uploader(filename: str) -> str:
+    """clean_title_for_search din uploadere (FINAL 5 / FINAL 6)"""
+    name = Path(filename).stem
+    name = DATE_SUFFIX_RE.sub('', name)
+    name = UPLOADER_BRACKETS_RE.sub('', name)
+    name = UPLOADER_VERSION_RE.sub('', name)
+    name = UPLOADER_SUFFIX_RE.sub('', name)
+    name = NON_WORD_DASH_RE.sub(' ', name)
+    name = UPLOADER_TRAILING_DASH_RE.sub('', name)
+    return ' '.join(name.split())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def clean_title_pure_web(filename: str) -> str:
+    """clean_title_for_search din ArchivePureWebChecker"""
+    name = Path(filename).stem
+    name = ROUND_BRACKETS_RE.sub('', name)
+    name = SQUARE_BRACKETS_RE.sub('', name)
+
+    parts = name.rsplit(' - ', 1)
+    if len(parts) == 2 and parts[1].strip().lower() in PURE_WEB_SUFFIXES:
+        name = parts[0]
+
+    name = NON_WORD_RE.sub(' ', name)
+    return ' '.join(w for w in name.split() if not PURE_WEB_VERSION_RE.match(w.lower()))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def clean_title_alternativa(filename: str) -> str:
+    """clean_title_for_search din "Alternativa ultima ClaudeAI FINAL BEST" """
+    name = Path(filename).stem
+    name = DATE_SUFFIX_RE.sub('', name)
+    name = ROUND_BRACKETS_RE.sub('', name)
+    name = SQUARE_BRACKETS_RE.sub('', name)
+    name = ALTERNATIVA_DASH_VERSION_RE.sub('', name)
+    name = ALTERNATIVA_VERSION_RE.sub('', name)
+
+    parts = name.rsplit(' - ', 1)
+    if len(parts) == 2 and ALTERNATIVA_SUFFIX_RE.match(parts[1].strip()):
+        name = parts[0]
+
+    if ' - ' in name:
+        author, title = name.split(' - ', 1)
+        name = f"{author} - {LEADING_NUMBER_RE.sub('', title)}"
+
+    return ALTERNATIVA_TRAILING_DASH_RE.sub('', ' '.join(name.split()))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_title_complex(filename: str) -> str:
+    """_normalize_title din archive_duplicate_checker-COMPLEX FINAL"""
+    name = Path(filename).stem
+    for pattern in COMPLEX_PATTERNS:
+        name = pattern.sub('', name)
+    name = COMPLEX_SEPARATORS_RE.sub(' ', name).strip()
+    return COMPLEX_MAIN_SEPARATOR_RE.sub(' - ', name)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def clean_title_cleaner(filename: str) -> str:
+    """_clean_title din ArchiveCleaner (archive_duplicate_checker.py)"""
+    name = Path(filename).stem
+    for pattern in CLEANER_PATTERNS:
+        name = pattern.sub('', name)
+    return ' '.join(CLEANER_SEPARATOR_RE.sub(' - ', name).split())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _process_filename(filepath: str) -> Tuple[str, Tuple[str, ...]]:
+    filename = os.path.splitext(os.path.basename(filepath))[0]
+    filename = PROCESS_PARENS_RE.sub('', filename)
+    filename = DIGITS_RE.sub('', filename)
+    words = [w for w in WORD_RE.findall(filename.lower()) if w not in PROCESS_WORDS_TO_REMOVE]
+    return ' '.join(words), tuple(words)
+
+
+def process_filename(filepath: str) -> Tuple[str, List[str]]:
+    """process_filename din scripturile "sufixe 3 BUN" / "Cu BackUp": (query, cuvinte)"""
+    query, words = _process_filename(filepath)
+    return query, list(words)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def extract_title_from_filename(filepath: str) -> Tuple[str, str]:
+    """extract_title_from_filename_improved din ++FINAL 1: (autor, titlu)"""
+    filename = os.path.splitext(os.path.basename(filepath))[0]
+
+    if ' - ' in filename:
+        parts = filename.split(' - ')
+        return parts[0].strip(), ' - '.join(parts[1:]).strip()
+
+    clean_name = AGGRESSIVE_CLEANUP_RE.sub('', filename)
+    clean_name = ISOLATED_NUMBER_RE.sub('', clean_name)
+    clean_name = AGGRESSIVE_SEPARATORS_RE.sub(' ', clean_name)
+    return "", ' '.join(clean_name.split())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def sanitize_title(folder_name: str) -> str:
+    """sanitize_title din uploadere"""
+    return ' '.join(NON_WORD_DASH_RE.sub(' ', folder_name).split())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_filename_for_matching(filename) -> str:
+    """normalize_filename_for_matching din uploadere"""
+    name = Path(filename).stem if isinstance(filename, (str, Path)) else str(filename)
+    return '-'.join(NON_WORD_RE.sub(' ', name.lower()).split())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def generate_identifier_base(title: str) -> str:
+    """generate_identifier_base din ArchivePureWebChecker"""
+    identifier = IDENTIFIER_INVALID_RE.sub('-', title.lower())
+    identifier = SPACES_RE.sub('-', identifier)
+    identifier = DASHES_RE.sub('-', identifier).strip('-')
+
+    if len(identifier) > IDENTIFIER_MAX_LENGTH:
+        result_parts = []
+        current_length = 0
+        for word in identifier.split('-'):
+            if current_length + len(word) + 1 <= IDENTIFIER_MAX_LENGTH:  # +1 pentru liniuță
+                result_parts.append(word)
+                current_length += len(word) + 1
+            else:
+                break
+        identifier = '-'.join(result_parts)
+
+    return identifier
+
+
+PROFILES: Dict[str, Callable] = {
+    "uploader_search": clean_title_uploader,
+    "pure_web_search": clean_title_pure_web,
+    "alternativa_search": clean_title_alternativa,
+    "complex_normalize": normalize_title_complex,
+    "cleaner": clean_title_cleaner,
+    "process_filename": process_filename,
+    "aggressive_extract": extract_title_from_filename,
+    "sanitize_title": sanitize_title,
+    "match_key": normalize_filename_for_matching,
+    "identifier_base": generate_identifier_base,
+    "remove_diacritics": remove_diacritics,
+}
+
+
+def normalize(profile: str, text: str):
+    """Aplică profilul cu numele dat"""
+    return PROFILES[profile](text)
+
+
+def cache_clear():
+    """Golește cache-urile tuturor profilelor"""
+    for fn in (clean_title_uploader, clean_title_pure_web, clean_title_alternativa, normalize_title_complex,
+               clean_title_cleaner, _process_filename, extract_title_from_filename, sanitize_title,
+               normalize_filename_for_matching, generate_identifier_base, remove_diacritics):
+        fn.cache_clear()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Transfer de fișiere fără copiere prin Python: rename, reflink, copiere în kernel.
+
+move_file_to_d3, copy_error_files_to_temp, copy_invalid_files_to_temp și
+backup-ul ARCHIVE_BACKUP din scan_and_delete_found_folders_final treceau prin
+shutil.copy2 / shutil.move - fiecare octet citit și rescris, chiar pe același
+volum, unde un rename sau un link e instantaneu, iar d:\\3 era suprascris și
+când conținutul identic era deja acolo. Aici:
+- TransferEngine.transfer(): cea mai ieftină metodă pe care o permit volumele,
+  în ordine: rename (doar la mutare) -> reflink (FICLONE: Btrfs/XFS) ->
+  CopyFileW (Windows: copiere în kernel/server, block clone pe ReFS) ->
+  copy_file_range -> sendfile -> copiere cu buffer mare; o copie rămâne un
+  fișier separat (fără hardlink - editarea ei nu atinge originalul)
+- destinația identică (aceeași mărime, același conținut) nu se mai rescrie
+- metodele refuzate de o pereche de volume (EXDEV, EOPNOTSUPP) nu se mai
+  încearcă pentru perechea respectivă
+- TransferEngine.transfer_many(): transferurile în bloc printr-un pool limitat
+  de thread-uri; move_tree() mută foldere (rename sau copiere + ștergere)
+
+Folosire:
+    engine = TransferEngine()
+    result = engine.transfer(Path("g:/ARHIVA/C/carte.epub"), Path("d:/3/carte.epub"))
+    results = engine.transfer_many([(src, dest), ...])
+    print(engine.summary())
+"""
+
+import ctypes
+import errno
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+try:
+    import fcntl
+    FICLONE = 0x40049409  # _IOW(0x94, 9, int) din linux/fs.h
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+TRANSFER_WORKERS = 4             # Transferuri simultane în transfer_many
+COPY_CHUNK = 8 * 1024 * 1024     # Octeți per apel copy_file_range/sendfile/read
+COMPARE_CHUNK = 1024 * 1024      # Octeți comparați odată la verificarea destinației identice
+# Erorile care înseamnă "metoda nu merge între aceste volume", nu "transferul a eșuat"
+UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL, errno.ENOSYS,
+                      errno.EPERM, errno.EMLINK, errno.ETXTBSY}
+
+# mode -> metodele permise, în ordinea costului
+MODE_METHODS = {
+    "move": ["rename", "reflink", "copyfile", "copy_file_range", "sendfile", "copy"],
+    "copy": ["reflink", "copyfile", "copy_file_range", "sendfile", "copy"],
+}
+
+
+def same_content(src: Path, dest: Path) -> bool:
+    """Aceeași mărime și același conținut (comparat pe bucăți, oprire la prima diferență)"""
+    try:
+        src_stat, dest_stat = src.stat(), dest.stat()
+    except OSError:
+        return False
+    if src_stat.st_size != dest_stat.st_size:
+        return False
+    if (src_stat.st_dev, src_stat.st_ino) == (dest_stat.st_dev, dest_stat.st_ino) and src_stat.st_ino:
+        return True  # Hardlink spre același fișier
+    with open(src, 'rb') as a, open(dest, 'rb') as b:
+        while True:
+            chunk = a.read(COMPARE_CHUNK)
+            if chunk != b.read(COMPARE_CHUNK):
+                return False
+            if not chunk:
+                return True
+
+
+def _replace_with(dest: Path, make: Any):
+    """Creează destinația prin make(temp) și o pune peste dest atomic (overwrite ca shutil.copy2)"""
+    temp = dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}.part")
+    try:
+        make(temp)
+        os.replace(temp, dest)
+    except BaseException:
+        try:
+            temp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def _reflink(src: Path, dest: Path):
+    if not FCNTL_AVAILABLE:
+        raise OSError(errno.EOPNOTSUPP, "reflink indisponibil")
+
+    def make(temp: Path):
+        with open(src, 'rb') as s, open(temp, 'wb') as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        shutil.copystat(src, temp)
+    _replace_with(dest, make)
+
+
+def _copyfile_windows(src: Path, dest: Path):
+    if sys.platform != "win32":
+        raise OSError(errno.EOPNOTSUPP, "CopyFileW doar pe Windows")
+
+    def make(temp: Path):
+        # Copierea rămâne în kernel (sau pe server, la share-uri SMB) și păstrează atributele
+        if not ctypes.windll.kernel32.CopyFileW(str(src), str(temp), False):
+            raise ctypes.WinError()
+    _replace_with(dest, make)
+
+
+def _copy_file_range(src: Path, dest: Path):
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "copy_file_range indisponibil")
+    _kernel_copy(src, dest, lambda s, d, n: os.copy_file_range(s, d, n))
+
+
+def _sendfile(src: Path, dest: Path):
+    if not hasattr(os, "sendfile") or sys.platform == "darwin":  # Pe macOS destinația trebuie să fie socket
+        raise OSError(errno.ENOSYS, "sendfile indisponibil")
+    _kernel_copy(src, dest, lambda s, d, n: os.sendfile(d, s, None, n))
+
+
+def _kernel_copy(src: Path, dest: Path, step: Any):
+    def make(temp: Path):
+        with open(src, 'rb') as s, open(temp, 'wb') as d:
+            remaining = os.fstat(s.fileno()).st_size
+            while remaining > 0:
+                sent = step(s.fileno(), d.fileno(), min(COPY_CHUNK, remaining))
+                if sent == 0:  # Unele sisteme de fișiere întorc 0 în loc de eroare: metoda următoare
+                    raise OSError(errno.ENOSYS, "copiere în kernel întreruptă")
+                remaining -= sent
+        shutil.copystat(src, temp)
+    _replace_with(dest, make)
+
+
+def _copy(src: Path, dest: Path):
+    def make(temp: Path):
+        with open(src, 'rb') as s, open(temp, 'wb') as d:
+            shutil.copyfileobj(s, d, COPY_CHUNK)
+        shutil.copystat(src, temp)
+    _replace_with(dest, make)
+
+
+def _rename(src: Path, dest: Path):
+    os.replace(src, dest)
+
+
+METHODS = {
+    "rename": _rename, "reflink": _reflink, "copyfile": _copyfile_windows,
+    "copy_file_range": _copy_file_range, "sendfile": _sendfile, "copy": _copy,
+}
+
+
+class TransferEngine:
+    """Alege per pereche de volume cea mai ieftină metodă de transfer; ține statistici per metodă"""
+
+    def __init__(self, workers: int = TRANSFER_WORKERS, skip_identical: bool = True):
+        self.workers = workers
+        self.skip_identical = skip_identical
+        self.lock = threading.Lock()
+        self.unsupported: Dict[Tuple[int, int], set] = {}  # (st_dev sursă, st_dev destinație) -> metode refuzate
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def _volumes(self, src: Path, dest: Path) -> Tuple[int, int]:
+        try:
+            return src.stat().st_dev, dest.parent.stat().st_dev
+        except OSError:
+            return 0, 0
+
+    def _record(self, method: str, size: int, seconds: float):
+        with self.lock:
+            stat = self.stats.setdefault(method, {"files": 0, "bytes": 0, "seconds": 0.0})
+            stat["files"] += 1
+            stat["bytes"] += size
+            stat["seconds"] += seconds
+
+    def transfer(self, src: Path, dest: Path, mode: str = "copy") -> Dict[str, Any]:
+        """Transferă src în dest (overwrite); întoarce {src, dest, method, bytes, seconds, error}"""
+        src, dest = Path(src), Path(dest)
+        started = time.perf_counter()
+        result = {"src": str(src), "dest": str(dest), "method": "", "bytes": 0, "seconds": 0.0, "error": ""}
+        try:
+            size = src.stat().st_size
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            if self.skip_identical and dest.exists() and same_content(src, dest):
+                if mode == "move":
+                    src.unlink()
+                result.update(method="identical", seconds=time.perf_counter() - started)
+                self._record("identical", size, result["seconds"])
+                return result
+
+            volumes = self._volumes(src, dest)
+            for method in MODE_METHODS[mode]:
+                with self.lock:
+                    if method in self.unsupported.get(volumes, ()):
+                        continue
+                try:
+                    METHODS[method](src, dest)
+                except OSError as e:
+                    if method == "copy":
+                        raise  # Ultima variantă: eroarea e a fișierului, nu a metodei
+                    if e.errno in UNSUPPORTED_ERRNOS:
+                        with self.lock:
+                            self.unsupported.setdefault(volumes, set()).add(method)
+                    continue  # Altă eroare (ex: CopyFileW): metoda următoare o reproduce sau o ocolește
+                if mode == "move" and method != "rename":
+                    src.unlink()
+                result.update(method=method, bytes=size, seconds=time.perf_counter() - started)
+                self._record(method, size, result["seconds"])
+                return result
+        except Exception as e:
+            result["error"] = str(e)
+        result["seconds"] = time.perf_counter() - started
+        return result
+
+    def transfer_many(self, pairs: List[Tuple[Path, Path]], mode: str = "copy") -> List[Dict[str, Any]]:
+        """Transferurile în paralel (cel mult self.workers simultan); rezultatele în ordinea perechilor"""
+        if len(pairs) <= 1 or self.workers <= 1:
+            return [self.transfer(src, dest, mode) for src, dest in pairs]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(lambda pair: self.transfer(pair[0], pair[1], mode), pairs))
+
+    def move_tree(self, src: Path, dest: Path) -> Dict[str, Any]:
+        """Mută un folder: rename pe același volum, altfel fișierele prin transfer_many și apoi ștergerea sursei"""
+        src, dest = Path(src), Path(dest)
+        started = time.perf_counter()
+        result = {"src": str(src), "dest": str(dest), "method": "", "bytes": 0, "seconds": 0.0, "error": ""}
+        try:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.rename(src, dest)
+                result["method"] = "rename"
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                pairs = []
+                dest.mkdir(parents=True, exist_ok=True)
+                for path in src.rglob("*"):
+                    if path.is_dir():
+                        (dest / path.relative_to(src)).mkdir(parents=True, exist_ok=True)
+                    else:
+                        pairs.append((path, dest / path.relative_to(src)))
+                moved = self.transfer_many(pairs, mode="move")
+                failed = [r for r in moved if r["error"]]
+                if failed:
+                    raise OSError(f"{len(failed)} fișiere nemutate, sursa păstrată: {failed[0]['error']}")
+                shutil.rmtree(src)  # Doar foldere goale au rămas
+                result["method"] = "copy+delete"
+                result["bytes"] = sum(r["bytes"] for r in moved)
+        except Exception as e:
+            result["error"] = str(e)
+        result["seconds"] = time.perf_counter() - started
+        return result
+
+    def summary(self) -> str:
+        with self.lock:
+            stats = dict(self.stats)
+        if not stats:
+            return "📦 Transferuri: niciunul"
+        parts = [f"{method} {s['files']} ({s['bytes'] / 1024 ** 2:.1f} MB, {s['seconds']:.1f}s)"
+                 for method, s in sorted(stats.items(), key=lambda item: -item[1]["files"])]
+        return "📦 Transferuri: " + ", ".join(parts)
+
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Monitor în fundal pentru finalizarea upload-urilor din Chrome.
+
+Înlocuiește time.sleep(300) din check_for_errors_after_upload: un thread
+citește la fiecare MONITOR_INTERVAL secunde lista de tab-uri din DevTools
+(http://<debuggerAddress>/json/list - URL + titlu pentru toate tab-urile
+într-o singură cerere, fără switch_to.window și fără să atingă WebDriver-ul,
+care nu e thread-safe). Fiecare upload e marcat în UploadTabManager imediat ce
+starea lui e cunoscută:
+- redirect la /details/<id> -> succeeded (cu ora exactă a finalizării)
+- titlu de eroare de memorie sau tab dispărut -> failed
+
+Erorile afișate doar în pagină (#progress_msg, #overlay_alert) nu apar în
+/json/list, așa că wait_until_settled() face și o verificare prin driver la
+DRIVER_CHECK_INTERVAL secunde. Raportul final e gata când ultimul upload se
+termină, nu după o pauză fixă.
+
+Folosire:
+    monitor = UploadMonitor(tab_manager)
+    monitor.start()
+    ...
+    monitor.wait_until_settled()
+    print(monitor.report())
+"""
+
+import json
+import threading
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+from archive_tab_manager import FAILED, SUCCEEDED, UPLOADING, UploadTabManager, classify_tab
+
+MONITOR_INTERVAL = 2.0           # Secunde între citirile /json/list
+DRIVER_CHECK_INTERVAL = 60.0     # Verificare prin driver pentru erorile din pagină
+MAX_SETTLE_WAIT = 3 * 60 * 60    # Cât se așteaptă cel mult ultimul upload
+DEVTOOLS_TIMEOUT = 2.0
+SETTLE_CHECK_INTERVAL = 5.0      # Cât de des verifică wait_until_settled starea strânsă de monitor
+
+
+def debugger_address(driver: Any) -> Optional[str]:
+    """host:port DevTools al sesiunii (ChromeDriver îl expune și pentru Chrome pornit de el)"""
+    try:
+        return driver.capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+    except Exception:
+        return None
+
+
+def target_id(window_handle: str) -> str:
+    """Handle-ul WebDriver este id-ul țintei DevTools (cu prefixul CDwindow- la ChromeDriver vechi)"""
+    return window_handle.replace("CDwindow-", "").upper()
+
+
+def list_targets(address: str, timeout: float = DEVTOOLS_TIMEOUT) -> Dict[str, Dict[str, Any]]:
+    """Tab-urile din DevTools: id -> {url, title, type}"""
+    with urllib.request.urlopen(f"http://{address}/json/list", timeout=timeout) as response:
+        targets = json.load(response)
+    return {t["id"].upper(): t for t in targets if t.get("type") == "page"}
+
+
+class UploadMonitor:
+    """Thread care urmărește tab-urile de upload prin DevTools și marchează finalizarea"""
+
+    def __init__(self, tab_manager: UploadTabManager, interval: float = MONITOR_INTERVAL):
+        self.tab_manager = tab_manager
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.devtools_ok = True
+        self.polls = 0
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, name="upload-monitor", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=self.interval + DEVTOOLS_TIMEOUT)
+
+    def _loop(self):
+        while not self.stop_event.wait(self.interval):
+            self.poll()
+
+    def poll(self) -> int:
+        """O citire /json/list; întoarce câte upload-uri s-au terminat acum"""
+        tabs = self.tab_manager.uploading()
+        if not tabs:
+            return 0
+        address = debugger_address(self.tab_manager.driver)
+        if not address:
+            return 0
+        try:
+            targets = list_targets(address)
+        except Exception as e:
+            if self.devtools_ok:
+                print(f"   ⚠ DevTools indisponibil ({e}) - finalizarea se verifică doar prin driver")
+            self.devtools_ok = False
+            return 0
+        self.devtools_ok = True
+        self.polls += 1
+
+        settled = 0
+        for tab in tabs:
+            target = targets.get(target_id(tab.handle))
+            if target is None:
+                status = {"state": FAILED, "detail": "TAB_CLOSED", "identifier": ""}
+            else:
+                status = classify_tab({"url": target.get("url", ""), "title": target.get("title", "")})
+            settled += self.tab_manager.settle(tab, status)
+        return settled
+
+    def wait_until_settled(self, timeout: float = MAX_SETTLE_WAIT,
+                           driver_check_interval: float = DRIVER_CHECK_INTERVAL) -> bool:
+        """Așteaptă până nu mai e niciun upload în curs; False la timeout"""
+        started = time.monotonic()
+        last_driver_check = started
+        last_remaining = None
+        self.tab_manager.refresh()
+        while self.tab_manager.uploading():
+            now = time.monotonic()
+            if now - started > timeout:
+                print(f"⚠ {len(self.tab_manager.uploading())} upload-uri încă în curs după {timeout / 60:.0f} min")
+                return False
+            if now - last_driver_check >= driver_check_interval or not self.devtools_ok:
+                self.tab_manager.refresh()  # Erorile din pagină + fallback când DevTools nu răspunde
+                last_driver_check = now
+            else:
+                self.tab_manager.refresh(probe=False)  # Închide tab-urile confirmate de monitor
+            remaining = len(self.tab_manager.uploading())
+            if remaining and remaining != last_remaining:
+                print(f"   ⏳ {remaining} upload-uri în curs ({(now - started) / 60:.1f} min de așteptare)")
+            last_remaining = remaining
+            if remaining:
+                time.sleep(min(SETTLE_CHECK_INTERVAL, driver_check_interval))
+        self.tab_manager.refresh(probe=False)
+        print(f"✅ Toate upload-urile s-au terminat după {(time.monotonic() - started):.0f}s de așteptare")
+        return True
+
+    def report(self) -> List[str]:
+        """Câte o linie per upload: stare, durată, identifier/detaliu"""
+        lines = []
+        with self.tab_manager.lock:
+            tabs = sorted(self.tab_manager.tabs.values(), key=lambda t: t.opened_at)
+        for tab in tabs:
+            icon = "✅" if tab.state == SUCCEEDED else ("⏳" if tab.state == UPLOADING else "❌")
+            finished = tab.finished_at.strftime("%H:%M:%S") if tab.finished_at else "-"
+            lines.append(f"{icon} {tab.folder_name}: {tab.state} în {tab.minutes_open():.1f} min "
+                         f"(terminat {finished}) {tab.identifier or tab.detail}")
+        return lines
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Planificator explicit pentru upload-uri concurente.
+
+Înlocuiește lansarea strict secvențială din process_folder (cu sleep(10) după
+fiecare upload și sleep(2) între unități):
+- cel mult MAX_IN_FLIGHT upload-uri simultan, cu cel mult MAX_IN_FLIGHT_BYTES în zbor
+  (un item mai mare decât bugetul pornește singur, când nu mai e nimic în zbor)
+- ordine shortest-job-first pentru cât mai multe item-e terminate pe oră, cu aging:
+  fiecare secundă de așteptare scade costul cu AGING_BYTES_PER_SECOND, ca item-ele
+  mari să nu aștepte la nesfârșit
+- raportează MB/s și item-e/oră obținute
+
+Folosire:
+    scheduler = UploadScheduler(upload_fn, max_in_flight=3)
+    scheduler.submit(unit, size_bytes, unit["name"])
+    scheduler.run()
+    print(scheduler.summary())
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+MAX_IN_FLIGHT = 3
+MAX_IN_FLIGHT_BYTES = 1024 * 1024 * 1024           # 1 GB în zbor
+AGING_BYTES_PER_SECOND = 1024 * 1024               # 1 MB "câștigat" pe secundă de așteptare
+STOP_RESULT = "limit_reached"                      # Rezultatul care oprește lansările noi
+
+
+class UploadJob:
+    """Un item de încărcat și timpii lui"""
+
+    def __init__(self, payload: Any, size_bytes: int, name: str, sequence: int):
+        self.payload = payload
+        self.size_bytes = size_bytes
+        self.name = name
+        self.sequence = sequence
+        self.enqueued_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error = ""
+
+    def cost(self, now: float, aging_bytes_per_second: float) -> float:
+        """Costul SJF cu aging: mărimea minus creditul acumulat în coadă"""
+        return self.size_bytes - (now - self.enqueued_at) * aging_bytes_per_second
+
+
+class UploadScheduler:
+    """Coadă SJF cu aging, limitată de număr și de octeți în zbor"""
+
+    def __init__(self, upload_fn: Callable[[Any], Any], max_in_flight: int = MAX_IN_FLIGHT,
+                 max_in_flight_bytes: int = MAX_IN_FLIGHT_BYTES,
+                 aging_bytes_per_second: float = AGING_BYTES_PER_SECOND):
+        self.upload_fn = upload_fn
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_in_flight_bytes = max_in_flight_bytes
+        self.aging_bytes_per_second = aging_bytes_per_second
+
+        self.queue: List[UploadJob] = []
+        self.in_flight: List[UploadJob] = []
+        self.finished: List[UploadJob] = []
+        self.in_flight_bytes = 0
+        self.stopped = False
+        self.condition = threading.Condition()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._sequence = 0
+
+    def submit(self, payload: Any, size_bytes: int, name: str = "") -> UploadJob:
+        """Adaugă un item în coadă"""
+        with self.condition:
+            job = UploadJob(payload, size_bytes, name or str(payload), self._sequence)
+            self._sequence += 1
+            self.queue.append(job)
+            self.condition.notify_all()
+            return job
+
+    def stop(self):
+        """Nu mai lansează nimic nou (upload-urile în zbor se termină)"""
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+    def _next_job(self) -> Optional[UploadJob]:
+        """Cel mai ieftin job, dacă încape în bugetul de octeți (altfel așteaptă, fără să-l ocolească)"""
+        if not self.queue or len(self.in_flight) >= self.max_in_flight:
+            return None
+        now = time.monotonic()
+        job = min(self.queue, key=lambda j: (j.cost(now, self.aging_bytes_per_second), j.sequence))
+        if self.in_flight and self.in_flight_bytes + job.size_bytes > self.max_in_flight_bytes:
+            return None
+        return job
+
+    def _run_job(self, job: UploadJob):
+        try:
+            job.result = self.upload_fn(job.payload)
+        except Exception as e:
+            job.result = False
+            job.error = str(e)
+            print(f"❌ Eroare la upload-ul {job.name}: {e}")
+        finally:
+            with self.condition:
+                job.finished_at = time.monotonic()
+                self.in_flight.remove(job)
+                self.in_flight_bytes -= job.size_bytes
+                self.finished.append(job)
+                if job.result == STOP_RESULT:
+                    self.stopped = True
+                self.condition.notify_all()
+
+    def run(self) -> List[UploadJob]:
+        """Lansează job-urile până se golește coada; întoarce job-urile terminate"""
+        self.started_at = self.started_at or time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="upload") as pool:
+            with self.condition:
+                while True:
+                    if self.stopped and not self.in_flight:
+                        break
+                    if not self.queue and not self.in_flight:
+                        break
+                    job = None if self.stopped else self._next_job()
+                    if job is None:
+                        self.condition.wait(timeout=1.0)  # Timeout: aging-ul schimbă ordinea și fără evenimente
+                        continue
+                    self.queue.remove(job)
+                    self.in_flight.append(job)
+                    self.in_flight_bytes += job.size_bytes
+                    job.started_at = time.monotonic()
+                    print(f"🚀 Upload lansat: {job.name} ({job.size_bytes / (1024 * 1024):.1f} MB) - "
+                          f"{len(self.in_flight)}/{self.max_in_flight} în zbor, "
+                          f"{self.in_flight_bytes / (1024 * 1024):.0f} MB, {len(self.queue)} în coadă")
+                    pool.submit(self._run_job, job)
+        self.finished_at = time.monotonic()
+        return self.finished
+
+    def stats(self) -> Dict[str, Any]:
+        """MB/s și item-e/oră obținute, plus timpii de așteptare"""
+        end = self.finished_at or time.monotonic()
+        wall = max(end - (self.started_at or end), 1e-9)
+        succeeded = [j for j in self.finished if j.result and j.result != STOP_RESULT]
+        done_bytes = sum(j.size_bytes for j in succeeded)
+        waits = [j.started_at - j.enqueued_at for j in self.finished if j.started_at is not None]
+        return {
+            "completed": len(succeeded),
+            "failed": len(self.finished) - len(succeeded),
+            "pending": len(self.queue),
+            "bytes": done_bytes,
+            "seconds": wall,
+            "mb_per_second": done_bytes / (1024 * 1024) / wall,
+            "items_per_hour": len(succeeded) / wall * 3600,
+            "avg_wait_seconds": sum(waits) / len(waits) if waits else 0.0,
+            "max_wait_seconds": max(waits) if waits else 0.0,
+        }
+
+    def summary(self) -> str:
+        """Linie de raport"""
+        s = self.stats()
+        return (f"🚚 Planificator: {s['completed']} item-e reușite, {s['failed']} eșuate, {s['pending']} rămase; "
+                f"{s['mb_per_second']:.2f} MB/s, {s['items_per_hour']:.0f} item-e/oră "
+                f"(așteptare medie {s['avg_wait_seconds']:.0f}s, max {s['max_wait_seconds']:.0f}s)")
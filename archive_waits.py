@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Politică de așteptare pentru formularul de upload: condiții DOM explicite în loc
+de pauze fixe.
+
+Fiecare pas are propriul buget de timp (WAIT_BUDGETS), nu WebDriverWait(90)
+pentru tot:
+- pașii obligatorii (input-ul de fișiere, butonul de upload) ridică WaitTimeout
+  la expirarea bugetului
+- pașii opționali (title span, editorul de description...) întorc None după
+  câteva secunde, iar formularul continuă cu fallback-ul existent
+
+Condiția e orice funcție driver -> valoare (ca expected_conditions din Selenium);
+excepțiile din condiție (element încă absent, stale) înseamnă "încă nu".
+Timpul petrecut în așteptare se contorizează pe item și pe pas.
+
+Folosire:
+    waits = WaitPolicy(driver)
+    waits.start_item("Autor - Titlu")
+    file_input = waits.until("file_input", EC.presence_of_element_located(...))
+    title = waits.until("title", EC.presence_of_element_located(...), optional=True)
+    print(waits.item_summary())
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Secunde per pas (bugetul include randarea paginii după acțiunea anterioară)
+WAIT_BUDGETS = {
+    "page": 30,
+    "file_input": 15,
+    "form": 20,            # Formularul de metadate apare după ce fișierele sunt adăugate
+    "title": 3,            # Opțional - titlul implicit e cel din numele folderului
+    "description": 10,
+    "description_editor": 5,
+    "subjects": 10,
+    "subjects_input": 5,
+    "date": 10,
+    "date_fields": 5,
+    "collection": 5,
+    "verify": 10,
+    "upload_button": 15,
+    "upload_started": 10,
+}
+DEFAULT_BUDGET = 10
+POLL_INTERVAL = 0.1
+
+
+class WaitTimeout(Exception):
+    """Un pas obligatoriu nu și-a îndeplinit condiția în bugetul lui"""
+
+    def __init__(self, step: str, budget: float, last_error: str = ""):
+        self.step = step
+        self.budget = budget
+        super().__init__(f"'{step}' nu a apărut în {budget:g}s" + (f" ({last_error})" if last_error else ""))
+
+
+class WaitPolicy:
+    """Așteptări pe condiții DOM cu buget per pas și contor de timp per item"""
+
+    def __init__(self, driver: Any = None, budgets: Optional[Dict[str, float]] = None,
+                 poll_interval: float = POLL_INTERVAL):
+        self.driver = driver
+        self.budgets = dict(WAIT_BUDGETS, **(budgets or {}))
+        self.poll_interval = poll_interval
+        self.item_name = ""
+        self.item_waits: Dict[str, float] = {}
+        self.items: List[Dict[str, Any]] = []
+
+    def attach(self, driver: Any):
+        """Driver-ul nou după (re)conectarea la Chrome"""
+        self.driver = driver
+
+    def budget(self, step: str) -> float:
+        return self.budgets.get(step, DEFAULT_BUDGET)
+
+    def until(self, step: str, condition: Callable[[Any], Any], optional: bool = False,
+              budget: Optional[float] = None) -> Any:
+        """Valoarea condiției imediat ce devine adevărată; None (opțional) sau WaitTimeout la expirare"""
+        budget = self.budget(step) if budget is None else budget
+        started = time.monotonic()
+        deadline = started + budget
+        last_error = ""
+        try:
+            while True:
+                try:
+                    value = condition(self.driver)
+                    if value:
+                        return value
+                except Exception as e:
+                    last_error = type(e).__name__
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(self.poll_interval)
+        finally:
+            self._record(step, time.monotonic() - started)
+
+        if optional:
+            print(f"   ⏭ '{step}' lipsește după {budget:g}s - continui fără el")
+            return None
+        raise WaitTimeout(step, budget, last_error)
+
+    def until_true(self, step: str, predicate: Callable[[], Any], optional: bool = False,
+                   budget: Optional[float] = None) -> Any:
+        """Ca until(), pentru verificări care nu au nevoie de driver (ex. un script JS deja scris)"""
+        return self.until(step, lambda _driver: predicate(), optional=optional, budget=budget)
+
+    def _record(self, step: str, seconds: float):
+        self.item_waits[step] = self.item_waits.get(step, 0.0) + seconds
+
+    # ---------- raportare ----------
+
+    def start_item(self, name: str):
+        """Începe contorizarea pentru un item nou"""
+        self.finish_item()
+        self.item_name = name
+        self.item_waits = {}
+
+    def finish_item(self) -> Optional[Dict[str, Any]]:
+        """Închide item-ul curent și îl adaugă la total"""
+        if not self.item_name:
+            return None
+        item = {"name": self.item_name, "seconds": sum(self.item_waits.values()), "steps": dict(self.item_waits)}
+        self.items.append(item)
+        self.item_name = ""
+        self.item_waits = {}
+        return item
+
+    def item_summary(self) -> str:
+        """Linie de raport pentru item-ul curent"""
+        total = sum(self.item_waits.values())
+        slowest = sorted(self.item_waits.items(), key=lambda kv: kv[1], reverse=True)[:3]
+        details = ", ".join(f"{step} {seconds:.1f}s" for step, seconds in slowest)
+        return f"⏱️ Așteptare pentru {self.item_name or 'item'}: {total:.1f}s" + (f" ({details})" if details else "")
+
+    def total_summary(self, legacy_seconds_per_item: float = 0.0) -> str:
+        """Media pe item, comparată cu pauzele fixe înlocuite"""
+        self.finish_item()
+        if not self.items:
+            return "⏱️ Nicio așteptare înregistrată"
+        average = sum(item["seconds"] for item in self.items) / len(self.items)
+        line = f"⏱️ Așteptare medie: {average:.1f}s/item pe {len(self.items)} item-e"
+        if legacy_seconds_per_item:
+            saved = (legacy_seconds_per_item - average) * len(self.items)
+            line += f" (pauze fixe vechi: {legacy_seconds_per_item:.1f}s/item, economie ~{saved:.0f}s)"
+        return line
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Coada de lucru persistentă a upload-urilor, cu starea explicită a fiecărei unități.
+
+mark_unit_processed se chema abia după ce fill_form_fields apăsa Upload: un crash
+între alegerea fișierelor și click, sau în cele 30 de minute de transfer, nu
+lăsa nicio urmă a ce era în zbor - de aici "Reparare upload.py" și
+"Reparare rapida.py", care editau starea de mână. Aici fiecare unitate are o
+stare în WORK_QUEUE_FILE, scrisă atomic la fiecare tranziție:
+- queued: scanată, așteaptă la rând (ordinea din coadă = ordinea de upload)
+- launching: tab deschis / fișiere trimise, upload-ul încă neapăsat
+- in_flight: upload pornit, cu tab-ul (handle) și Chrome-ul (adresa) lui
+- verified: succes confirmat (redirect la /details/<id>, IAS3 terminat, mutat în d:\\3...)
+- failed: eroare confirmată sau upload pierdut cu rezultat necunoscut - nu se reia singur
+- invalid: fișiere corupte/trunchiate (archive_file_validator.py), neîncărcate -
+  se revalidează la pornire și se reiau doar dacă trec acum
+
+La repornire, folderele din coadă se reiau fără os.walk, iar reconcile() lămurește
+unitățile rămase launching/in_flight:
+- tab-ul încă există (DevTools /json/list + o sondă Runtime.evaluate): succes ->
+  verified, eroare -> failed, upload în curs -> rămâne in_flight și e preluat de
+  UploadTabManager, formular neapăsat -> queued
+- IAS3 (fără tab): queued, cu identifier-ul ales la prima încercare păstrat -
+  item-ul a fost deja creat de primul PUT, reluarea încarcă în el
+- tab-ul a dispărut: identifier-ul prezis există pe archive.org -> verified;
+  altfel launching -> queued, in_flight -> failed (TAB_LOST, de verificat manual:
+  reîncărcarea ar putea dubla item-ul)
+
+Folosire:
+    python archive_work_queue.py                    # sumar + unitățile neterminate
+    python archive_work_queue.py --reconcile        # lămurește upload-urile rămase în zbor
+    python archive_work_queue.py --retry-failed     # failed -> queued
+    python archive_work_queue.py --requeue "Autor\\Carte"
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import quote
+
+from archive_dom_probe import evaluate
+from archive_identifier_predictor import predict_for_files
+from archive_tab_manager import FAILED as TAB_FAILED, SUCCEEDED as TAB_SUCCEEDED, classify_tab
+from archive_upload_monitor import list_targets, target_id
+
+WORK_QUEUE_FILE = "upload_work_queue.json"
+METADATA_URL = "https://archive.org/metadata"
+METADATA_TIMEOUT = 15.0
+
+QUEUED = "queued"
+LAUNCHING = "launching"
+IN_FLIGHT = "in_flight"
+VERIFIED = "verified"
+FAILED = "failed"
+INVALID = "invalid"
+STATES = (QUEUED, LAUNCHING, IN_FLIGHT, VERIFIED, FAILED, INVALID)
+
+# Tranzițiile permise: un tab confirmat de monitor înainte de mark_unit_processed nu mai revine la in_flight
+TRANSITIONS = {
+    QUEUED: (LAUNCHING, VERIFIED, FAILED, INVALID),
+    LAUNCHING: (QUEUED, IN_FLIGHT, VERIFIED, FAILED),
+    IN_FLIGHT: (QUEUED, VERIFIED, FAILED),
+    VERIFIED: (QUEUED,),
+    FAILED: (QUEUED, VERIFIED),
+    INVALID: (QUEUED,),
+}
+
+# Ca PROBE_JS din archive_tab_manager, ca expresie pentru Runtime.evaluate
+RECONCILE_PROBE_JS = """
+(function () {
+    var progress = document.getElementById('progress_msg');
+    var overlay = document.getElementById('overlay_alert');
+    return {
+        url: location.href,
+        title: document.title,
+        progress: progress ? (progress.textContent || '').trim() : '',
+        overlay: !!(overlay && overlay.offsetParent !== null),
+        upload_button: !!document.getElementById('upload_button')
+    };
+})()
+"""
+
+
+def item_exists(identifier: str, timeout: float = METADATA_TIMEOUT) -> bool:
+    """archive.org întoarce {} la /metadata pentru item-urile inexistente"""
+    with urllib.request.urlopen(f"{METADATA_URL}/{quote(identifier)}", timeout=timeout) as response:
+        return response.read().strip() not in (b"", b"{}")
+
+
+class WorkQueue:
+    """Unitățile de upload în ordinea cozii, cu starea fiecăreia; salvată la fiecare tranziție"""
+
+    def __init__(self, path: str = WORK_QUEUE_FILE):
+        self.path = Path(path)
+        self.folders: Dict[str, Dict[str, Any]] = {}   # folder -> {"deferred", "queued_at"}
+        self.entries: Dict[str, Dict[str, Any]] = {}   # numele unității -> intrarea (ordinea de inserare = coada)
+        self.lock = threading.RLock()  # Pool-ul Chrome și IAS3 actualizează din mai multe thread-uri
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.folders = data.get("folders", {})
+                self.entries = {entry["name"]: entry for entry in data.get("units", [])}
+                for entry in self.entries.values():
+                    if entry["state"] == VERIFIED and entry["detail"] == "INVALID":
+                        entry["state"] = INVALID  # Cozile vechi le țineau ca verified
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠ Nu am putut citi {self.path} ({e}), pornesc cu coada goală")
+
+    def _save(self):
+        # Scriere atomică: un crash în timpul salvării nu pierde starea upload-urilor în zbor
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with self.lock:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"updated": datetime.now().isoformat(), "folders": self.folders,
+                           "units": list(self.entries.values())}, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+
+    # ---------- foldere ----------
+
+    def has_folder(self, folder_path: Path) -> bool:
+        with self.lock:
+            return str(folder_path) in self.folders
+
+    def is_deferred(self, folder_path: Path) -> bool:
+        with self.lock:
+            return self.folders.get(str(folder_path), {}).get("deferred", False)
+
+    def enqueue(self, folder_path: Path, units: List[Dict[str, Any]], deferred: bool = False):
+        """Unitățile scanate ale unui folder intră la coada cozii (cele deja prezente nu se dublează)"""
+        now = datetime.now().isoformat()
+        with self.lock:
+            self.folders[str(folder_path)] = {"deferred": deferred, "queued_at": now}
+            for unit in units:
+                if unit["name"] in self.entries:
+                    continue
+                self.entries[unit["name"]] = {
+                    "name": unit["name"], "folder": str(folder_path), "path": str(unit["path"]),
+                    "has_pdf": unit["has_pdf"], "is_root": unit["is_root"],
+                    "files": [str(f) for f in unit["all_files"]],
+                    "state": QUEUED, "tab": "", "address": "", "identifier": "", "detail": "",
+                    "attempts": 0, "updated": now,
+                }
+            self._save()
+
+    @staticmethod
+    def _unit(entry: Dict[str, Any]) -> Dict[str, Any]:
+        files = [Path(f) for f in entry["files"]]
+        return {
+            "path": Path(entry["path"]),
+            "actual_path": Path(entry["path"]),
+            "name": entry["name"],
+            "has_pdf": entry["has_pdf"],
+            "pdf_files": [f for f in files if f.suffix.lower() == '.pdf'],
+            "all_files": files,
+            "is_root": entry["is_root"],
+        }
+
+    def unit(self, name: str) -> Dict[str, Any]:
+        """Unitatea din coadă, în forma din scan_folder_structure"""
+        with self.lock:
+            return self._unit(self.entries[name])
+
+    def folder_units(self, folder_path: Path) -> List[Dict[str, Any]]:
+        """Unitățile queued ale folderului, refăcute ca în scan_folder_structure (fără os.walk)"""
+        now = datetime.now().isoformat()
+        with self.lock:
+            # O reîncercare încă în backoff (archive_retry.py) așteaptă momentul ei
+            return [self._unit(e) for e in self.entries.values()
+                    if e["folder"] == str(folder_path) and e["state"] == QUEUED and e.get("retry_at", "") <= now]
+
+    def prune(self) -> int:
+        """Scoate folderele cu toate unitățile verified; întoarce câte s-au scos
+
+        Un folder cu unități invalid rămâne: revalidarea de la pornire le găsește doar în coadă
+        """
+        with self.lock:
+            done = [folder for folder in self.folders
+                    if all(e["state"] == VERIFIED for e in self.entries.values() if e["folder"] == folder)]
+            for folder in done:
+                del self.folders[folder]
+            self.entries = {name: e for name, e in self.entries.items() if e["folder"] in self.folders}
+            if done:
+                self._save()
+        return len(done)
+
+    # ---------- tranziții ----------
+
+    def transition(self, name: str, state: str, **fields: Any) -> bool:
+        """Schimbă starea unității dacă tranziția e permisă; True dacă s-a schimbat"""
+        with self.lock:
+            entry = self.entries.get(name)
+            if entry is None or (state != entry["state"] and state not in TRANSITIONS[entry["state"]]):
+                return False
+            entry.update(fields)
+            entry["state"] = state
+            entry["updated"] = datetime.now().isoformat()
+            self._save()
+        return True
+
+    def launching(self, name: str):
+        with self.lock:
+            attempts = self.entries[name]["attempts"] + 1 if name in self.entries else 0
+        self.transition(name, LAUNCHING, attempts=attempts, tab="", address="", detail="", outcome="")
+
+    def attach_tab(self, name: str, handle: str, address: str):
+        """Tab-ul în care rulează upload-ul - după el se regăsește la repornire"""
+        self.transition(name, LAUNCHING, tab=handle, address=address)
+
+    def in_flight(self, name: str):
+        self.transition(name, IN_FLIGHT)
+
+    def verified(self, name: str, detail: str = "", identifier: str = ""):
+        fields = {"identifier": identifier} if identifier else {}  # Fără identifier nou îl păstrează pe cel ales
+        self.transition(name, VERIFIED, detail=detail, **fields)
+
+    def set_identifier(self, name: str, identifier: str):
+        """Identifier-ul ales la primul upload IAS3 - reîncercările și reluarea îl refolosesc"""
+        with self.lock:
+            entry = self.entries.get(name)
+            if entry is None or entry["identifier"] == identifier:
+                return
+            entry["identifier"] = identifier
+            self._save()
+
+    def identifier(self, name: str) -> str:
+        with self.lock:
+            return self.entries[name]["identifier"] if name in self.entries else ""
+
+    def failed(self, name: str, detail: str):
+        self.transition(name, FAILED, detail=detail)
+
+    def invalid(self, name: str, detail: str = "INVALID"):
+        self.transition(name, INVALID, detail=detail)
+
+    def requeue(self, name: str, detail: str = ""):
+        self.transition(name, QUEUED, tab="", address="", detail=detail)
+
+    def settle_tab(self, tab: Any):
+        """Callback pentru UploadTabManager: tab-ul a ajuns în starea finală"""
+        if tab.state == TAB_SUCCEEDED:
+            self.verified(tab.folder_name, tab.detail, tab.identifier)
+        elif tab.state == TAB_FAILED:
+            self.failed(tab.folder_name, tab.detail)
+
+    # ---------- interogări ----------
+
+    def in_state(self, *states: str) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [dict(e) for e in self.entries.values() if e["state"] in states]
+
+    def counts(self) -> Dict[str, int]:
+        with self.lock:
+            states = [e["state"] for e in self.entries.values()]
+        return {state: states.count(state) for state in STATES}
+
+    def summary(self) -> str:
+        c = self.counts()
+        return (f"🧾 Coada de lucru: {c[QUEUED]} în așteptare, {c[LAUNCHING]} în lansare, {c[IN_FLIGHT]} în zbor, "
+                f"{c[VERIFIED]} verificate, {c[FAILED]} eșuate, {c[INVALID]} invalide ({len(self.folders)} foldere, {self.path})")
+
+    # ---------- repornire ----------
+
+    def _lost_outcome(self, entry: Dict[str, Any], exists: Callable[[str], bool]) -> Dict[str, str]:
+        """Tab-ul a dispărut: identifier-ul prezis pe archive.org decide între verified și queued/failed"""
+        files = [Path(f) for f in entry["files"]]
+        pdf_files = sorted((f for f in files if f.suffix.lower() == '.pdf'), key=lambda f: f.name.casefold())
+        try:
+            for identifier in predict_for_files(pdf_files[0], files) if pdf_files else []:
+                if exists(identifier):
+                    return {"state": VERIFIED, "identifier": identifier, "detail": "găsit pe archive.org la repornire"}
+        except Exception as e:
+            return {"state": FAILED, "identifier": "", "detail": f"TAB_LOST - archive.org inaccesibil ({e})"}
+        if entry["state"] == LAUNCHING:
+            return {"state": QUEUED, "identifier": "", "detail": "tab pierdut înainte de upload"}
+        return {"state": FAILED, "identifier": "", "detail": "TAB_LOST - upload întrerupt, de verificat manual"}
+
+    def reconcile(self, exists: Callable[[str], bool] = item_exists) -> Dict[str, int]:
+        """Lămurește unitățile rămase launching/in_flight după o oprire; întoarce câte au ajuns în fiecare stare"""
+        pending = self.in_state(LAUNCHING, IN_FLIGHT)
+        outcome = {state: 0 for state in STATES}
+        if not pending:
+            return outcome
+        print(f"🔁 {len(pending)} unități rămase în zbor la oprirea trecută - le verific...")
+
+        targets_by_address: Dict[str, Optional[Dict[str, Dict[str, Any]]]] = {}
+        for entry in pending:
+            address = entry["address"]
+            if address and address not in targets_by_address:
+                try:
+                    targets_by_address[address] = list_targets(address)
+                except Exception:
+                    targets_by_address[address] = None  # Chrome oprit: tab-urile lui s-au pierdut
+
+        for entry in pending:
+            targets = targets_by_address.get(entry["address"]) if entry["tab"] else None
+            target = targets.get(target_id(entry["tab"])) if targets else None
+            if not entry["tab"]:
+                # IAS3: nimic nu rulează fără proces; multipart reia de la ultima parte confirmată,
+                # în item-ul creat deja de primul PUT
+                result = {"state": QUEUED, "identifier": entry["identifier"], "detail": "reluat după oprire"}
+            elif target is None:
+                result = self._lost_outcome(entry, exists)
+            else:
+                try:
+                    probe = evaluate(target["webSocketDebuggerUrl"], RECONCILE_PROBE_JS) or {}
+                except Exception:
+                    probe = {"url": target.get("url", ""), "title": target.get("title", "")}
+                status = classify_tab(probe)
+                if status["state"] == TAB_SUCCEEDED:
+                    result = {"state": VERIFIED, "identifier": status["identifier"], "detail": status["detail"]}
+                elif status["state"] == TAB_FAILED:
+                    result = {"state": FAILED, "identifier": "", "detail": status["detail"]}
+                elif entry["state"] == LAUNCHING and probe.get("upload_button") and not probe.get("progress"):
+                    result = {"state": QUEUED, "identifier": "", "detail": "formular neapăsat"}
+                else:
+                    result = {"state": IN_FLIGHT, "identifier": "", "detail": "upload încă în curs - preluat"}
+
+            fields = {"identifier": result["identifier"], "detail": result["detail"]}
+            if result["state"] == QUEUED:
+                fields.update(tab="", address="")
+            with self.lock:
+                self.entries[entry["name"]].update(fields, state=result["state"], updated=datetime.now().isoformat())
+            outcome[result["state"]] += 1
+            print(f"   {entry['name']}: {entry['state']} -> {result['state']} ({result['detail']})")
+        self._save()
+        return outcome
+
+
+def main():
+    """Funcția principală"""
+    parser = argparse.ArgumentParser(description="Coada de lucru a upload-urilor (stare per unitate)")
+    parser.add_argument("--file", default=WORK_QUEUE_FILE)
+    parser.add_argument("--reconcile", action="store_true", help="Lămurește unitățile rămase launching/in_flight")
+    parser.add_argument("--retry-failed", action="store_true", help="Toate unitățile failed revin în coadă")
+    parser.add_argument("--requeue", nargs="+", metavar="UNITATE", help="Unitățile date revin în coadă")
+    args = parser.parse_args()
+
+    work_queue = WorkQueue(args.file)
+    if args.reconcile:
+        work_queue.reconcile()
+    names = [e["name"] for e in work_queue.in_state(FAILED)] if args.retry_failed else []
+    for name in names + (args.requeue or []):
+        if work_queue.transition(name, QUEUED, tab="", address="", detail="reluat manual", attempts=0, retry_at=""):
+            print(f"↩ {name}: înapoi în coadă")
+        else:
+            print(f"⚠ {name}: nu e în coadă sau nu poate fi reluată")
+
+    print(work_queue.summary())
+    for entry in work_queue.in_state(LAUNCHING, IN_FLIGHT, FAILED, INVALID):
+        where = f" [{entry['address']} {entry['tab']}]" if entry["tab"] else ""
+        print(f"   {entry['state']:<10} {entry['name']}{where} {entry['detail']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
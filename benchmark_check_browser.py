@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Latența și memoria per verificare de duplicat: Chrome-ul interactiv de pe 9222
+(profilul complet, ca până acum) vs profilul lean headless din
+archive_check_browser.py.
+
+O verificare face ce fac check_folder_with_chrome / check_duplicate_with_browser:
+tab nou pe archive.org/upload, fișierul în input[type=file], apoi așteptarea
+până când #item_id are o valoare. Se măsoară:
+- latența per verificare (p50/p95/medie)
+- memoria Chrome după fiecare verificare (RSS total cu psutil, altfel heap JS)
+- KB transferați per încărcare a paginii (arată efectul cache-ului și al blocării)
+
+Necesită Chrome pornit cu start_chrome_debug.bat pentru modul "debug" și
+profilul lean logat (python archive_check_browser.py --login).
+
+Folosire:
+    python benchmark_check_browser.py --folder "g:\\ARHIVA\\B+" --count 10
+    python benchmark_check_browser.py carte1.pdf carte2.pdf --modes lean --repeat 3
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from archive_check_browser import (CHECK_DEBUG_PORT, PSUTIL_AVAILABLE, browser_memory_mb, js_heap_mb,
+                                   start_lean_browser)
+from benchmark_checkers import percentile
+
+ARCHIVE_URL = "https://archive.org/upload"
+DEBUG_ADDRESS = "127.0.0.1:9222"
+DEBUG_PORT = 9222
+CHECK_TIMEOUT = 60
+CHECK_EXTENSIONS = ['.pdf', '.epub', '.mobi', '.djvu', '.docx', '.doc']
+
+ITEM_ID_JS = """
+var el = document.getElementById('item_id');
+if (!el) { return ''; }
+return (el.textContent || '').trim() || el.getAttribute('title') || el.value || '';
+"""
+TRANSFER_JS = """
+return performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+    .reduce(function (total, entry) { return total + (entry.transferSize || 0); }, 0);
+"""
+
+
+def sample_files(folder: Path, count: int) -> List[Path]:
+    """Câte un fișier din primele `count` foldere (ca priority_file din checkere)"""
+    files = []
+    for directory in sorted(p for p in folder.iterdir() if p.is_dir()):
+        candidates = [f for f in directory.rglob('*') if f.suffix.lower() in CHECK_EXTENSIONS]
+        if candidates:
+            files.append(sorted(candidates)[0])
+        if len(files) >= count:
+            break
+    return files
+
+
+def attach_debug_chrome():
+    options = Options()
+    options.add_experimental_option("debuggerAddress", DEBUG_ADDRESS)
+    return webdriver.Chrome(options=options)
+
+
+def run_check(driver, filepath: Path) -> Dict[str, Any]:
+    """O simulare: tab nou, upload page, fișier, #item_id; întoarce timpii și identifier-ul"""
+    base_window = driver.current_window_handle
+    driver.execute_script("window.open('');")
+    driver.switch_to.window(driver.window_handles[-1])
+    started = time.perf_counter()
+    try:
+        driver.get(ARCHIVE_URL)
+        file_input = WebDriverWait(driver, CHECK_TIMEOUT).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, 'input[type="file"]')))
+        page_loaded = time.perf_counter() - started
+        transferred = driver.execute_script(TRANSFER_JS) or 0
+        file_input.send_keys(str(filepath.absolute()))
+        identifier = WebDriverWait(driver, CHECK_TIMEOUT, poll_frequency=0.1).until(
+            lambda d: d.execute_script(ITEM_ID_JS))
+        heap = js_heap_mb(driver)
+        return {"seconds": time.perf_counter() - started, "page_seconds": page_loaded,
+                "kb": transferred / 1024, "identifier": identifier, "heap_mb": heap, "error": ""}
+    except Exception as e:
+        return {"seconds": time.perf_counter() - started, "page_seconds": 0.0, "kb": 0.0,
+                "identifier": "", "heap_mb": None, "error": str(e).splitlines()[0] if str(e) else type(e).__name__}
+    finally:
+        try:
+            driver.close()
+            driver.switch_to.window(base_window)
+        except Exception:
+            pass
+
+
+def benchmark_mode(mode: str, files: List[Path], repeat: int) -> Dict[str, Any]:
+    print(f"\n🧪 Mod {mode}: {len(files)} fișiere x {repeat}")
+    started = time.perf_counter()
+    if mode == "lean":
+        driver, port = start_lean_browser(), CHECK_DEBUG_PORT
+    else:
+        driver, port = attach_debug_chrome(), DEBUG_PORT
+    startup = time.perf_counter() - started
+
+    results = []
+    memory: List[float] = []
+    try:
+        for round_number in range(repeat):
+            for filepath in files:
+                result = run_check(driver, filepath)
+                rss = browser_memory_mb(port)
+                mem = rss if rss is not None else result["heap_mb"]
+                if mem is not None:
+                    memory.append(mem)
+                results.append(result)
+                status = result["identifier"] or f"EROARE: {result['error']}"
+                print(f"   [{round_number + 1}] {filepath.name[:45]:<45} {result['seconds']:6.2f}s "
+                      f"{result['kb']:8.0f} KB  {mem or 0:7.0f} MB  {status}")
+    finally:
+        if mode == "lean":
+            driver.quit()
+
+    ok = [r for r in results if not r["error"]]
+    seconds = [r["seconds"] for r in ok]
+    return {
+        "mode": mode,
+        "startup": startup,
+        "checks": len(results),
+        "errors": len(results) - len(ok),
+        "p50": percentile(seconds, 50),
+        "p95": percentile(seconds, 95),
+        "mean": statistics.mean(seconds) if seconds else 0.0,
+        "page_mean": statistics.mean(r["page_seconds"] for r in ok) if ok else 0.0,
+        "kb_mean": statistics.mean(r["kb"] for r in ok) if ok else 0.0,
+        "mem_mean": statistics.mean(memory) if memory else None,
+        "mem_max": max(memory) if memory else None,
+    }
+
+
+def print_report(reports: List[Dict[str, Any]]):
+    memory_kind = "RSS total Chrome" if PSUTIL_AVAILABLE else "heap JS (fără psutil)"
+    print(f"\n📊 Per verificare (memorie: {memory_kind})")
+    print(f"{'mod':<8}{'pornire':>9}{'verif.':>8}{'erori':>7}{'p50':>8}{'p95':>8}{'medie':>8}"
+          f"{'pagină':>8}{'KB':>9}{'MB med':>9}{'MB max':>9}")
+    for r in reports:
+        mem_mean = f"{r['mem_mean']:.0f}" if r["mem_mean"] is not None else "-"
+        mem_max = f"{r['mem_max']:.0f}" if r["mem_max"] is not None else "-"
+        print(f"{r['mode']:<8}{r['startup']:>8.1f}s{r['checks']:>8}{r['errors']:>7}{r['p50']:>7.2f}s"
+              f"{r['p95']:>7.2f}s{r['mean']:>7.2f}s{r['page_mean']:>7.2f}s{r['kb_mean']:>9.0f}{mem_mean:>9}{mem_max:>9}")
+    if len(reports) == 2 and reports[0]["mean"] and reports[1]["mean"]:
+        debug, lean = (reports[0], reports[1]) if reports[0]["mode"] == "debug" else (reports[1], reports[0])
+        print(f"\n⚡ lean vs debug: latență medie x{debug['mean'] / lean['mean']:.2f}")
+        if debug["mem_mean"] and lean["mem_mean"]:
+            print(f"💾 memorie medie: {lean['mem_mean']:.0f} MB vs {debug['mem_mean']:.0f} MB")
+
+
+def main():
+    """Funcția principală"""
+    parser = argparse.ArgumentParser(description="Chrome interactiv (9222) vs profil lean headless pentru verificări")
+    parser.add_argument("files", nargs="*", help="Fișierele de încercat")
+    parser.add_argument("--folder", help="Ia câte un fișier din primele --count foldere")
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=2, help="Runde (a doua arată efectul cache-ului)")
+    parser.add_argument("--modes", nargs="+", choices=["debug", "lean"], default=["debug", "lean"])
+    args = parser.parse_args()
+
+    files = [Path(f) for f in args.files]
+    if args.folder:
+        files += sample_files(Path(args.folder), args.count)
+    files = [f for f in files if f.exists()]
+    if not files:
+        print("❌ Niciun fișier de verificat (dă fișiere sau --folder)")
+        return 1
+
+    reports = [benchmark_mode(mode, files, args.repeat) for mode in args.modes]
+    print_report(reports)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de throughput pentru checkerele de duplicate, rulat contra
+serverului local archive_mock_server.py (fără trafic către archive.org).
+
+Măsoară pentru ArchivePureWebChecker, ArchiveCleaner și scanerul agresiv:
+- foldere/secundă
+- cereri HTTP per folder
+- latența p50/p95 per folder și per cerere
+
+Folosire:
+    python benchmark_checkers.py --folders 200 --latency-ms 60 --jitter-ms 20
+    python benchmark_checkers.py --checkers aggressive --workers 4 --error-rate 0.05 --max-rps 30
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from archive_mock_server import FIXTURES_FILE, MockArchive, MockArchiveServer
+
+CHECKERS_DIR = Path(__file__).resolve().parent / "Cauta fisierele 3"
+PURE_WEB_SCRIPT = "Fara chrome cauta titluri cu sufixe 2.py"
+CLEANER_SCRIPT = "archive_duplicate_checker.py"
+AGGRESSIVE_SCRIPT = "++FINAL 1 BUN - Fara BackUp si stergerea fisierelor dupa ce au fost gasite.py"
+
+UNKNOWN_WORDS = ['umbra', 'cetatii', 'pierdute', 'jurnal', 'calatorie', 'ultimul', 'anotimp',
+                 'cronica', 'tacerii', 'noptii', 'arhipelag', 'memorii', 'oglinda', 'vanatorii']
+UNKNOWN_AUTHORS = ['Popescu, Ion', 'Ionescu, Maria', 'Dumitrescu, Radu', 'Stanescu, Ana', 'Vasilescu, Dan']
+
+
+def load_script(filename: str, module_name: str):
+    """Importă un script (cu spații în nume) ca modul"""
+    spec = importlib.util.spec_from_file_location(module_name, CHECKERS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentilă prin interpolare liniară"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def build_sample_filenames(archive: MockArchive, count: int, known_ratio: float, seed: int) -> List[str]:
+    """Nume de fișiere realiste: o parte există în fixture-uri, restul nu"""
+    rng = random.Random(seed)
+    base_items = [item for item in archive.items.values() if not item["identifier"][-1].isdigit()]
+    rng.shuffle(base_items)
+
+    filenames = []
+    for index in range(count):
+        if index < count * known_ratio and base_items:
+            item = base_items[index % len(base_items)]
+            title = item["title"]
+            creator = item.get("creator", "")
+            if creator and title.lower().startswith(creator.lower()):
+                title = f"{creator} - {title[len(creator):].strip()}"
+            filenames.append(f"{title}.pdf")
+        else:
+            words = rng.sample(UNKNOWN_WORDS, 3)
+            filenames.append(f"{rng.choice(UNKNOWN_AUTHORS)} - {' '.join(words).capitalize()} {index}.pdf")
+    rng.shuffle(filenames)
+    return filenames
+
+
+def make_pure_web_runner(base_url: str):
+    module = load_script(PURE_WEB_SCRIPT, "bench_pure_web")
+    module.API_BASE_URL = f"{base_url}/advancedsearch.php"
+    module.DETAILS_BASE_URL = f"{base_url}/details"
+    module.SEARCH_BASE_URL = f"{base_url}/search"
+    logging.getLogger("ArchivePureWebChecker").setLevel(logging.WARNING)
+    checker = module.ArchivePureWebChecker()
+
+    def check(filename: str) -> bool:
+        search_title = checker.clean_title_for_search(filename)
+        folder_info = {
+            "folder_path": Path(filename),
+            "priority_file": Path(filename),
+            "all_files": [],
+            "total_size": 0,
+            "search_title": search_title,
+            "identifier_base": checker.generate_identifier_base(search_title),
+        }
+        # Aceeași ordine ca check_folder_web_only, fără ștergere
+        is_duplicate, _ = checker.method_3_direct_url_test_enhanced(folder_info)
+        if not is_duplicate:
+            is_duplicate, _ = checker.method_2_api_identifier_search(folder_info)
+        return is_duplicate
+
+    return check, checker.flight
+
+
+def make_cleaner_runner(base_url: str):
+    module = load_script(CLEANER_SCRIPT, "bench_cleaner")
+    module.API_URL = f"{base_url}/advancedsearch.php"
+    logging.getLogger("ArchiveCleaner").setLevel(logging.WARNING)
+    cleaner = module.ArchiveCleaner()
+
+    def check(filename: str) -> bool:
+        return cleaner._check_archive(cleaner._clean_title(filename))
+
+    return check, cleaner.flight
+
+
+def make_aggressive_runner(base_url: str):
+    module = load_script(AGGRESSIVE_SCRIPT, "bench_aggressive")
+    module.ADVANCED_SEARCH_URL = f"{base_url}/advancedsearch.php"
+
+    def check(filename: str) -> bool:
+        author, title = module.extract_title_from_filename_improved(filename)
+        strategies = module.generate_search_strategies_enhanced(author, title, filename)
+        found, _ = module.search_archive_org_aggressive(strategies, min_relevance_score=0.2)
+        return found
+
+    return check, module.SEARCH_FLIGHT
+
+
+RUNNERS: Dict[str, Callable[[str], Any]] = {
+    "pure_web": make_pure_web_runner,
+    "cleaner": make_cleaner_runner,
+    "aggressive": make_aggressive_runner,
+}
+
+
+def run_benchmark(name: str, check: Callable[[str], bool], filenames: List[str],
+                  server: MockArchiveServer, workers: int) -> Dict[str, Any]:
+    """Rulează un checker peste toate folderele și adună metricile"""
+    server.reset_stats()
+    folder_times: List[float] = []
+    found = 0
+
+    def timed(filename: str):
+        started = time.perf_counter()
+        result = check(filename)
+        return result, time.perf_counter() - started
+
+    started = time.perf_counter()
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(timed, filenames))
+    else:
+        outcomes = [timed(filename) for filename in filenames]
+    elapsed = time.perf_counter() - started
+
+    for result, seconds in outcomes:
+        folder_times.append(seconds)
+        found += 1 if result else 0
+
+    stats = server.stats()
+    folders = len(filenames)
+    return {
+        "checker": name,
+        "folders": folders,
+        "found": found,
+        "seconds": round(elapsed, 3),
+        "folders_per_sec": round(folders / elapsed, 2) if elapsed else 0.0,
+        "requests": stats["requests"],
+        "requests_per_folder": round(stats["requests"] / folders, 2) if folders else 0.0,
+        "folder_p50_ms": round(percentile(folder_times, 50) * 1000, 1),
+        "folder_p95_ms": round(percentile(folder_times, 95) * 1000, 1),
+        "request_p50_ms": round(percentile(stats["latencies"], 50) * 1000, 1),
+        "request_p95_ms": round(percentile(stats["latencies"], 95) * 1000, 1),
+        "by_endpoint": stats["by_endpoint"],
+        "by_status": {str(k): v for k, v in stats["by_status"].items()},
+    }
+
+
+def print_report(results: List[Dict[str, Any]]):
+    print("\n" + "=" * 100)
+    print("📊 BENCHMARK CHECKERE (mock archive.org)")
+    print("=" * 100)
+    print(f"{'Checker':<12} {'Foldere':>8} {'Găsite':>7} {'Foldere/s':>10} {'Cereri/folder':>14} "
+          f"{'Folder p50':>11} {'Folder p95':>11} {'Cerere p50':>11} {'Cerere p95':>11}")
+    for r in results:
+        print(f"{r['checker']:<12} {r['folders']:>8} {r['found']:>7} {r['folders_per_sec']:>10.2f} "
+              f"{r['requests_per_folder']:>14.2f} {r['folder_p50_ms']:>9.1f}ms {r['folder_p95_ms']:>9.1f}ms "
+              f"{r['request_p50_ms']:>9.1f}ms {r['request_p95_ms']:>9.1f}ms")
+    for r in results:
+        print(f"\n🔎 {r['checker']}: {r['by_endpoint']} | status: {r['by_status']}")
+        if r.get("coalescing"):
+            print(f"   {r['coalescing']}")
+    print("=" * 100)
+
+
+def main():
+    """Funcția principală"""
+    parser = argparse.ArgumentParser(description="Benchmark checkere contra mock archive.org")
+    parser.add_argument("--checkers", default="pure_web,cleaner,aggressive")
+    parser.add_argument("--folders", type=int, default=100)
+    parser.add_argument("--known-ratio", type=float, default=0.5)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-rps", type=float, default=None)
+    parser.add_argument("--fixtures", default=str(FIXTURES_FILE))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Salvează rezultatele într-un fișier JSON")
+    args = parser.parse_args()
+
+    archive = MockArchive.from_file(Path(args.fixtures))
+    filenames = build_sample_filenames(archive, args.folders, args.known_ratio, args.seed)
+
+    # Scripturile scriu log-uri și fișiere de stare în directorul curent
+    work_dir = tempfile.mkdtemp(prefix="bench_checkers_")
+    original_cwd = os.getcwd()
+    os.chdir(work_dir)
+
+    results = []
+    try:
+        with MockArchiveServer(archive, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                               error_rate=args.error_rate, max_rps=args.max_rps, seed=args.seed) as server:
+            print(f"🧪 Mock archive.org: {server.base_url} ({len(archive.items)} iteme, {len(filenames)} foldere)")
+            for name in [n.strip() for n in args.checkers.split(',') if n.strip()]:
+                if name not in RUNNERS:
+                    print(f"⚠ Checker necunoscut: {name}")
+                    continue
+                print(f"\n🚀 Rulez {name}...")
+                check, flight = RUNNERS[name](server.base_url)
+                result = run_benchmark(name, check, filenames, server, args.workers)
+                result["coalescing"] = flight.summary()
+                results.append(result)
+    finally:
+        os.chdir(original_cwd)
+
+    print_report(results)
+    print(f"📁 Log-uri și stări temporare în: {work_dir}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 Rezultate salvate în: {args.json}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
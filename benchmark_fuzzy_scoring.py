@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark: costul scorării fuzzy per folder în scanerul agresiv,
+înainte (calculate_aggressive_fuzzy_relevance per document) și după
+(score_strategies, un singur lot pentru toate strategiile folderului).
+Verifică și că scorurile sunt identice.
+
+Fără rețea: documentele candidate vin din fixture-urile mock-ului archive.org
+(câte 12 per strategie, ca rows=12 din search_archive_org_aggressive).
+
+Folosire:
+    python benchmark_fuzzy_scoring.py --folders 300 --repeat 3
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from archive_fuzzy_batch import BATCH_AVAILABLE, score_strategies
+from archive_mock_server import FIXTURES_FILE, MockArchive
+from benchmark_checkers import AGGRESSIVE_SCRIPT, build_sample_filenames, load_script, percentile
+
+ROWS = 12
+
+
+def build_workload(module, archive: MockArchive, folders: int, seed: int) -> List[List[Tuple[List[str], List[Tuple[str, str]]]]]:
+    """Pentru fiecare folder: lista de (cuvinte interogare, documente candidate) pe strategii"""
+    rng = random.Random(seed)
+    pool = list(archive.items.values())
+    workload = []
+
+    for filename in build_sample_filenames(archive, folders, 0.5, seed):
+        author, title = module.extract_title_from_filename_improved(filename)
+        strategies = module.generate_search_strategies_enhanced(author, title, filename)
+        folder = []
+        for strategy in strategies:
+            query = strategy['query']
+            if not query.strip():
+                continue
+            docs = archive.search(query)[:ROWS]
+            docs += rng.sample(pool, ROWS - len(docs))
+            folder.append((query, [module.doc_title_creator(doc) for doc in docs]))
+        workload.append(folder)
+    return workload
+
+
+def score_original(module, folder) -> List[Tuple[float, Dict[str, Any]]]:
+    scores = []
+    for query, docs in folder:
+        for title, creator in docs:
+            # Varianta originală recalcula cuvintele interogării pentru fiecare document
+            query_words = module.extract_query_words(query)
+            scores.append(module.calculate_aggressive_fuzzy_relevance(query_words, title, creator))
+    return scores
+
+
+def score_batch(module, folder) -> List[Tuple[float, Dict[str, Any]]]:
+    scores = []
+    for strategy_scores in score_strategies([(module.extract_query_words(query), docs) for query, docs in folder]):
+        scores.extend(strategy_scores)
+    return scores
+
+
+def time_per_folder(fns, module, workload, repeat: int) -> List[List[float]]:
+    """Cel mai bun timp per folder pentru fiecare variantă; variantele alternează pe fiecare folder,
+    ca variațiile de frecvență/încărcare ale mașinii să le afecteze pe toate la fel"""
+    best = [[float('inf')] * len(workload) for _ in fns]
+    for _ in range(repeat):
+        for index, folder in enumerate(workload):
+            for times, fn in zip(best, fns):
+                started = time.perf_counter()
+                fn(module, folder)
+                times[index] = min(times[index], time.perf_counter() - started)
+    return best
+
+
+def main():
+    """Funcția principală"""
+    parser = argparse.ArgumentParser(description="Micro-benchmark scorare fuzzy (original vs cdist)")
+    parser.add_argument("--folders", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--fixtures", default=str(FIXTURES_FILE))
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    module = load_script(AGGRESSIVE_SCRIPT, "bench_aggressive")
+    if not (module.FUZZY_AVAILABLE and BATCH_AVAILABLE):
+        print("❌ Necesită rapidfuzz și numpy: pip install rapidfuzz numpy")
+        return 1
+
+    archive = MockArchive.from_file(Path(args.fixtures))
+    workload = build_workload(module, archive, args.folders, args.seed)
+    docs_total = sum(len(docs) for folder in workload for _, docs in folder)
+    print(f"🧪 {len(workload)} foldere, {docs_total} documente scorate per trecere")
+
+    # Verificare: scoruri și detalii identice
+    mismatches = 0
+    for folder in workload:
+        if score_original(module, folder) != score_batch(module, folder):
+            mismatches += 1
+    print(f"{'✅' if mismatches == 0 else '❌'} Scoruri identice: {len(workload) - mismatches}/{len(workload)} foldere")
+
+    before, after = time_per_folder([score_original, score_batch], module, workload, args.repeat)
+
+    print("\n" + "=" * 70)
+    print(f"{'Varianta':<22} {'Medie':>10} {'p50':>10} {'p95':>10} {'Total':>12}")
+    for name, times in (("original (per doc)", before), ("batch (per folder)", after)):
+        print(f"{name:<22} {sum(times) / len(times) * 1e6:>8.0f}µs {percentile(times, 50) * 1e6:>8.0f}µs "
+              f"{percentile(times, 95) * 1e6:>8.0f}µs {sum(times):>10.3f}s")
+    print(f"⚡ Accelerare: {sum(before) / sum(after):.2f}x")
+    print("=" * 70)
+    return 0 if mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
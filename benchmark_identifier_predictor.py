@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Validare pentru archive_identifier_predictor: acuratețe pe perechile
+fișier/identifier cunoscute și numărul de cereri /details per folder,
+comparat cu variantele generate orb de method_3_direct_url_test_enhanced.
+
+Perechi folosite (doar date independente de predictor):
+- upload-uri reale din loguri și scripturi (KNOWN_UPLOADS; numele fișierului e
+  reconstruit din folder, identifier-ul e cel real)
+- perechi înregistrate de pe archive.org (fixtures/identifier_pairs.json, scrise de
+  `archive_mock_server.py record --pairs`): primul fișier original al item-ului ->
+  identifier-ul real; se verifică și pasul titlu -> identifier pe titlul real
+
+Snapshot-ul din fixtures/archive_mock_fixtures.json NU e folosit: identifier-ele lui
+sunt derivate din titlu de archive_mock_server, nu citite de pe archive.org.
+
+Fără rețea (perechile se înregistrează separat).
+
+Folosire:
+    python archive_mock_server.py record --pairs --query "creator:(chatterji)" --query "creator:(lungu)"
+    python benchmark_identifier_predictor.py
+    python benchmark_identifier_predictor.py --pairs alte_perechi.json --show-misses 20
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import archive_identifier_predictor as predictor
+from archive_mock_server import IDENTIFIER_PAIRS_FILE
+from archive_title_normalizer import clean_title_pure_web, generate_identifier_base
+
+KNOWN_UPLOADS = [
+    {"filename": "Chatterji, J.C. - Filozofia ezoterica a Indiei - ctrl.pdf",
+     "identifier": "chatterji-j.-c.-filozofia-ezoterica-a-indiei-ctrl",
+     "source": "Fara chrome cauta titluri cu sufixe 2.py (test_specific_chatterji)"},
+    {"filename": "Berthon, Simon - Razboi intre aliati. Povestea rivalitatii dintre Churchill, Roosevelt si de Gaulle.pdf",
+     "identifier": "berthon-simon-razboi-intre-aliati.-povestea-rivalitatii-dintre-churchill-rooseve_202508",
+     "source": "FINAL-sterge si fisierele care apar la upload cu sufixe (test_direct_search)"},
+    {"filename": "Chelaru, Ioan - Casatoria si divortul.pdf",
+     "identifier": "chelaru-ioan-casatoria-si-divortul_202508",
+     "source": "deleted_duplicates_20250825_181851.json"},
+    {"filename": "Certo, Samuel - Managementul modern.pdf",
+     "identifier": "certo-samuel-managementul-modern_202508",
+     "source": "Fara chrome cauta titluri cu sufixe 2.py (method_1_search_duplicates)"},
+    {"filename": "Lungu, Monica Elena - Sinteze de noi coloranti reactivi cu randament tinctorial marit.pdf",
+     "identifier": "lungu-monica-elena-sinteze-de-noi-coloranti-reactivi-cu-randament-tinctorial-marit",
+     "source": "archive_cleanup_log_20250806_002434.txt"},
+]
+
+# Copie a generării din method_3_direct_url_test_enhanced (doar lista de variante)
+LEGACY_SUFFIXES = ['-retail', '-scan', '-ctrl', '-ocr', '-vp', '-istor']
+LEGACY_MIDDLE_WORDS = ['trad', 'trad.', 'ed', 'edition', 'vol', 'tome']
+LEGACY_DATE_SUFFIXES = ['_202508', '_20250806', '_202507', '_20250705', '_202506', '_20250604']
+
+
+def legacy_variants(identifier_base: str) -> List[str]:
+    """Variantele testate de method_3_direct_url_test_enhanced înainte de predictor"""
+    variants = [identifier_base]
+    variants.extend(identifier_base + suffix for suffix in LEGACY_SUFFIXES)
+    parts = identifier_base.split('-')
+    if len(parts) >= 3:
+        base_author = '-'.join(parts[:2])
+        rest_title = '-'.join(parts[2:])
+        for word in LEGACY_MIDDLE_WORDS:
+            middle_variant = f"{base_author}-{word}-{rest_title}"
+            variants.append(middle_variant)
+            variants.extend(middle_variant + suffix for suffix in LEGACY_SUFFIXES)
+    variants.extend(identifier_base + suffix for suffix in LEGACY_DATE_SUFFIXES)
+    return list(dict.fromkeys(variants))
+
+
+def load_pairs(pairs_file: Path) -> List[Tuple[str, str, str, str]]:
+    """(fișier, identifier, titlu, sursă) din upload-urile cunoscute și perechile înregistrate"""
+    pairs = [(p["filename"], p["identifier"], "", "upload") for p in KNOWN_UPLOADS]
+    if pairs_file.exists():
+        with open(pairs_file, 'r', encoding='utf-8') as f:
+            items = json.load(f)["items"]
+        pairs.extend((item["filename"], item["identifier"], item.get("title", ""), "recorded") for item in items)
+    return pairs
+
+
+def evaluate(pairs: List[Tuple[str, str, str, str]]) -> Dict:
+    """Acuratețe și cereri per folder: predictor vs variantele vechi"""
+    stats = {}
+    misses = []
+    for filename, identifier, title, source in pairs:
+        expected = predictor.strip_date_suffix(identifier)
+        predictions = predictor.predict_identifiers(filename)
+        legacy = legacy_variants(generate_identifier_base(clean_title_pure_web(filename)))
+
+        s = stats.setdefault(source, {"pairs": 0, "top1": 0, "top2": 0, "lookups": 0,
+                                      "legacy_found": 0, "legacy_lookups": 0, "titled": 0, "title_exact": 0})
+        s["pairs"] += 1
+        s["top1"] += predictions[0] == expected
+        s["top2"] += expected in predictions
+        s["lookups"] += len(predictions)
+        s["legacy_found"] += identifier in legacy or expected in legacy
+        s["legacy_lookups"] += len(legacy)
+        if title:  # Titlul real: regula titlu -> identifier, separat de ghicirea titlului din fișier
+            s["titled"] += 1
+            s["title_exact"] += expected in (predictor.identifier_from_title(title),
+                                             predictor.identifier_from_title(title, predictor.IDENTIFIER_HARD_LIMIT))
+        if expected not in predictions:
+            misses.append((source, filename, expected, predictions))
+    return {"stats": stats, "misses": misses}
+
+
+def time_predictions(filenames: List[str], repeat: int) -> float:
+    """µs per folder (cache rece)"""
+    best = float('inf')
+    for _ in range(repeat):
+        predictor.cache_clear()
+        started = time.perf_counter()
+        for filename in filenames:
+            predictor.predict_identifiers(filename)
+        best = min(best, time.perf_counter() - started)
+    return best / max(len(filenames), 1) * 1e6
+
+
+def main():
+    """Funcția principală"""
+    parser = argparse.ArgumentParser(description="Validare predictor identifier archive.org")
+    parser.add_argument("--show-misses", type=int, default=10, help="Câte ratări să afișeze")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--pairs", default=str(IDENTIFIER_PAIRS_FILE), help="Perechi înregistrate (record --pairs)")
+    args = parser.parse_args()
+
+    pairs = load_pairs(Path(args.pairs))
+    result = evaluate(pairs)
+
+    print("=" * 70)
+    print("🔮 PREDICTOR IDENTIFIER ARCHIVE.ORG")
+    print("=" * 70)
+    for source, s in result["stats"].items():
+        n = max(s["pairs"], 1)
+        print(f"📦 {source}: {s['pairs']} perechi")
+        print(f"   ✅ exact top-1: {s['top1'] / n * 100:.1f}%   top-2: {s['top2'] / n * 100:.1f}%")
+        print(f"   🌐 cereri /details per folder: {s['lookups'] / n:.2f} "
+              f"(variante vechi: {s['legacy_lookups'] / n:.1f}, găsite {s['legacy_found'] / n * 100:.1f}%)")
+        if s["titled"]:
+            print(f"   🏷️ titlu real -> identifier: {s['title_exact'] / s['titled'] * 100:.1f}%")
+    if "recorded" not in result["stats"]:
+        print(f"⚠ Fără perechi înregistrate ({args.pairs}): acuratețea de mai sus e doar pe "
+              f"{len(KNOWN_UPLOADS)} upload-uri. Înregistrează: python archive_mock_server.py record --pairs --query ...")
+
+    print(f"⏱️ Predicție: {time_predictions([p[0] for p in pairs], args.repeat):.1f} µs/folder")
+
+    if result["misses"] and args.show_misses:
+        print(f"\n❌ Ratări ({len(result['misses'])}), primele {args.show_misses}:")
+        for source, filename, expected, predictions in result["misses"][:args.show_misses]:
+            print(f"   [{source}] {filename}")
+            print(f"      așteptat: {expected}")
+            print(f"      prezis:   {', '.join(predictions)}")
+
+    upload = result["stats"].get("upload", {})
+    return 0 if upload.get("top2") == upload.get("pairs") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
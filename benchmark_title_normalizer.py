@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Verificare (golden) + benchmark pentru archive_title_normalizer.py.
+
+- Implementările vechi sunt copiate mai jos neschimbate (LEGACY); din ele se
+  generează fișierul golden fixtures/title_normalizer_golden.json.
+- Fiecare profil al bibliotecii trebuie să dea exact aceleași rezultate ca
+  golden-ul și ca implementarea veche pe ~100k nume de fișiere realiste.
+- Benchmark: implementarea veche vs bibliotecă (cache rece și cald).
+
+Folosire:
+    python benchmark_title_normalizer.py                    # verificare + benchmark pe 100k nume
+    python benchmark_title_normalizer.py --count 20000
+    python benchmark_title_normalizer.py --regenerate-golden
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import archive_title_normalizer as normalizer
+
+ROOT = Path(__file__).resolve().parent
+GOLDEN_FILE = ROOT / "fixtures" / "title_normalizer_golden.json"
+LOG_FOLDER = ROOT / "Cauta fisierele 3"
+GOLDEN_CASES = 400
+
+
+# ============================================================
+# Implementările vechi, copiate neschimbat (fără print/log)
+# ============================================================
+
+def legacy_uploader_search(filename):
+    name = Path(filename).stem
+    name = re.sub(r'[_-]\d{6,8}$', '', name)
+    name = re.sub(r'\s*[\(\[].*?[\)\]]', '', name)
+    name = re.sub(r'\b[vV]\.?\s*\d+([\.\-]\d+)*\b', '', name)
+    suffixes = ['scan', 'ctrl', 'retail', r'cop\d+', 'Vp', 'draft', 'final', 'ocr', 'edit',
+                'proof', 'beta', 'alpha', 'test', 'demo', 'sample', 'preview', 'full',
+                'complete', 'fix', 'corrected']
+    pattern = r'\b(' + '|'.join(suffixes) + r')\b'
+    name = re.sub(pattern, '', name, flags=re.IGNORECASE)
+    name = re.sub(r'[^\w\s-]', ' ', name)
+    name = re.sub(r'\s+[-–]\s*$', '', name)
+    name = re.sub(r'\s+', ' ', name).strip()
+    return name
+
+
+def legacy_pure_web_search(filename):
+    name = Path(filename).stem
+    name = re.sub(r'\s*\([^)]*\)', '', name)
+    name = re.sub(r'\s*\[[^\]]*\]', '', name)
+    technical_suffixes = ['retail', 'scan', 'ctrl', 'ocr', 'vp', 'draft', 'final', 'edit', 'copy', 'backup']
+    parts = name.rsplit(' - ', 1)
+    if len(parts) == 2:
+        last_part = parts[1].strip().lower()
+        if last_part in technical_suffixes:
+            name = parts[0]
+    name = re.sub(r'[^\w\s]', ' ', name)
+    words = name.split()
+    words = [w for w in words if not re.match(r'^v\.?\d', w.lower())]
+    result = ' '.join(words)
+    result = re.sub(r'\s+', ' ', result).strip()
+    return result
+
+
+def legacy_alternativa_search(filename):
+    name = Path(filename).stem
+    name = re.sub(r'[_-]\d{6,8}$', '', name)
+    name = re.sub(r'\s*\([^)]*\)', '', name)
+    name = re.sub(r'\s*\[[^\]]*\]', '', name)
+    name = re.sub(r'\s*[-–]\s*[vV]\.?\s*[\d\.]+[\d\.\-]*(?:\s+[A-Z]+)?(?:\s*[-–]\s*\d+)?$', '', name)
+    name = re.sub(r'\s+[vV]\.?\s*[\d\.]+[\d\.\-]*(?:\s+[A-Z]+)?$', '', name)
+    suffixes_to_remove = [
+        'scan', 'ctrl', 'retail', r'cop\d+', 'Vp', 'draft', 'final',
+        'ocr', 'OCR', 'edit', 'edited', 'rev', 'revised', 'proof',
+        'beta', 'alpha', 'test', 'demo', 'sample', 'preview',
+        'full', 'complete', 'fix', 'fixed', 'corrected'
+    ]
+    suffix_pattern = '|'.join(suffixes_to_remove)
+    parts = name.rsplit(' - ', 1)
+    if len(parts) == 2:
+        last_part = parts[1].strip()
+        if re.match(f'^({suffix_pattern})$', last_part, re.IGNORECASE):
+            name = parts[0]
+    if ' - ' in name:
+        parts = name.split(' - ', 1)
+        if len(parts) == 2:
+            title = re.sub(r'^\d+\.\s*', '', parts[1])
+            name = f"{parts[0]} - {title}"
+    name = re.sub(r'\s+', ' ', name).strip()
+    name = re.sub(r'\s*[-–]\s*$', '', name)
+    return name
+
+
+def legacy_complex_normalize(filename):
+    name = Path(filename).stem
+    patterns = [
+        r'[_-]\d{6,8}$',
+        r'[\(\[].*?[\)\]]',
+        r'\b(vol|volume|part|nr|no|v|ver|version)\.?\s*\d+\b',
+        r'\b(ed|edit|edition|rev|revised)\b.*$',
+        r'\b(scan(ned)?|ocr|digital|copy|retail|draft|final|proof)\b',
+        r'[_\s\-]+$'
+    ]
+    for pattern in patterns:
+        name = re.sub(pattern, '', name, flags=re.IGNORECASE)
+    name = re.sub(r'[\s_\-]+', ' ', name).strip()
+    name = re.sub(r'\s+-\s+', ' - ', name)
+    return name
+
+
+def legacy_cleaner(filename):
+    name = Path(filename).stem
+    patterns = [
+        r'[_-]\d{6,8}$',
+        r'\s*[\(\[].*?[\)\]]',
+        r'\b[vV]\.?\s*\d+([\.\-]\d+)*\b',
+        r'\b(ed|edit|edition|version)\b.*$',
+        r'\b(scan(ned)?|ocr|digital|copy|retail)\b',
+        r'[_\s]+$'
+    ]
+    for pattern in patterns:
+        name = re.sub(pattern, '', name, flags=re.IGNORECASE)
+    name = re.sub(r'\s+[-–]\s*', ' - ', name)
+    name = re.sub(r'\s+', ' ', name).strip()
+    return name
+
+
+def legacy_process_filename(filepath):
+    filename = os.path.splitext(os.path.basename(filepath))[0]
+    words_to_remove = [
+        'retail', 'scan', 'ctrl', 'ocr', 'vp', 'istor',
+        'trad', 'trad.', 'ed', 'edition', 'vol', 'tome'
+    ]
+    filename = re.sub(r'\([^)]*\)', '', filename)
+    filename = re.sub(r'\d+', '', filename)
+    words = re.findall(r'\w+', filename.lower())
+    filtered_words = [word for word in words if word not in words_to_remove]
+    search_query = ' '.join(filtered_words)
+    return search_query, filtered_words
+
+
+def legacy_aggressive_extract(filepath):
+    filename = os.path.splitext(os.path.basename(filepath))[0]
+    if ' - ' in filename:
+        parts = filename.split(' - ')
+        if len(parts) >= 2:
+            author_part = parts[0].strip()
+            title_part = ' - '.join(parts[1:]).strip()
+            return author_part, title_part
+    cleanup_words = [
+        'scan', 'ctrl', 'ocr', 'retail', 'foto', 'conv', 'convert',
+        'epub', 'pdf', 'djvu', 'mobi', 'mmxii', 'mmxi', 'mmxx'
+    ]
+    clean_name = filename
+    for word in cleanup_words:
+        clean_name = re.sub(rf'\b{word}\b', '', clean_name, flags=re.IGNORECASE)
+    clean_name = re.sub(r'\b\d+\b', '', clean_name)
+    clean_name = re.sub(r'[._\-]+', ' ', clean_name)
+    clean_name = ' '.join(clean_name.split())
+    return "", clean_name
+
+
+def legacy_sanitize_title(folder_name):
+    title = re.sub(r'[^\w\s-]', ' ', folder_name)
+    title = re.sub(r'\s+', ' ', title).strip()
+    return title
+
+
+def legacy_match_key(filename):
+    name = Path(filename).stem if isinstance(filename, (str, Path)) else str(filename)
+    name = name.lower()
+    name = re.sub(r'[^\w\s]', ' ', name)
+    name = re.sub(r'\s+', ' ', name).strip()
+    name = name.replace(' ', '-')
+    return name
+
+
+def legacy_identifier_base(title):
+    identifier = title.lower()
+    identifier = re.sub(r'[^a-z0-9\s\.]', '-', identifier)
+    identifier = re.sub(r'\s+', '-', identifier)
+    identifier = re.sub(r'-+', '-', identifier)
+    identifier = identifier.strip('-')
+    if len(identifier) > 80:
+        words = identifier.split('-')
+        result_parts = []
+        current_length = 0
+        for word in words:
+            if current_length + len(word) + 1 <= 80:
+                result_parts.append(word)
+                current_length += len(word) + 1
+            else:
+                break
+        identifier = '-'.join(result_parts)
+    return identifier
+
+
+def legacy_remove_diacritics(text):
+    return ''.join(c for c in unicodedata.normalize('NFD', text)
+                   if unicodedata.category(c) != 'Mn')
+
+
+LEGACY: Dict[str, Callable] = {
+    "uploader_search": legacy_uploader_search,
+    "pure_web_search": legacy_pure_web_search,
+    "alternativa_search": legacy_alternativa_search,
+    "complex_normalize": legacy_complex_normalize,
+    "cleaner": legacy_cleaner,
+    "process_filename": legacy_process_filename,
+    "aggressive_extract": legacy_aggressive_extract,
+    "sanitize_title": legacy_sanitize_title,
+    "match_key": legacy_match_key,
+    "identifier_base": legacy_identifier_base,
+    "remove_diacritics": legacy_remove_diacritics,
+}
+
+# ============================================================
+# Nume de fișiere realiste
+# ============================================================
+
+DECORATIONS = [' - scan', ' - ctrl', ' - retail', ' - Vp', ' - final', ' - ocr', ' - cop1',
+               ' (trad. Ion Vinea)', ' [ro]', ' (ed. a II-a)', ' v.0.9', ' v.0.9.8.5-161', ' v.1.0 MMXII',
+               ' - v.2.0', ' Vol. 2', ' vol 3', ' ed. 2', ' part 1', ' - Draft', ' 2nd edition',
+               ' scanned', ' digital copy']
+DATE_SUFFIXES = ['_202508', '-20250806', '_20250827', '']
+EXTENSIONS = ['.pdf', '.pdf', '.pdf', '.epub', '.djvu', '.mobi', '.doc', '.docx', '.rtf']
+DIACRITICS = {'a': 'ă', 'i': 'î', 's': 'ș', 't': 'ț', 'A': 'Â', 'S': 'Ş', 'T': 'Ţ'}
+EDGE_CASES = [
+    "", ".pdf", "Carte.pdf", "ABC - 4. Comosicus.pdf", "Autor - Titlu - scan.pdf",
+    "Popescu, Ion - Istoria Romanilor (trad.) [ro] v.1.0 MMXII - 161.pdf",
+    "C:\\fakepath\\Ionescu - Carte.pdf", "g:/ARHIVA/B/Ionescu/Ionescu - Carte_202508.pdf",
+    "Ștefănescu, Ană - Țară și oameni.epub", "a" * 120 + ".pdf", "X - " + "cuvânt-lung " * 12 + ".pdf",
+    "___ - ---.pdf", "Vol. 2 - Ed. 3.pdf", "  spatii   multiple  .pdf", "Ångström – Ωmega ﬁnal.pdf",
+]
+
+
+def load_base_titles() -> List[Tuple[str, str]]:
+    """(autor, titlu) din rapoartele deleted_folders_*.json"""
+    pairs = []
+    for log_path in sorted(glob.glob(str(LOG_FOLDER / "deleted_folders_*.json"))):
+        with open(log_path, 'r', encoding='utf-8') as f:
+            for entry in json.load(f):
+                author = (entry.get("name") or "").strip()
+                title = (entry.get("best_match") or "").strip()
+                if author and title.lower().startswith(author.lower()):
+                    title = title[len(author):].strip()
+                if title:
+                    pairs.append((author, title))
+    return pairs or [("Popescu, Ion", "Istoria Romanilor"), ("Hall, John", "Classical Conditioning")]
+
+
+def generate_filenames(count: int, seed: int) -> List[str]:
+    """Nume de fișiere realiste: autor - titlu + sufixe tehnice, versiuni, date, diacritice"""
+    rng = random.Random(seed)
+    pairs = load_base_titles()
+    names = []
+    for index in range(count):
+        author, title = rng.choice(pairs)
+        if rng.random() < 0.25:
+            title = ''.join(DIACRITICS.get(c, c) if rng.random() < 0.3 else c for c in title)
+        if rng.random() < 0.15:
+            title = f"{rng.randint(1, 12)}. {title}"
+        name = f"{author} - {title}" if author and rng.random() < 0.8 else title
+        for decoration in rng.sample(DECORATIONS, rng.choice([0, 0, 1, 1, 2])):
+            name += decoration
+        if rng.random() < 0.1:
+            name = name.replace(' ', '_')
+        name += rng.choice(DATE_SUFFIXES)
+        if rng.random() < 0.3:
+            name += f" {index}"  # Nume unice, ca să nu măsurăm doar cache-ul
+        names.append(name + rng.choice(EXTENSIONS))
+    return names
+
+
+# ============================================================
+# Verificare și benchmark
+# ============================================================
+
+def as_json(value: Any) -> Any:
+    return json.loads(json.dumps(value, ensure_ascii=False))
+
+
+def regenerate_golden(seed: int):
+    cases = EDGE_CASES + generate_filenames(GOLDEN_CASES, seed)
+    data = {
+        "profiles": list(LEGACY),
+        "cases": [{"input": name, "outputs": {p: as_json(fn(name)) for p, fn in LEGACY.items()}}
+                  for name in cases],
+    }
+    GOLDEN_FILE.parent.mkdir(exist_ok=True)
+    with open(GOLDEN_FILE, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    print(f"💾 Golden regenerat: {GOLDEN_FILE} ({len(cases)} cazuri × {len(LEGACY)} profile)")
+
+
+def verify_golden() -> int:
+    with open(GOLDEN_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    failures = 0
+    for case in data["cases"]:
+        for profile, expected in case["outputs"].items():
+            actual = as_json(normalizer.normalize(profile, case["input"]))
+            if actual != expected:
+                failures += 1
+                if failures <= 10:
+                    print(f"   ❌ {profile}: {case['input']!r} -> {actual!r} (așteptat {expected!r})")
+    print(f"{'✅' if not failures else '❌'} Golden: {len(data['cases'])} cazuri, {failures} diferențe")
+    return failures
+
+
+def verify_against_legacy(names: List[str]) -> int:
+    failures = 0
+    for profile, legacy in LEGACY.items():
+        normalizer.cache_clear()
+        diff = sum(1 for name in names if normalizer.normalize(profile, name) != legacy(name))
+        failures += diff
+        if diff:
+            print(f"   ❌ {profile}: {diff} diferențe")
+    print(f"{'✅' if not failures else '❌'} Comparație cu implementările vechi pe {len(names)} nume: {failures} diferențe")
+    return failures
+
+
+def benchmark(names: List[str]):
+    # Trecerea "caldă" refolosește nume deja văzute; setul trebuie să încapă în cache
+    warm_names = names[:normalizer.CACHE_SIZE]
+    print("\n" + "=" * 78)
+    print(f"{'Profil':<20} {'Vechi':>10} {'Nou (rece)':>12} {'Nou (cald)':>12} {'Accelerare':>11}")
+    for profile, legacy in LEGACY.items():
+        fn = normalizer.PROFILES[profile]
+
+        started = time.perf_counter()
+        for name in names:
+            legacy(name)
+        old = (time.perf_counter() - started) / len(names)
+
+        normalizer.cache_clear()
+        started = time.perf_counter()
+        for name in names:
+            fn(name)
+        cold = (time.perf_counter() - started) / len(names)
+
+        normalizer.cache_clear()
+        for name in warm_names:
+            fn(name)
+        started = time.perf_counter()
+        for name in warm_names:
+            fn(name)
+        warm = (time.perf_counter() - started) / len(warm_names)
+
+        print(f"{profile:<20} {old * 1e6:>8.2f}µs {cold * 1e6:>10.2f}µs {warm * 1e6:>10.2f}µs {old / cold:>10.2f}x")
+    print("=" * 78)
+
+
+def main():
+    """Funcția principală"""
+    parser = argparse.ArgumentParser(description="Golden + benchmark pentru archive_title_normalizer")
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--regenerate-golden", action="store_true")
+    args = parser.parse_args()
+
+    if args.regenerate_golden:
+        regenerate_golden(args.seed)
+        return 0
+
+    failures = verify_golden()
+    names = generate_filenames(args.count, args.seed + 1)
+    failures += verify_against_legacy(names)
+    benchmark(names)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark pentru bucla completă ArchiveUploader, offline: arhivă sintetică
+(archive_fake_backend.generate_archive) + backend de upload fals (--backend fake).
+
+Rulează run() exact ca în producție (plan, coadă de lucru, validare, mutări în
+d:\\3, reîncercări) într-un director temporar și raportează:
+- unități/oră (upload-uri verificate și mutări în d:\\3; unitățile invalide doar numărate)
+- timpul pe etape, exclusiv: scan, validate, upload, state (JSON-urile de stare),
+  pacing (pauzele fixe din buclă), backoff (așteptarea reîncercărilor), other
+
+Pauzele (time.sleep în uploader, backend și archive_retry) sunt implicit
+simulate: se adună la etapa lor fără să fie dormite, ca o rulare de ore să se
+măsoare în secunde; ceasul reîncercărilor avansează odată cu ele.
+--real-sleep le doarme efectiv.
+
+Folosire:
+    python benchmark_uploader_loop.py --authors 30 --books 5 --median-mb 5 --mb-per-second 2
+    python benchmark_uploader_loop.py --failure-rate 0.1 --corrupt-ratio 0.05 --json rezultat.json
+"""
+
+import argparse
+import contextlib
+import functools
+import importlib.util
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import archive_fake_backend
+import archive_retry
+from archive_fake_backend import FAKE_ITEM_OVERHEAD, FAKE_MB_PER_SECOND, FakeUploadBackend, generate_archive
+
+UPLOADER_SCRIPT = Path(__file__).resolve().parent / "+FINAL 3 - asta pornesti SIMPLU.py"
+STAGES = ["scan", "validate", "upload", "state", "pacing", "backoff", "retry", "other"]
+# Metoda uploader-ului -> etapa în care i se contorizează timpul (exclusiv, fără apelurile imbricate)
+UPLOADER_STAGES = {
+    "get_folders_to_process": "scan",
+    "scan_folder_structure": "scan",
+    "divert_invalid_units": "validate",
+    "upload_files_fake": "upload",
+    "_save_state": "state",
+    "retry_failed_uploads": "retry",
+    "requeue_failed_units": "retry",
+}
+
+
+def load_script(path: Path, module_name: str):
+    """Importă un script (cu spații în nume) ca modul"""
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class StageClock:
+    """Ceas pe etape, cu timp exclusiv: o etapă imbricată oprește contorul celei exterioare"""
+
+    def __init__(self, real_sleep: bool = False):
+        self.real_sleep = real_sleep
+        self.skipped = 0.0  # Secundele de pauză simulate (nedormite)
+        self.totals = {stage: 0.0 for stage in STAGES}
+        self.stack: List[str] = []
+        self.last = self.now()
+
+    def now(self) -> float:
+        return time.perf_counter() + self.skipped
+
+    def _charge(self):
+        now = self.now()
+        self.totals[self.stack[-1] if self.stack else "other"] += now - self.last
+        self.last = now
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        self._charge()
+        self.stack.append(name)
+        try:
+            yield
+        finally:
+            self._charge()
+            self.stack.pop()
+
+    def sleep(self, seconds: float, stage: Optional[str] = None):
+        with self.stage(stage or (self.stack[-1] if self.stack else "other")):
+            if self.real_sleep:
+                time.sleep(seconds)
+            else:
+                self.skipped += max(0.0, seconds)
+
+    def wrap(self, obj: Any, method: str, stage: str):
+        original = getattr(obj, method)
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            with self.stage(stage):
+                return original(*args, **kwargs)
+        setattr(obj, method, timed)
+
+
+class SleepProxy:
+    """Înlocuiește modulul time într-un modul: sleep trece prin StageClock, restul e time"""
+
+    def __init__(self, clock: StageClock, stage: Optional[str]):
+        self.clock = clock
+        self.stage = stage
+
+    def sleep(self, seconds: float):
+        self.clock.sleep(seconds, self.stage)
+
+    def __getattr__(self, name: str):
+        return getattr(time, name)
+
+
+def virtual_datetime(clock: StageClock):
+    """datetime cu now() decalat de pauzele simulate - altfel retry_at n-ar ajunge niciodată la scadență"""
+    class VirtualDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) + timedelta(seconds=clock.skipped)
+    return VirtualDatetime
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Generează arhiva, rulează ArchiveUploader(backend="fake") și întoarce măsurătorile"""
+    uploader_module = load_script(UPLOADER_SCRIPT, "archive_uploader_final3")
+    clock = StageClock(real_sleep=args.real_sleep)
+    workdir = Path(tempfile.mkdtemp(prefix="uploader_bench_"))
+    cwd = os.getcwd()
+    patched = [(uploader_module, "pacing"), (archive_retry, "backoff"), (archive_fake_backend, None)]
+    try:
+        started = time.perf_counter()
+        archive = generate_archive(workdir / "ARHIVA", args.authors, args.books, args.median_mb, args.max_mb,
+                                   args.no_pdf_ratio, args.corrupt_ratio, args.seed, args.encrypted_ratio)
+        generate_seconds = time.perf_counter() - started
+        print(f"📚 Arhivă sintetică: {archive['units']} unități ({archive['upload_units']} cu PDF), "
+              f"{archive['files']} fișiere, {archive['bytes'] / 1024 ** 2:.1f} MB ({archive['corrupt']} PDF-uri trunchiate, "
+              f"{archive['encrypted']} criptate) în {generate_seconds:.1f}s")
+
+        # Stările JSON (state, coadă, plan, cache de validare) se scriu relativ la directorul curent
+        os.chdir(workdir)
+        uploader_module.ARCHIVE_PATH = workdir / "ARHIVA"
+        uploader_module.MOVE_PATH = workdir / "3"
+        uploader_module.TEMP_PATH = workdir / "TEMP"
+        for module, stage in patched:
+            module.time = SleepProxy(clock, stage)
+        archive_retry.datetime = virtual_datetime(clock)
+
+        uploader = uploader_module.ArchiveUploader(backend="fake")
+        uploader.fake_backend = FakeUploadBackend(args.mb_per_second, args.item_overhead, args.failure_rate,
+                                                  seed=args.seed)
+        for method, stage in UPLOADER_STAGES.items():
+            clock.wrap(uploader, method, stage)
+        clock.wrap(uploader.work_queue, "_save", "state")
+
+        output = io.StringIO()
+        clock.last = clock.now()
+        run_started = clock.now()
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+            success = uploader.run()
+        clock._charge()
+        total = clock.now() - run_started
+    finally:
+        for module, _ in patched:
+            module.time = time
+        archive_retry.datetime = datetime
+        os.chdir(cwd)
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    with uploader.work_queue.lock:
+        entries = list(uploader.work_queue.entries.values())
+    actions = Counter(e.get("detail") for e in entries if e["state"] == "verified")
+    uploaded, moved = actions["UPLOAD"], actions["MUTAT"] + actions["GOLA"]
+    return {
+        "success": success, "workdir": str(workdir), "archive": archive,
+        "seconds": total, "simulated_sleep": clock.skipped,
+        "uploaded": uploaded, "moved": moved, "invalid": uploader.work_queue.counts()["invalid"],
+        "counts": uploader.work_queue.counts(),
+        "units_per_hour": (uploaded + moved) / total * 3600 if total else 0.0,
+        "uploads_per_hour": uploaded / total * 3600 if total else 0.0,
+        "stages": clock.totals, "backend": uploader.fake_backend.summary(),
+        "log_tail": output.getvalue().splitlines()[-15:] if not success else [],
+    }
+
+
+def print_report(result: Dict[str, Any]):
+    print(f"\n📊 Bucla ArchiveUploader ({'OK' if result['success'] else 'EȘUATĂ'}) - {result['workdir']}")
+    print(f"   ⏱️ {result['seconds']:.1f}s (din care {result['simulated_sleep']:.1f}s pauze simulate)")
+    print(f"   🚀 {result['units_per_hour']:.0f} unități/oră ({result['uploads_per_hour']:.0f} upload-uri/oră) - "
+          f"{result['uploaded']} încărcate, {result['moved']} mutate, {result['invalid']} invalide, stări: {result['counts']}")
+    print(f"   {result['backend']}")
+    if result["invalid"] != result["archive"]["corrupt"]:
+        # Doar PDF-urile trunchiate trebuie oprite; cele criptate cu object stream-uri trec de validare
+        print(f"   ⚠ {result['invalid']} unități oprite ca invalide, arhiva are {result['archive']['corrupt']} PDF-uri trunchiate")
+    print(f"   {'etapă':<10} {'secunde':>10} {'%':>7}")
+    for stage in STAGES:
+        seconds = result["stages"][stage]
+        share = seconds / result["seconds"] * 100 if result["seconds"] else 0.0
+        print(f"   {stage:<10} {seconds:>10.2f} {share:>6.1f}%")
+    for line in result["log_tail"]:
+        print(f"   | {line}")
+
+
+def main():
+    """Funcția principală"""
+    parser = argparse.ArgumentParser(description="Benchmark offline pentru bucla ArchiveUploader")
+    parser.add_argument("--authors", type=int, default=20)
+    parser.add_argument("--books", type=int, default=5, help="Cărți per autor")
+    parser.add_argument("--median-mb", type=float, default=2.0)
+    parser.add_argument("--max-mb", type=float, default=50.0)
+    parser.add_argument("--no-pdf-ratio", type=float, default=0.15)
+    parser.add_argument("--corrupt-ratio", type=float, default=0.02)
+    parser.add_argument("--encrypted-ratio", type=float, default=0.05)
+    parser.add_argument("--mb-per-second", type=float, default=FAKE_MB_PER_SECOND)
+    parser.add_argument("--item-overhead", type=float, default=FAKE_ITEM_OVERHEAD)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--real-sleep", action="store_true", help="Doarme efectiv pauzele (implicit simulate)")
+    parser.add_argument("--keep", action="store_true", help="Păstrează directorul temporar (arhivă, stări, rapoarte)")
+    parser.add_argument("--verbose", action="store_true", help="Afișează log-ul uploader-ului")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Salvează rezultatele într-un fișier JSON")
+    args = parser.parse_args()
+
+    result = run_benchmark(args)
+    print_report(result)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"💾 Rezultate salvate în {args.json}")
+    return 0 if result["success"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())